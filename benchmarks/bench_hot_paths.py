@@ -0,0 +1,205 @@
+"""Benchmarks de los caminos calientes del pipeline MU 2026 sobre datos sintéticos.
+
+Ejecutar:
+  python -m pytest benchmarks/bench_hot_paths.py -q -s
+  MU_BENCH_ROWS=100000 python -m pytest benchmarks/bench_hot_paths.py -q -s
+
+Los casos end-to-end requieren control/catalogos/PUENTE_SIES_COMPILADO.tsv
+(``make compile-sies``); sin él se omiten. Sus cachés de índices compilados
+van a ``tmp_path``: el benchmark no escribe bajo el repo.
+"""
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+
+import codigo_gobernanza_v2 as gob
+import motor_campos_ing
+import motor_for_ing_act
+import motor_vig_fecha
+from conftest import bench_rows
+from src.identity import SiesCodeTable
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Lectura y resumen histórico (Hoja1)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def test_bench_lectura_hoja1(bench, workbook_sintetico, hojas_sinteticas):
+    df = bench(pd.read_excel, workbook_sintetico, sheet_name="Hoja1")
+    assert len(df) == len(hojas_sinteticas["Hoja1"])
+
+
+def test_bench_historico_mu_summary(bench, hojas_sinteticas):
+    hoja1 = hojas_sinteticas["Hoja1"]
+    summary, anio_ref = bench(gob._build_mu_historico_summary, hoja1, "RUT", "DIG", "CODCARR")
+    assert anio_ref is not None
+    assert not summary.empty
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FOR_ING_ACT por fila (pipeline principal)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def test_bench_resolve_for_ing_act(bench, hojas_sinteticas):
+    da = hojas_sinteticas["DatosAlumnos"]
+    valid_codes, _ = gob._load_for_ing_act_catalog()
+
+    def _run():
+        return [
+            gob._resolve_for_ing_act_row(pd.NA, vias, carrera, codcarpr, valid_codes)
+            for vias, carrera, codcarpr in zip(da["VIASDEADMISION"], da["NOMBRE_L"], da["CODCARPR"])
+        ]
+
+    out = bench(_run)
+    assert len(out) == len(da)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Fase 3 SIES y consolidación por CODCLI (loops por fila)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _ambiguos_sinteticos(n: int) -> tuple[pd.DataFrame, dict, dict, SiesCodeTable]:
+    """Ambigüedades SIES que recorren cada regla de la cascada en proporciones parecidas."""
+    rng = np.random.default_rng(27)
+    car = rng.integers(1, 400, n)
+    sed = rng.integers(1, 4, n)
+    jor = rng.choice([1, 2], n)
+    regla = np.arange(n) % 4  # 0 sede, 1 tipo plan, 2 homologación, 3 condición año
+    cod_a = [f"I1S{s}C{c}J{j}V1" for s, c, j in zip(sed, car, jor)]
+    cod_b = [f"I1S{s % 3 + 1}C{c}J{3 - j}V1" for s, c, j in zip(sed, car, jor)]
+    codcarpr = np.where(regla == 1, "CI", "AD").astype(object) + pd.Series(car).astype(str).to_numpy()
+    letra = np.where(jor == 1, "D", "V")
+
+    df = pd.DataFrame(
+        {
+            "CODCARPR_NORM": codcarpr,
+            "JORNADA_FUENTE": np.where(regla == 2, "X", letra),
+            "CODIGOS_SIES_POTENCIALES": [f"{a} | {b}" for a, b in zip(cod_a, cod_b)],
+            "CODIGO_CARRERA_SIES_1": cod_a,
+            "CODIGO_CARRERA_SIES_2": cod_b,
+            "CODIGO_CARRERA_SIES_1_CONDICION_ANIO_INGRESO": np.where(regla == 3, ">=2020", ""),
+            "CODIGO_CARRERA_SIES_2_CONDICION_ANIO_INGRESO": np.where(regla == 3, "<=2019", ""),
+            "ANIO_ING_ACT": rng.integers(2015, 2026, n).astype(str),
+            "COD_SED": np.where(regla == 0, sed.astype(str), ""),
+            gob.FINAL_SIES_CODE_COL: pd.NA,
+            "SIES_MATCH_STATUS": "AMBIGUO_SIES",
+        }
+    )
+    oferta_idx = {}
+    for a, b, r in zip(cod_a, cod_b, regla):
+        tp_a = 3 if r == 1 else 1
+        oferta_idx[a] = {"TIPO_PLAN_CARRERA": tp_a, "JORNADA": int(a[-3]), "DURACION_ESTUDIOS": 8}
+        oferta_idx[b] = {"TIPO_PLAN_CARRERA": 1, "JORNADA": int(b[-3]), "DURACION_ESTUDIOS": 8}
+    homol_dict = {(c, "X"): a for c, a, r in zip(codcarpr, cod_a, regla) if r == 2}
+    return df, oferta_idx, homol_dict, SiesCodeTable.from_codes(cod_a, cod_b)
+
+
+def _candidatos_sinteticos(n: int) -> pd.DataFrame:
+    """Candidatos OK_CARGA_PREGRADO con duplicados intra-CODCLI, por clave 8-col y multi-carrera."""
+    rng = np.random.default_rng(28)
+    codcli = np.arange(n)
+    intra = rng.random(n) < 0.10
+    codcli[intra] = rng.integers(0, n, intra.sum())
+    ndoc = 10_000_000 + codcli
+    multi = rng.random(n) < 0.10
+    ndoc[multi] = 10_000_000 + rng.integers(0, n, multi.sum())
+    return pd.DataFrame(
+        {
+            "CODCLI": codcli.astype(str),
+            "TIPO_DOC": "R",
+            "N_DOC": ndoc.astype(str),
+            "DV": (ndoc % 10).astype(str),
+            "COD_SED": "1",
+            "COD_CAR": rng.integers(1, 40, n).astype(str),
+            "MODALIDAD": "1",
+            "JOR": rng.choice(["1", "2"], n),
+            "VERSION": "1",
+            "_FECHA_MAT_TMP": pd.Timestamp("2026-03-01") - pd.to_timedelta(rng.integers(0, 90, n), unit="D"),
+            "NIV_ACA": rng.integers(1, 10, n).astype(str),
+            "VIG": rng.choice([1, 2], n),
+            "ANIO_ING_ACT": rng.integers(2015, 2026, n).astype(str),
+            "NOMBRE_CARRERA_FUENTE": "CARRERA SINTETICA",
+        }
+    )
+
+
+def test_bench_resolver_ambiguedades_sies_heuristica(bench):
+    ambiguos, oferta_idx, homol_dict, sies_codes = _ambiguos_sinteticos(bench_rows())
+
+    out = bench(gob._resolver_ambiguedades_sies_heuristica, ambiguos, oferta_idx, homol_dict, sies_codes)
+    reglas = set(out["SIES_RESOLUCION_HEURISTICA"].dropna())
+    assert {"REGLA_SEDE", "REGLA_TIPO_PLAN", "REGLA_HOMOLOGACION", "REGLA_CONDICION_ANIO_INGRESO"} <= reglas
+
+
+def test_bench_consolidar_candidatos_por_codcli(bench):
+    base = _candidatos_sinteticos(bench_rows())
+
+    def _setup():
+        estado = pd.Series("OK_CARGA_PREGRADO", index=base.index, dtype=object)
+        return (base.copy(), estado), {}
+
+    candidatos, estado, auditoria = bench.pedantic(
+        gob._consolidar_candidatos_por_codcli, setup=_setup, rounds=1, iterations=1
+    )
+    assert candidatos["CODCLI"].is_unique
+    assert {"A_INTRA_CODCLI", "C_MULTI_CODCLI_MISMA_IDENTIDAD"} <= set(auditoria["CASO"])
+    assert (estado != "OK_CARGA_PREGRADO").sum() == len(base) - len(candidatos)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Motores standalone (carga + derivación)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def test_bench_motor_for_ing_act(bench, workbook_sintetico, monkeypatch):
+    monkeypatch.setattr(motor_for_ing_act, "EXCEL_IN", workbook_sintetico)
+
+    def _run():
+        da, h1, _ = motor_for_ing_act.load_data()
+        return motor_for_ing_act.apply_decision_tree(motor_for_ing_act.derive_flags(da, h1))
+
+    da = bench(_run)
+    assert da["FOR_ING_ACT"].notna().all()
+
+
+def test_bench_motor_vig_fecha(bench, workbook_sintetico, monkeypatch):
+    monkeypatch.setattr(motor_vig_fecha, "EXCEL_IN", workbook_sintetico)
+
+    def _run():
+        da = motor_vig_fecha.load_data()
+        return motor_vig_fecha.derive_fecha_matricula(motor_vig_fecha.derive_vig(da))
+
+    da = bench(_run)
+    assert {"VIG", "FECHA_MATRICULA"}.issubset(da.columns)
+
+
+def test_bench_motor_campos_ing_act(bench, workbook_sintetico, monkeypatch):
+    monkeypatch.setattr(motor_vig_fecha, "EXCEL_IN", workbook_sintetico)
+    base = motor_vig_fecha.load_data()
+
+    def _run(da):
+        return motor_campos_ing.derive_sem_ing_act(motor_campos_ing.derive_anio_ing_act(da))
+
+    da = bench.pedantic(_run, setup=lambda: ((base.copy(),), {}), rounds=1, iterations=1)
+    assert {"ANIO_ING_ACT", "SEM_ING_ACT"}.issubset(da.columns)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# End-to-end MU (requiere puente SIES compilado)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def test_bench_pipeline_matricula_end_to_end(bench, workbook_sintetico, tmp_path, monkeypatch, requiere_puente_sies):
+    out_dir = tmp_path / "resultados"
+    # Índices compilados (oferta, homologación del workbook, puente-duración) fuera del repo.
+    monkeypatch.setattr(gob, "DEFAULT_COMPILED_INDEX_DIR", tmp_path / "indices")
+
+    report = bench.pedantic(
+        gob.ejecutar_pipeline_matricula_unificada_legacy_like,
+        kwargs={"input_file": workbook_sintetico, "output_dir": out_dir, "usar_gobernanza_v2": True},
+        rounds=1,
+        iterations=1,
+    )
+    assert (out_dir / "matricula_unificada_2026_pregrado.csv").exists()
+    assert json.loads(json.dumps(report, default=str))
@@ -0,0 +1,53 @@
+"""Regresión de memoria del pipeline MU sobre el workbook sintético.
+
+Corre la CLI en un subproceso (RSS limpio, sin el estado de pytest) y
+compara el pico de RSS del ``perf_profile.json`` con un presupuesto:
+
+  MU_MEM_BUDGET_MB=300  python -m pytest benchmarks/bench_memoria.py -q -s
+
+Sin ``MU_MEM_BUDGET_MB`` el presupuesto escala con ``MU_BENCH_ROWS``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT, bench_rows
+
+MU_MEM_BUDGET_ENV = "MU_MEM_BUDGET_MB"
+MEM_BASE_MB = 200.0
+MEM_MB_POR_1000_FILAS = 10.0
+
+
+def presupuesto_memoria_mb() -> float:
+    raw = os.environ.get(MU_MEM_BUDGET_ENV, "").strip()
+    if raw:
+        return float(raw)
+    return MEM_BASE_MB + MEM_MB_POR_1000_FILAS * bench_rows() / 1000
+
+
+def test_pipeline_matricula_rss_peak(workbook_sintetico, tmp_path, requiere_puente_sies):
+    out_dir = tmp_path / "resultados"
+    cmd = [
+        sys.executable,
+        str(ROOT / "codigo_gobernanza_v2.py"),
+        "--input", str(workbook_sintetico),
+        "--output-dir", str(out_dir),
+        "--proceso", "matricula",
+        "--usar-gobernanza-v2", "true",
+    ]
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stdout[-2000:] + proc.stderr[-2000:]
+
+    profile = json.loads((out_dir / "perf_profile.json").read_text(encoding="utf-8"))
+    peak = profile.get("rss_peak_mb")
+    if peak is None:
+        pytest.skip("RSS no disponible en esta plataforma")
+    budget = presupuesto_memoria_mb()
+    etapa = max(profile["stages"], key=lambda s: s.get("rss_peak_mb") or 0)
+    print(f"\n🧠 RSS pico: {peak:.1f} MB (presupuesto {budget:.0f} MB, {bench_rows()} filas objetivo; etapa {etapa['name']})")
+    assert peak <= budget, f"RSS pico {peak:.1f} MB supera el presupuesto de {budget:.0f} MB (etapa {etapa['name']})"
@@ -0,0 +1,200 @@
+"""Fixtures compartidos de la suite de benchmarks MU 2026.
+
+Escala por variable de entorno:
+  MU_BENCH_ROWS=10000   (default, apto para CI)
+  MU_BENCH_ROWS=100000  /  MU_BENCH_ROWS=1000000  (corridas manuales)
+
+Si ``pytest-benchmark`` está instalado se usa su fixture ``benchmark``
+(estadísticas, ``--benchmark-compare``); si no, ``bench`` degrada a un
+cronómetro simple que imprime el tiempo de cada caso.
+
+Gate de regresión (opt-in): con ``MU_BENCH_BASELINE=<ruta.json>`` cada caso
+se compara con la referencia grabada en esa ruta y falla si supera
+``MU_BENCH_TOLERANCE`` veces su tiempo (default 1.5). La referencia se graba
+en la misma máquina con ``MU_BENCH_UPDATE_BASELINE=1``; si fue grabada en otra
+máquina o a otra escala (``MU_BENCH_ROWS``) el gate no aplica. Sin
+``MU_BENCH_BASELINE`` los tiempos solo se imprimen.
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+for _p in (ROOT, ROOT / "scripts", BENCH_DIR):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from generar_workbook_sintetico import (  # noqa: E402
+    ParametrosSinteticos,
+    construir_hojas,
+    escribir_workbook,
+    estudiantes_para_filas,
+)
+from src.export import atomic_write_json  # noqa: E402
+
+MU_BENCH_ROWS_ENV = "MU_BENCH_ROWS"
+DEFAULT_BENCH_ROWS = 10_000
+PUENTE_SIES_COMPILADO = ROOT / "control" / "catalogos" / "PUENTE_SIES_COMPILADO.tsv"
+
+MU_BENCH_TOLERANCE_ENV = "MU_BENCH_TOLERANCE"
+MU_BENCH_UPDATE_ENV = "MU_BENCH_UPDATE_BASELINE"
+MU_BENCH_BASELINE_ENV = "MU_BENCH_BASELINE"
+DEFAULT_BENCH_TOLERANCE = 1.5
+# Bajo este margen absoluto la diferencia es ruido del reloj, no regresión.
+BENCH_NOISE_FLOOR_S = 0.05
+
+try:  # pragma: no cover - depende del entorno
+    import pytest_benchmark  # noqa: F401
+
+    HAS_PYTEST_BENCHMARK = True
+except ImportError:  # pragma: no cover
+    HAS_PYTEST_BENCHMARK = False
+
+
+def bench_rows() -> int:
+    raw = os.environ.get(MU_BENCH_ROWS_ENV, "").strip().replace("_", "")
+    return int(raw) if raw.isdigit() and int(raw) > 0 else DEFAULT_BENCH_ROWS
+
+
+def bench_tolerance() -> float:
+    raw = os.environ.get(MU_BENCH_TOLERANCE_ENV, "").strip()
+    return float(raw) if raw else DEFAULT_BENCH_TOLERANCE
+
+
+def baseline_path() -> Path | None:
+    raw = os.environ.get(MU_BENCH_BASELINE_ENV, "").strip()
+    return Path(raw).expanduser() if raw else None
+
+
+def bench_machine() -> str:
+    """Identifica la máquina de la referencia: tiempos absolutos solo se comparan en ella."""
+    return f"{platform.node()}|{platform.machine()}|{os.cpu_count()}"
+
+
+def load_baseline(path: Path | None) -> dict[str, float]:
+    """Tiempos de referencia por caso; vacío si no hay ruta, no existe o es de otra máquina/escala."""
+    if path is None or not path.exists():
+        return {}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("filas") != bench_rows() or payload.get("maquina") != bench_machine():
+        return {}
+    return {str(k): float(v) for k, v in payload.get("casos", {}).items()}
+
+
+def check_regression(name: str, elapsed_s: float, baseline: dict[str, float]) -> str | None:
+    """Mensaje de regresión si ``elapsed_s`` excede la referencia tolerada; None si no."""
+    ref = baseline.get(name)
+    if ref is None:
+        return None
+    limite = max(ref * bench_tolerance(), ref + BENCH_NOISE_FLOOR_S)
+    if elapsed_s <= limite:
+        return None
+    return (
+        f"Regresión de rendimiento en {name}: {elapsed_s:.3f}s > {limite:.3f}s "
+        f"(referencia {ref:.3f}s × {bench_tolerance():g}, {MU_BENCH_BASELINE_ENV})"
+    )
+
+
+def _elapsed_s(bench) -> float | None:
+    """Tiempo del caso: ``elapsed_s`` del cronómetro simple o el mínimo de pytest-benchmark."""
+    if isinstance(bench, _SimpleBench):
+        return bench.elapsed_s
+    stats = getattr(getattr(bench, "stats", None), "stats", None)
+    return getattr(stats, "min", None)
+
+
+@pytest.fixture(scope="session")
+def bench_params() -> ParametrosSinteticos:
+    return ParametrosSinteticos(estudiantes=estudiantes_para_filas(bench_rows()))
+
+
+@pytest.fixture(scope="session")
+def hojas_sinteticas(bench_params):
+    return construir_hojas(bench_params)
+
+
+@pytest.fixture(scope="session")
+def workbook_sintetico(hojas_sinteticas, tmp_path_factory) -> Path:
+    out = tmp_path_factory.mktemp("mu_bench") / "PROMEDIOS_SINTETICO.xlsx"
+    return escribir_workbook(hojas_sinteticas, out)
+
+
+class _SimpleBench:
+    """Sustituto mínimo de ``benchmark``: una corrida, tiempo a stdout."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.elapsed_s: float | None = None
+
+    def __call__(self, fn, *args, **kwargs):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.elapsed_s = time.perf_counter() - t0
+        print(f"\n⏱️  {self.name}: {self.elapsed_s:.3f}s ({bench_rows()} filas objetivo)")
+        return result
+
+    def pedantic(self, fn, args=(), kwargs=None, setup=None, rounds=1, iterations=1, **_ignored):
+        if setup is not None:
+            args, kwargs = setup()
+        return self(fn, *args, **(kwargs or {}))
+
+
+@pytest.fixture(scope="session")
+def bench_registro():
+    """Tiempos medidos en la sesión; con ``MU_BENCH_UPDATE_BASELINE=1`` pasan a ser la referencia."""
+    registro: dict[str, float] = {}
+    yield registro
+    path = baseline_path()
+    if os.environ.get(MU_BENCH_UPDATE_ENV, "").strip() != "1" or not registro:
+        return
+    if path is None:
+        print(f"\n⚠️ {MU_BENCH_UPDATE_ENV}=1 sin {MU_BENCH_BASELINE_ENV}: referencia no grabada")
+        return
+    casos = {**load_baseline(path), **{k: round(v, 4) for k, v in registro.items()}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_json(
+        path, {"filas": bench_rows(), "maquina": bench_machine(), "casos": dict(sorted(casos.items()))}
+    )
+    print(f"\n✅ Referencia actualizada: {path} ({len(registro)} casos)")
+
+
+if HAS_PYTEST_BENCHMARK:  # pragma: no cover
+
+    @pytest.fixture
+    def _bench_base(benchmark):
+        return benchmark
+
+else:
+
+    @pytest.fixture
+    def _bench_base(request):
+        return _SimpleBench(request.node.name)
+
+
+@pytest.fixture
+def bench(_bench_base, request, bench_registro):
+    yield _bench_base
+    elapsed = _elapsed_s(_bench_base)
+    if elapsed is None:
+        return
+    name = request.node.name
+    bench_registro[name] = elapsed
+    if os.environ.get(MU_BENCH_UPDATE_ENV, "").strip() == "1":
+        return
+    mensaje = check_regression(name, elapsed, load_baseline(baseline_path()))
+    if mensaje:
+        pytest.fail(mensaje, pytrace=False)
+
+
+@pytest.fixture
+def requiere_puente_sies():
+    if not PUENTE_SIES_COMPILADO.exists():
+        pytest.skip(f"Falta {PUENTE_SIES_COMPILADO.relative_to(ROOT)} (ejecutar: make compile-sies)")
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Generador de workbook sintético — MU 2026
+Proyecto avance_curricular
+
+Emite un Excel con el mismo esquema que PROMEDIOSDEALUMNOS (hojas Hoja1,
+DatosAlumnos, base_datos y CUADRO HOMOLOGACIÓN) sin datos personales reales,
+para medir el pipeline y sus motores fuera del entorno con datos confidenciales.
+
+Las carreras (CODCARPR, NOMBRE_CARRERA, JORNADA) se toman de
+DURACION_ESTUDIOS.tsv, de modo que SOURCE_KEY_3 cruza contra el puente SIES
+compilado igual que en una corrida real.
+
+Uso:
+  python3 benchmarks/generar_workbook_sintetico.py --filas 10000 --output /tmp/mu_sintetico_10k.xlsx
+  python3 benchmarks/generar_workbook_sintetico.py --estudiantes 500 --tasa-ambiguedad 0.3
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE = Path(__file__).resolve().parent.parent
+DURACION_PATH = BASE / "DURACION_ESTUDIOS.tsv"
+
+HOJA_HOMOLOGACION = "CUADRO HOMOLOGACIÓN"
+ANIO_PROCESO = 2026
+RAMOS_POR_PERIODO = (4, 7)  # rango [min, max) de ramos inscritos por período
+_JORNADA_LETRA = {"1": "D", "2": "V", "3": "O", "4": "O"}
+_INVALID_TOKENS = {"", "NAN", "NONE", "NULL", "<NA>"}
+
+_NOMBRES = np.array(["CAMILA", "JAVIERA", "SOFIA", "VALENTINA", "CATALINA", "MATIAS", "BENJAMIN",
+                     "VICENTE", "TOMAS", "SEBASTIAN", "IGNACIO", "CONSTANZA", "FERNANDA", "DIEGO"])
+_APELLIDOS = np.array(["GONZALEZ", "MUNOZ", "ROJAS", "DIAZ", "PEREZ", "SOTO", "CONTRERAS", "SILVA",
+                       "MARTINEZ", "SEPULVEDA", "MORALES", "RODRIGUEZ", "LOPEZ", "FUENTES"])
+_VIAS_ADMISION = np.array(["ENSENANZA MEDIA NACIONAL", "CAMBIO EXTERNO", "EXTRANJERO", "MNP AA"])
+
+
+@dataclass(frozen=True)
+class ParametrosSinteticos:
+    estudiantes: int = 1000
+    profundidad_historia: int = 3  # años de historial por carrera (incluye el de ingreso)
+    tasa_multicarrera: float = 0.05  # fracción de RUT con una segunda carrera
+    tasa_ambiguedad: float = 0.15  # fracción de matrículas en llaves SIES ambiguas
+    tasa_sin_datos_alumnos: float = 0.0  # fracción de CODCLI ausentes en DatosAlumnos
+    semilla: int = 7804
+
+
+def _normalize_text(value: object) -> str:
+    if pd.isna(value):
+        return ""
+    text = unicodedata.normalize("NFKD", str(value).strip().upper())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", text)
+
+
+def _dv_rut(body: np.ndarray) -> np.ndarray:
+    """Dígito verificador módulo 11, vectorizado."""
+    total = np.zeros(len(body), dtype=np.int64)
+    rest = body.astype(np.int64).copy()
+    factor = 0
+    while rest.any():
+        total += (rest % 10) * (2 + factor % 6)
+        rest //= 10
+        factor += 1
+    dv = 11 - (total % 11)
+    out = dv.astype(str).astype(object)
+    out[dv == 11] = "0"
+    out[dv == 10] = "K"
+    return out
+
+
+def cargar_pool_carreras(duracion_path: Path = DURACION_PATH) -> pd.DataFrame:
+    """Pool (CODCARPR, CARRERA, JORNADA) realista con flag de ambigüedad SIES.
+
+    Una combinación es ambigua cuando su llave JORNADA|CODCARPR|NOMBRE apunta a
+    más de un CODIGO_UNICO en DURACION_ESTUDIOS.tsv.
+    """
+    dur = pd.read_csv(duracion_path, sep="\t", dtype=str, keep_default_na=False)
+    dur = dur[~dur["NOMBRE_CARRERA"].map(_normalize_text).str.startswith("DIPLOMADO")]
+    rows: list[dict[str, str]] = []
+    for rec in dur.itertuples(index=False):
+        letra = _JORNADA_LETRA.get(str(rec.JORNADA).strip())
+        if letra is None:
+            continue
+        tokens = {str(rec.CODCARPR_CANONICO)} | set(str(rec.CODCARPR_ALIAS_LIST).split("|"))
+        for token in tokens:
+            cod = _normalize_text(token)
+            if cod in _INVALID_TOKENS or not re.fullmatch(r"[A-Z]+", cod):
+                continue
+            rows.append(
+                {
+                    "CODCARPR": cod,
+                    "CARRERA": _normalize_text(rec.NOMBRE_CARRERA),
+                    "JORNADA": letra,
+                    "CODIGO_UNICO": str(rec.CODIGO_UNICO).strip().upper(),
+                    "DURACION_ESTUDIOS": int(pd.to_numeric(rec.DURACION_ESTUDIOS, errors="coerce") or 8),
+                }
+            )
+    pool = pd.DataFrame(rows)
+    if pool.empty:
+        raise ValueError(f"No se encontraron carreras con CODCARPR en {duracion_path}")
+    n_codigos = pool.groupby(["JORNADA", "CODCARPR", "CARRERA"])["CODIGO_UNICO"].transform("nunique")
+    pool["ES_AMBIGUO"] = n_codigos.gt(1)
+    return (
+        pool.sort_values(["JORNADA", "CODCARPR", "CARRERA", "CODIGO_UNICO"])
+        .drop_duplicates(subset=["JORNADA", "CODCARPR", "CARRERA"], keep="first")
+        .reset_index(drop=True)
+    )
+
+
+def _asignar_carreras(rng: np.random.Generator, pool: pd.DataFrame, n: int, tasa_ambiguedad: float) -> np.ndarray:
+    amb_idx = np.flatnonzero(pool["ES_AMBIGUO"].to_numpy())
+    uni_idx = np.flatnonzero(~pool["ES_AMBIGUO"].to_numpy())
+    if len(amb_idx) == 0 or len(uni_idx) == 0:
+        return rng.integers(0, len(pool), size=n)
+    usa_amb = rng.random(n) < tasa_ambiguedad
+    return np.where(usa_amb, rng.choice(amb_idx, size=n), rng.choice(uni_idx, size=n))
+
+
+def construir_hojas(params: ParametrosSinteticos, pool: pd.DataFrame | None = None) -> dict[str, pd.DataFrame]:
+    """Construye las hojas en memoria (sin escribir Excel)."""
+    if pool is None:
+        pool = cargar_pool_carreras()
+    rng = np.random.default_rng(params.semilla)
+    n_est = int(params.estudiantes)
+
+    # ── Estudiantes (RUT) y matrículas (CODCLI) ────────────────────────────
+    rut_body = 10_000_000 + rng.choice(15_000_000, size=n_est, replace=False)
+    multi = rng.random(n_est) < params.tasa_multicarrera
+    mat_est = np.concatenate([np.arange(n_est), np.flatnonzero(multi)])
+    n_mat = len(mat_est)
+
+    carrera_idx = _asignar_carreras(rng, pool, n_mat, params.tasa_ambiguedad)
+    anio_ing = ANIO_PROCESO - rng.integers(0, max(params.profundidad_historia, 1), size=n_mat)
+    periodo_ing = np.where(rng.random(n_mat) < 0.85, 1, 2)
+    # La segunda carrera de un RUT multi-carrera parte después de la primera.
+    anio_ing[n_est:] = np.minimum(anio_ing[mat_est[n_est:]] + 1, ANIO_PROCESO)
+
+    car = pool.iloc[carrera_idx].reset_index(drop=True)
+    bucket = pd.Series(anio_ing.astype(str)) + periodo_ing.astype(str) + car["CODCARPR"]
+    correlativo = bucket.groupby(bucket).cumcount().to_numpy() + 1
+    if correlativo.max(initial=0) > 999:
+        raise ValueError("Demasiados estudiantes por (año, período, CODCARPR): reduce --estudiantes o amplía la historia")
+    codcli = bucket + pd.Series(correlativo).map("{:03d}".format)
+
+    nivel = np.clip((ANIO_PROCESO - anio_ing) * 2 + 1, 1, car["DURACION_ESTUDIOS"].to_numpy())
+    nombre = rng.choice(_NOMBRES, size=n_est)
+    paterno = rng.choice(_APELLIDOS, size=n_est)
+    materno = rng.choice(_APELLIDOS, size=n_est)
+    sexo = rng.choice(np.array(["M", "F"]), size=n_est)
+    nac_anio = rng.integers(1975, 2008, size=n_est)
+    fecha_nac = pd.to_datetime(
+        pd.DataFrame({"year": nac_anio, "month": rng.integers(1, 13, size=n_est), "day": rng.integers(1, 29, size=n_est)})
+    ).dt.strftime("%d/%m/%Y").to_numpy()
+    dv = _dv_rut(rut_body)
+
+    estado = rng.choice(
+        np.array(["VIGENTE", "ELIMINADO", "SUSPENDIDO", "TITULADO"]), size=n_mat, p=[0.85, 0.08, 0.04, 0.03]
+    )
+    situacion = np.select(
+        [estado == "VIGENTE", estado == "ELIMINADO", estado == "SUSPENDIDO"],
+        ["1 - ALUMNO REGULAR", "7 - NO RENUEVA MATRICULA", "2 - SUSPENSIÓN TEMPORAL"],
+        default="31 - TITULADO APROBADO",
+    )
+    fecha_mat = pd.to_datetime(
+        pd.DataFrame({"year": np.full(n_mat, ANIO_PROCESO - 1), "month": 12, "day": rng.integers(1, 29, size=n_mat)})
+    ).dt.strftime("%d/%m/%Y").to_numpy()
+
+    matriculas = pd.DataFrame(
+        {
+            "CODCLI": codcli,
+            "RUT": rut_body[mat_est],
+            "DIG": dv[mat_est],
+            "PATERNO": paterno[mat_est],
+            "MATERNO": materno[mat_est],
+            "NOMBRE": nombre[mat_est],
+            "SEXO": sexo[mat_est],
+            "FECHANACIMIENTO": fecha_nac[mat_est],
+            "NACIONALIDAD": np.where(rng.random(n_mat) < 0.93, "CHILENA", "VENEZOLANA"),
+            "CODCARR": car["CODCARPR"],
+            "CARRERA": car["CARRERA"],
+            "JORNADA": car["JORNADA"],
+            "PLAN_DE_ESTUDIO": car["CODCARPR"] + anio_ing.astype(str) + "1",
+            "ANOINGRESO": anio_ing,
+            "PERIODOINGRESO": periodo_ing,
+            "FECHAMATRICULA": fecha_mat,
+            "NIVEL": nivel,
+            "REGIMEN": "SEMESTRAL",
+            "ESTADO_ACADEMICO": estado,
+            "SITUACION": situacion,
+        }
+    )
+
+    # ── Hoja1: una fila por ramo inscrito (historial) ──────────────────────
+    anio_ini = np.maximum(anio_ing, ANIO_PROCESO - max(params.profundidad_historia, 1) + 1)
+    # Períodos cerrados antes de ANIO_PROCESO + el primer semestre en curso.
+    n_periodos = (ANIO_PROCESO - anio_ini) * 2 + 1
+    ramos = rng.integers(RAMOS_POR_PERIODO[0], RAMOS_POR_PERIODO[1], size=int(n_periodos.sum()))
+    per_mat = np.repeat(np.arange(n_mat), n_periodos)
+    per_ord = np.arange(len(per_mat)) - np.repeat(np.cumsum(n_periodos) - n_periodos, n_periodos)
+    per_anio = anio_ini[per_mat] + per_ord // 2
+    per_sem = per_ord % 2 + 1
+
+    fila_per = np.repeat(np.arange(len(per_mat)), ramos)
+    fila_mat = per_mat[fila_per]
+    fila_ord = np.arange(len(fila_per)) - np.repeat(np.cumsum(ramos) - ramos, ramos)
+    n_filas = len(fila_per)
+    en_curso = per_anio[fila_per] == ANIO_PROCESO
+    nota = np.round(rng.uniform(1.0, 7.0, size=n_filas), 1)
+    convalidado = (rng.random(n_filas) < 0.02) & ~en_curso
+    descripcion = np.where(nota >= 4.0, "APROBADO", "REPROBADO").astype(object)
+    descripcion[convalidado] = "CONVALIDACION"
+    descripcion[en_curso] = ""
+    nota_final = np.where(en_curso | convalidado, np.nan, nota)
+
+    hoja1 = matriculas.iloc[fila_mat].reset_index(drop=True)
+    hoja1["ANO"] = per_anio[fila_per]
+    hoja1["PERIODO"] = per_sem[fila_per]
+    hoja1["CODRAMO"] = (
+        hoja1["CODCARR"] + pd.Series(per_ord[fila_per] + 1).map("{:02d}".format) + pd.Series(fila_ord).map("{:02d}".format)
+    )
+    hoja1["NOTA_FINAL"] = nota_final
+    hoja1["DESCRIPCION_ESTADO"] = descripcion
+    hoja1["CONVALIDADO"] = np.where(convalidado, "S", "N")
+
+    # ── DatosAlumnos: una fila por CODCLI ─────────────────────────────────
+    da_mask = rng.random(n_mat) >= params.tasa_sin_datos_alumnos
+    datos_alumnos = pd.DataFrame(
+        {
+            "CODCLI": matriculas["CODCLI"],
+            "RUT": matriculas["RUT"],
+            "DIG": matriculas["DIG"],
+            "NOMBRES": matriculas["NOMBRE"],
+            "APELLIDO PATERNO": matriculas["PATERNO"],
+            "APELLIDO MATERNO": matriculas["MATERNO"],
+            "SEXO": matriculas["SEXO"],
+            "FECHANACIMIENTO": matriculas["FECHANACIMIENTO"],
+            "NACIONALIDAD": matriculas["NACIONALIDAD"],
+            "SEDE": "CASA CENTRAL (SANTIAGO)",
+            "CODCARPR": matriculas["CODCARR"],
+            "NOMBRE_L": matriculas["CARRERA"],
+            "JORNADA": matriculas["JORNADA"],
+            "ANOINGRESO": matriculas["ANOINGRESO"],
+            "PERIODOINGRESO": matriculas["PERIODOINGRESO"],
+            "ANOMATRICULA": ANIO_PROCESO,
+            "PERIODOMATRICULA": 1,
+            "FECHAMATRICULA": matriculas["FECHAMATRICULA"],
+            "NIVEL": matriculas["NIVEL"],
+            "SITUACION": matriculas["SITUACION"],
+            "ESTADOACADEMICO": matriculas["ESTADO_ACADEMICO"],
+            "MATRICULA": "SI",
+            "CON_FIRMA": "SI",
+            "COMUNACOLEGIO": "SANTIAGO",
+            "CIUDADCOLEGIO": "SANTIAGO",
+            "VIASDEADMISION": rng.choice(_VIAS_ADMISION, size=n_mat, p=[0.8, 0.1, 0.08, 0.02]),
+        }
+    )[da_mask].reset_index(drop=True)
+
+    base_datos = pd.DataFrame({"N_DOC": rut_body, "DV": dv})
+
+    homologacion = (
+        pool[["CODCARPR", "JORNADA", "CODIGO_UNICO"]]
+        .rename(columns={"JORNADA": "JORNADA_DA", "CODIGO_UNICO": "CODIGO_SIES"})
+        .drop_duplicates(subset=["CODCARPR", "JORNADA_DA"], keep="first")
+        .reset_index(drop=True)
+    )
+
+    return {
+        "Hoja1": hoja1,
+        "DatosAlumnos": datos_alumnos,
+        "base_datos": base_datos,
+        HOJA_HOMOLOGACION: homologacion,
+    }
+
+
+def estudiantes_para_filas(filas: int, profundidad_historia: int = 3) -> int:
+    """Cantidad aproximada de estudiantes para alcanzar ``filas`` en Hoja1."""
+    ramos_medios = sum(RAMOS_POR_PERIODO) / 2 - 0.5
+    periodos_medios = max(profundidad_historia, 1)  # ~ (2*(prof-1)/2 + 1) en promedio
+    return max(1, math.ceil(filas / (ramos_medios * periodos_medios)))
+
+
+def escribir_workbook(hojas: dict[str, pd.DataFrame], output: Path) -> Path:
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        for name, df in hojas.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return output
+
+
+def generar_workbook_sintetico(output: Path, params: ParametrosSinteticos | None = None) -> Path:
+    params = params or ParametrosSinteticos()
+    return escribir_workbook(construir_hojas(params), output)
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Genera un workbook sintético con el esquema de PROMEDIOSDEALUMNOS")
+    p.add_argument("--output", default="resultados/benchmarks/PROMEDIOS_SINTETICO.xlsx", help="Ruta del Excel de salida")
+    g = p.add_mutually_exclusive_group()
+    g.add_argument("--estudiantes", type=int, default=None, help="Cantidad de RUT distintos")
+    g.add_argument("--filas", type=int, default=None, help="Filas objetivo aproximadas en Hoja1")
+    p.add_argument("--profundidad-historia", type=int, default=3, help="Años de historial por carrera")
+    p.add_argument("--tasa-multicarrera", type=float, default=0.05, help="Fracción de RUT con segunda carrera")
+    p.add_argument("--tasa-ambiguedad", type=float, default=0.15, help="Fracción de matrículas en llaves SIES ambiguas")
+    p.add_argument("--tasa-sin-datos-alumnos", type=float, default=0.0, help="Fracción de CODCLI ausentes en DatosAlumnos")
+    p.add_argument("--semilla", type=int, default=7804)
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.filas is not None:
+        estudiantes = estudiantes_para_filas(args.filas, args.profundidad_historia)
+    else:
+        estudiantes = args.estudiantes or ParametrosSinteticos.estudiantes
+    params = ParametrosSinteticos(
+        estudiantes=estudiantes,
+        profundidad_historia=args.profundidad_historia,
+        tasa_multicarrera=args.tasa_multicarrera,
+        tasa_ambiguedad=args.tasa_ambiguedad,
+        tasa_sin_datos_alumnos=args.tasa_sin_datos_alumnos,
+        semilla=args.semilla,
+    )
+    hojas = construir_hojas(params)
+    out = escribir_workbook(hojas, Path(args.output))
+    print(f"✅ Workbook sintético: {out}")
+    for name, df in hojas.items():
+        print(f"   ↳ {name}: {len(df)} filas")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
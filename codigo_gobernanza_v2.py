@@ -1,24 +1,71 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import io
 import json
 import re
-import shutil
 import tempfile
 import unicodedata
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterable
 
+import numpy as np
 import pandas as pd
 from src.patches.apply_patches import (
+    DEFAULT_PATCH_DIR,
     DEFAULT_SIT_FON_SOL_PATCH_PATH,
-    PATCH_AUDIT_STATUS_SIT_FON_SOL,
-    PATCH_METHOD_SIT_FON_SOL,
-    PATCH_SOURCE_SIT_FON_SOL,
-    apply_sit_fon_sol_patch,
-    load_json_patch,
-    resolve_patch_targets,
+    PATCH_REPORT_FILENAME,
+    PatchRegistry,
+    discover_patch_files,
+)
+from src.export import (
+    DEFAULT_EXPORT_WORKERS,
+    OVERSIZE_POLICIES,
+    ExportScheduler,
+    ExportTaskResult,
+    RowHighlight,
+    SheetExportStats,
+    atomic_path,
+    atomic_to_csv,
+    atomic_to_parquet,
+    atomic_write_json,
+    atomic_write_text,
+    build_row_highlight,
+    existing_artifact_path,
+    parquet_engine_available,
+    trace_compression_from_env,
+    write_workbook_streaming,
+)
+from src.dtypes import (
+    SharedCategories,
+    apply_category_policy,
+    copy_on_write,
+    decategorize,
+    map_categories,
+)
+from src.catalogs import (
+    CompiledIndexCache,
+    GovernanceBundle,
+    load_active_governance_bundle,
+    sources_key,
+)
+from src.governance import (
+    UNIVERSO_CACHE_SUBDIR,
+    construir_hoja_alertas,
+    ejecutar_gobernanza_codcarpr_anoingreso,
+    motivo_alerta_codcar,
+)
+from src.identity import IdentityIndex, SiesCodeTable
+from src.trace import TraceStore
+from src.perf import (
+    DEFAULT_PERF_PROFILE_FILENAME,
+    PerfProfiler,
+    activate_profiler,
+    deactivate_profiler,
+    perf_sequence,
+    perf_stage,
 )
 
 # ==============================
@@ -49,12 +96,18 @@ def _split_codcarpr_candidates(canon: object, aliases: object) -> list[str]:
     return sorted(out)
 
 
-def _load_duracion_as_governance_df() -> pd.DataFrame:
-    candidates = [
+def _duracion_tsv_candidates() -> list[Path]:
+    return [
         Path(__file__).with_name("DURACION_ESTUDIOS.tsv"),
         Path.cwd() / "DURACION_ESTUDIOS.tsv",
     ]
-    for path in candidates:
+
+
+def _load_duracion_as_governance_df() -> pd.DataFrame:
+    for path in _duracion_tsv_candidates():
+        bundled = _governance_bundle_table(path)
+        if bundled is not None:
+            return bundled.copy(deep=False)
         if path.exists():
             try:
                 df = pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False)
@@ -96,8 +149,47 @@ def _cargar_matriz_desambiguacion_desde_duracion() -> dict:
     return matriz_dict
 
 
-# Cargar matriz al iniciar desde DURACION_ESTUDIOS.tsv
-MATRIZ_DESAMBIGUACION = _cargar_matriz_desambiguacion_desde_duracion()
+# ==============================
+# BUNDLE DE GOBERNANZA (make compile-governance)
+# ==============================
+# Bundle y matriz SIES se cargan en la primera consulta, no al importar:
+# importar el módulo no lee catálogos ni imprime avisos, y
+# ``reset_governance_state`` obliga a releerlos (p. ej. tras reescribir DURACION).
+_GOVERNANCE_STATE: dict[str, object] = {}
+
+
+def _governance_bundle() -> GovernanceBundle | None:
+    if "bundle" not in _GOVERNANCE_STATE:
+        bundle, status = load_active_governance_bundle(Path(__file__).resolve().parent)
+        _GOVERNANCE_STATE.update(bundle=bundle, status=status)
+    return _GOVERNANCE_STATE["bundle"]
+
+
+def _governance_bundle_status() -> str:
+    _governance_bundle()
+    return str(_GOVERNANCE_STATE["status"])
+
+
+def _governance_bundle_table(path: str | Path) -> pd.DataFrame | None:
+    bundle = _governance_bundle()
+    return bundle.table(path) if bundle is not None else None
+
+
+def _governance_bundle_document(path: str | Path) -> object | None:
+    bundle = _governance_bundle()
+    return bundle.document(path) if bundle is not None else None
+
+
+def _matriz_desambiguacion() -> dict:
+    """Matriz (CODCARPR, JORNADA, VERSION)->SIES desde DURACION_ESTUDIOS, construida una vez por estado."""
+    if "matriz" not in _GOVERNANCE_STATE:
+        _GOVERNANCE_STATE["matriz"] = _cargar_matriz_desambiguacion_desde_duracion()
+    return _GOVERNANCE_STATE["matriz"]
+
+
+def reset_governance_state() -> None:
+    """Descarta bundle y matriz cargados; la próxima consulta los vuelve a leer."""
+    _GOVERNANCE_STATE.clear()
 
 # ==============================
 # Contratos oficiales (Capa C)
@@ -110,6 +202,33 @@ MATRICULA_UNIFICADA_COLUMNS = [
     "FECHA_MATRICULA", "REINCORPORACION", "VIG",
 ]
 
+# Columnas de ARCHIVO_LISTO_SUBIDA que las etapas posteriores a la decisión de
+# carga siguen leyendo o escribiendo. El resto (familias *_FUENTE_FINAL,
+# UZ_HIST_*, CODIGO_CARRERA_SIES_[1-5]*, _PARSED_*, ...) es traza de auditoría:
+# se aparta en un TraceStore y solo vuelve a la hoja ancha al exportar el xlsx.
+ARCHIVO_SUBIDA_OPERATIVE_COLUMNS = MATRICULA_UNIFICADA_COLUMNS + [
+    "CODCLI", "NOMBRE_CARRERA_FUENTE", "JORNADA_FUENTE", "CODCARPR_NORM",
+    "DA_MATCH_MODO", "DA_ESTADOACADEMICO", "DA_SITUACION",
+    "FOR_ING_ACT_FUENTE_VALOR", "FOR_ING_ACT_FUENTE_CAMPO", "FOR_ING_ACT_METODO", "FOR_ING_ACT_IMPUTADO",
+    "FOR_ING_ACT_REQUIERE_REVISION", "FOR_ING_ACT_CONTINUIDAD_STATUS",
+    "ASI_INS_HIS_FUENTE_FINAL", "ASI_INS_HIS_METODO_FINAL", "ASI_INS_HIS_AUDIT_STATUS",
+    "ASI_APR_HIS_FUENTE_FINAL", "ASI_APR_HIS_METODO_FINAL", "ASI_APR_HIS_AUDIT_STATUS",
+    "SIES_MATCH_STATUS", "SIES_RESOLUCION_HEURISTICA", "CODIGOS_SIES_POTENCIALES",
+    "CODIGO_CARRERA_SIES_FINAL", "COD_CAR_METODO_FINAL",
+]
+
+# Trazas que las etapas de normalización MU y la decisión de carga todavía
+# leen. Lo demás se aparta apenas termina la etapa que lo genera: la
+# resolución SIES (puente/manual/ajuste sede + _PARSED_*) y la cascada
+# COD_SED/COD_CAR/JOR/MODALIDAD/VERSION.
+ARCHIVO_SUBIDA_TRACE_LEIDA_EN_DECISION = [
+    "REGIMEN_FUENTE", "ES_DIPLOMADO", "FOR_ING_ACT_FUENTE_NORM", "UZ_HIST_SCOPE_STATUS", "DURACION_ESTUDIOS_REF",
+    "NAC_STATUS", "PAIS_EST_SEC_STATUS", "FECH_NAC_STATUS", "NIV_ACA_AUDIT_STATUS",
+    "FECHA_MATRICULA_FUENTE_FINAL", "FECHA_MATRICULA_METODO_FINAL", "FECHA_MATRICULA_AUDIT_STATUS",
+    "ASI_INS_ANT_AUDIT_STATUS", "ASI_APR_ANT_AUDIT_STATUS", "PROM_PRI_SEM_AUDIT_STATUS", "PROM_SEG_SEM_AUDIT_STATUS",
+    "VIG_FUENTE_FINAL", "VIG_METODO_FINAL", "VIG_AUDIT_STATUS", "VIG_ESPERADO_DA",
+]
+
 CARRERAS_AC_COLUMNS = [
     "CODIGO_IES_NUM", "CODIGO_UNICO", "PLAN_ESTUDIOS", "NOMBRE_SEDE", "NOMBRE_CARRERA", "JORNADA", "VERSION",
     "DURACION_ESTUDIOS", "DURACION_TITULACION", "DURACION_TOTAL", "NIVEL_CARRERA", "TIPO_UNIDAD_MEDIDA",
@@ -132,6 +251,8 @@ ANUAL_COLS = [
 
 MU_FUSION_OUTPUT_FILENAME = "archivo_listo_para_sies.xlsx"
 MU_PREGRADO_CSV_FILENAME = "matricula_unificada_2026_pregrado.csv"
+MU_TRACE_LONG_FILENAME = "traza_archivo_listo_subida_long.tsv"
+MU_ARCHIVO_SUBIDA_PARQUET_FILENAME = "archivo_listo_subida.parquet"
 FINAL_SIES_CODE_COL = "CODIGO_CARRERA_SIES_FINAL"
 MAX_SIES_CODES_PER_KEY = 5
 DEFAULT_EXCLUIR_DIPLOMADOS = True
@@ -150,6 +271,8 @@ DEFAULT_PUENTE_SIES_CANDIDATES = [
     Path.home() / "Downloads" / "puente_sies.tsv",
 ]
 DEFAULT_PUENTE_SIES_COMPILADO_PATH = Path(__file__).with_name("control") / "catalogos" / "PUENTE_SIES_COMPILADO.tsv"
+DEFAULT_COMPILED_INDEX_DIR = Path(__file__).with_name("control") / "catalogos"
+COMPILED_INDEX_VERSION = 1
 DEFAULT_GOB_NAC_CANDIDATES = [
     Path(__file__).with_name("gobernanza_nac.tsv"),
     Path.cwd() / "gobernanza_nac.tsv",
@@ -178,6 +301,10 @@ DEFAULT_SIT_FON_SOL_PATCH_CANDIDATES = [
     Path(__file__).resolve().parent / DEFAULT_SIT_FON_SOL_PATCH_PATH,
     Path.cwd() / DEFAULT_SIT_FON_SOL_PATCH_PATH,
 ]
+DEFAULT_PATCH_DIR_CANDIDATES = [
+    Path(__file__).resolve().parent / DEFAULT_PATCH_DIR,
+    Path.cwd() / DEFAULT_PATCH_DIR,
+]
 DEFAULT_GOB_DA_ESTADO_SITUACION_CANDIDATES = [
     Path(__file__).with_name("gobernanza_catalogos") / "gob_datosalumnos_estadoacademico_situacion.tsv",
     Path.cwd() / "gobernanza_catalogos" / "gob_datosalumnos_estadoacademico_situacion.tsv",
@@ -223,6 +350,15 @@ def _resolve_optional_path(path_value: str | None, candidates: list[Path]) -> st
     return str(existing) if existing else None
 
 
+def _resolve_patch_paths(patch_dir: str | None, sit_fon_sol_patch_json_path: str | None) -> list[Path]:
+    """Patches de la carpeta; un JSON SIT_FON_SOL explícito reemplaza al de la carpeta."""
+    paths = discover_patch_files(patch_dir) if patch_dir else []
+    if sit_fon_sol_patch_json_path:
+        explicit = Path(sit_fon_sol_patch_json_path).expanduser()
+        paths = [p for p in paths if p.name != DEFAULT_SIT_FON_SOL_PATCH_PATH.name] + [explicit]
+    return paths
+
+
 def _normalize_doc(num: object, dv: object) -> str:
     return "".join(ch for ch in str(num) if ch.isdigit()) + str(dv).strip().upper()
 
@@ -259,12 +395,14 @@ def _pick_sheet(book: dict[str, pd.DataFrame], required: Iterable[str]) -> pd.Da
     req = set(required)
     for df in book.values():
         if req.issubset(df.columns):
-            return df.copy()
+            return df.copy(deep=False)
     raise ValueError(f"No se encontró hoja con columnas: {sorted(req)}")
 
 
 def _series_or_default(df: pd.DataFrame, col: str, default: str = "") -> pd.Series:
     if col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            return df[col]  # categorías ya son texto (política de dtypes)
         return df[col].astype(str)
     return pd.Series([default] * len(df), index=df.index, dtype=str)
 
@@ -278,6 +416,18 @@ def _normalize_text(value: object) -> str:
     return re.sub(r"\s+", " ", text)
 
 
+# Marcas combinantes que deja NFKD (acentos, diéresis, tildes) en los bloques usados por los catálogos.
+_COMBINING_MARKS_PATTERN = "[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]"
+
+
+def _normalize_text_series(values: pd.Series) -> pd.Series:
+    """Versión vectorizada de ``_normalize_text`` (NA → "")."""
+    values = values.astype(object)
+    text = values.where(values.notna(), "").astype(str).str.strip().str.upper()
+    text = text.str.normalize("NFKD").str.replace(_COMBINING_MARKS_PATTERN, "", regex=True)
+    return text.str.replace(r"\s+", " ", regex=True)
+
+
 def _nonempty_mask(series: pd.Series) -> pd.Series:
     return series.notna() & series.astype(str).str.strip().ne("")
 
@@ -378,7 +528,7 @@ def _load_da_origin_records(input_file: Path) -> dict[int, list[dict[str, object
         required = {"CODCLI", "RUT", "ANOINGRESO"}
         if not required.issubset(src.columns):
             return {}
-        work = src.copy()
+        work = src.copy(deep=False)
         work["_RUT_NUM"] = work["RUT"].map(_rut_num_only)
         work["_CODCLI"] = work["CODCLI"].astype(str).str.strip()
         work["_CODCARPR"] = (
@@ -423,7 +573,7 @@ def _load_for_ing_act_tns_origin_trace(trace_path: Path) -> dict[int, tuple[int
         trace = pd.read_csv(trace_path, sep="\t", usecols=usecols)
         trace["FOR_ING_ACT"] = pd.to_numeric(trace["FOR_ING_ACT"], errors="coerce")
         trace["_RUT_NUM"] = pd.to_numeric(trace["_RUT_NUM"], errors="coerce")
-        trace = trace[trace["FOR_ING_ACT"].eq(11) & trace["_RUT_NUM"].notna()].copy()
+        trace = trace[trace["FOR_ING_ACT"].eq(11) & trace["_RUT_NUM"].notna()]
         if trace.empty:
             return {}
         if "TNS_PREV_MIN_ANO_DA" in trace.columns:
@@ -678,7 +828,7 @@ def _build_mu_historico_summary(
 
     hist_cols = ["ANO", "PERIODO", "CODRAMO", rut_col, dv_col, codcarr_col]
     extra_cols = [c for c in ["DESCRIPCION_ESTADO", "ESTADO", "CONVALIDADO", "NOTA_FINAL"] if c in src.columns]
-    hist = src[hist_cols + extra_cols].copy().rename(
+    hist = src[hist_cols + extra_cols].rename(
         columns={
             rut_col: "RUT",
             dv_col: "DIG",
@@ -686,12 +836,12 @@ def _build_mu_historico_summary(
         }
     )
     hist["RUT_NORM"] = [_normalize_doc(n, d) for n, d in zip(hist["RUT"], hist["DIG"])]
-    hist["CODCARPR_NORM"] = hist["CODCARR"].map(_normalize_text)
+    hist["CODCARPR_NORM"] = map_categories(hist["CODCARR"], _normalize_text)
     hist["ANO_NUM"] = pd.to_numeric(hist["ANO"], errors="coerce")
     hist["SEMESTRE_HIST"] = _normalize_period_to_semester(hist["PERIODO"])
     hist["NOTA_MU"] = _normalize_grade_to_mu_scale(hist["NOTA_FINAL"]) if "NOTA_FINAL" in hist.columns else pd.Series(pd.NA, index=hist.index, dtype="Int64")
-    hist["ESTADO_HIST_NORM"] = _series_or_default(hist, "DESCRIPCION_ESTADO").map(_normalize_text)
-    hist["CONVALIDADO_NORM"] = _series_or_default(hist, "CONVALIDADO").map(_normalize_text)
+    hist["ESTADO_HIST_NORM"] = map_categories(_series_or_default(hist, "DESCRIPCION_ESTADO"), _normalize_text)
+    hist["CONVALIDADO_NORM"] = map_categories(_series_or_default(hist, "CONVALIDADO"), _normalize_text)
 
     anio_vals = hist["ANO_NUM"].dropna()
     if anio_vals.empty:
@@ -704,7 +854,7 @@ def _build_mu_historico_summary(
 
     rows: list[dict[str, object]] = []
     for (rut_norm, codcarpr_norm), sub in hist.groupby(["RUT_NORM", "CODCARPR_NORM"], dropna=False):
-        sub_ref = sub[sub["ANO_NUM"] == anio_ref].copy()
+        sub_ref = sub[sub["ANO_NUM"] == anio_ref]
         estado_ref = sub_ref["ESTADO_HIST_NORM"]
         estado_hist = sub["ESTADO_HIST_NORM"]
         transfer_ref = estado_ref.str.contains(r"CONVALID|HOMOLOG|RECONOC|EQUIV", regex=True, na=False) | sub_ref["CONVALIDADO_NORM"].eq("S")
@@ -906,7 +1056,7 @@ def _build_for_ing_act_report_payload(
     catalog_source: str,
 ) -> dict[str, object]:
     included_mask = included_mask.reindex(stage_df.index, fill_value=False).astype(bool)
-    included = stage_df.loc[included_mask].copy()
+    included = stage_df.loc[included_mask]
     valid_codes_sorted = sorted(int(v) for v in valid_codes)
     report: dict[str, object] = {
         "source_used": {
@@ -999,7 +1149,7 @@ def _build_for_ing_act_report_payload(
         "ANIO_ING_ORI",
         "SEM_ING_ORI",
     ]
-    examples_df = included.loc[unresolved_mask, example_cols].head(25).copy()
+    examples_df = included.loc[unresolved_mask, example_cols].head(25)
     examples_df.insert(0, "ROW_EXCEL_1_BASED", (examples_df.index + 2).astype(int))
     examples_df = examples_df.fillna("").astype(str)
 
@@ -1016,7 +1166,7 @@ def _build_for_ing_act_report_payload(
 
 
 def _map_jornada_to_mod_jor(series: pd.Series) -> tuple[pd.Series, pd.Series]:
-    s_norm = series.fillna("").map(_normalize_text)
+    s_norm = map_categories(series, _normalize_text)
     s_low = s_norm.str.lower()
     modalidad = pd.Series(pd.NA, index=series.index, dtype="object")
     jor = pd.Series(pd.NA, index=series.index, dtype="object")
@@ -1046,39 +1196,6 @@ _SIES_CODE_RE = re.compile(r"^I\d+S(?P<cod_sed>\d+)C(?P<cod_car>\d+)J(?P<jor>\d+
 _BLANK_SIES_TOKEN_VALUES = {"", "NAN", "NONE", "NULL", "<NA>"}
 
 
-def _is_blank_sies_token(value: object) -> bool:
-    if value is None:
-        return True
-    try:
-        if pd.isna(value):
-            return True
-    except (TypeError, ValueError):
-        pass
-    return str(value).strip().upper() in _BLANK_SIES_TOKEN_VALUES
-
-
-def _iter_sies_code_tokens(*values: object) -> list[str]:
-    tokens: list[str] = []
-    for value in values:
-        if _is_blank_sies_token(value):
-            continue
-        for token in str(value).split("|"):
-            token = token.strip().upper()
-            if token in _BLANK_SIES_TOKEN_VALUES:
-                continue
-            tokens.append(token)
-    return list(dict.fromkeys(tokens))
-
-
-def _extract_cod_car_from_sies_code(value: object) -> object:
-    if _is_blank_sies_token(value):
-        return pd.NA
-    match = _SIES_CODE_RE.match(str(value).strip().upper())
-    if not match:
-        return pd.NA
-    return int(match.group("cod_car"))
-
-
 def _parse_nullable_int(value: object) -> int | None:
     parsed = pd.to_numeric(pd.Series([value]), errors="coerce").iloc[0]
     if pd.isna(parsed):
@@ -1118,46 +1235,22 @@ def _looks_like_codcarpr(value: object) -> bool:
     return bool(re.fullmatch(r"[A-Z]{2,10}", text))
 
 
-def _extract_shared_cod_car_from_sies_values(*values: object) -> object:
-    tokens = _iter_sies_code_tokens(*values)
-    if not tokens:
-        return pd.NA
-    cod_cars: set[int] = set()
-    for token in tokens:
-        match = _SIES_CODE_RE.match(token)
-        if not match:
-            return pd.NA
-        cod_cars.add(int(match.group("cod_car")))
-    if len(cod_cars) == 1:
-        return next(iter(cod_cars))
-    return pd.NA
-
-
-def _extract_shared_cod_car_from_potenciales(potenciales: object) -> object:
-    """Extrae COD_CAR si TODOS los códigos SIES potenciales comparten el mismo componente C."""
-    return _extract_shared_cod_car_from_sies_values(potenciales)
-
-
-def _derive_codigo_carrera_from_sies_row(row: pd.Series) -> object:
-    values: list[object] = []
-    for col in ["CODIGOS_SIES_POTENCIALES", "CODIGO_CARRERA_SIES"]:
-        if col in row.index:
-            values.append(row.get(col))
-    for idx in range(1, MAX_SIES_CODES_PER_KEY + 1):
-        col = f"CODIGO_CARRERA_SIES_{idx}"
-        if col in row.index:
-            values.append(row.get(col))
-    return _extract_shared_cod_car_from_sies_values(*values)
+def _derive_codigo_carrera_from_sies_frame(df: pd.DataFrame, sies_codes: SiesCodeTable | None = None) -> pd.Series:
+    """COD_CAR (``Int64``) si TODOS los códigos SIES de la fila comparten el mismo componente C."""
+    cols = [c for c in ["CODIGOS_SIES_POTENCIALES", "CODIGO_CARRERA_SIES"] if c in df.columns]
+    cols += [f"CODIGO_CARRERA_SIES_{idx}" for idx in range(1, MAX_SIES_CODES_PER_KEY + 1) if f"CODIGO_CARRERA_SIES_{idx}" in df.columns]
+    if not cols:
+        return pd.Series(pd.NA, index=df.index, dtype="Int64")
+    return (sies_codes or SiesCodeTable()).shared_cod_car(*(df[c] for c in cols))
 
 
 def _coerce_codigo_carrera_from_codigo_unico(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty or "CODIGO_UNICO" not in df.columns:
         return df
-    out = df.copy()
+    out = df.copy(deep=False)
     if "CODIGO_CARRERA" not in out.columns:
         out["CODIGO_CARRERA"] = pd.NA
-    derived = out["CODIGO_UNICO"].map(_extract_cod_car_from_sies_code)
-    derived_num = pd.to_numeric(derived, errors="coerce")
+    derived_num = SiesCodeTable().component(out["CODIGO_UNICO"], "COD_CAR")
     current_num = pd.to_numeric(out["CODIGO_CARRERA"], errors="coerce")
     out["CODIGO_CARRERA"] = derived_num.combine_first(current_num).astype("Int64")
     return out
@@ -1196,18 +1289,12 @@ def _normalize_nombre_carrera_for_lookup(nombre: str) -> str:
     return n
 
 
-def _extract_sies_components(value: object) -> tuple[str, str, str, str] | None:
-    if pd.isna(value):
-        return None
-    text = str(value).strip().upper()
-    m = _SIES_CODE_RE.match(text)
-    if not m:
-        return None
-    cod_sed = str(int(m.group("cod_sed")))
-    cod_car = str(int(m.group("cod_car")))
-    jor = str(int(m.group("jor")))
-    version = str(int(m.group("version")))
-    return cod_sed, cod_car, jor, version
+def _sies_component_text(component: pd.Series) -> pd.Series:
+    """Componente SIES (``Int64``) como texto sin ceros a la izquierda (``_PARSED_*``)."""
+    out = pd.Series(pd.NA, index=component.index, dtype="object")
+    mask = component.notna()
+    out[mask] = component[mask].astype("int64").astype(str).astype(object)
+    return out
 
 
 def _modalidad_from_jor(jor_series: pd.Series) -> pd.Series:
@@ -1289,7 +1376,7 @@ def _load_datos_alumnos_lookup(input_file: Path) -> pd.DataFrame:
             "VIASDEADMISION",
         ]
         cols = [c for c in keep if c in src.columns]
-        out = src[cols].copy()
+        out = src[cols]
         out["CODCLI"] = out["CODCLI"].astype(str).str.strip()
         out = out[out["CODCLI"] != ""]
 
@@ -1355,13 +1442,34 @@ def _status_from_vig(vig: object) -> str:
         return "Matrícula OK"
 
 
+def _lookup_catalog_key_3(
+    exact_keys: pd.Series,
+    fallback_keys: pd.Series,
+    catalog_index: pd.Index,
+) -> tuple[list[int], pd.Series]:
+    """Posición en el catálogo por llave exacta y, si no existe, por llave de continuidad.
+
+    Ambas llaves se factorizan contra el índice único del catálogo
+    (``get_indexer``: entero por llave, -1 sin match) y se resuelven en una
+    sola pasada. Retorna las posiciones (-1 = sin match) y el tipo de match
+    por fila: ``EXACTO``, ``FALLBACK_NOMBRE`` o ``SIN_MATCH``.
+    """
+    exact = pd.Series(catalog_index.get_indexer(exact_keys), index=exact_keys.index)
+    fallback = pd.Series(catalog_index.get_indexer(fallback_keys), index=exact_keys.index)
+    pos = exact.where(exact >= 0, fallback)
+    tipo = pd.Series("SIN_MATCH", index=exact_keys.index, dtype="object")
+    tipo[fallback >= 0] = "FALLBACK_NOMBRE"
+    tipo[exact >= 0] = "EXACTO"
+    return pos.tolist(), tipo
+
+
 def _build_bridge_codcarpr_to_codcar(df_bridge: pd.DataFrame) -> dict[str, int]:
     """Construye mapa CODCARPR → CODIGO_CARRERA desde el puente SIES."""
     if df_bridge.empty:
         return {}
     mapping: dict[str, int] = {}
-    work = df_bridge.copy()
-    derived = work.apply(_derive_codigo_carrera_from_sies_row, axis=1)
+    work = df_bridge.copy(deep=False)
+    derived = _derive_codigo_carrera_from_sies_frame(work)
     current = pd.to_numeric(work.get("CODIGO_CARRERA", pd.Series(pd.NA, index=work.index)), errors="coerce")
     work["CODIGO_CARRERA_NUM"] = pd.to_numeric(derived, errors="coerce").combine_first(current)
     for _, row in work.dropna(subset=["CODIGO_CARRERA_NUM"]).iterrows():
@@ -1442,56 +1550,61 @@ def _write_excel_atomic(
     final_path: Path,
     red_rows_sheet: str | None = None,
     red_rows_mask: pd.Series | None = None,
-) -> None:
-    from openpyxl.styles import PatternFill, Font
-    final_path.parent.mkdir(parents=True, exist_ok=True)
-    with tempfile.TemporaryDirectory(prefix="mu_export_") as tmpdir:
-        tmp_path = Path(tmpdir) / final_path.name
-        with pd.ExcelWriter(tmp_path, engine="openpyxl") as writer:
-            for sheet_name, df in sheets.items():
-                df.to_excel(writer, index=False, sheet_name=sheet_name[:31])
-            # ── Formato rojo en CODCLI para filas que requieren revisión manual ──
-            if red_rows_sheet and red_rows_mask is not None and red_rows_mask.any():
-                ws = writer.sheets[red_rows_sheet[:31]]
-                red_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-                red_font = Font(color="9C0006")
-                df_target = sheets[red_rows_sheet]
-                codcli_col_idx = list(df_target.columns).index("CODCLI") + 1 if "CODCLI" in df_target.columns else 1
-                # Columnas clave para marcar: CODCLI, N_CODES_SIES, SIES_RESOLUCION_HEURISTICA
-                mark_cols = []
-                for cname in ["CODCLI", "N_CODES_SIES", "CODIGOS_SIES_POTENCIALES", "SIES_RESOLUCION_HEURISTICA"]:
-                    if cname in df_target.columns:
-                        mark_cols.append(list(df_target.columns).index(cname) + 1)
-                if not mark_cols:
-                    mark_cols = [codcli_col_idx]
-                pos_map = {v: i for i, v in enumerate(df_target.index)}
-                for idx in red_rows_mask[red_rows_mask].index:
-                    if idx in pos_map:
-                        excel_row = pos_map[idx] + 2
-                        for col in mark_cols:
-                            cell = ws.cell(row=excel_row, column=col)
-                            cell.fill = red_fill
-                            cell.font = red_font
-        if final_path.exists():
-            final_path.unlink()
-        shutil.copy2(tmp_path, final_path)
-
-
-def _write_mu_csv_atomic(df: pd.DataFrame, final_path: Path) -> None:
-    final_path.parent.mkdir(parents=True, exist_ok=True)
-    with tempfile.TemporaryDirectory(prefix="mu_export_csv_") as tmpdir:
-        tmp_path = Path(tmpdir) / final_path.name
-        df.to_csv(
+    max_rows_per_sheet: int | None = None,
+    oversize_policy: str = "dividir",
+    extra_highlights: list[RowHighlight] | None = None,
+) -> list[SheetExportStats]:
+    """Exporta el workbook en streaming (memoria acotada por bloque de filas).
+
+    El formato rojo de revisión manual se aplica al escribir cada fila marcada.
+    """
+    highlights: list[RowHighlight] = list(extra_highlights or [])
+    if red_rows_sheet and red_rows_sheet in sheets:
+        # Columnas clave para marcar: CODCLI, N_CODES_SIES, SIES_RESOLUCION_HEURISTICA
+        highlight = build_row_highlight(
+            red_rows_sheet,
+            sheets[red_rows_sheet],
+            red_rows_mask,
+            ["CODCLI", "N_CODES_SIES", "CODIGOS_SIES_POTENCIALES", "SIES_RESOLUCION_HEURISTICA"],
+        )
+        if highlight is not None:
+            highlights.append(highlight)
+    with atomic_path(final_path) as tmp_path:
+        stats = write_workbook_streaming(
+            sheets,
             tmp_path,
-            sep=";",
-            header=False,
-            index=False,
-            encoding="utf-8",
-            lineterminator="\n",
+            highlights=highlights,
+            max_rows_per_sheet=max_rows_per_sheet,
+            oversize_policy=oversize_policy,
         )
-        if final_path.exists():
-            final_path.unlink()
-        shutil.copy2(tmp_path, final_path)
+    for st in stats:
+        if st.skipped:
+            print(f"⚠️  Hoja '{st.name}' omitida del Excel ({st.rows} filas > umbral)")
+        elif len(st.parts) > 1:
+            print(f"  ↳ Hoja '{st.name}' dividida en {len(st.parts)} partes: {', '.join(st.parts)}")
+    return stats
+
+
+def _serialize_mu32_csv(df: pd.DataFrame) -> str:
+    return df.to_csv(sep=";", header=False, index=False, lineterminator="\n")
+
+
+def _announce_export_ready(result: ExportTaskResult) -> None:
+    if result.ok and result.name == "csv_mu32":
+        print(f"✅ CSV MU32 listo para carga ({result.wall_s:.2f}s)")
+
+
+def _write_mu_csv_atomic(df: pd.DataFrame, final_path: Path) -> str:
+    """Escribe el CSV MU32 y retorna el texto escrito (artefacto reutilizable en memoria)."""
+    csv_text = _serialize_mu32_csv(df)
+    atomic_write_text(final_path, csv_text, newline="")
+    return csv_text
+
+
+def _parquet_text_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Columnas object/categóricas como ``string``: Parquet no admite tipos mezclados por columna."""
+    texto = [c for c in df.columns if df[c].dtype == object or isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return df.astype({c: "string" for c in texto}) if texto else df
 
 
 _AUDIT_CONSOL_COLUMNS = [
@@ -1541,7 +1654,7 @@ def _consolidar_candidatos_por_codcli(
             "ACCION": "EXCLUIDO",
         })
     estado_carga.loc[candidatos.index[intra_dup]] = "EXCLUIDO_DUPLICADO_INTRA_CODCLI"
-    candidatos = candidatos.loc[~intra_dup].copy()
+    candidatos = candidatos.loc[~intra_dup]
     candidatos.drop(columns=["_NIV_SORT"], inplace=True, errors="ignore")
 
     # ── Paso 2: Dedup clave compuesta 8-col (legacy safety-net) ───────
@@ -1567,7 +1680,7 @@ def _consolidar_candidatos_por_codcli(
             "ACCION": "EXCLUIDO",
         })
     estado_carga.loc[candidatos.index[dup_8col]] = "EXCLUIDO_DUPLICADO_CLAVE_CARGA"
-    candidatos = candidatos.loc[~dup_8col].copy()
+    candidatos = candidatos.loc[~dup_8col]
 
     # ── Paso 3: Clasificar multi-identidad (Caso C) ──────────────────
     id_counts = candidatos.groupby(identity_keys, sort=False).size()
@@ -1638,19 +1751,20 @@ def _load_governance_tsv(path: str | None, required_columns: list[str]) -> pd.Da
         return pd.DataFrame()
 
     p = Path(path).expanduser().resolve()
-    if not p.exists():
-        return pd.DataFrame()
-
-    try:
-        df = pd.read_csv(p, sep="\t", dtype=str, keep_default_na=False)
-    except Exception:
-        return pd.DataFrame()
+    df = _governance_bundle_table(p)
+    if df is None:
+        if not p.exists():
+            return pd.DataFrame()
+        try:
+            df = pd.read_csv(p, sep="\t", dtype=str, keep_default_na=False)
+        except Exception:
+            return pd.DataFrame()
 
     missing = [c for c in required_columns if c not in df.columns]
     if missing:
         return pd.DataFrame()
 
-    return df.copy()
+    return df.copy(deep=False)
 
 
 def _normalize_code_or_na(value: object) -> object:
@@ -1693,6 +1807,19 @@ def _normalize_continuidad_name_for_sies(name: object) -> str:
     return text
 
 
+def _catalog_key_columns(out: pd.DataFrame, prefix: str) -> pd.DataFrame:
+    """Normaliza JORNADA/CODCARPR/NOMBRE_L y agrega familias y llaves ``<prefix>_KEY_*``."""
+    out["GRUPO_TRAZA"] = out["GRUPO_TRAZA"].astype(str).str.strip()
+    for col in ["JORNADA", "CODCARPR", "NOMBRE_L"]:
+        out[col] = _normalize_text_series(out[col])
+    for col, fuente in [("FAMILIA_TRAZA", "GRUPO_TRAZA"), ("FAMILIA_CODCARPR", "CODCARPR")]:
+        out[col] = _normalize_text_series(out[fuente]).str.extract(r"^([A-Z]+)", expand=False).fillna("")
+    sin_jornada = "|" + out["CODCARPR"] + "|" + out["NOMBRE_L"]
+    out[f"{prefix}_KEY_3"] = out["JORNADA"] + sin_jornada
+    out[f"{prefix}_KEY_NO_JORNADA"] = sin_jornada
+    return out
+
+
 def _prepare_catalog_manual(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
@@ -1702,15 +1829,7 @@ def _prepare_catalog_manual(df: pd.DataFrame) -> pd.DataFrame:
     if missing:
         raise ValueError(f"Catálogo manual inválido: faltan columnas {sorted(missing)}")
 
-    out = df.copy()
-    out["GRUPO_TRAZA"] = out["GRUPO_TRAZA"].astype(str).str.strip()
-    out["JORNADA"] = out["JORNADA"].map(_normalize_text)
-    out["CODCARPR"] = out["CODCARPR"].map(_normalize_text)
-    out["NOMBRE_L"] = out["NOMBRE_L"].map(_normalize_text)
-    out["FAMILIA_TRAZA"] = out["GRUPO_TRAZA"].map(_extract_alpha_prefix)
-    out["FAMILIA_CODCARPR"] = out["CODCARPR"].map(_extract_alpha_prefix)
-    out["MANUAL_KEY_3"] = out.apply(lambda r: _build_key_3(r["JORNADA"], r["CODCARPR"], r["NOMBRE_L"]), axis=1)
-    out["MANUAL_KEY_NO_JORNADA"] = out.apply(lambda r: _build_key_no_jornada(r["CODCARPR"], r["NOMBRE_L"]), axis=1)
+    out = _catalog_key_columns(df.copy(deep=False), "MANUAL")
     return out.drop_duplicates().reset_index(drop=True)
 
 
@@ -1772,7 +1891,7 @@ def _load_oferta_academica_dim(input_file: Path, explicit_path: str | None = Non
                 sheet_name=target_sheet,
                 usecols=usecols,
             )
-            dim = dim.dropna(subset=["CODIGO_UNICO"]).copy()
+            dim = dim.dropna(subset=["CODIGO_UNICO"])
             dim["CODIGO_UNICO"] = dim["CODIGO_UNICO"].astype(str).str.strip().str.upper()
             dim = _coerce_codigo_carrera_from_codigo_unico(dim)
             dim = dim.drop_duplicates(subset=["CODIGO_UNICO"], keep="first").reset_index(drop=True)
@@ -1817,55 +1936,56 @@ def _prepare_puente_sies(df: pd.DataFrame) -> pd.DataFrame:
     if missing:
         raise ValueError(f"Puente SIES inválido: faltan columnas {sorted(missing)}")
 
-    base = df.copy()
-    base["GRUPO_TRAZA"] = base["GRUPO_TRAZA"].astype(str).str.strip()
-    base["JORNADA"] = base["JORNADA"].map(_normalize_text)
-    base["CODCARPR"] = base["CODCARPR"].map(_normalize_text)
-    base["NOMBRE_L"] = base["NOMBRE_L"].map(_normalize_text)
+    base = _catalog_key_columns(df.copy(deep=False), "BRIDGE")
     base["CODIGO_CARRERA_SIES"] = base["CODIGO_CARRERA_SIES"].astype(str).str.strip()
-    base["FAMILIA_TRAZA"] = base["GRUPO_TRAZA"].map(_extract_alpha_prefix)
-    base["FAMILIA_CODCARPR"] = base["CODCARPR"].map(_extract_alpha_prefix)
-    base["BRIDGE_KEY_3"] = base.apply(lambda r: _build_key_3(r["JORNADA"], r["CODCARPR"], r["NOMBRE_L"]), axis=1)
-    base["BRIDGE_KEY_NO_JORNADA"] = base.apply(lambda r: _build_key_no_jornada(r["CODCARPR"], r["NOMBRE_L"]), axis=1)
-
-    rows = []
-    for key, sub in base.groupby("BRIDGE_KEY_3", dropna=False):
-        codes = (
-            sub["CODIGO_CARRERA_SIES"]
-            .dropna()
-            .astype(str)
-            .str.strip()
-            .replace("", pd.NA)
-            .dropna()
-            .drop_duplicates()
-            .tolist()
-        )
-        row: dict[str, object] = {
-            "BRIDGE_KEY_3": key,
-            "BRIDGE_KEY_NO_JORNADA": sub["BRIDGE_KEY_NO_JORNADA"].iloc[0],
-            "GRUPO_TRAZA": " | ".join(sub["GRUPO_TRAZA"].dropna().astype(str).drop_duplicates().tolist()),
-            "FAMILIA_TRAZA": sub["FAMILIA_TRAZA"].iloc[0],
-            "FAMILIA_CODCARPR": sub["FAMILIA_CODCARPR"].iloc[0],
-            "JORNADA": sub["JORNADA"].iloc[0],
-            "CODCARPR": sub["CODCARPR"].iloc[0],
-            "NOMBRE_L": sub["NOMBRE_L"].iloc[0],
-            "N_CODES_SIES": len(codes),
-            "CODIGOS_SIES_POTENCIALES": " | ".join(codes),
-        }
-        for idx in range(MAX_SIES_CODES_PER_KEY):
-            row[f"CODIGO_CARRERA_SIES_{idx + 1}"] = codes[idx] if idx < len(codes) else pd.NA
-        rows.append(row)
-
-    result = pd.DataFrame(rows).sort_values(["GRUPO_TRAZA", "JORNADA", "CODCARPR", "NOMBRE_L"]).reset_index(drop=True)
-    result["CODIGO_CARRERA"] = pd.to_numeric(
-        result.apply(_derive_codigo_carrera_from_sies_row, axis=1), errors="coerce"
-    ).astype("Int64")
+
+    # Atributos descriptivos: primera fila de cada llave.
+    result = base.drop_duplicates("BRIDGE_KEY_3").set_index("BRIDGE_KEY_3").sort_index()
+    result = result[["BRIDGE_KEY_NO_JORNADA", "FAMILIA_TRAZA", "FAMILIA_CODCARPR", "JORNADA", "CODCARPR", "NOMBRE_L"]]
+    grupos = base[["BRIDGE_KEY_3", "GRUPO_TRAZA"]].dropna().astype({"GRUPO_TRAZA": str}).drop_duplicates()
+    grupo_traza = grupos.groupby("BRIDGE_KEY_3", sort=False)["GRUPO_TRAZA"].agg(" | ".join)
+    result.insert(1, "GRUPO_TRAZA", grupo_traza.reindex(result.index, fill_value=""))
+
+    # Códigos SIES distintos por llave, en orden de aparición; slots 1..N.
+    codes = base[["BRIDGE_KEY_3", "CODIGO_CARRERA_SIES"]].dropna()
+    codes = codes[codes["CODIGO_CARRERA_SIES"].ne("")].drop_duplicates()
+    by_key = codes.groupby("BRIDGE_KEY_3", sort=False)["CODIGO_CARRERA_SIES"]
+    result["N_CODES_SIES"] = by_key.size().reindex(result.index, fill_value=0).astype(int)
+    result["CODIGOS_SIES_POTENCIALES"] = by_key.agg(" | ".join).reindex(result.index, fill_value="")
+    slot = by_key.cumcount()
+    for idx in range(MAX_SIES_CODES_PER_KEY):
+        en_slot = codes[slot.eq(idx)].set_index("BRIDGE_KEY_3")["CODIGO_CARRERA_SIES"]
+        slot_col = en_slot.reindex(result.index).astype(object)
+        result[f"CODIGO_CARRERA_SIES_{idx + 1}"] = slot_col.where(slot_col.notna(), pd.NA).infer_objects()
+
+    result = result.reset_index().sort_values(["GRUPO_TRAZA", "JORNADA", "CODCARPR", "NOMBRE_L"]).reset_index(drop=True)
+    result["CODIGO_CARRERA"] = _derive_codigo_carrera_from_sies_frame(result)
     return result
 
 
-def _build_catalog_and_bridge_from_duracion() -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Genera catálogo manual y puente SIES desde DURACION_ESTUDIOS.tsv."""
-    dur = _load_duracion_as_governance_df()
+def _build_catalog_and_bridge_from_duracion(
+    cache: CompiledIndexCache | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Genera catálogo manual y puente SIES desde DURACION_ESTUDIOS.tsv.
+
+    Usa el derivado precompilado del bundle de gobernanza si está cargado;
+    si no, con ``cache`` el resultado se reutiliza mientras no cambie el TSV.
+    """
+    bundle = _governance_bundle()
+    if bundle is not None and "catalogo_puente_duracion" in bundle.derived:
+        cat_manual, puente = bundle.derived["catalogo_puente_duracion"]
+        return cat_manual.copy(deep=False), puente.copy(deep=False)
+    sources = [p for p in _duracion_tsv_candidates() if p.exists()][:1]
+    if cache is None or not sources:
+        return _compile_catalog_and_bridge_from_duracion()
+    key = sources_key(sources, COMPILED_INDEX_VERSION)
+    return cache.load_or_build("catalogo_puente_duracion", key, _compile_catalog_and_bridge_from_duracion)
+
+
+def _compile_catalog_and_bridge_from_duracion(dur: pd.DataFrame | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Catálogo manual y puente desde DURACION_ESTUDIOS (el TSV activo si no se entrega ``dur``)."""
+    if dur is None:
+        dur = _load_duracion_as_governance_df()
     if dur.empty:
         return pd.DataFrame(), pd.DataFrame()
 
@@ -1924,7 +2044,7 @@ def cargar_fuentes(path: Path) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame
         equiv = book.get("Equivalencia")
         if equiv is None:
             raise ValueError("Falta hoja Equivalencia")
-        return carreras, matricula, hist.copy(), equiv.copy()
+        return carreras, matricula, hist.copy(deep=False), equiv.copy(deep=False)
     except ValueError as err:
         # Modo compatible para archivos legacy tipo "Hoja1" con CODCARR/PLAN_DE_ESTUDIO.
         hoja1 = book.get("Hoja1")
@@ -1932,7 +2052,7 @@ def cargar_fuentes(path: Path) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame
         if hoja1 is None or not req_hoja1.issubset(hoja1.columns):
             raise err
 
-        src = hoja1.copy()
+        src = hoja1.copy(deep=False)
         carreras = (
             src[["CODCARR", "PLAN_DE_ESTUDIO"]]
             .dropna(subset=["CODCARR", "PLAN_DE_ESTUDIO"])
@@ -1960,12 +2080,12 @@ def cargar_fuentes(path: Path) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame
 
         hist_cols = ["ANO", "PERIODO", "RUT", "DIG", "CODCARR", "CODRAMO"]
         extra_hist = [c for c in ["DESCRIPCION_ESTADO", "ESTADO_ACADEMICO", "JORNADA"] if c in src.columns]
-        hist = src[hist_cols + extra_hist].copy()
+        hist = src[hist_cols + extra_hist]
         if "DESCRIPCION_ESTADO" not in hist.columns and "ESTADO" in src.columns:
             hist["DESCRIPCION_ESTADO"] = src["ESTADO"]
 
         equiv_cols = ["CODCARR"] + (["JORNADA"] if "JORNADA" in src.columns else [])
-        equiv = src[equiv_cols].dropna(subset=["CODCARR"]).drop_duplicates().copy()
+        equiv = src[equiv_cols].dropna(subset=["CODCARR"]).drop_duplicates()
         equiv["CODIGO_UNICO"] = equiv["CODCARR"]
 
         print("Modo compatible activado: se derivaron Carreras/Matrícula/Equivalencia desde Hoja1.")
@@ -1973,7 +2093,7 @@ def cargar_fuentes(path: Path) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame
 
 
 def preparar_matricula_intermedia(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
+    out = df.copy(deep=False)
     out["RUT_NORM"] = [_normalize_doc(n, d) for n, d in zip(out["NUM_DOCUMENTO"], out["DV"])]
     # Regla: no colapsar por RUT, solo deduplicación exacta de clave de negocio
     key = ["NUM_DOCUMENTO", "DV", "CODIGO_UNICO", "PLAN_ESTUDIOS"]
@@ -1982,7 +2102,7 @@ def preparar_matricula_intermedia(df: pd.DataFrame) -> pd.DataFrame:
 
 def construir_puente_equiv(df_equiv: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     cols = [c for c in ["CODCARR", "CODIGO_UNICO", "JORNADA", "VERSION"] if c in df_equiv.columns]
-    bridge = df_equiv[cols].dropna(subset=["CODCARR", "CODIGO_UNICO"]).copy()
+    bridge = df_equiv[cols].dropna(subset=["CODCARR", "CODIGO_UNICO"])
     bridge["CODCARR"] = bridge["CODCARR"].astype(str)
 
     g = (
@@ -1999,7 +2119,7 @@ def construir_puente_equiv(df_equiv: pd.DataFrame) -> tuple[pd.DataFrame, pd.Dat
 
 
 def mapear_historico_con_equiv(df_hist: pd.DataFrame, bridge: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
-    hist = df_hist.copy()
+    hist = df_hist.copy(deep=False)
     hist["RUT_NORM"] = [_normalize_doc(n, d) for n, d in zip(hist["RUT"], hist["DIG"])]
     hist["CODCARR"] = hist["CODCARR"].astype(str)
     if "CODIGO_UNICO" not in hist.columns:
@@ -2009,7 +2129,7 @@ def mapear_historico_con_equiv(df_hist: pd.DataFrame, bridge: pd.DataFrame) -> t
 
     if key_jornada:
         hist["JORNADA"] = hist["JORNADA"].astype(str)
-        bridge = bridge.copy()
+        bridge = bridge.copy(deep=False)
         bridge["JORNADA"] = bridge["JORNADA"].astype(str)
         pair = bridge.drop_duplicates(["CODCARR", "JORNADA", "CODIGO_UNICO"])
         counts = pair.groupby(["CODCARR", "JORNADA"])["CODIGO_UNICO"].nunique().reset_index(name="n")
@@ -2020,7 +2140,7 @@ def mapear_historico_con_equiv(df_hist: pd.DataFrame, bridge: pd.DataFrame) -> t
             hist["CODIGO_UNICO"] = hist["CODIGO_UNICO"].combine_first(hist["CODIGO_UNICO_EQ"])
             hist = hist.drop(columns=["CODIGO_UNICO_EQ"])
 
-    unresolved = hist[hist["CODIGO_UNICO"].isna()].copy()
+    unresolved = hist[hist["CODIGO_UNICO"].isna()]
     if not unresolved.empty:
         single = bridge.groupby("CODCARR")["CODIGO_UNICO"].nunique().reset_index(name="n")
         single = single[single["n"] == 1].merge(
@@ -2033,7 +2153,7 @@ def mapear_historico_con_equiv(df_hist: pd.DataFrame, bridge: pd.DataFrame) -> t
             on="CODCARR",
             how="left",
         )
-        resolved = hist[hist["CODIGO_UNICO"].notna()].copy()
+        resolved = hist[hist["CODIGO_UNICO"].notna()]
         hist = pd.concat([resolved, unresolved], ignore_index=True)
 
     review = hist[hist["CODIGO_UNICO"].isna()][["CODCARR"]].value_counts().reset_index(name="filas_sin_map")
@@ -2043,76 +2163,72 @@ def mapear_historico_con_equiv(df_hist: pd.DataFrame, bridge: pd.DataFrame) -> t
 # ==============================
 # CAPA B: Modelo intermedio
 # ==============================
+RESUMEN_HISTORICO_COLUMNS = [
+    "RUT_NORM",
+    "CODIGO_UNICO",
+    "CURSO_1ER_SEM",
+    "CURSO_2DO_SEM",
+    "UNIDADES_CURSADAS",
+    "UNIDADES_APROBADAS",
+    "UNID_CURSADAS_TOTAL",
+    "UNID_APROBADAS_TOTAL",
+]
+
+
 def construir_resumen_historico(hist_mapeado: pd.DataFrame) -> pd.DataFrame:
-    valid = hist_mapeado[hist_mapeado["CODIGO_UNICO"].notna()].copy()
+    """Resumen por (RUT_NORM, CODIGO_UNICO) en una sola agregación agrupada.
+
+    Los filtros por año de referencia y estado se aplican como máscaras sobre
+    CODRAMO antes de agrupar; ``nunique`` ignora las filas enmascaradas.
+    """
+    valid = hist_mapeado[hist_mapeado["CODIGO_UNICO"].notna()]
     if valid.empty:
-        return pd.DataFrame(
-            columns=[
-                "RUT_NORM",
-                "CODIGO_UNICO",
-                "CURSO_1ER_SEM",
-                "CURSO_2DO_SEM",
-                "UNIDADES_CURSADAS",
-                "UNIDADES_APROBADAS",
-                "UNID_CURSADAS_TOTAL",
-                "UNID_APROBADAS_TOTAL",
-            ]
-        )
+        return pd.DataFrame(columns=RESUMEN_HISTORICO_COLUMNS)
 
     anio_vals = pd.to_numeric(valid["ANO"], errors="coerce").dropna()
     if anio_vals.empty:
-        return pd.DataFrame(
-            columns=[
-                "RUT_NORM",
-                "CODIGO_UNICO",
-                "CURSO_1ER_SEM",
-                "CURSO_2DO_SEM",
-                "UNIDADES_CURSADAS",
-                "UNIDADES_APROBADAS",
-                "UNID_CURSADAS_TOTAL",
-                "UNID_APROBADAS_TOTAL",
-            ]
-        )
+        return pd.DataFrame(columns=RESUMEN_HISTORICO_COLUMNS)
     anio_ref = int(anio_vals.max())
 
-    rows = []
-    for (rut, cod), sub in valid.groupby(["RUT_NORM", "CODIGO_UNICO"]):
-        s_ref = sub[sub["ANO"] == anio_ref]
-
-        estado_ref = _series_or_default(s_ref, "DESCRIPCION_ESTADO").str.upper()
-        estado_hist = _series_or_default(sub, "DESCRIPCION_ESTADO").str.upper()
-
-        codramo_ref = s_ref["CODRAMO"] if "CODRAMO" in s_ref.columns else pd.Series(index=s_ref.index, dtype=object)
-        codramo_hist = sub["CODRAMO"] if "CODRAMO" in sub.columns else pd.Series(index=sub.index, dtype=object)
-
-        rows.append(
-            {
-                "RUT_NORM": rut,
-                "CODIGO_UNICO": cod,
-                "CURSO_1ER_SEM": "SI" if (s_ref["PERIODO"] == 1).any() else "NO",
-                "CURSO_2DO_SEM": "SI" if (s_ref["PERIODO"] == 2).any() else "NO",
-                "UNIDADES_CURSADAS": codramo_ref.nunique(),
-                "UNIDADES_APROBADAS": codramo_ref[estado_ref.str.contains("APROB", na=False)].nunique(),
-                "UNID_CURSADAS_TOTAL": codramo_hist.nunique(),
-                "UNID_APROBADAS_TOTAL": codramo_hist[
-                    estado_hist.str.contains(r"APROB|CONVALID|RECONOC|EQUIV|HOMOLOG", regex=True, na=False)
-                ].nunique(),
-            }
-        )
+    es_ref = valid["ANO"] == anio_ref
+    estado = _series_or_default(valid, "DESCRIPCION_ESTADO").str.upper()
+    aprob_ref = estado.str.contains("APROB", na=False).astype(bool)
+    aprob_hist = estado.str.contains(r"APROB|CONVALID|RECONOC|EQUIV|HOMOLOG", regex=True, na=False).astype(bool)
+    codramo = valid["CODRAMO"] if "CODRAMO" in valid.columns else pd.Series(pd.NA, index=valid.index, dtype=object)
 
-    return pd.DataFrame(rows)
+    frame = pd.DataFrame(
+        {
+            "RUT_NORM": valid["RUT_NORM"],
+            "CODIGO_UNICO": valid["CODIGO_UNICO"],
+            "CURSO_1ER_SEM": es_ref & (valid["PERIODO"] == 1),
+            "CURSO_2DO_SEM": es_ref & (valid["PERIODO"] == 2),
+            "UNIDADES_CURSADAS": codramo.where(es_ref),
+            "UNIDADES_APROBADAS": codramo.where(es_ref & aprob_ref),
+            "UNID_CURSADAS_TOTAL": codramo,
+            "UNID_APROBADAS_TOTAL": codramo.where(aprob_hist),
+        }
+    )
+    grouped = frame.groupby(["RUT_NORM", "CODIGO_UNICO"], observed=True)
+    out = grouped[["UNIDADES_CURSADAS", "UNIDADES_APROBADAS", "UNID_CURSADAS_TOTAL", "UNID_APROBADAS_TOTAL"]].nunique()
+    for col in ["CURSO_1ER_SEM", "CURSO_2DO_SEM"]:
+        out[col] = np.where(grouped[col].any(), "SI", "NO")
+    out = out.reset_index()
+    for col in ["RUT_NORM", "CODIGO_UNICO"]:
+        if isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype(out[col].cat.categories.dtype)
+    return out[RESUMEN_HISTORICO_COLUMNS]
 
 
 def construir_carreras_control(df_carreras: pd.DataFrame) -> pd.DataFrame:
-    out = df_carreras.copy().drop_duplicates(["CODIGO_UNICO", "PLAN_ESTUDIOS"])
+    out = df_carreras.drop_duplicates(["CODIGO_UNICO", "PLAN_ESTUDIOS"])
     for col in CARRERAS_AC_COLUMNS:
         if col not in out.columns:
             out[col] = pd.NA
-    return out[CARRERAS_AC_COLUMNS].copy()
+    return out[CARRERAS_AC_COLUMNS]
 
 
 def construir_matricula_ac_control(df_matricula: pd.DataFrame, resumen: pd.DataFrame) -> pd.DataFrame:
-    out = df_matricula.copy()
+    out = df_matricula.copy(deep=False)
     if not resumen.empty:
         out = out.merge(resumen, on=["RUT_NORM", "CODIGO_UNICO"], how="left", suffixes=("", "_CALC"))
 
@@ -2131,24 +2247,55 @@ def construir_matricula_ac_control(df_matricula: pd.DataFrame, resumen: pd.DataF
     for col in MATRICULA_AC_COLUMNS:
         if col not in out.columns:
             out[col] = pd.NA
-    return out[MATRICULA_AC_COLUMNS].copy()
+    return out[MATRICULA_AC_COLUMNS]
+
+
+_JORNADA_LEGACY_JOR = [("diurn", "1"), ("vespert", "2"), ("semi", "3"), ("dist", "4")]
+
+
+def _legacy_jor_por_codigo_unico(df_equiv: pd.DataFrame) -> pd.Series:
+    """CODIGO_UNICO → JOR heredado desde el texto de JORNADA (gana el último par)."""
+    if not {"CODIGO_UNICO", "JORNADA"}.issubset(df_equiv.columns):
+        return pd.Series(dtype=object)
+    pairs = df_equiv[["CODIGO_UNICO", "JORNADA"]].dropna().drop_duplicates()
+    texto = pairs["JORNADA"].astype(str).str.strip().str.lower()
+    jor = np.select(
+        [texto.str.contains(pat, regex=False) for pat, _ in _JORNADA_LEGACY_JOR],
+        [jor for _, jor in _JORNADA_LEGACY_JOR],
+        default=pd.NA,
+    )
+    jmap = pd.Series(jor, index=pairs["CODIGO_UNICO"].astype(object).to_numpy(), dtype=object)
+    return jmap[~jmap.index.duplicated(keep="last")]
+
+
+def _matriz_desambiguacion_lookup(codcarpr: pd.Series, jornada: pd.Series, version: pd.Series) -> pd.Series:
+    """Join vectorizado contra la matriz de desambiguación; NA si la llave no existe.
+
+    Equivale a ``resolver_ambiguedad_sies(...)[0]`` fila a fila: las llaves se
+    normalizan con ``str().strip().upper()`` (NaN → ``"NAN"``) y CODCARPR o
+    JORNADA vacíos (``None``, ``""``, ``0``) no se resuelven.
+    """
+    def _norm(values: pd.Series) -> pd.Series:
+        values = values.astype(object)
+        return values.where(values.notna(), "nan").astype(str).str.strip().str.upper()
+
+    def _vacio(values: pd.Series) -> np.ndarray:
+        raw = values.to_numpy(dtype=object)
+        return (raw == None) | (raw == "") | (raw == 0)  # noqa: E711 — comparación elemento a elemento
+
+    matriz_dict = _matriz_desambiguacion()
+    if not matriz_dict:
+        return pd.Series(pd.NA, index=codcarpr.index, dtype=object)
+    matriz = pd.MultiIndex.from_tuples(list(matriz_dict))
+    sies = np.array([v[0] for v in matriz_dict.values()], dtype=object)
+    keys = pd.MultiIndex.from_arrays([_norm(codcarpr), _norm(jornada), _norm(version)])
+    pos = matriz.get_indexer(keys)
+    pos[_vacio(codcarpr) | _vacio(jornada)] = -1
+    return pd.Series(np.where(pos >= 0, sies[pos], None), index=codcarpr.index, dtype=object)
 
 
 def construir_matricula_unificada_control(mat_ac: pd.DataFrame, df_equiv: pd.DataFrame) -> pd.DataFrame:
-    jmap: dict[object, tuple[object, object]] = {}
-    if {"CODIGO_UNICO", "JORNADA"}.issubset(df_equiv.columns):
-        for _, r in df_equiv[["CODIGO_UNICO", "JORNADA"]].dropna().drop_duplicates().iterrows():
-            j = str(r["JORNADA"]).strip().lower()
-            if "diurn" in j:
-                jmap[r["CODIGO_UNICO"]] = ("PRESENCIAL", "1")
-            elif "vespert" in j:
-                jmap[r["CODIGO_UNICO"]] = ("PRESENCIAL", "2")
-            elif "semi" in j:
-                jmap[r["CODIGO_UNICO"]] = ("SEMIPRESENCIAL", "3")
-            elif "dist" in j:
-                jmap[r["CODIGO_UNICO"]] = ("DISTANCIA", "4")
-            else:
-                jmap[r["CODIGO_UNICO"]] = (pd.NA, pd.NA)
+    jmap = _legacy_jor_por_codigo_unico(df_equiv)
 
     out = pd.DataFrame(index=mat_ac.index)
     out["TIPO_DOC"] = mat_ac.get("TIPO_DOCUMENTO")
@@ -2168,40 +2315,24 @@ def construir_matricula_unificada_control(mat_ac: pd.DataFrame, df_equiv: pd.Dat
     out["COD_SED"] = pd.NA
     out["COD_CAR"] = mat_ac.get("CODIGO_UNICO")
     
-    # Resolver MODALIDAD y JOR usando matriz de desambiguación
-    out_sies, out_confianza, out_notas, is_ambiguo = [], [], [], []
-    for idx, row in mat_ac.iterrows():
-        codcarpr = row.get("CODIGO_UNICO", "")
-        jornada_src = row.get("JORNADA", "")
-        version_src = row.get("VERSION", "")
-        
-        # Extract VERSION from plan if not present - use plan's VERSION field
-        if not version_src or pd.isna(version_src):
-            plan_estudios = row.get("PLAN_ESTUDIOS", "")
-            if plan_estudios and isinstance(plan_estudios, str):
-                # Try to extract version from plan name (e.g., "Plan_V1_2024" -> "V1")
-                match = re.search(r'(V\d+)', str(plan_estudios).upper())
-                version_src = match.group(1) if match else "V1"
-            else:
-                version_src = "V1"
-        
-        codigo_sies, confianza, notas, ambiguo = resolver_ambiguedad_sies(codcarpr, jornada_src, version_src)
-        out_sies.append(codigo_sies)
-        out_confianza.append(confianza)
-        out_notas.append(notas)
-        is_ambiguo.append(ambiguo)
-
-    out["MODALIDAD"] = pd.Series(out_sies, index=out.index)
-    out["_SIES_CONFIANZA"] = pd.Series(out_confianza, index=out.index)
-    out["_SIES_NOTAS"] = pd.Series(out_notas, index=out.index)
-    out["_SIES_AMBIGUO"] = pd.Series(is_ambiguo, index=out.index)
-    
-    # Mapeo heredado de JORNADA (mantener compatibilidad con jmap si falla matriz)
-    modality = mat_ac.get("CODIGO_UNICO").map(lambda c: jmap.get(c, (pd.NA, pd.NA)))
-    legacy_mod, legacy_jor = zip(*modality.tolist()) if modality.tolist() else ([], [])
-    
-    # Usar matriz primero, fallback a legacy mapping
-    out["JOR"] = pd.Series([legacy_jor[i] if pd.isna(out_sies[i]) else pd.NA for i in range(len(out_sies))], index=out.index)
+    # Resolver MODALIDAD con la matriz de desambiguación (join por llave).
+    def _col(name: str) -> pd.Series:
+        return mat_ac[name].astype(object) if name in mat_ac.columns else pd.Series("", index=mat_ac.index, dtype=object)
+
+    codcarpr = _col("CODIGO_UNICO")
+    version_src = _col("VERSION")
+    # Sin VERSION se toma desde el nombre del plan (e.g., "Plan_V1_2024" -> "V1"); por defecto V1.
+    sin_version = version_src.isna() | version_src.eq("") | version_src.eq(0)
+    try:
+        version_plan = _col("PLAN_ESTUDIOS").str.upper().str.extract(r"(V\d+)", expand=False).fillna("V1")
+    except AttributeError:  # PLAN_ESTUDIOS sin ningún valor de texto
+        version_plan = pd.Series("V1", index=mat_ac.index, dtype=object)
+    version_src = version_src.where(~sin_version, version_plan)
+    out["MODALIDAD"] = _matriz_desambiguacion_lookup(codcarpr, _col("JORNADA"), version_src)
+
+    # Mapeo heredado de JORNADA (fallback cuando la matriz no resuelve)
+    legacy_jor = codcarpr.map(jmap) if len(jmap) else pd.Series(pd.NA, index=out.index, dtype=object)
+    out["JOR"] = legacy_jor.where(out["MODALIDAD"].isna(), pd.NA)
     out["VERSION"] = pd.NA
     out["FOR_ING_ACT"] = pd.NA
     out["ANIO_ING_ACT"] = mat_ac.get("ANIO_INGRESO_CARRERA_ACTUAL")
@@ -2223,9 +2354,210 @@ def construir_matricula_unificada_control(mat_ac: pd.DataFrame, df_equiv: pd.Dat
     else:
         out["REINCORPORACION"] = 0
     out["VIG"] = mat_ac.get("VIGENCIA")
-    return out[MATRICULA_UNIFICADA_COLUMNS].copy()
+    return out[MATRICULA_UNIFICADA_COLUMNS]
+
+
+_PUENTE_TRAZA_COLUMNS = [
+    f"{col}_{fuente}"
+    for fuente in ("MANUAL", "PUENTE")
+    for col in ("GRUPO_TRAZA", "FAMILIA_TRAZA", "FAMILIA_CODCARPR")
+]
+
+
+def _prepare_puente_compilado(
+    df_bridge: pd.DataFrame,
+    *extra_codes: Iterable[object],
+) -> tuple[pd.DataFrame, SiesCodeTable]:
+    """Normaliza el puente compilado: columnas SIES completas, CODIGO_CARRERA y una fila por llave.
+
+    ``extra_codes`` (p. ej. la oferta) se internan antes que los códigos del
+    puente en la misma ``SiesCodeTable``, que se retorna para las etapas siguientes.
+    """
+    df_bridge = df_bridge.copy(deep=False)
+    for idx in range(1, MAX_SIES_CODES_PER_KEY + 1):
+        col = f"CODIGO_CARRERA_SIES_{idx}"
+        if col not in df_bridge.columns:
+            df_bridge[col] = pd.NA
+        for suffix in (
+            "CONDICION_ANIO_INGRESO",
+            "ANIO_INGRESO_MIN",
+            "ANIO_INGRESO_MAX",
+        ):
+            cond_col = f"{col}_{suffix}"
+            if cond_col not in df_bridge.columns:
+                df_bridge[cond_col] = pd.NA
+    sies_codes = SiesCodeTable.from_codes(
+        *extra_codes,
+        *(df_bridge[f"CODIGO_CARRERA_SIES_{idx}"] for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)),
+    )
+    df_bridge["CODIGO_CARRERA"] = _derive_codigo_carrera_from_sies_frame(df_bridge, sies_codes)
+    df_bridge["N_CODES_SIES"] = pd.to_numeric(df_bridge["N_CODES_SIES"], errors="coerce").fillna(0).astype(int)
+    df_bridge = df_bridge.drop_duplicates(subset=["BRIDGE_KEY_3"], keep="first").reset_index(drop=True)
+    return df_bridge, sies_codes
+
+
+def _merge_puente_sies(
+    archivo_subida: pd.DataFrame,
+    df_manual: pd.DataFrame,
+    df_bridge: pd.DataFrame,
+    excluir_diplomados: bool,
+) -> tuple[pd.DataFrame, dict[str, int]]:
+    """Cruce con catálogo manual y puente SIES: códigos potenciales y SIES_MATCH_STATUS/DIAG.
+
+    Solo depende de las llaves fuente de ``archivo_subida`` y de los catálogos,
+    por lo que puede re-ejecutarse tras remediar DURACION_ESTUDIOS sin correr
+    el resto del pipeline. Retorna el frame cruzado y el conteo por tipo de match.
+    """
+    # Re-ejecución: descartar la traza de un cruce previo antes de volver a unir.
+    archivo_subida = archivo_subida.drop(columns=_PUENTE_TRAZA_COLUMNS, errors="ignore")
+    if not df_manual.empty:
+        manual_exact = (
+            df_manual[["MANUAL_KEY_3", "GRUPO_TRAZA", "FAMILIA_TRAZA", "FAMILIA_CODCARPR"]]
+            .drop_duplicates(subset=["MANUAL_KEY_3"])
+            .rename(
+                columns={
+                    "MANUAL_KEY_3": "SOURCE_KEY_3",
+                    "GRUPO_TRAZA": "GRUPO_TRAZA_MANUAL",
+                    "FAMILIA_TRAZA": "FAMILIA_TRAZA_MANUAL",
+                    "FAMILIA_CODCARPR": "FAMILIA_CODCARPR_MANUAL",
+                }
+            )
+        )
+        archivo_subida = archivo_subida.merge(manual_exact, on="SOURCE_KEY_3", how="left")
+        manual_key_set = set(df_manual["MANUAL_KEY_3"])
+        archivo_subida["MANUAL_MATCH_STATUS"] = archivo_subida["SOURCE_KEY_3"].isin(manual_key_set).map(
+            {True: "MATCH_MANUAL", False: "SIN_MATCH_MANUAL"}
+        )
+    else:
+        archivo_subida["GRUPO_TRAZA_MANUAL"] = pd.NA
+        archivo_subida["FAMILIA_TRAZA_MANUAL"] = pd.NA
+        archivo_subida["FAMILIA_CODCARPR_MANUAL"] = pd.NA
+        archivo_subida["MANUAL_MATCH_STATUS"] = "SIN_CATALOGO_MANUAL"
+
+    puente_match_tipo: dict[str, int] = {}
+    for idx in range(1, MAX_SIES_CODES_PER_KEY + 1):
+        archivo_subida[f"CODIGO_CARRERA_SIES_{idx}"] = pd.NA
+    archivo_subida["N_CODES_SIES"] = pd.NA
+    archivo_subida["CODIGOS_SIES_POTENCIALES"] = pd.NA
+    archivo_subida[FINAL_SIES_CODE_COL] = pd.NA
+    archivo_subida["SIES_RESOLUCION_HEURISTICA"] = pd.NA
+    archivo_subida["SIES_CONFIANZA_POST"] = pd.NA
+
+    if not df_bridge.empty:
+        sies_cols = [
+            "N_CODES_SIES",
+            "CODIGOS_SIES_POTENCIALES",
+        ] + [f"CODIGO_CARRERA_SIES_{idx}" for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)]
+        sies_cols += [
+            f"CODIGO_CARRERA_SIES_{idx}_{suffix}"
+            for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)
+            for suffix in (
+                "CONDICION_ANIO_INGRESO",
+                "ANIO_INGRESO_MIN",
+                "ANIO_INGRESO_MAX",
+            )
+        ]
+        archivo_subida = archivo_subida.drop(columns=[c for c in sies_cols if c in archivo_subida.columns], errors="ignore")
+
+        bridge_join_cols = [
+            "BRIDGE_KEY_3",
+            "GRUPO_TRAZA",
+            "FAMILIA_TRAZA",
+            "FAMILIA_CODCARPR",
+            "N_CODES_SIES",
+            "CODIGOS_SIES_POTENCIALES",
+        ] + [f"CODIGO_CARRERA_SIES_{idx}" for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)]
+        bridge_join_cols += [
+            f"CODIGO_CARRERA_SIES_{idx}_{suffix}"
+            for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)
+            for suffix in (
+                "CONDICION_ANIO_INGRESO",
+                "ANIO_INGRESO_MIN",
+                "ANIO_INGRESO_MAX",
+            )
+        ]
+        bridge_exact = df_bridge[bridge_join_cols].rename(
+            columns={
+                "BRIDGE_KEY_3": "SOURCE_KEY_3",
+                "GRUPO_TRAZA": "GRUPO_TRAZA_PUENTE",
+                "FAMILIA_TRAZA": "FAMILIA_TRAZA_PUENTE",
+                "FAMILIA_CODCARPR": "FAMILIA_CODCARPR_PUENTE",
+            }
+        )
+        # Llave de continuidad (sin alterar SOURCE_KEY_3 original):
+        # ej. "CONTINUIDAD AUDITORIA" -> "AUDITORIA",
+        # "CONTINUIDAD INGENIERIA ... " -> "INGENIERIA EN ...".
+        fallback_key_3 = (
+            map_categories(archivo_subida["JORNADA_FUENTE"], _normalize_text)
+            + "|"
+            + archivo_subida["CODCARPR_NORM"]
+            + "|"
+            + map_categories(archivo_subida["NOMBRE_CARRERA_FUENTE"], _normalize_continuidad_name_for_sies)
+        )
+        # Un solo lookup por posición: llave exacta y, si falla, llave de continuidad.
+        bridge_pos, bridge_match_tipo = _lookup_catalog_key_3(
+            archivo_subida["SOURCE_KEY_3"], fallback_key_3, pd.Index(df_bridge["BRIDGE_KEY_3"]),
+        )
+        apply_fallback_mask = bridge_match_tipo.eq("FALLBACK_NOMBRE")
+        bridge_rows = bridge_exact.drop(columns=["SOURCE_KEY_3"]).reindex(bridge_pos)
+        # El fallback por nombre solo aporta códigos SIES, no la traza del puente.
+        bridge_rows.loc[apply_fallback_mask.to_numpy(), ["GRUPO_TRAZA_PUENTE", "FAMILIA_TRAZA_PUENTE", "FAMILIA_CODCARPR_PUENTE"]] = pd.NA
+        archivo_subida = archivo_subida.reset_index(drop=True)
+        archivo_subida = pd.concat([archivo_subida, bridge_rows.set_axis(archivo_subida.index)], axis=1)
+        apply_fallback_mask = apply_fallback_mask.set_axis(archivo_subida.index)
+        puente_match_tipo = bridge_match_tipo.value_counts().to_dict()
+
+        key_no_jornada = set(df_bridge["BRIDGE_KEY_NO_JORNADA"])
+        codcarpr_bridge = set(df_bridge["CODCARPR"])
+
+        exists_no_j = archivo_subida["KEY_3_NO_JORNADA"].isin(key_no_jornada)
+        exists_cod = archivo_subida["CODCARPR_NORM"].isin(codcarpr_bridge)
+        n_codes = pd.to_numeric(archivo_subida["N_CODES_SIES"], errors="coerce").fillna(0)
+        match_any = n_codes > 0
+
+        archivo_subida["SIES_MATCH_STATUS"] = "SIN_MATCH_SIES"
+        archivo_subida["SIES_MATCH_DIAG"] = "SIN_CODCARPR_EN_PUENTE_SIES"
+
+        unique_mask = match_any & (n_codes == 1)
+        amb_mask = match_any & (n_codes > 1)
+
+        archivo_subida.loc[unique_mask, "SIES_MATCH_STATUS"] = "MATCH_SIES"
+        archivo_subida.loc[unique_mask, "SIES_MATCH_DIAG"] = "MATCH_SIES_UNICO"
+        archivo_subida.loc[unique_mask, FINAL_SIES_CODE_COL] = archivo_subida.loc[unique_mask, "CODIGO_CARRERA_SIES_1"]
+
+        archivo_subida.loc[amb_mask, "SIES_MATCH_STATUS"] = "AMBIGUO_SIES"
+        archivo_subida.loc[amb_mask, "SIES_MATCH_DIAG"] = "MATCH_SIES_AMBIGUO"
+        archivo_subida.loc[unique_mask & apply_fallback_mask, "SIES_MATCH_DIAG"] = "MATCH_SIES_UNICO_FALLBACK_NOMBRE"
+        archivo_subida.loc[amb_mask & apply_fallback_mask, "SIES_MATCH_DIAG"] = "MATCH_SIES_AMBIGUO_FALLBACK_NOMBRE"
 
+        archivo_subida.loc[(~match_any) & exists_no_j, "SIES_MATCH_DIAG"] = "PROBABLE_PROBLEMA_JORNADA_SIES"
+        archivo_subida.loc[(~match_any) & (~exists_no_j) & exists_cod, "SIES_MATCH_DIAG"] = "PROBABLE_PROBLEMA_NOMBRE_SIES"
+    else:
+        archivo_subida["GRUPO_TRAZA_PUENTE"] = pd.NA
+        archivo_subida["FAMILIA_TRAZA_PUENTE"] = pd.NA
+        archivo_subida["FAMILIA_CODCARPR_PUENTE"] = pd.NA
+        archivo_subida["SIES_MATCH_STATUS"] = "SIN_PUENTE_SIES"
+        archivo_subida["SIES_MATCH_DIAG"] = "SIN_PUENTE_SIES"
 
+    archivo_subida["GRUPO_TRAZA"] = archivo_subida["GRUPO_TRAZA_PUENTE"].combine_first(archivo_subida["GRUPO_TRAZA_MANUAL"])
+    archivo_subida["FAMILIA_TRAZA"] = archivo_subida["GRUPO_TRAZA"].map(_extract_alpha_prefix)
+    archivo_subida["FAMILIA_CODCARPR"] = archivo_subida["CODCARPR_NORM"].map(_extract_alpha_prefix)
+
+    if excluir_diplomados:
+        excl = archivo_subida["ES_DIPLOMADO"].fillna(False)
+        archivo_subida.loc[excl, "SIES_MATCH_STATUS"] = "EXCLUIDO_DIPLOMADO"
+        archivo_subida.loc[excl, "SIES_MATCH_DIAG"] = "EXCLUIDO_DIPLOMADO"
+        archivo_subida.loc[excl, FINAL_SIES_CODE_COL] = pd.NA
+        archivo_subida.loc[excl, "CODIGOS_SIES_POTENCIALES"] = pd.NA
+        archivo_subida.loc[excl, "N_CODES_SIES"] = pd.NA
+        for idx in range(1, MAX_SIES_CODES_PER_KEY + 1):
+            archivo_subida.loc[excl, f"CODIGO_CARRERA_SIES_{idx}"] = pd.NA
+
+
+    return archivo_subida, puente_match_tipo
+
+
+@copy_on_write()
 def ejecutar_pipeline_matricula_unificada_legacy_like(
     input_file: Path,
     output_dir: Path,
@@ -2237,9 +2569,14 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     gob_pais_est_sec_tsv_path: str | None = None,
     gob_sede_tsv_path: str | None = None,
     sit_fon_sol_patch_json_path: str | None = None,
+    patch_dir: str | None = None,
     excluir_diplomados: bool = DEFAULT_EXCLUIR_DIPLOMADOS,
     usar_gobernanza_v2: bool = False,
     filtro_base_datos_sheet: str | None = None,
+    excel_max_filas_hoja: int | None = None,
+    excel_hojas_grandes: str = "dividir",
+    export_workers: int = DEFAULT_EXPORT_WORKERS,
+    marcar_alertas_codcar: bool = False,
 ) -> dict[str, object]:
     """
     Fase 1 de fusión con pipeline legacy:
@@ -2248,6 +2585,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     - Construye archivo tipo "ARCHIVO_LISTO_SUBIDA" con columnas de Matrícula Unificada
       y estados operativos del administrador de duplicados.
     """
+    _perf = perf_sequence("mu")
     xls = pd.ExcelFile(input_file)
     selected_sheet = sheet_name or xls.sheet_names[0]
 
@@ -2350,6 +2688,8 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     elif _filtro_bd_sheet:
         print(f"  ⚠️ Filtro base_datos: hoja '{_filtro_bd_sheet}' no existe en el Excel")
 
+    _perf.lap("lectura_fuente_y_filtro_base_datos", rows_out=len(src))
+
     # ── Depuración provisoria RUT ↔ CODCLI (pre-pipeline) ──────────────
     _pre_col_rut = _pick_first_column(src, ["RUT", "NUM_DOCUMENTO", "N_DOC"])
     _pre_col_codcli = _pick_first_column(src, ["CODCLI"])
@@ -2360,6 +2700,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
             src, _pre_col_rut, _pre_col_codcli, output_dir,
         )
     # ────────────────────────────────────────────────────────────────────
+    _perf.lap("depuracion_rut_multi_codcli", rows_out=len(src))
 
     manual_source = catalogo_manual_tsv_path or "auto:DURACION_ESTUDIOS.tsv"
     sit_fon_patch_source = sit_fon_sol_patch_json_path or "no_patch_json"
@@ -2437,15 +2778,15 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         ["FOR_ING_ACT", "FORMA_INGRESO", "FORMAINGRESO", "FORMA_INGRESO_ACTUAL", "TIPO_INGRESO"],
     )
 
-    src_work = src.copy()
+    src_work = src.copy(deep=False)
     codcarpr_plan_swap_flag = pd.Series("NO", index=src_work.index, dtype="object")
     if col_plan:
         codcarpr_looks_plan = src_work[req_codcarr].map(_looks_like_plan_estudio)
         plan_looks_codcarpr = src_work[col_plan].map(_looks_like_codcarpr)
         swap_mask = codcarpr_looks_plan & plan_looks_codcarpr
         if swap_mask.any():
-            codcarpr_original = src_work.loc[swap_mask, req_codcarr].copy()
-            plan_original = src_work.loc[swap_mask, col_plan].copy()
+            codcarpr_original = src_work.loc[swap_mask, req_codcarr]
+            plan_original = src_work.loc[swap_mask, col_plan]
             src_work.loc[swap_mask, req_codcarr] = plan_original.values
             src_work.loc[swap_mask, col_plan] = codcarpr_original.values
             src.loc[swap_mask, req_codcarr] = plan_original.values
@@ -2468,6 +2809,14 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         src.loc[codcarpr_fill_mask, req_codcarr] = codcarpr_from_codcli[codcarpr_fill_mask]
         print(f"  ↳ CODCARR inferido desde CODCLI: {int(codcarpr_fill_mask.sum())} filas")
 
+    # Política de dtypes: columnas de gobernanza de baja cardinalidad de la
+    # fuente pasan a `category`; `src` reutiliza las mismas columnas. Los joins
+    # posteriores (histórico, DatosAlumnos, puente) van sobre ids de IdentityIndex.
+    _categorias = SharedCategories()
+    _cols_categoricas = apply_category_policy([src_work], _categorias)
+    for _col in _cols_categoricas:
+        src[_col] = src_work[_col]
+
     rows_enriquecidas_datos_alumnos = 0
     cod_sed_resueltos_regla = 0
     pais_est_sec_inferidos_localidad = 0
@@ -2498,6 +2847,8 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     )
     valid_for_ing_act_codes, gob_for_ing_act_source = _load_for_ing_act_catalog()
 
+    _perf.lap("oferta_y_catalogos_gobernanza", rows_out=len(src_work))
+
     # ── Período objetivo del run (para ANIO_ANTERIOR dinámico por período) ──
     if col_anio_ing and col_anio_ing in src.columns:
         _pf_anio = pd.to_numeric(src[col_anio_ing], errors="coerce").dropna()
@@ -2517,17 +2868,18 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     historico_mu_df, anio_ref_historico_mu = _build_mu_historico_summary(
         src, req_rut, req_dv, req_codcarr, anio_ref_override=anio_anterior_prom,
     )
+    # Índice de identidad de la corrida: los joins internos operan sobre ids int32;
+    # el texto normalizado solo se calcula una vez por fila fuente.
+    _ids = IdentityIndex()
+    _src_rut_norm = [_normalize_doc(n, d) for n, d in zip(src_work[req_rut], src_work[req_dv])]
     if not historico_mu_df.empty:
-        src_work["_HIST_MU_KEY"] = [
-            _normalize_doc(n, d) + "|" + _normalize_text(c)
-            for n, d, c in zip(src_work[req_rut], src_work[req_dv], src_work[req_codcarr])
-        ]
-        historico_mu_join = historico_mu_df.copy()
-        historico_mu_join["_HIST_MU_KEY"] = historico_mu_join["RUT_NORM"] + "|" + historico_mu_join["CODCARPR_NORM"]
+        src_work["_HIST_MU_ID"] = _ids.pair_ids(_src_rut_norm, map_categories(src_work[req_codcarr], _normalize_text))
+        historico_mu_join = historico_mu_df.copy(deep=False)
+        historico_mu_join["_HIST_MU_ID"] = _ids.pair_ids(historico_mu_join["RUT_NORM"], historico_mu_join["CODCARPR_NORM"])
         src_work = src_work.merge(
             historico_mu_join[
                 [
-                    "_HIST_MU_KEY",
+                    "_HIST_MU_ID",
                     "UZ_HIST_KEY",
                     "ANIO_REFERENCIA_HIST_UZ",
                     "UZ_HIST_ANIO_MIN",
@@ -2550,26 +2902,29 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
                     "UZ_FUENTE_HIST",
                 ]
             ],
-            on="_HIST_MU_KEY",
+            on="_HIST_MU_ID",
             how="left",
         )
 
+    _perf.lap("historico_mu_resumen_y_merge", rows_out=len(src_work))
+
     # Nuevo flujo (v2) sólo con flag para facilitar rollback inmediato.
     if usar_gobernanza_v2:
         da_lookup = _load_datos_alumnos_lookup(input_file)
         if not da_lookup.empty:
             src_work[req_codcli] = src_work[req_codcli].astype(str).str.strip()
-            src_work = src_work.merge(da_lookup, on=req_codcli, how="left")
+            src_work["_CODCLI_ID"] = _ids.codcli_ids(src_work[req_codcli])
+            da_lookup = da_lookup.assign(_CODCLI_ID=_ids.codcli_ids(da_lookup["CODCLI"])).drop(columns=["CODCLI"])
+            src_work = src_work.merge(da_lookup, on="_CODCLI_ID", how="left")
             has_codcli_match = src_work["DA_MATCH_FLAG"].fillna("") == "1" if "DA_MATCH_FLAG" in src_work.columns else pd.Series(False, index=src_work.index)
             da_match_modo.loc[has_codcli_match] = "MATCH_CODCLI"
 
             # Fallback controlado: solo para no encontrados por CODCLI.
             if "DA_RUT_NORM" in da_lookup.columns:
-                src_work["_SRC_RUT_NORM"] = [_normalize_doc(n, d) for n, d in zip(src_work[req_rut], src_work[req_dv])]
+                src_work["_SRC_RUT_ID"] = _ids.rut_ids(_src_rut_norm)
                 da_by_rut = (
                     da_lookup[da_lookup["DA_RUT_NORM"].astype(str).str.strip() != ""]
                     .drop_duplicates(subset=["DA_RUT_NORM"], keep="first")
-                    .copy()
                 )
                 if not da_by_rut.empty:
                     da_fill_cols = [
@@ -2577,11 +2932,12 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
                         for c in da_by_rut.columns
                         if c.startswith("DA_") and c not in {"DA_MATCH_FLAG", "DA_RUT_NORM"}
                     ]
-                    rut_right = ["DA_RUT_NORM"] + da_fill_cols
+                    da_by_rut["_DA_RUT_ID"] = _ids.rut_ids(da_by_rut["DA_RUT_NORM"])
+                    rut_right = ["_DA_RUT_ID", "DA_RUT_NORM"] + da_fill_cols
                     src_work = src_work.merge(
                         da_by_rut[rut_right].add_suffix("_BY_RUT"),
-                        left_on="_SRC_RUT_NORM",
-                        right_on="DA_RUT_NORM_BY_RUT",
+                        left_on="_SRC_RUT_ID",
+                        right_on="_DA_RUT_ID_BY_RUT",
                         how="left",
                     )
 
@@ -2601,6 +2957,8 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
             rows_enriquecidas_datos_alumnos = int((da_match_modo != "SIN_MATCH").sum())
             sin_match_datos_alumnos_rows = int((da_match_modo == "SIN_MATCH").sum())
 
+    _perf.lap("enriquecimiento_datos_alumnos", rows_out=len(src_work))
+
     def _na_series() -> pd.Series:
         return pd.Series(pd.NA, index=src_work.index, dtype="object")
 
@@ -2651,14 +3009,14 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         out["FECH_NAC"] = out["FECH_NAC"].combine_first(src_work["DA_FECHANACIMIENTO"])
         fech_nac_status.loc[fecha_nac_da_mask] = "FALLBACK_DATOS_ALUMNOS"
 
-    out["NAC"] = src_work[col_nac] if col_nac else _na_series()
+    out["NAC"] = decategorize(src_work[col_nac]) if col_nac else _na_series()
     if usar_gobernanza_v2 and "DA_NACIONALIDAD" in src_work.columns:
         out["NAC"] = out["NAC"].combine_first(src_work["DA_NACIONALIDAD"])
     nac_status = pd.Series("SIN_INSUMO", index=src_work.index, dtype="object")
     nac_status.loc[out["NAC"].notna()] = "SOURCE_TEXT"
 
     if usar_gobernanza_v2 and not gob_nac_df.empty:
-        gob_nac = gob_nac_df.copy()
+        gob_nac = gob_nac_df.copy(deep=False)
         gob_nac["NACIONALIDAD_NORM"] = gob_nac["NACIONALIDAD_NORM"].map(_normalize_text)
         nac_map = (
             gob_nac[gob_nac["NACIONALIDAD_NORM"] != ""]
@@ -2702,7 +3060,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
             else pd.Series("", index=src_work.index, dtype="object")
         )
         if not gob_pais_est_sec_df.empty:
-            gob_pais = gob_pais_est_sec_df.copy()
+            gob_pais = gob_pais_est_sec_df.copy(deep=False)
             gob_pais["COMUNACOLEGIO_NORM"] = gob_pais["COMUNACOLEGIO_NORM"].map(_normalize_text)
             gob_pais["CIUDADCOLEGIO_NORM"] = gob_pais["CIUDADCOLEGIO_NORM"].map(_normalize_text)
             gob_pais["KEY_BOTH"] = gob_pais["COMUNACOLEGIO_NORM"] + "|" + gob_pais["CIUDADCOLEGIO_NORM"]
@@ -2740,7 +3098,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
                 default_code = _normalize_code_or_na(default_rows.iloc[0]["COD_PAIS_EST_SEC"])
                 has_localidad = (comuna_norm != "") | (ciudad_norm != "")
                 if not pd.isna(default_code):
-                    mapped_final = mapped_final.copy()
+                    mapped_final = mapped_final.copy(deep=False)
                     default_gob_mask = has_localidad & mapped_final.isna()
                     mapped_final.loc[has_localidad] = mapped_final.loc[has_localidad].combine_first(
                         pd.Series(default_code, index=mapped_final.loc[has_localidad].index)
@@ -2777,7 +3135,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         if usar_gobernanza_v2 and "DA_SEDE" in src_work.columns:
             sede_norm = src_work["DA_SEDE"].fillna("").map(_normalize_text)
             if not gob_sede_df.empty:
-                gob_sede = gob_sede_df.copy()
+                gob_sede = gob_sede_df.copy(deep=False)
                 gob_sede["SEDE_NORM"] = gob_sede["SEDE_NORM"].map(_normalize_text)
                 sede_map = (
                     gob_sede[gob_sede["SEDE_NORM"] != ""]
@@ -2793,7 +3151,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
             cod_sed_status.loc[cod_sed_map.notna()] = "MAPEADO_GOB_SEDE"
             cod_sed_status.loc[(cod_sed_map.isna()) & (sede_norm != "")] = "SIN_MAPEO_GOB_SEDE"
 
-    out["COD_CAR"] = src_work[req_codcarr]
+    out["COD_CAR"] = decategorize(src_work[req_codcarr])
 
     modalidad, jor = _map_jornada_to_mod_jor(src_work[req_jornada])
     out["MODALIDAD"] = modalidad
@@ -2821,6 +3179,8 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     src_work["FOR_ING_ACT_RESUELTO"] = for_ing_trace_df["FOR_ING_ACT"]
     out["FOR_ING_ACT"] = src_work["FOR_ING_ACT_RESUELTO"]
 
+    _perf.lap("for_ing_act_resolucion", rows_out=len(src_work))
+
     anio_input_label = f"INPUT_{col_anio_ing.upper().replace(' ', '_')}" if col_anio_ing else "SIN_COLUMNA_INPUT"
     sem_input_label = f"INPUT_{col_sem_ing.upper().replace(' ', '_')}" if col_sem_ing else "SIN_COLUMNA_INPUT"
     niv_input_label = f"INPUT_{col_niv_aca.upper().replace(' ', '_')}" if col_niv_aca else "SIN_COLUMNA_INPUT"
@@ -3016,6 +3376,8 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     out["REINCORPORACION"] = 0
 
     out["VIG"] = src_work[col_vig] if col_vig else 1
+    # Única copia explícita del bloque MU: consolida las ~30 columnas antes de
+    # que archivo_subida agregue el resto (evita un frame fragmentado).
     out = out[MATRICULA_UNIFICADA_COLUMNS].copy()
 
     def _build_fase4_trace(
@@ -3095,9 +3457,11 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     )
     estado_inicial = out["VIG"].map(_status_from_vig)
     estado_inicial = estado_inicial.where(~duplicated_vig, "Matrícula Duplicada")
-    estado_final = estado_inicial.copy()
+    estado_final = estado_inicial.copy(deep=False)
+
+    _perf.lap("campos_mu_base", rows_out=len(out))
 
-    archivo_subida = out.copy()
+    archivo_subida = out.copy(deep=False)
     archivo_subida["CODCLI"] = src_work[req_codcli]
     archivo_subida["PLAN_DE_ESTUDIO"] = src_work[col_plan] if col_plan else pd.NA
     archivo_subida["CODCARPR_PLAN_SWAP_FLAG"] = codcarpr_plan_swap_flag
@@ -3110,15 +3474,15 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     archivo_subida["ACTIVAR_DESACTIVAR"] = "Registro Activo"
     archivo_subida["ESTADO_FINAL_REGISTRO"] = estado_final
     archivo_subida["SOURCE_KEY_3"] = (
-        src_work[req_jornada].map(_normalize_text)
+        map_categories(src_work[req_jornada], _normalize_text)
         + "|"
-        + src_work[req_codcarr].map(_normalize_text)
+        + map_categories(src_work[req_codcarr], _normalize_text)
         + "|"
-        + src_work[req_nombre_carrera].map(_normalize_text)
+        + map_categories(src_work[req_nombre_carrera], _normalize_text)
     )
-    archivo_subida["KEY_3_NO_JORNADA"] = "|" + src_work[req_codcarr].map(_normalize_text) + "|" + src_work[req_nombre_carrera].map(_normalize_text)
-    archivo_subida["CODCARPR_NORM"] = src_work[req_codcarr].map(_normalize_text)
-    archivo_subida["ES_DIPLOMADO"] = src_work[req_nombre_carrera].map(_is_diplomado_name)
+    archivo_subida["KEY_3_NO_JORNADA"] = "|" + map_categories(src_work[req_codcarr], _normalize_text) + "|" + map_categories(src_work[req_nombre_carrera], _normalize_text)
+    archivo_subida["CODCARPR_NORM"] = map_categories(src_work[req_codcarr], _normalize_text)
+    archivo_subida["ES_DIPLOMADO"] = map_categories(src_work[req_nombre_carrera], _is_diplomado_name)
     archivo_subida["MATCH_KEY_3"] = archivo_subida["SOURCE_KEY_3"]
     archivo_subida["FLAG_GOBERNANZA_V2"] = "SI" if usar_gobernanza_v2 else "NO"
     archivo_subida["DA_MATCH_MODO"] = da_match_modo
@@ -3206,285 +3570,116 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     vig_esperado_da = pd.Series(pd.NA, index=archivo_subida.index, dtype="Int64")
 
     if not gob_da_estado_situ_df.empty:
-        da_map_df = gob_da_estado_situ_df.copy()
+        da_map_df = gob_da_estado_situ_df.copy(deep=False)
         da_map_df["ESTADOACADEMICO_NORM"] = da_map_df["ESTADOACADEMICO"].map(_normalize_text)
         da_map_df["SITUACION_NORM"] = da_map_df["SITUACION"].map(_normalize_text)
         da_map_df["KEY_DA"] = da_map_df["ESTADOACADEMICO_NORM"] + "|" + da_map_df["SITUACION_NORM"]
         da_vig_map = (
             da_map_df.drop_duplicates(subset=["KEY_DA"], keep="first")
             .set_index("KEY_DA")["VIG_ESPERADO"]
-            .to_dict()
-        )
-        key_da = estado_da_norm + "|" + situ_da_norm
-        vig_esperado_da = pd.to_numeric(key_da.map(da_vig_map), errors="coerce").astype("Int64")
-
-    # Fallback Hoja1 cuando no hay match completo en DatosAlumnos.
-    if not gob_hoja1_estado_desc_df.empty and "DESCRIPCION_ESTADO" in src_work.columns:
-        estado_h1_norm = src_work.get("ESTADO_ACADEMICO", pd.Series("", index=src_work.index)).fillna("").map(_normalize_text)
-        desc_h1_norm = src_work["DESCRIPCION_ESTADO"].fillna("").map(_normalize_text)
-        h1_map_df = gob_hoja1_estado_desc_df.copy()
-        h1_map_df["ESTADO_ACADEMICO_NORM"] = h1_map_df["ESTADO_ACADEMICO"].map(_normalize_text)
-        h1_map_df["DESCRIPCION_ESTADO_NORM"] = h1_map_df["DESCRIPCION_ESTADO"].fillna("").map(_normalize_text)
-        h1_map_df["KEY_H1"] = h1_map_df["ESTADO_ACADEMICO_NORM"] + "|" + h1_map_df["DESCRIPCION_ESTADO_NORM"]
-        h1_vig_map = (
-            h1_map_df.drop_duplicates(subset=["KEY_H1"], keep="first")
-            .set_index("KEY_H1")["VIG_ESPERADO"]
-            .to_dict()
-        )
-        key_h1 = estado_h1_norm + "|" + desc_h1_norm
-        vig_esperado_h1 = pd.to_numeric(key_h1.map(h1_vig_map), errors="coerce").astype("Int64")
-        vig_esperado_da = vig_esperado_da.fillna(vig_esperado_h1)
-
-    # Regla institucional explícita: estados sin matrícula siempre VIG=0.
-    force_vig0_da = estado_da_norm.isin(["TITULADO", "ELIMINADO", "SUSPENDIDO"])
-    vig_esperado_da = vig_esperado_da.where(~force_vig0_da, 0)
-    archivo_subida["VIG_ESPERADO_DA"] = vig_esperado_da
-
-    # Fuente base manual: se reconstruye desde DURACION_ESTUDIOS para trazabilidad
-    # de GRUPO_TRAZA/FAMILIA. El cruce SIES central se consume EXCLUSIVAMENTE
-    # desde el catálogo compilado control/catalogos/PUENTE_SIES_COMPILADO.tsv.
-    df_manual, _ = _build_catalog_and_bridge_from_duracion()
-
-    manual_override_raw = _load_governance_tsv(
-        catalogo_manual_tsv_path,
-        ["GRUPO_TRAZA", "JORNADA", "CODCARPR", "NOMBRE_L"],
-    )
-    if not manual_override_raw.empty:
-        try:
-            manual_override = _prepare_catalog_manual(
-                manual_override_raw[["GRUPO_TRAZA", "JORNADA", "CODCARPR", "NOMBRE_L"]]
-            )
-        except Exception as exc:
-            print(f"⚠️  No se aplicó override catalogo_manual.tsv: {exc}")
-            manual_override = pd.DataFrame()
-        if not manual_override.empty:
-            if df_manual.empty:
-                df_manual = manual_override.copy()
-            else:
-                override_keys = set(manual_override["MANUAL_KEY_3"])
-                df_manual = (
-                    pd.concat(
-                        [
-                            df_manual.loc[~df_manual["MANUAL_KEY_3"].isin(override_keys)],
-                            manual_override,
-                        ],
-                        ignore_index=True,
-                    )
-                    .drop_duplicates(subset=["MANUAL_KEY_3"], keep="last")
-                    .sort_values(["GRUPO_TRAZA", "JORNADA", "CODCARPR", "NOMBRE_L"])
-                    .reset_index(drop=True)
-                )
-            print(
-                "✅ Override catálogo manual aplicado: "
-                f"{len(manual_override)} llaves desde {catalogo_manual_tsv_path}"
-            )
-
-    compiled_required = [
-        "BRIDGE_KEY_3",
-        "BRIDGE_KEY_NO_JORNADA",
-        "GRUPO_TRAZA",
-        "FAMILIA_TRAZA",
-        "FAMILIA_CODCARPR",
-        "JORNADA",
-        "CODCARPR",
-        "NOMBRE_L",
-        "N_CODES_SIES",
-        "CODIGOS_SIES_POTENCIALES",
-        "CODIGO_CARRERA_SIES_1",
-    ]
-    df_bridge = _load_governance_tsv(str(puente_compilado_path), compiled_required)
-    if df_bridge.empty:
-        raise FileNotFoundError(
-            "No se encontró catálogo compilado de cruce SIES en "
-            f"{puente_compilado_path}. Ejecuta scripts/compile_puente_sies_compilado.py antes del run oficial."
-        )
-    for idx in range(1, MAX_SIES_CODES_PER_KEY + 1):
-        col = f"CODIGO_CARRERA_SIES_{idx}"
-        if col not in df_bridge.columns:
-            df_bridge[col] = pd.NA
-        for suffix in (
-            "CONDICION_ANIO_INGRESO",
-            "ANIO_INGRESO_MIN",
-            "ANIO_INGRESO_MAX",
-        ):
-            cond_col = f"{col}_{suffix}"
-            if cond_col not in df_bridge.columns:
-                df_bridge[cond_col] = pd.NA
-    df_bridge["CODIGO_CARRERA"] = pd.to_numeric(
-        df_bridge.apply(_derive_codigo_carrera_from_sies_row, axis=1), errors="coerce"
-    ).astype("Int64")
-    df_bridge["N_CODES_SIES"] = pd.to_numeric(df_bridge["N_CODES_SIES"], errors="coerce").fillna(0).astype(int)
-    df_bridge = df_bridge.drop_duplicates(subset=["BRIDGE_KEY_3"], keep="first").reset_index(drop=True)
-
-    if not df_manual.empty:
-        manual_exact = (
-            df_manual[["MANUAL_KEY_3", "GRUPO_TRAZA", "FAMILIA_TRAZA", "FAMILIA_CODCARPR"]]
-            .drop_duplicates(subset=["MANUAL_KEY_3"])
-            .rename(
-                columns={
-                    "MANUAL_KEY_3": "SOURCE_KEY_3",
-                    "GRUPO_TRAZA": "GRUPO_TRAZA_MANUAL",
-                    "FAMILIA_TRAZA": "FAMILIA_TRAZA_MANUAL",
-                    "FAMILIA_CODCARPR": "FAMILIA_CODCARPR_MANUAL",
-                }
-            )
-        )
-        archivo_subida = archivo_subida.merge(manual_exact, on="SOURCE_KEY_3", how="left")
-        manual_key_set = set(df_manual["MANUAL_KEY_3"])
-        archivo_subida["MANUAL_MATCH_STATUS"] = archivo_subida["SOURCE_KEY_3"].isin(manual_key_set).map(
-            {True: "MATCH_MANUAL", False: "SIN_MATCH_MANUAL"}
-        )
-    else:
-        archivo_subida["GRUPO_TRAZA_MANUAL"] = pd.NA
-        archivo_subida["FAMILIA_TRAZA_MANUAL"] = pd.NA
-        archivo_subida["FAMILIA_CODCARPR_MANUAL"] = pd.NA
-        archivo_subida["MANUAL_MATCH_STATUS"] = "SIN_CATALOGO_MANUAL"
-
-    for idx in range(1, MAX_SIES_CODES_PER_KEY + 1):
-        archivo_subida[f"CODIGO_CARRERA_SIES_{idx}"] = pd.NA
-    archivo_subida["N_CODES_SIES"] = pd.NA
-    archivo_subida["CODIGOS_SIES_POTENCIALES"] = pd.NA
-    archivo_subida[FINAL_SIES_CODE_COL] = pd.NA
-    archivo_subida["SIES_RESOLUCION_HEURISTICA"] = pd.NA
-    archivo_subida["SIES_CONFIANZA_POST"] = pd.NA
-
-    if not df_bridge.empty:
-        sies_cols = [
-            "N_CODES_SIES",
-            "CODIGOS_SIES_POTENCIALES",
-        ] + [f"CODIGO_CARRERA_SIES_{idx}" for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)]
-        sies_cols += [
-            f"CODIGO_CARRERA_SIES_{idx}_{suffix}"
-            for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)
-            for suffix in (
-                "CONDICION_ANIO_INGRESO",
-                "ANIO_INGRESO_MIN",
-                "ANIO_INGRESO_MAX",
-            )
-        ]
-        archivo_subida = archivo_subida.drop(columns=[c for c in sies_cols if c in archivo_subida.columns], errors="ignore")
-
-        bridge_join_cols = [
-            "BRIDGE_KEY_3",
-            "GRUPO_TRAZA",
-            "FAMILIA_TRAZA",
-            "FAMILIA_CODCARPR",
-            "N_CODES_SIES",
-            "CODIGOS_SIES_POTENCIALES",
-        ] + [f"CODIGO_CARRERA_SIES_{idx}" for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)]
-        bridge_join_cols += [
-            f"CODIGO_CARRERA_SIES_{idx}_{suffix}"
-            for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)
-            for suffix in (
-                "CONDICION_ANIO_INGRESO",
-                "ANIO_INGRESO_MIN",
-                "ANIO_INGRESO_MAX",
-            )
-        ]
-        bridge_exact = df_bridge[bridge_join_cols].rename(
-            columns={
-                "BRIDGE_KEY_3": "SOURCE_KEY_3",
-                "GRUPO_TRAZA": "GRUPO_TRAZA_PUENTE",
-                "FAMILIA_TRAZA": "FAMILIA_TRAZA_PUENTE",
-                "FAMILIA_CODCARPR": "FAMILIA_CODCARPR_PUENTE",
-            }
-        )
-        archivo_subida = archivo_subida.merge(bridge_exact, on="SOURCE_KEY_3", how="left")
-
-        # Fallback por normalización de nombre para continuidad (sin alterar SOURCE_KEY_3 original):
-        # ej. "CONTINUIDAD AUDITORIA" -> "AUDITORIA",
-        # "CONTINUIDAD INGENIERIA ... " -> "INGENIERIA EN ...".
-        fallback_name = archivo_subida["NOMBRE_CARRERA_FUENTE"].map(_normalize_continuidad_name_for_sies)
-        fallback_key_3 = (
-            archivo_subida["JORNADA_FUENTE"].map(_normalize_text)
-            + "|"
-            + archivo_subida["CODCARPR_NORM"].map(_normalize_text)
-            + "|"
-            + fallback_name
-        )
-        fallback_lookup = (
-            df_bridge[bridge_join_cols]
-            .drop_duplicates(subset=["BRIDGE_KEY_3"], keep="first")
-            .rename(columns={"BRIDGE_KEY_3": "SOURCE_KEY_3_FALLBACK"})
-        )
-        fallback_input = pd.DataFrame(
-            {
-                "_IDX_FB": archivo_subida.index,
-                "SOURCE_KEY_3_FALLBACK": fallback_key_3,
-            }
-        )
-        fallback_join = fallback_input.merge(fallback_lookup, on="SOURCE_KEY_3_FALLBACK", how="left").set_index("_IDX_FB")
-        fallback_has_match = fallback_join["N_CODES_SIES"].notna()
-        exact_missing = archivo_subida["N_CODES_SIES"].isna()
-        apply_fallback_mask = exact_missing & fallback_has_match.reindex(archivo_subida.index, fill_value=False)
-        if apply_fallback_mask.any():
-            assign_cols = [
-                "N_CODES_SIES",
-                "CODIGOS_SIES_POTENCIALES",
-                "GRUPO_TRAZA",
-                "FAMILIA_TRAZA",
-                "FAMILIA_CODCARPR",
-            ] + [f"CODIGO_CARRERA_SIES_{idx}" for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)]
-            assign_cols += [
-                f"CODIGO_CARRERA_SIES_{idx}_{suffix}"
-                for idx in range(1, MAX_SIES_CODES_PER_KEY + 1)
-                for suffix in (
-                    "CONDICION_ANIO_INGRESO",
-                    "ANIO_INGRESO_MIN",
-                    "ANIO_INGRESO_MAX",
-                )
-            ]
-            for c in assign_cols:
-                if c in fallback_join.columns:
-                    archivo_subida.loc[apply_fallback_mask, c] = fallback_join.loc[apply_fallback_mask, c]
-
-        key_exact = set(df_bridge["BRIDGE_KEY_3"])
-        key_no_jornada = set(df_bridge["BRIDGE_KEY_NO_JORNADA"])
-        codcarpr_bridge = set(df_bridge["CODCARPR"])
+            .to_dict()
+        )
+        key_da = estado_da_norm + "|" + situ_da_norm
+        vig_esperado_da = pd.to_numeric(key_da.map(da_vig_map), errors="coerce").astype("Int64")
 
-        match_exact = archivo_subida["SOURCE_KEY_3"].isin(key_exact)
-        exists_no_j = archivo_subida["KEY_3_NO_JORNADA"].isin(key_no_jornada)
-        exists_cod = archivo_subida["CODCARPR_NORM"].isin(codcarpr_bridge)
-        n_codes = pd.to_numeric(archivo_subida["N_CODES_SIES"], errors="coerce").fillna(0)
-        match_any = n_codes > 0
+    # Fallback Hoja1 cuando no hay match completo en DatosAlumnos.
+    if not gob_hoja1_estado_desc_df.empty and "DESCRIPCION_ESTADO" in src_work.columns:
+        estado_h1_norm = map_categories(src_work.get("ESTADO_ACADEMICO", pd.Series("", index=src_work.index)), _normalize_text)
+        desc_h1_norm = map_categories(src_work["DESCRIPCION_ESTADO"], _normalize_text)
+        h1_map_df = gob_hoja1_estado_desc_df.copy(deep=False)
+        h1_map_df["ESTADO_ACADEMICO_NORM"] = h1_map_df["ESTADO_ACADEMICO"].map(_normalize_text)
+        h1_map_df["DESCRIPCION_ESTADO_NORM"] = h1_map_df["DESCRIPCION_ESTADO"].fillna("").map(_normalize_text)
+        h1_map_df["KEY_H1"] = h1_map_df["ESTADO_ACADEMICO_NORM"] + "|" + h1_map_df["DESCRIPCION_ESTADO_NORM"]
+        h1_vig_map = (
+            h1_map_df.drop_duplicates(subset=["KEY_H1"], keep="first")
+            .set_index("KEY_H1")["VIG_ESPERADO"]
+            .to_dict()
+        )
+        key_h1 = estado_h1_norm + "|" + desc_h1_norm
+        vig_esperado_h1 = pd.to_numeric(key_h1.map(h1_vig_map), errors="coerce").astype("Int64")
+        vig_esperado_da = vig_esperado_da.fillna(vig_esperado_h1)
 
-        archivo_subida["SIES_MATCH_STATUS"] = "SIN_MATCH_SIES"
-        archivo_subida["SIES_MATCH_DIAG"] = "SIN_CODCARPR_EN_PUENTE_SIES"
+    # Regla institucional explícita: estados sin matrícula siempre VIG=0.
+    force_vig0_da = estado_da_norm.isin(["TITULADO", "ELIMINADO", "SUSPENDIDO"])
+    vig_esperado_da = vig_esperado_da.where(~force_vig0_da, 0)
+    archivo_subida["VIG_ESPERADO_DA"] = vig_esperado_da
 
-        unique_mask = match_any & (n_codes == 1)
-        amb_mask = match_any & (n_codes > 1)
+    _perf.lap("trazas_archivo_subida_vig_esperado", rows_out=len(archivo_subida))
 
-        archivo_subida.loc[unique_mask, "SIES_MATCH_STATUS"] = "MATCH_SIES"
-        archivo_subida.loc[unique_mask, "SIES_MATCH_DIAG"] = "MATCH_SIES_UNICO"
-        archivo_subida.loc[unique_mask, FINAL_SIES_CODE_COL] = archivo_subida.loc[unique_mask, "CODIGO_CARRERA_SIES_1"]
+    # Fuente base manual: se reconstruye desde DURACION_ESTUDIOS para trazabilidad
+    # de GRUPO_TRAZA/FAMILIA. El cruce SIES central se consume EXCLUSIVAMENTE
+    # desde el catálogo compilado control/catalogos/PUENTE_SIES_COMPILADO.tsv.
+    # Catálogos preparados memoizados por hash de archivo (control/catalogos/*.pkl).
+    _index_cache = CompiledIndexCache(DEFAULT_COMPILED_INDEX_DIR)
+    df_manual, _ = _build_catalog_and_bridge_from_duracion(_index_cache)
 
-        archivo_subida.loc[amb_mask, "SIES_MATCH_STATUS"] = "AMBIGUO_SIES"
-        archivo_subida.loc[amb_mask, "SIES_MATCH_DIAG"] = "MATCH_SIES_AMBIGUO"
-        archivo_subida.loc[unique_mask & apply_fallback_mask, "SIES_MATCH_DIAG"] = "MATCH_SIES_UNICO_FALLBACK_NOMBRE"
-        archivo_subida.loc[amb_mask & apply_fallback_mask, "SIES_MATCH_DIAG"] = "MATCH_SIES_AMBIGUO_FALLBACK_NOMBRE"
+    manual_override_raw = _load_governance_tsv(
+        catalogo_manual_tsv_path,
+        ["GRUPO_TRAZA", "JORNADA", "CODCARPR", "NOMBRE_L"],
+    )
+    if not manual_override_raw.empty:
+        try:
+            manual_override = _index_cache.load_or_build(
+                "catalogo_manual_override",
+                sources_key([Path(catalogo_manual_tsv_path).expanduser().resolve()], COMPILED_INDEX_VERSION),
+                lambda: _prepare_catalog_manual(
+                    manual_override_raw[["GRUPO_TRAZA", "JORNADA", "CODCARPR", "NOMBRE_L"]]
+                ),
+            )
+        except Exception as exc:
+            print(f"⚠️  No se aplicó override catalogo_manual.tsv: {exc}")
+            manual_override = pd.DataFrame()
+        if not manual_override.empty:
+            if df_manual.empty:
+                df_manual = manual_override.copy(deep=False)
+            else:
+                override_keys = set(manual_override["MANUAL_KEY_3"])
+                df_manual = (
+                    pd.concat(
+                        [
+                            df_manual.loc[~df_manual["MANUAL_KEY_3"].isin(override_keys)],
+                            manual_override,
+                        ],
+                        ignore_index=True,
+                    )
+                    .drop_duplicates(subset=["MANUAL_KEY_3"], keep="last")
+                    .sort_values(["GRUPO_TRAZA", "JORNADA", "CODCARPR", "NOMBRE_L"])
+                    .reset_index(drop=True)
+                )
+            print(
+                "✅ Override catálogo manual aplicado: "
+                f"{len(manual_override)} llaves desde {catalogo_manual_tsv_path}"
+            )
 
-        archivo_subida.loc[(~match_any) & exists_no_j, "SIES_MATCH_DIAG"] = "PROBABLE_PROBLEMA_JORNADA_SIES"
-        archivo_subida.loc[(~match_any) & (~exists_no_j) & exists_cod, "SIES_MATCH_DIAG"] = "PROBABLE_PROBLEMA_NOMBRE_SIES"
-    else:
-        archivo_subida["GRUPO_TRAZA_PUENTE"] = pd.NA
-        archivo_subida["FAMILIA_TRAZA_PUENTE"] = pd.NA
-        archivo_subida["FAMILIA_CODCARPR_PUENTE"] = pd.NA
-        archivo_subida["SIES_MATCH_STATUS"] = "SIN_PUENTE_SIES"
-        archivo_subida["SIES_MATCH_DIAG"] = "SIN_PUENTE_SIES"
+    compiled_required = [
+        "BRIDGE_KEY_3",
+        "BRIDGE_KEY_NO_JORNADA",
+        "GRUPO_TRAZA",
+        "FAMILIA_TRAZA",
+        "FAMILIA_CODCARPR",
+        "JORNADA",
+        "CODCARPR",
+        "NOMBRE_L",
+        "N_CODES_SIES",
+        "CODIGOS_SIES_POTENCIALES",
+        "CODIGO_CARRERA_SIES_1",
+    ]
+    df_bridge = _load_governance_tsv(str(puente_compilado_path), compiled_required)
+    if df_bridge.empty:
+        raise FileNotFoundError(
+            "No se encontró catálogo compilado de cruce SIES en "
+            f"{puente_compilado_path}. Ejecuta scripts/compile_puente_sies_compilado.py antes del run oficial."
+        )
+    # Códigos SIES internados: el puente y la oferta se parsean una sola vez y
+    # las etapas siguientes consultan componentes (S/C/J/V) por id.
+    df_bridge, _sies_codes = _prepare_puente_compilado(
+        df_bridge,
+        oferta_dim["CODIGO_UNICO"] if "CODIGO_UNICO" in oferta_dim.columns else [],
+    )
 
-    archivo_subida["GRUPO_TRAZA"] = archivo_subida["GRUPO_TRAZA_PUENTE"].combine_first(archivo_subida["GRUPO_TRAZA_MANUAL"])
-    archivo_subida["FAMILIA_TRAZA"] = archivo_subida["GRUPO_TRAZA"].map(_extract_alpha_prefix)
-    archivo_subida["FAMILIA_CODCARPR"] = archivo_subida["CODCARPR_NORM"].map(_extract_alpha_prefix)
+    archivo_subida, puente_match_tipo = _merge_puente_sies(archivo_subida, df_manual, df_bridge, excluir_diplomados)
 
-    if excluir_diplomados:
-        excl = archivo_subida["ES_DIPLOMADO"].fillna(False)
-        archivo_subida.loc[excl, "SIES_MATCH_STATUS"] = "EXCLUIDO_DIPLOMADO"
-        archivo_subida.loc[excl, "SIES_MATCH_DIAG"] = "EXCLUIDO_DIPLOMADO"
-        archivo_subida.loc[excl, FINAL_SIES_CODE_COL] = pd.NA
-        archivo_subida.loc[excl, "CODIGOS_SIES_POTENCIALES"] = pd.NA
-        archivo_subida.loc[excl, "N_CODES_SIES"] = pd.NA
-        for idx in range(1, MAX_SIES_CODES_PER_KEY + 1):
-            archivo_subida.loc[excl, f"CODIGO_CARRERA_SIES_{idx}"] = pd.NA
+    _perf.lap("puente_sies_merge_y_diagnostico", rows_out=len(archivo_subida))
 
     # Regla de gobernanza bloqueante: combinaciones SOURCE_KEY_3 no catalogadas en SIES.
     sin_match_bloqueante = archivo_subida["SIES_MATCH_STATUS"].eq("SIN_MATCH_SIES") & ~archivo_subida["ES_DIPLOMADO"].fillna(False)
@@ -3499,7 +3694,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         )
         output_dir.mkdir(parents=True, exist_ok=True)
         pendientes_path = output_dir / "sies_combinaciones_nuevas_bloqueantes.tsv"
-        pendientes.to_csv(pendientes_path, sep="\t", index=False, encoding="utf-8")
+        atomic_to_csv(pendientes, pendientes_path, sep="\t", index=False)
         muestra = pendientes.head(5).to_dict(orient="records")
         raise RuntimeError(
             "BLOQUEANTE_SIES: se detectaron combinaciones SOURCE_KEY_3 no catalogadas "
@@ -3531,24 +3726,26 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     resumen_sies = (
         archivo_subida["SIES_MATCH_DIAG"].fillna("<NA>").value_counts(dropna=False).rename_axis("estado").reset_index(name="n")
     )
-    ambiguos_pre = archivo_subida[archivo_subida["SIES_MATCH_STATUS"] == "AMBIGUO_SIES"].copy()
+    ambiguos_pre = archivo_subida[archivo_subida["SIES_MATCH_STATUS"] == "AMBIGUO_SIES"]
     
     # FASE 3: Resolver ambigüedades SIES con heurística
     if not ambiguos_pre.empty:
         print(f"📋 Fase 3: Resolviendo {len(ambiguos_pre)} ambigüedades SIES...")
         # Construir índice de oferta y homologación para la cascada
-        oferta_idx = _build_oferta_index(oferta_dim)
-        homol_dict = _load_cuadro_homologacion(input_file)
-        ambiguos_resueltos = _resolver_ambiguedades_sies_heuristica(ambiguos_pre, oferta_idx, homol_dict)
+        oferta_idx = _build_oferta_index(oferta_dim, _index_cache)
+        homol_dict = _load_cuadro_homologacion(input_file, _index_cache)
+        ambiguos_resueltos = _resolver_ambiguedades_sies_heuristica(
+            ambiguos_pre, oferta_idx, homol_dict, sies_codes=_sies_codes,
+        )
         # Actualizar archivo_subida con los ambiguos resueltos usando loc por índice
         for col in ["SIES_RESOLUCION_HEURISTICA", "SIES_CONFIANZA_POST", FINAL_SIES_CODE_COL, "SIES_MATCH_STATUS"]:
             if col in ambiguos_resueltos.columns:
                 archivo_subida.loc[ambiguos_resueltos.index, col] = ambiguos_resueltos[col]
-        ambiguos = archivo_subida[archivo_subida["SIES_MATCH_STATUS"] == "AMBIGUO_SIES"].copy()
+        ambiguos = archivo_subida[archivo_subida["SIES_MATCH_STATUS"] == "AMBIGUO_SIES"]
     else:
-        ambiguos = ambiguos_pre.copy()
+        ambiguos = ambiguos_pre.copy(deep=False)
     
-    sin_match = archivo_subida[archivo_subida["SIES_MATCH_STATUS"] == "SIN_MATCH_SIES"].copy()
+    sin_match = archivo_subida[archivo_subida["SIES_MATCH_STATUS"] == "SIN_MATCH_SIES"]
 
     sin_match_datos_alumnos_df = pd.DataFrame(
         columns=[
@@ -3576,6 +3773,8 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
                 }
             ).loc[mask_no_match_da].reset_index(drop=True)
 
+    _perf.lap("fase3_ambiguedades_sies", rows_out=len(archivo_subida))
+
     # Normalización final contra reglas del manual de carga pregrado.
     # Se conserva ARCHIVO_LISTO_SUBIDA completo, y se construye una hoja
     # MATRICULA_UNIFICADA_32 lista para carga (sin diplomados, sin duplicados).
@@ -3588,23 +3787,11 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     archivo_subida["SIES_AJUSTE_SEDE_ORIGEN"] = pd.NA
     if not oferta_dim.empty and FINAL_SIES_CODE_COL in archivo_subida.columns:
         cod_sed_pref = pd.to_numeric(archivo_subida["COD_SED"], errors="coerce")
-        parsed_pre = archivo_subida[FINAL_SIES_CODE_COL].apply(_extract_sies_components)
-        parsed_pre_sed = pd.to_numeric(
-            parsed_pre.map(lambda x: x[0] if isinstance(x, tuple) else pd.NA),
-            errors="coerce",
-        )
-        parsed_pre_car = pd.to_numeric(
-            parsed_pre.map(lambda x: x[1] if isinstance(x, tuple) else pd.NA),
-            errors="coerce",
-        )
-        parsed_pre_jor = pd.to_numeric(
-            parsed_pre.map(lambda x: x[2] if isinstance(x, tuple) else pd.NA),
-            errors="coerce",
-        )
-        parsed_pre_ver = pd.to_numeric(
-            parsed_pre.map(lambda x: x[3] if isinstance(x, tuple) else pd.NA),
-            errors="coerce",
-        )
+        parsed_pre = _sies_codes.components(archivo_subida[FINAL_SIES_CODE_COL])
+        parsed_pre_sed = parsed_pre["COD_SED"]
+        parsed_pre_car = parsed_pre["COD_CAR"]
+        parsed_pre_jor = parsed_pre["JOR"]
+        parsed_pre_ver = parsed_pre["VERSION"]
         sede_mismatch = (
             cod_sed_pref.notna()
             & parsed_pre_sed.notna()
@@ -3618,14 +3805,12 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
                 oferta_dim[["CODIGO_UNICO"]]
                 .dropna()
                 .drop_duplicates()
-                .copy()
             )
-            oferta_codes["_PARSED"] = oferta_codes["CODIGO_UNICO"].map(_extract_sies_components)
-            oferta_codes = oferta_codes[oferta_codes["_PARSED"].map(lambda x: isinstance(x, tuple))].copy()
-            oferta_codes["SED_PARSE"] = pd.to_numeric(oferta_codes["_PARSED"].map(lambda x: x[0]), errors="coerce")
-            oferta_codes["CAR_PARSE"] = pd.to_numeric(oferta_codes["_PARSED"].map(lambda x: x[1]), errors="coerce")
-            oferta_codes["JOR_PARSE"] = pd.to_numeric(oferta_codes["_PARSED"].map(lambda x: x[2]), errors="coerce")
-            oferta_codes["VER_PARSE"] = pd.to_numeric(oferta_codes["_PARSED"].map(lambda x: x[3]), errors="coerce")
+            _oferta_parsed = _sies_codes.components(oferta_codes["CODIGO_UNICO"])
+            oferta_codes["SED_PARSE"] = _oferta_parsed["COD_SED"]
+            oferta_codes["CAR_PARSE"] = _oferta_parsed["COD_CAR"]
+            oferta_codes["JOR_PARSE"] = _oferta_parsed["JOR"]
+            oferta_codes["VER_PARSE"] = _oferta_parsed["VERSION"]
             oferta_codes = oferta_codes.dropna(subset=["SED_PARSE", "CAR_PARSE", "JOR_PARSE", "VER_PARSE"])
 
             key_to_codes: dict[tuple[int, int, int, int], list[str]] = {}
@@ -3666,23 +3851,34 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
             if ajustadas:
                 print(f"    ↳ Ajuste SIES por sede gobernanza: {ajustadas} filas")
 
-    parsed_sies = archivo_subida[FINAL_SIES_CODE_COL].apply(_extract_sies_components)
+    parsed_sies = _sies_codes.components(archivo_subida[FINAL_SIES_CODE_COL])
     parsed_df = pd.DataFrame(
         {
-            "_PARSED_COD_SED": parsed_sies.map(lambda x: x[0] if isinstance(x, tuple) else pd.NA),
-            "_PARSED_COD_CAR": parsed_sies.map(lambda x: x[1] if isinstance(x, tuple) else pd.NA),
-            "_PARSED_JOR": parsed_sies.map(lambda x: x[2] if isinstance(x, tuple) else pd.NA),
-            "_PARSED_VERSION": parsed_sies.map(lambda x: x[3] if isinstance(x, tuple) else pd.NA),
+            f"_PARSED_{comp}": _sies_component_text(parsed_sies[comp])
+            for comp in ["COD_SED", "COD_CAR", "JOR", "VERSION"]
         },
         index=archivo_subida.index,
     )
     archivo_subida = pd.concat([archivo_subida, parsed_df], axis=1)
 
+    # La traza de la resolución SIES ya no se lee: se aparta antes de la cascada
+    # (que todavía consulta COD_SED_STATUS) y solo vuelve para la hoja del xlsx.
+    # Los patches por RUT completan <COL>_FUENTE_FINAL/_METODO_FINAL/_AUDIT_STATUS
+    # de sus columnas objetivo, así que esa traza sigue en el frame hasta aplicarlos.
+    _patch_registry = PatchRegistry.from_paths(
+        _resolve_patch_paths(patch_dir, sit_fon_sol_patch_json_path), documents=_governance_bundle_document,
+    )
+    _trace_vigente = ARCHIVO_SUBIDA_OPERATIVE_COLUMNS + ARCHIVO_SUBIDA_TRACE_LEIDA_EN_DECISION + [
+        f"{col}_{sufijo}" for col in _patch_registry.rules for sufijo in ("FUENTE_FINAL", "METODO_FINAL", "AUDIT_STATUS")
+    ]
+    _trace_store = TraceStore()
+    archivo_subida = _trace_store.detach(archivo_subida, "resolucion_sies", _trace_vigente + ["COD_SED_STATUS"])
+
     # Estandarización de identificadores de oferta (sede/carrera/jornada/version).
-    parsed_cod_sed = pd.to_numeric(archivo_subida["_PARSED_COD_SED"], errors="coerce")
-    parsed_cod_car = pd.to_numeric(archivo_subida["_PARSED_COD_CAR"], errors="coerce")
-    parsed_jor = pd.to_numeric(archivo_subida["_PARSED_JOR"], errors="coerce")
-    parsed_version = pd.to_numeric(archivo_subida["_PARSED_VERSION"], errors="coerce")
+    parsed_cod_sed = parsed_sies["COD_SED"]
+    parsed_cod_car = parsed_sies["COD_CAR"]
+    parsed_jor = parsed_sies["JOR"]
+    parsed_version = parsed_sies["VERSION"]
 
     oferta_mod = pd.Series(pd.NA, index=archivo_subida.index, dtype="object")
     oferta_jor = pd.Series(pd.NA, index=archivo_subida.index, dtype="object")
@@ -3707,10 +3903,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     oferta_cod_car_num = pd.to_numeric(oferta_cod_car, errors="coerce")
     shared_cod_car_num = pd.Series(pd.NA, index=archivo_subida.index, dtype="Float64")
     if "CODIGOS_SIES_POTENCIALES" in archivo_subida.columns:
-        shared_cod_car_num = pd.to_numeric(
-            archivo_subida["CODIGOS_SIES_POTENCIALES"].apply(_extract_shared_cod_car_from_potenciales),
-            errors="coerce",
-        )
+        shared_cod_car_num = _sies_codes.shared_cod_car(archivo_subida["CODIGOS_SIES_POTENCIALES"])
     archivo_subida["COD_CAR"] = (
         parsed_cod_car
         .combine_first(oferta_cod_car_num)
@@ -3744,7 +3937,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     # ── Fallback VERSION: cuando COD_CAR+JOR están, usar la versión máxima de DURACION_ESTUDIOS ──
     _ver_missing = archivo_subida["VERSION"].isna() & archivo_subida["COD_CAR"].notna() & archivo_subida["JOR"].notna()
     if _ver_missing.any() and not oferta_dim.empty:
-        _dur_ver = oferta_dim[["CODIGO_UNICO"]].copy()
+        _dur_ver = oferta_dim[["CODIGO_UNICO"]]
         _dur_ver["_VERSION"] = _dur_ver["CODIGO_UNICO"].str.extract(r"V(\d+)$", expand=False).astype(float)
         _dur_ver["_COD_CAR"] = _dur_ver["CODIGO_UNICO"].str.extract(r"C(\d+)J", expand=False).astype(float)
         _dur_ver["_JOR"] = _dur_ver["CODIGO_UNICO"].str.extract(r"J(\d+)V", expand=False).astype(float)
@@ -3876,6 +4069,9 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     archivo_subida["VERSION_METODO_FINAL"] = version_method
     archivo_subida["VERSION_AUDIT_STATUS"] = version_audit
 
+    _perf.lap("cascada_cod_sed_car_jor_mod_version", rows_out=len(archivo_subida))
+    archivo_subida = _trace_store.detach(archivo_subida, "cascada_oferta", _trace_vigente)
+
     # Sexo: homologa catálogos F/M/S -> H/M/NB.
     archivo_subida["SEXO"] = archivo_subida["SEXO"].map(_normalize_sexo_mu)
     for c in ["PRIMER_APELLIDO", "SEGUNDO_APELLIDO", "NOMBRE"]:
@@ -3934,7 +4130,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     archivo_subida.loc[_is_continuidad, "FOR_ING_ACT_REQUIERE_REVISION"] = "NO"
 
     # --- DA-based override: FOR=11 (articulación) desde trace del motor standalone ---
-    _trace_path = Path(__file__).resolve().parent / "control" / "for_ing_act_trace_long.tsv"
+    _trace_path = existing_artifact_path(Path(__file__).resolve().parent / "control" / "for_ing_act_trace_long.tsv")
     if _trace_path.exists():
         _trace = pd.read_csv(_trace_path, sep="\t", usecols=["_RUT_NUM", "FOR_ING_ACT", "FOR_ING_ACT_RULE_DA"])
         _trace_11 = _trace[_trace["FOR_ING_ACT"] == 11][["_RUT_NUM"]].drop_duplicates()
@@ -4067,7 +4263,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         archivo_subida.loc[vig_cero, "ASI_INS_HIS"] = 0
         archivo_subida.loc[vig_cero, "ASI_APR_HIS"] = 0
 
-    hist_scope_status = archivo_subida["UZ_HIST_SCOPE_STATUS"].astype("object").copy()
+    hist_scope_status = archivo_subida["UZ_HIST_SCOPE_STATUS"].astype("object")
     archivo_subida.loc[
         archivo_subida["ASI_INS_HIS_AUDIT_STATUS"].eq("CALCULADO_DESDE_HISTORICO_HOJA1"),
         "ASI_INS_HIS_AUDIT_STATUS",
@@ -4080,7 +4276,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
 
     # Campos numéricos obligatorios con fallback operativo explícito.
     nac_num = pd.to_numeric(archivo_subida["NAC"], errors="coerce")
-    nac_status_final = archivo_subida["NAC_STATUS"].astype("object").copy()
+    nac_status_final = archivo_subida["NAC_STATUS"].astype("object")
     nac_default_mask = ~nac_num.between(1, 197)
     nac_status_final.loc[nac_default_mask & nac_status_final.eq("SIN_INSUMO")] = "DEFAULT_38_SIN_INSUMO"
     nac_status_final.loc[nac_default_mask & nac_status_final.eq("SOURCE_TEXT")] = "DEFAULT_38_SOURCE_TEXT_INVALIDO"
@@ -4090,7 +4286,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     archivo_subida["NAC_STATUS"] = nac_status_final
     archivo_subida["NAC"] = nac_num.where(nac_num.between(1, 197), pd.NA).fillna(38).astype("Int64")
     pais_num = pd.to_numeric(archivo_subida["PAIS_EST_SEC"], errors="coerce")
-    pais_status_final = archivo_subida["PAIS_EST_SEC_STATUS"].astype("object").copy()
+    pais_status_final = archivo_subida["PAIS_EST_SEC_STATUS"].astype("object")
     pais_default_mask = ~pais_num.between(1, 197)
     pais_status_final.loc[pais_default_mask & pais_status_final.eq("SIN_INSUMO")] = "DEFAULT_38_SIN_INSUMO"
     pais_status_final.loc[pais_default_mask & pais_status_final.eq("SOURCE_EMPTY")] = "DEFAULT_38_SOURCE_EMPTY"
@@ -4103,13 +4299,13 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     # Regla operativa vigente MU2026: NIV_ACA=20 se normaliza a 8 para catálogo oficial.
     niv_aca_map_20_to_8_mask = niv_aca_raw.eq(20)
     niv_aca_raw = niv_aca_raw.where(~niv_aca_map_20_to_8_mask, 8)
-    niv_aca_admin_orig = niv_aca_raw.copy()
-    regimen_norm = _series_or_default(archivo_subida, "REGIMEN_FUENTE").map(_normalize_text)
+    niv_aca_admin_orig = niv_aca_raw.copy(deep=False)
+    regimen_norm = map_categories(_series_or_default(archivo_subida, "REGIMEN_FUENTE"), _normalize_text)
     trim_regimen_mask = regimen_norm.str.contains("TRIM", regex=False)
     niv_aca_eq_sem = _trimester_level_to_semester(niv_aca_raw)
     niv_trim_aplicado_mask = trim_regimen_mask & niv_aca_raw.notna() & niv_aca_eq_sem.notna()
     niv_aca_raw = niv_aca_raw.where(~niv_trim_aplicado_mask, niv_aca_eq_sem)
-    niv_aca_status_final = archivo_subida["NIV_ACA_AUDIT_STATUS"].astype("object").copy()
+    niv_aca_status_final = archivo_subida["NIV_ACA_AUDIT_STATUS"].astype("object")
     niv_aca_status_final.loc[niv_aca_map_20_to_8_mask] = "NORMALIZADO_20_A_8"
     niv_aca_status_final.loc[niv_trim_aplicado_mask] = "TRIM_EQ_SEM_APLICADA"
     niv_default_mask = ~niv_aca_raw.ge(1)
@@ -4178,9 +4374,9 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         "FECH_NAC_STATUS",
     ] = "FALLBACK_1900_DATOS_ALUMNOS_INVALIDO"
     fecha_mat_dt = pd.to_datetime(archivo_subida["FECHA_MATRICULA"], errors="coerce", dayfirst=True)
-    fecha_mat_status_final = archivo_subida["FECHA_MATRICULA_AUDIT_STATUS"].astype("object").copy()
-    fecha_mat_source_final = archivo_subida["FECHA_MATRICULA_FUENTE_FINAL"].astype("object").copy()
-    fecha_mat_method_final = archivo_subida["FECHA_MATRICULA_METODO_FINAL"].astype("object").copy()
+    fecha_mat_status_final = archivo_subida["FECHA_MATRICULA_AUDIT_STATUS"].astype("object")
+    fecha_mat_source_final = archivo_subida["FECHA_MATRICULA_FUENTE_FINAL"].astype("object")
+    fecha_mat_method_final = archivo_subida["FECHA_MATRICULA_METODO_FINAL"].astype("object")
     fecha_mat_future_mask = fecha_mat_dt > pd.Timestamp.today().normalize()
     fecha_mat_dt = fecha_mat_dt.where(~fecha_mat_future_mask, pd.Timestamp.today().normalize())
     fecha_mat_fmt = _to_ddmmyyyy(fecha_mat_dt, fallback="01/01/1900")
@@ -4200,6 +4396,8 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     archivo_subida["FECHA_MATRICULA_METODO_FINAL"] = fecha_mat_method_final
     archivo_subida["FECHA_MATRICULA_AUDIT_STATUS"] = fecha_mat_status_final
 
+    _perf.lap("normalizacion_campos_mu", rows_out=len(archivo_subida))
+
     sit_fon_sol_patch_stats: dict[str, object] = {
         "patch_applied": False,
         "patch_path": sit_fon_patch_source,
@@ -4208,39 +4406,31 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         "n_rows_affected": 0,
         "n_rut_missing": 0,
     }
-    archivo_subida["SIT_FON_SOL_PATCH_FLAG"] = "NO"
-    archivo_subida["SIT_FON_SOL_PATCH_RUT"] = pd.NA
-    if sit_fon_sol_patch_json_path:
-        _patch_map = load_json_patch(sit_fon_sol_patch_json_path)
-        _patch_rut_series, _patch_mask, _patch_col, _patch_matches_by_col, _patch_matched_ruts, _patch_missing_ruts = (
-            resolve_patch_targets(
-                archivo_subida,
-                _patch_map,
-                rut_columns_candidates=["N_DOC", "NUM_DOCUMENTO", "RUT", "RUT_NUM", "CODCLI"],
-            )
-        )
-        archivo_subida, sit_fon_sol_patch_stats = apply_sit_fon_sol_patch(
-            archivo_subida,
-            sit_fon_sol_patch_json_path,
-            rut_columns_candidates=["N_DOC", "NUM_DOCUMENTO", "RUT", "RUT_NUM", "CODCLI"],
-            target_col="SIT_FON_SOL",
+    # Todos los patches de patches/mu2026 en un solo join por RUT y una pasada.
+    archivo_subida, patch_report = _patch_registry.apply(
+        archivo_subida,
+        rut_columns_candidates=["N_DOC", "NUM_DOCUMENTO", "RUT", "RUT_NUM", "CODCLI"],
+    )
+    patch_report["patch_dir"] = str(patch_dir or "")
+    for _patch_stats in patch_report["patches"]:
+        _patch_stats["patch_applied"] = True
+        _patch_stats["rut_column_selected_runtime"] = _patch_stats["rut_column_selected"]
+        _patch_stats["rut_matches_by_column_runtime"] = _patch_stats["rut_matches_by_column"]
+        print(
+            f"✅ Patch {_patch_stats['patch_name']} aplicado ({', '.join(_patch_stats['columnas'])}): "
+            f"{_patch_stats['n_rows_targeted']} filas objetivo, "
+            f"{_patch_stats['n_rows_affected']} filas cambiadas."
         )
-        sit_fon_sol_patch_stats["patch_applied"] = True
-        sit_fon_sol_patch_stats["n_rut_matched"] = int(len(_patch_matched_ruts))
-        sit_fon_sol_patch_stats["n_rut_missing"] = int(len(_patch_missing_ruts))
-        sit_fon_sol_patch_stats["rut_column_selected_runtime"] = _patch_col
-        sit_fon_sol_patch_stats["rut_matches_by_column_runtime"] = _patch_matches_by_col
-        archivo_subida.loc[_patch_mask, "SIT_FON_SOL_FUENTE_FINAL"] = PATCH_SOURCE_SIT_FON_SOL
-        archivo_subida.loc[_patch_mask, "SIT_FON_SOL_METODO_FINAL"] = PATCH_METHOD_SIT_FON_SOL
-        archivo_subida.loc[_patch_mask, "SIT_FON_SOL_AUDIT_STATUS"] = PATCH_AUDIT_STATUS_SIT_FON_SOL
-        archivo_subida.loc[_patch_mask, "SIT_FON_SOL_PATCH_FLAG"] = "SI"
-        archivo_subida.loc[_patch_mask, "SIT_FON_SOL_PATCH_RUT"] = _patch_rut_series[_patch_mask]
+        if "SIT_FON_SOL" in _patch_stats["columnas"]:
+            sit_fon_sol_patch_stats = _patch_stats
+    if len(_patch_registry) > 1:
         print(
-            "✅ Patch SIT_FON_SOL aplicado: "
-            f"{sit_fon_sol_patch_stats.get('n_rows_targeted', 0)} filas objetivo, "
-            f"{sit_fon_sol_patch_stats.get('n_rows_affected', 0)} filas cambiadas."
+            f"  ↳ {len(_patch_registry)} patches: {patch_report['n_rows_targeted']} filas objetivo, "
+            f"{patch_report['n_rows_affected']} filas cambiadas en total"
         )
 
+    _perf.lap("fecha_matricula_y_patch_sit_fon_sol", rows_out=len(archivo_subida))
+
     # Construcción de carga final (pregrado): excluir diplomados, no-match de datos alumnos
     # y deduplicar por clave de matrícula.
     estado_carga = pd.Series("OK_CARGA_PREGRADO", index=archivo_subida.index, dtype="object")
@@ -4358,14 +4548,19 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         required_ok &= archivo_subida[required_col].astype(str).str.strip().ne("")
     estado_carga.loc[(estado_carga == "OK_CARGA_PREGRADO") & (~required_ok)] = "EXCLUIDO_CAMPOS_OBLIGATORIOS"
 
-    candidatos = archivo_subida[estado_carga == "OK_CARGA_PREGRADO"].copy()
+    # Desde aquí solo se opera sobre columnas operativas; la traza de auditoría
+    # queda apartada y se re-ensambla únicamente para la hoja del xlsx.
+    archivo_subida = _trace_store.detach(archivo_subida, "decision_carga", ARCHIVO_SUBIDA_OPERATIVE_COLUMNS)
+    candidatos = archivo_subida[estado_carga == "OK_CARGA_PREGRADO"]
+    _perf.lap("estado_carga_pregrado", rows_out=len(candidatos))
     candidatos["_FECHA_MAT_TMP"] = pd.to_datetime(candidatos["FECHA_MATRICULA"], errors="coerce", dayfirst=True)
 
     candidatos, estado_carga, auditoria_consolidacion = _consolidar_candidatos_por_codcli(
         candidatos, estado_carga,
     )
 
-    matricula_unificada_32 = candidatos[MATRICULA_UNIFICADA_COLUMNS].copy()
+    matricula_unificada_32 = candidatos[MATRICULA_UNIFICADA_COLUMNS]
+    _perf.lap("consolidacion_codcli", rows_out=len(matricula_unificada_32))
 
     # ── Exclusiones por multi-carrera activa (gobernanza institucional) ──
     from scripts.aplicar_exclusiones_multi_carrera import aplicar_exclusiones as _aplicar_exc_mc
@@ -4440,6 +4635,8 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
 
     # FOR_ING_ACT se conserva desde la resolución trazable (catálogo 1..11), sin sobreescritura fija.
 
+    _perf.lap("exclusiones_multi_carrera", rows_out=len(matricula_unificada_32))
+
     archivo_subida["ESTADO_CARGA_PREGRADO"] = estado_carga
     archivo_subida["INCLUIR_EN_MATRICULA_32"] = (estado_carga == "OK_CARGA_PREGRADO").map({True: "SI", False: "NO"})
 
@@ -4467,7 +4664,6 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
                 "ESTADO_CARGA_PREGRADO",
             ]
         ]
-        .copy()
     )
     included_final_mask = archivo_subida["ESTADO_CARGA_PREGRADO"] == "OK_CARGA_PREGRADO"
     uz_cols = ["ASI_INS_ANT", "ASI_APR_ANT", "PROM_PRI_SEM", "PROM_SEG_SEM", "ASI_INS_HIS", "ASI_APR_HIS"]
@@ -4528,6 +4724,8 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
                     _filled_dur = _needs_dur & archivo_subida["NOMBRE_CARRERA_TSV"].notna()
                     print(f"    ↳ DURACION_TSV fallback por COD_CAR: {int(_filled_dur.sum())} filas")
 
+    _perf.lap("resumenes_y_duracion_tsv", rows_out=len(matricula_unificada_32))
+
     output_dir.mkdir(parents=True, exist_ok=True)
     out_path = output_dir / MU_FUSION_OUTPUT_FILENAME
     csv_out_path = output_dir / MU_PREGRADO_CSV_FILENAME
@@ -4535,12 +4733,12 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     # ── Enriquecer CATALOGO_MANUAL y SIN_MATCH_DATOS_ALUMNOS con CODIGO_CARRERA ──
     _bridge_map = _build_bridge_codcarpr_to_codcar(df_bridge)
     if not df_manual.empty and _bridge_map:
-        df_manual = df_manual.copy()
+        df_manual = df_manual.copy(deep=False)
         df_manual["CODIGO_CARRERA"] = df_manual["CODCARPR"].map(
             lambda x: _bridge_map.get(str(x).strip().upper()) if pd.notna(x) else pd.NA
         )
     if not sin_match_datos_alumnos_df.empty and _bridge_map:
-        sin_match_datos_alumnos_df = sin_match_datos_alumnos_df.copy()
+        sin_match_datos_alumnos_df = sin_match_datos_alumnos_df.copy(deep=False)
         sin_match_datos_alumnos_df["CODIGO_CARRERA"] = sin_match_datos_alumnos_df["COD_CAR_FUENTE"].map(
             lambda x: _bridge_map.get(str(x).strip().upper()) if pd.notna(x) else pd.NA
         )
@@ -4630,7 +4828,7 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
     sheets_export["RESUMEN_EJECUTIVO"] = resumen_ejecutivo
     sheets_export["REVISION_MANUAL"] = revision_manual
     sheets_export["MATRICULA_UNIFICADA_32"] = matricula_unificada_32
-    sheets_export["ARCHIVO_LISTO_SUBIDA"] = archivo_subida
+    sheets_export["ARCHIVO_LISTO_SUBIDA"] = _trace_store.materialize(archivo_subida)
     sheets_export["RESUMEN_MU"] = resumen
     sheets_export["RESUMEN_MANUAL"] = resumen_manual
     sheets_export["RESUMEN_SIES"] = resumen_sies
@@ -4659,12 +4857,82 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         sheets_export["SIN_MATCH_DATOS_ALUMNOS"] = sin_match_datos_alumnos_df
     if not auditoria_consolidacion.empty:
         sheets_export["AUDITORIA_CONSOLIDACION"] = auditoria_consolidacion
-    _write_excel_atomic(sheets_export, out_path, red_rows_sheet="ARCHIVO_LISTO_SUBIDA", red_rows_mask=_red_mask)
-    _write_mu_csv_atomic(matricula_unificada_32, csv_out_path)
-
+    # Alertas COD_CAR/SIES marcadas al escribir (sin reabrir el xlsx con scripts/marcar_alertas_codcar.py).
+    _alert_highlights: list[RowHighlight] = []
+    if marcar_alertas_codcar:
+        _subida_export = sheets_export["ARCHIVO_LISTO_SUBIDA"]
+        try:
+            _motivo_alerta = motivo_alerta_codcar(_subida_export)
+        except ValueError as exc:
+            print(f"⚠️  Alertas COD_CAR omitidas: {exc}")
+        else:
+            sheets_export["ALERTAS_REVISION"] = construir_hoja_alertas(_subida_export, _motivo_alerta)
+            _alert_hl = build_row_highlight(
+                "ARCHIVO_LISTO_SUBIDA", _subida_export, _motivo_alerta.ne(""), list(_subida_export.columns)
+            )
+            if _alert_hl is not None:
+                _alert_highlights.append(_alert_hl)
+            print(f"  ↳ Alertas COD_CAR: {int(_motivo_alerta.ne('').sum())} filas marcadas (hoja ALERTAS_REVISION)")
+    # Exportación concurrente: el CSV de carga se envía primero y se anuncia
+    # apenas queda persistido (fsync), sin esperar al xlsx de auditoría.
+    _scheduler = ExportScheduler(max_workers=export_workers, on_ready=_announce_export_ready)
+    _csv_future = _scheduler.submit("csv_mu32", _write_mu_csv_atomic, matricula_unificada_32, csv_out_path)
+    _excel_future = _scheduler.submit(
+        "xlsx_auditoria",
+        _write_excel_atomic,
+        sheets_export,
+        out_path,
+        red_rows_sheet="ARCHIVO_LISTO_SUBIDA",
+        red_rows_mask=_red_mask,
+        max_rows_per_sheet=excel_max_filas_hoja,
+        oversize_policy=excel_hojas_grandes,
+        extra_highlights=_alert_highlights,
+    )
     if not auditoria_consolidacion.empty:
         audit_tsv_path = output_dir / "auditoria_consolidacion_codcli.tsv"
-        auditoria_consolidacion.to_csv(audit_tsv_path, sep="\t", index=False)
+        _scheduler.submit("tsv_auditoria_consolidacion", atomic_to_csv, auditoria_consolidacion, audit_tsv_path, sep="\t", index=False)
+    _scheduler.submit(
+        "tsv_traza_larga",
+        _trace_store.write,
+        output_dir / MU_TRACE_LONG_FILENAME,
+        trace_compression_from_env(),
+        critical=False,
+    )
+    # Copia columnar de ARCHIVO_LISTO_SUBIDA para auditorías (tools/auditar_cambio_sies_cicib.py)
+    # que leen solo las columnas que necesitan; opcional según motor Parquet instalado.
+    if parquet_engine_available():
+        _scheduler.submit(
+            "parquet_archivo_subida",
+            atomic_to_parquet,
+            _parquet_text_frame(sheets_export["ARCHIVO_LISTO_SUBIDA"]),
+            output_dir / MU_ARCHIVO_SUBIDA_PARQUET_FILENAME,
+            index=False,
+            critical=False,
+        )
+    else:
+        print("  ℹ️ Parquet de ARCHIVO_LISTO_SUBIDA omitido (sin pyarrow/fastparquet)")
+    # Reportes JSON auxiliares: no bloquean el pipeline si fallan.
+    _scheduler.submit(
+        "json_patch_sit_fon_sol",
+        atomic_write_json,
+        output_dir / "reporte_patch_sit_fon_sol.json",
+        sit_fon_sol_patch_stats,
+        critical=False,
+    )
+    _scheduler.submit(
+        "json_patches_mu2026",
+        atomic_write_json,
+        output_dir / PATCH_REPORT_FILENAME,
+        patch_report,
+        critical=False,
+    )
+    _scheduler.submit(
+        "json_for_ing_act",
+        atomic_write_json,
+        output_dir / "reporte_for_ing_act.json",
+        for_ing_act_report,
+        critical=False,
+    )
 
     _report = {
         "output_file": str(out_path),
@@ -4708,32 +4976,69 @@ def ejecutar_pipeline_matricula_unificada_legacy_like(
         "oferta_academica_source": oferta_source,
         "sit_fon_sol_patch_source": sit_fon_patch_source,
         "sit_fon_sol_patch_stats": sit_fon_sol_patch_stats,
+        "patches_mu2026": patch_report,
         "for_ing_act_report": for_ing_act_report,
     }
     if _filtro_bd_stats:
         _report["filtro_base_datos"] = _filtro_bd_stats
     if _stats_depur:
         _report["depuracion_rut_multi_codcli"] = _stats_depur
+    _report["indice_identidad"] = _ids.stats()
+    _report["codigos_sies"] = _sies_codes.stats()
+    _report["puente_sies_match_tipo"] = puente_match_tipo
+    _report["indices_compilados"] = {name: ("cache" if hit else "compilado") for name, hit in _index_cache.hits.items()}
+    _report["bundle_gobernanza"] = {
+        "estado": _governance_bundle_status(),
+        **(_governance_bundle().stats() if _governance_bundle() is not None else {}),
+    }
+    _report["traza_larga"] = _trace_store.stats()
+    _report["columnas_categoricas"] = _categorias.stats()
+
+    _export_report = _scheduler.wait()
+    _perf.lap("export_concurrente", rows_out=len(matricula_unificada_32))
+    _report["exportacion"] = _export_report.to_dict()
+    for _task in _export_report.failed:
+        _nivel = "❌" if _task.critical else "⚠️ "
+        print(f"{_nivel} Exportación '{_task.name}' falló: {_task.error_type}: {_task.error}")
+    _export_report.raise_for_errors()
+
+    _excel_ajustes = {
+        st.name: ("OMITIDA" if st.skipped else st.parts)
+        for st in _excel_future.result()
+        if st.skipped or len(st.parts) > 1
+    }
+    if _excel_ajustes:
+        _report["excel_hojas_ajustadas"] = _excel_ajustes
+    _report["mu_run_id"] = _mu_run_id(
+        input_file,
+        {
+            **_mu_sheet_options(xls.sheet_names, sheet_name, filtro_base_datos_sheet),
+            "catalogo_manual_tsv_path": catalogo_manual_tsv_path,
+            "puente_sies_tsv_path": puente_sies_tsv_path,
+            "oferta_academica_xlsx_path": oferta_academica_xlsx_path,
+            "gob_nac_tsv_path": gob_nac_tsv_path,
+            "gob_pais_est_sec_tsv_path": gob_pais_est_sec_tsv_path,
+            "gob_sede_tsv_path": gob_sede_tsv_path,
+            "sit_fon_sol_patch_json_path": sit_fon_sol_patch_json_path,
+            "patch_dir": patch_dir,
+            "excluir_diplomados": excluir_diplomados,
+            "usar_gobernanza_v2": usar_gobernanza_v2,
+        },
+    )
     # Persistir JSON del pipeline de matrícula para trazabilidad
     _mu_json_path = output_dir / "reporte_matricula.json"
     try:
-        _mu_json_path.write_text(json.dumps(_report, indent=2, ensure_ascii=False), encoding="utf-8")
+        atomic_write_json(_mu_json_path, _report)
     except Exception:
         pass  # no bloquear pipeline por fallo de escritura JSON
-    try:
-        (output_dir / "reporte_patch_sit_fon_sol.json").write_text(
-            json.dumps(sit_fon_sol_patch_stats, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
-    except Exception:
-        pass
-    try:
-        (output_dir / "reporte_for_ing_act.json").write_text(
-            json.dumps(for_ing_act_report, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
-    except Exception:
-        pass
+    _remember_mu_run(
+        _report["mu_run_id"],
+        _csv_future.result(),
+        _report,
+        usar_gobernanza_v2,
+        sheets={name: sheets_export[name] for name in ("MATRICULA_UNIFICADA_32", "ARCHIVO_LISTO_SUBIDA")},
+    )
+    _perf.lap("reportes_json", rows_out=len(matricula_unificada_32))
     return _report
 
 
@@ -4980,15 +5285,15 @@ def validar_matricula_unificada(mu: pd.DataFrame) -> list[Issue]:
 def exportar_control_y_pes(
     df: pd.DataFrame, control_path: Path, pes_path: Path, issues: list[Issue], area: str
 ) -> None:
-    df.to_csv(control_path, index=False, encoding="utf-8")
+    atomic_to_csv(df, control_path, index=False)
     if "CODIGO_IES_NUM" not in df.columns:
         issues.append(Issue("ERROR", area, "No existe CODIGO_IES_NUM para generar pes_ready"))
         return
     pes = df.drop(columns=["CODIGO_IES_NUM"])
-    pes.to_csv(pes_path, index=False, header=False, encoding="utf-8")
+    atomic_to_csv(pes, pes_path, index=False, header=False)
 
 
-def _load_mu_control_from_pregrado_csv(csv_path: Path) -> pd.DataFrame:
+def _load_mu_control_from_pregrado_csv(csv_path: Path | io.StringIO) -> pd.DataFrame:
     df = pd.read_csv(
         csv_path,
         sep=";",
@@ -5000,23 +5305,154 @@ def _load_mu_control_from_pregrado_csv(csv_path: Path) -> pd.DataFrame:
     return df.replace("", pd.NA)
 
 
-def _run_mu_pipeline_for_control(input_file: Path, output_dir: Path) -> tuple[pd.DataFrame, dict[str, object]]:
-    report = ejecutar_pipeline_matricula_unificada_legacy_like(
-        input_file,
-        output_dir,
-        catalogo_manual_tsv_path=_resolve_optional_path(None, DEFAULT_CATALOGO_MANUAL_CANDIDATES),
-        oferta_academica_xlsx_path=_resolve_optional_path(None, DEFAULT_OFERTA_ACADEMICA_XLSX_CANDIDATES),
-        gob_nac_tsv_path=_resolve_optional_path(None, DEFAULT_GOB_NAC_CANDIDATES),
-        gob_pais_est_sec_tsv_path=_resolve_optional_path(None, DEFAULT_GOB_PAIS_EST_SEC_CANDIDATES),
-        gob_sede_tsv_path=_resolve_optional_path(None, DEFAULT_GOB_SEDE_CANDIDATES),
-        sit_fon_sol_patch_json_path=_resolve_optional_path(None, DEFAULT_SIT_FON_SOL_PATCH_CANDIDATES),
-        excluir_diplomados=DEFAULT_EXCLUIR_DIPLOMADOS,
-        usar_gobernanza_v2=True,
-    )
-    csv_path = output_dir / MU_PREGRADO_CSV_FILENAME
-    if not csv_path.exists():
-        raise FileNotFoundError(f"No se generó la salida MU esperada: {csv_path}")
-    return _load_mu_control_from_pregrado_csv(csv_path), report
+@dataclass
+class MuRunArtifacts:
+    """Salida MU32 de una corrida ya ejecutada en este proceso.
+
+    Permite que el control de avance reutilice el CSV recién generado en vez
+    de volver a correr todo el pipeline MU (``--proceso ambos``), y que la
+    auditoría maestra consuma las hojas auditadas sin releer el xlsx.
+    ``run_id`` cubre el input y las opciones MU efectivas de la corrida.
+    """
+
+    run_id: str
+    csv_text: str
+    report: dict[str, object]
+    usar_gobernanza_v2: bool
+    sheets: dict[str, pd.DataFrame] = field(default_factory=dict)
+
+    def control_frame(self) -> pd.DataFrame:
+        # Mismo parser que la lectura desde disco: paridad exacta con el CSV oficial.
+        return _load_mu_control_from_pregrado_csv(io.StringIO(self.csv_text))
+
+
+# Opciones de ejecutar_pipeline_matricula_unificada_legacy_like que cambian
+# MATRICULA_UNIFICADA_32 / ARCHIVO_LISTO_SUBIDA (las de exportación no).
+MU_RUN_PATH_OPTIONS = (
+    "catalogo_manual_tsv_path",
+    "puente_sies_tsv_path",
+    "oferta_academica_xlsx_path",
+    "gob_nac_tsv_path",
+    "gob_pais_est_sec_tsv_path",
+    "gob_sede_tsv_path",
+    "sit_fon_sol_patch_json_path",
+    "patch_dir",
+)
+MU_RUN_VALUE_OPTIONS = ("sheet_name", "filtro_base_datos_sheet", "excluir_diplomados", "usar_gobernanza_v2")
+
+# Una sola corrida pendiente: se retira al consumirla y una corrida nueva
+# descarta la anterior (sus hojas ya no las pedirá nadie).
+_MU_RUN_ARTIFACTS: dict[str, MuRunArtifacts] = {}
+
+
+def _path_fingerprint(path: Path) -> tuple[str, int, int]:
+    path = Path(path).expanduser().resolve()
+    stat = path.stat()
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _mu_option_fingerprint(value: object) -> object:
+    """Ruta de catálogo/patch con su estado en disco (un directorio, por archivo)."""
+    if not value:
+        return None
+    path = Path(str(value)).expanduser()
+    if path.is_dir():
+        return [str(path.resolve())] + [_path_fingerprint(p) for p in sorted(path.iterdir()) if p.is_file()]
+    return _path_fingerprint(path) if path.exists() else str(path)
+
+
+def _mu_sheet_options(
+    sheet_names: list[str],
+    sheet_name: str | None,
+    filtro_base_datos_sheet: str | None,
+) -> dict[str, object]:
+    """Hoja fuente y filtro ``base_datos`` efectivos (defaults resueltos como en el pipeline MU).
+
+    ``--sheet`` igual a la primera hoja o ``--filtro-base-datos-sheet base_datos``
+    auto-detectable producen la misma MU32 que omitirlos.
+    """
+    filtro = filtro_base_datos_sheet
+    if filtro is None and "base_datos" in sheet_names:
+        filtro = "base_datos"
+    return {
+        "sheet_name": sheet_name or (sheet_names[0] if sheet_names else None),
+        "filtro_base_datos_sheet": filtro,
+    }
+
+
+def _mu_run_id(input_file: Path, options: dict[str, object]) -> str:
+    """Identificador de corrida MU: input (ruta, mtime, tamaño) + opciones MU efectivas."""
+    payload = [_path_fingerprint(input_file)]
+    payload += [(name, _mu_option_fingerprint(options.get(name))) for name in MU_RUN_PATH_OPTIONS]
+    payload += [(name, options.get(name)) for name in MU_RUN_VALUE_OPTIONS]
+    return hashlib.sha256(json.dumps(payload, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def _remember_mu_run(
+    run_id: str,
+    csv_text: str,
+    report: dict[str, object],
+    usar_gobernanza_v2: bool,
+    sheets: dict[str, pd.DataFrame] | None = None,
+) -> None:
+    _MU_RUN_ARTIFACTS.clear()
+    _MU_RUN_ARTIFACTS[run_id] = MuRunArtifacts(run_id, csv_text, report, usar_gobernanza_v2, dict(sheets or {}))
+
+
+def _take_mu_run(input_file: Path, options: dict[str, object]) -> MuRunArtifacts | None:
+    """Retira los artefactos MU de este proceso si input y opciones coinciden (sin cambios en disco)."""
+    try:
+        return _MU_RUN_ARTIFACTS.pop(_mu_run_id(input_file, options), None)
+    except OSError:
+        return None
+
+
+def mu_run_artifacts(run_id: str) -> MuRunArtifacts | None:
+    """Retira los artefactos de la corrida ``run_id`` (``report["mu_run_id"]``) de este proceso."""
+    return _MU_RUN_ARTIFACTS.pop(run_id, None)
+
+
+def _mu_control_options(input_file: Path) -> dict[str, object]:
+    """Opciones MU con que el control de avance corre (o reutiliza) el pipeline."""
+    with pd.ExcelFile(input_file) as xls:
+        sheet_names = xls.sheet_names
+    return {
+        **_mu_sheet_options(sheet_names, None, None),
+        "catalogo_manual_tsv_path": _resolve_optional_path(None, DEFAULT_CATALOGO_MANUAL_CANDIDATES),
+        "oferta_academica_xlsx_path": _resolve_optional_path(None, DEFAULT_OFERTA_ACADEMICA_XLSX_CANDIDATES),
+        "gob_nac_tsv_path": _resolve_optional_path(None, DEFAULT_GOB_NAC_CANDIDATES),
+        "gob_pais_est_sec_tsv_path": _resolve_optional_path(None, DEFAULT_GOB_PAIS_EST_SEC_CANDIDATES),
+        "gob_sede_tsv_path": _resolve_optional_path(None, DEFAULT_GOB_SEDE_CANDIDATES),
+        "sit_fon_sol_patch_json_path": _resolve_optional_path(None, DEFAULT_SIT_FON_SOL_PATCH_CANDIDATES),
+        "patch_dir": _resolve_optional_path(None, DEFAULT_PATCH_DIR_CANDIDATES),
+        "excluir_diplomados": DEFAULT_EXCLUIR_DIPLOMADOS,
+        "usar_gobernanza_v2": True,
+    }
+
+
+def _run_mu_pipeline_for_control(
+    input_file: Path,
+    options: dict[str, object],
+) -> tuple[pd.DataFrame, dict[str, object]]:
+    """Corre MU con las opciones del control en un directorio temporal.
+
+    Las salidas MU del usuario (``output_dir``) no se tocan, y una corrida
+    pendiente de otro consumidor sigue registrada.
+    """
+    pendientes = dict(_MU_RUN_ARTIFACTS)
+    try:
+        with tempfile.TemporaryDirectory(prefix="mu_control_") as tmp:
+            report = ejecutar_pipeline_matricula_unificada_legacy_like(input_file, Path(tmp), **options)
+            mu_run = _take_mu_run(input_file, options)
+            if mu_run is not None:
+                return mu_run.control_frame(), report
+            csv_path = Path(tmp) / MU_PREGRADO_CSV_FILENAME
+            if not csv_path.exists():
+                raise FileNotFoundError(f"No se generó la salida MU esperada: {csv_path}")
+            return _load_mu_control_from_pregrado_csv(csv_path), report
+    finally:
+        _MU_RUN_ARTIFACTS.clear()
+        _MU_RUN_ARTIFACTS.update(pendientes)
 
 
 def _profile_column(series: pd.Series) -> dict[str, float]:
@@ -5059,38 +5495,65 @@ def resolver_ambiguedad_sies(codcarpr: str, jornada: str, version: str = "V1") -
     
     key = (str(codcarpr).strip().upper(), str(jornada).strip().upper(), str(version).strip().upper())
     
-    if key in MATRIZ_DESAMBIGUACION:
-        sies, conf, notas = MATRIZ_DESAMBIGUACION[key]
+    matriz_dict = _matriz_desambiguacion()
+    if key in matriz_dict:
+        sies, conf, notas = matriz_dict[key]
         return (sies, conf, notas, False)
     else:
         return (None, "0%", f"No encontrado en matriz: ({codcarpr}, {jornada}, {version})", True)
 
 
-def _build_oferta_index(oferta_dim: pd.DataFrame) -> dict:
-    """Construye índice CODIGO_UNICO → atributos desde oferta_dim."""
-    idx = {}
+def _build_oferta_index(oferta_dim: pd.DataFrame, cache: CompiledIndexCache | None = None) -> dict:
+    """Construye índice CODIGO_UNICO → atributos desde oferta_dim.
+
+    Con ``cache`` el índice se reutiliza mientras no cambie el archivo de
+    oferta (hash de contenido + hoja).
+    """
     if oferta_dim.empty:
-        return idx
-    for _, row in oferta_dim.iterrows():
-        cu = str(row.get("CODIGO_UNICO", "")).strip().upper()
-        if not cu:
-            continue
-        codigo_carrera = _extract_cod_car_from_sies_code(cu)
-        if pd.isna(codigo_carrera):
-            codigo_carrera = row.get("CODIGO_CARRERA")
-        idx[cu] = {
-            "TIPO_PLAN_CARRERA": row.get("TIPO_PLAN_CARRERA"),
-            "JORNADA": row.get("JORNADA"),
-            "DURACION_ESTUDIOS": row.get("DURACION_ESTUDIOS"),
-            "MODALIDAD": row.get("MODALIDAD"),
-            "CODIGO_CARRERA": codigo_carrera,
-            "NIVEL_CARRERA": row.get("NIVEL_CARRERA"),
-        }
-    return idx
+        return {}
+    source = oferta_dim["OFERTA_SOURCE_PATH"].iloc[0] if "OFERTA_SOURCE_PATH" in oferta_dim.columns else None
+    if cache is None or not source or not Path(source).exists():
+        return _compile_oferta_index(oferta_dim)
+    key = sources_key([source], oferta_dim["OFERTA_SOURCE_SHEET"].iloc[0], COMPILED_INDEX_VERSION)
+    return cache.load_or_build("indice_oferta", key, lambda: _compile_oferta_index(oferta_dim))
+
+
+def _compile_oferta_index(oferta_dim: pd.DataFrame) -> dict:
+    cu = oferta_dim["CODIGO_UNICO"].astype(object).where(oferta_dim["CODIGO_UNICO"].notna(), "nan")
+    cu = cu.astype(str).str.strip().str.upper()
+    keep = cu.ne("")
+    dim = oferta_dim[keep]
+    cu = cu[keep]
+    codigo_carrera = SiesCodeTable().component(cu, "COD_CAR").astype(object)
+    if "CODIGO_CARRERA" in dim.columns:
+        codigo_carrera = codigo_carrera.where(codigo_carrera.notna(), dim["CODIGO_CARRERA"])
+    else:
+        codigo_carrera = codigo_carrera.where(codigo_carrera.notna(), None)
+    attrs = pd.DataFrame(
+        {
+            col: dim[col].astype(object) if col in dim.columns else None
+            for col in ["TIPO_PLAN_CARRERA", "JORNADA", "DURACION_ESTUDIOS", "MODALIDAD"]
+        },
+        index=dim.index,
+    )
+    attrs["CODIGO_CARRERA"] = codigo_carrera
+    attrs["NIVEL_CARRERA"] = dim["NIVEL_CARRERA"].astype(object) if "NIVEL_CARRERA" in dim.columns else None
+    # Igual que la asignación fila a fila: ante CODIGO_UNICO repetido gana la última fila.
+    return dict(zip(cu.tolist(), attrs.to_dict("records")))
 
 
-def _load_cuadro_homologacion(input_file: Path) -> dict:
-    """Carga CUADRO HOMOLOGACIÓN → dict (CODCARPR, JORNADA_DA) → CODIGO_SIES."""
+def _load_cuadro_homologacion(input_file: Path, cache: CompiledIndexCache | None = None) -> dict:
+    """Carga CUADRO HOMOLOGACIÓN → dict (CODCARPR, JORNADA_DA) → CODIGO_SIES.
+
+    Con ``cache`` la hoja solo se relee cuando cambia el workbook de entrada.
+    """
+    if cache is None or not Path(input_file).exists():
+        return _compile_cuadro_homologacion(input_file)
+    key = sources_key([input_file], COMPILED_INDEX_VERSION)
+    return cache.load_or_build("indice_homologacion", key, lambda: _compile_cuadro_homologacion(input_file))
+
+
+def _compile_cuadro_homologacion(input_file: Path) -> dict:
     homol: dict[tuple[str, str], str] = {}
     try:
         xls = pd.ExcelFile(input_file)
@@ -5102,12 +5565,16 @@ def _load_cuadro_homologacion(input_file: Path) -> dict:
         if target is None:
             return homol
         hm = pd.read_excel(input_file, sheet_name=target)
-        for _, row in hm.iterrows():
-            codcarpr = str(row.get("CODCARPR", "")).strip().upper()
-            jornada_da = str(row.get("JORNADA_DA", "")).strip().upper()
-            codigo_sies = str(row.get("CODIGO_SIES", "")).strip().upper()
-            if codcarpr and jornada_da and codigo_sies:
-                homol[(codcarpr, jornada_da)] = codigo_sies
+
+        def _text(col: str) -> pd.Series:
+            if col not in hm.columns:
+                return pd.Series("", index=hm.index)
+            values = hm[col].astype(object)
+            return values.where(values.notna(), "nan").astype(str).str.strip().str.upper()
+
+        codcarpr, jornada_da, codigo_sies = _text("CODCARPR"), _text("JORNADA_DA"), _text("CODIGO_SIES")
+        ok = codcarpr.ne("") & jornada_da.ne("") & codigo_sies.ne("")
+        homol = dict(zip(zip(codcarpr[ok], jornada_da[ok]), codigo_sies[ok]))
     except Exception as e:
         print(f"⚠️  No se pudo cargar CUADRO HOMOLOGACIÓN: {e}")
     return homol
@@ -5117,6 +5584,7 @@ def _resolver_ambiguedades_sies_heuristica(
     ambiguos_df: pd.DataFrame,
     oferta_idx: dict | None = None,
     homol_dict: dict | None = None,
+    sies_codes: SiesCodeTable | None = None,
 ) -> pd.DataFrame:
     """Resuelve ambigüedades SIES usando una cascada trazable y auditada.
 
@@ -5129,6 +5597,7 @@ def _resolver_ambiguedades_sies_heuristica(
         ambiguos_df: DataFrame con registros SIES_MATCH_STATUS == "AMBIGUO_SIES"
         oferta_idx: dict CODIGO_UNICO → {TIPO_PLAN_CARRERA, JORNADA, ...}
         homol_dict: dict (CODCARPR, JORNADA_DA_LETRA) → CODIGO_SIES
+        sies_codes: tabla de códigos SIES internados (componentes S/C/J/V por código)
 
     Returns:
         DataFrame con ambigüedades resueltas o marcadas como PENDIENTE_GOBERNANZA
@@ -5137,13 +5606,15 @@ def _resolver_ambiguedades_sies_heuristica(
         oferta_idx = {}
     if homol_dict is None:
         homol_dict = {}
+    if sies_codes is None:
+        sies_codes = SiesCodeTable()
 
     if ambiguos_df.empty:
         ambiguos_df["SIES_RESOLUCION_HEURISTICA"] = pd.NA
         ambiguos_df["SIES_CONFIANZA_POST"] = pd.NA
         return ambiguos_df
 
-    result = ambiguos_df.copy()
+    result = ambiguos_df.copy(deep=False)
 
     if "SIES_RESOLUCION_HEURISTICA" not in result.columns:
         result["SIES_RESOLUCION_HEURISTICA"] = pd.NA
@@ -5159,19 +5630,19 @@ def _resolver_ambiguedades_sies_heuristica(
     def _shared_cod_car(candidatos: list[object]) -> int | None:
         cod_cars = set()
         for codigo in candidatos:
-            match = _SIES_CODE_RE.match(str(codigo).strip().upper())
-            if match:
-                cod_cars.add(int(match.group("cod_car")))
+            parts = sies_codes.parts(codigo)
+            if parts:
+                cod_cars.add(parts[2])
         return cod_cars.pop() if len(cod_cars) == 1 else None
 
     max_version_by_cod_car_jor: dict[tuple[int, int], int] = {}
-    for codigo in oferta_idx:
-        match = _SIES_CODE_RE.match(str(codigo).strip().upper())
-        if not match:
-            continue
-        key = (int(match.group("cod_car")), int(match.group("jor")))
-        version = int(match.group("version"))
-        max_version_by_cod_car_jor[key] = max(version, max_version_by_cod_car_jor.get(key, 0))
+    if oferta_idx:
+        oferta_parsed = sies_codes.components(pd.Series(list(oferta_idx), dtype=object)).dropna()
+        if not oferta_parsed.empty:
+            max_version_by_cod_car_jor = {
+                (int(car), int(jor)): int(ver)
+                for (car, jor), ver in oferta_parsed.groupby(["COD_CAR", "JOR"])["VERSION"].max().items()
+            }
 
     # Mapeo de jornada fuente (letra o texto) a numérico SIES y a letra normalizada
     _JOR_TO_SIES = {"D": 1, "V": 2, "O": 4, "1": 1, "2": 2, "4": 4,
@@ -5245,8 +5716,8 @@ def _resolver_ambiguedades_sies_heuristica(
         if target_sed is not None:
             candidatos_sede = []
             for codigo in candidatos:
-                match_sede = _SIES_CODE_RE.match(str(codigo).strip().upper())
-                if match_sede and int(match_sede.group("cod_sed")) == target_sed:
+                parts = sies_codes.parts(codigo)
+                if parts and parts[1] == target_sed:
                     candidatos_sede.append(str(codigo).strip().upper())
             candidatos_sede = sorted(set(candidatos_sede))
             if len(candidatos_sede) == 1:
@@ -5327,14 +5798,8 @@ def _resolver_ambiguedades_sies_heuristica(
         if target_cod_car is not None and target_jor is not None and target_version is not None:
             candidatos_cjv = []
             for codigo in candidatos:
-                match = _SIES_CODE_RE.match(str(codigo).strip().upper())
-                if not match:
-                    continue
-                if (
-                    int(match.group("cod_car")) == target_cod_car
-                    and int(match.group("jor")) == target_jor
-                    and int(match.group("version")) == target_version
-                ):
+                parts = sies_codes.parts(codigo)
+                if parts and parts[2:] == (target_cod_car, target_jor, target_version):
                     candidatos_cjv.append(str(codigo).strip().upper())
             candidatos_cjv = sorted(set(candidatos_cjv))
             if len(candidatos_cjv) == 1:
@@ -5423,49 +5888,65 @@ def generar_procedencia_y_calidad(
         out_rows.extend(rows)
 
     prov_df = pd.DataFrame(out_rows)
-    prov_df.to_csv(output_dir / "reporte_procedencia.csv", index=False, encoding="utf-8")
-    (output_dir / "reporte_calidad_semantica.json").write_text(
-        json.dumps(summary, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+    atomic_to_csv(prov_df, output_dir / "reporte_procedencia.csv", index=False)
+    atomic_write_json(output_dir / "reporte_calidad_semantica.json", summary)
     return summary
 
 
+@copy_on_write()
 def ejecutar_pipeline(input_file: Path, output_dir: Path) -> dict[str, object]:
     output_dir.mkdir(parents=True, exist_ok=True)
     issues: list[Issue] = []
+    _perf = perf_sequence("avance")
 
     carreras_raw, mat_raw, hist_raw, equiv = cargar_fuentes(input_file)
+    _perf.lap("cargar_fuentes", rows_out=len(mat_raw))
 
     mat_i = preparar_matricula_intermedia(mat_raw)
     bridge, diag_amb = construir_puente_equiv(equiv)
     hist_map, review_nomap = mapear_historico_con_equiv(hist_raw, bridge)
     resumen = construir_resumen_historico(hist_map)
+    _perf.lap("capa_a_historico_y_equivalencias", rows_out=len(mat_i))
 
     carreras_ctrl = construir_carreras_control(carreras_raw)
     matac_ctrl = construir_matricula_ac_control(mat_i, resumen)
     mu_ctrl = construir_matricula_unificada_control(matac_ctrl, equiv)
+    _perf.lap("capa_b_controles", rows_out=len(mu_ctrl))
     mu_ctrl_source = "legacy_capa_b"
     mu_fallback_report: dict[str, object] | None = None
 
     issues.extend(validar_carreras(carreras_ctrl))
     issues.extend(validar_matricula_ac(matac_ctrl, carreras_ctrl))
     mu_issues = validar_matricula_unificada(mu_ctrl)
+    mu_fallback_reutilizado = False
     if mu_issues:
         try:
-            mu_ctrl_fallback, mu_fallback_report = _run_mu_pipeline_for_control(input_file, output_dir)
+            # Con --proceso ambos la corrida MU ya ocurrió en este proceso: reutilizar
+            # su salida en memoria si sus opciones dan la misma MU32; si no, recalcular
+            # fuera de output_dir para no pisar las salidas MU del usuario.
+            mu_options = _mu_control_options(input_file)
+            mu_run = _take_mu_run(input_file, mu_options)
+            if mu_run is not None:
+                mu_ctrl_fallback, mu_fallback_report = mu_run.control_frame(), mu_run.report
+                mu_fallback_reutilizado = True
+            else:
+                mu_ctrl_fallback, mu_fallback_report = _run_mu_pipeline_for_control(input_file, mu_options)
             mu_fallback_issues = validar_matricula_unificada(mu_ctrl_fallback)
             if len(mu_fallback_issues) <= len(mu_issues):
                 mu_ctrl = mu_ctrl_fallback
                 mu_issues = mu_fallback_issues
                 mu_ctrl_source = "pipeline_matricula_v2"
                 print("Modo avance: se reutilizó la salida validada del pipeline MU v2 para el control regulatorio.")
+                if mu_fallback_reutilizado:
+                    print("  ↳ Salida MU de esta misma ejecución (sin recalcular el pipeline).")
         except Exception as exc:
             issues.append(Issue("ERROR", "matricula_unificada", f"Fallback MU v2 falló: {exc}"))
     issues.extend(mu_issues)
+    _perf.lap("capa_c_validacion", rows_out=len(mu_ctrl))
 
-    mu_ctrl.to_csv(output_dir / "matricula_unificada_2026_control.csv", index=False, encoding="utf-8")
-    mu_ctrl.to_excel(output_dir / "matricula_unificada_2026_oficial.xlsx", index=False)
+    atomic_to_csv(mu_ctrl, output_dir / "matricula_unificada_2026_control.csv", index=False)
+    with atomic_path(output_dir / "matricula_unificada_2026_oficial.xlsx") as tmp_xlsx:
+        mu_ctrl.to_excel(tmp_xlsx, index=False)
     exportar_control_y_pes(
         carreras_ctrl,
         output_dir / "carreras_avance_curricular_2025_control.csv",
@@ -5481,10 +5962,13 @@ def ejecutar_pipeline(input_file: Path, output_dir: Path) -> dict[str, object]:
         "matricula_ac",
     )
 
-    diag_amb.to_csv(output_dir / "sies_ambiguedad_diagnostico.csv", index=False, encoding="utf-8")
-    review_nomap.to_csv(output_dir / "sies_codcarr_sin_mapeo.csv", index=False, encoding="utf-8")
+    atomic_to_csv(diag_amb, output_dir / "sies_ambiguedad_diagnostico.csv", index=False)
+    atomic_to_csv(review_nomap, output_dir / "sies_codcarr_sin_mapeo.csv", index=False)
+
+    _perf.lap("exportar_controles_y_pes", rows_out=len(mu_ctrl))
 
     calidad_semantica = generar_procedencia_y_calidad(output_dir, mu_ctrl, carreras_ctrl, matac_ctrl, issues)
+    _perf.lap("procedencia_y_calidad", rows_out=len(mu_ctrl))
 
     report = {
         "rows": {
@@ -5502,6 +5986,7 @@ def ejecutar_pipeline(input_file: Path, output_dir: Path) -> dict[str, object]:
         },
         "calidad_semantica": calidad_semantica,
         "matricula_unificada_source": mu_ctrl_source,
+        "matricula_unificada_fallback_reutilizado": mu_fallback_reutilizado,
         "apto_oficial": {
             "matricula_unificada": not any(
                 i.severity in {"BLOCKER", "ERROR"} and i.area in {"matricula_unificada"} for i in issues
@@ -5514,7 +5999,7 @@ def ejecutar_pipeline(input_file: Path, output_dir: Path) -> dict[str, object]:
     }
     if mu_fallback_report is not None:
         report["matricula_unificada_fallback_report"] = mu_fallback_report
-    (output_dir / "reporte_validacion.json").write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    atomic_write_json(output_dir / "reporte_validacion.json", report)
     return report
 
 
@@ -5530,7 +6015,7 @@ def generar_comparacion_versiones(output_dir: Path) -> None:
 | Defaults sensibles | rellenos por defecto | evitar inventar | `PAIS_EST_SEC` y `REINCORPORACION` quedan BLOCKER si faltan |
 | Ambigüedad SIES | diagnóstico simple | revisión consolidada | diagnóstico + archivo de `CODCARR` sin mapeo |
 """
-    (output_dir / "comparacion_versiones.md").write_text(md, encoding="utf-8")
+    atomic_write_text(output_dir / "comparacion_versiones.md", md)
 
 
 def generar_diccionario_columnas(output_dir: Path) -> None:
@@ -5547,10 +6032,10 @@ def generar_diccionario_columnas(output_dir: Path) -> None:
     rows.extend((c, "inferencia operativa / pendiente de validación documental") for c in MATRICULA_UNIFICADA_COLUMNS if c not in known)
     lines = ["# Diccionario de columnas y clasificación", "", "| Columna | Clasificación |", "|---|---|"]
     lines.extend(f"| {c} | {k} |" for c, k in rows)
-    (output_dir / "diccionario_columnas.md").write_text("\n".join(lines), encoding="utf-8")
+    atomic_write_text(output_dir / "diccionario_columnas.md", "\n".join(lines))
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Pipeline híbrido SIES/PES")
     p.add_argument(
         "--input",
@@ -5629,6 +6114,24 @@ def parse_args() -> argparse.Namespace:
             "Por defecto se mantiene el flujo legacy para rollback inmediato."
         ),
     )
+    p.add_argument(
+        "--marcar-alertas-codcar",
+        choices=["true", "false"],
+        default="false",
+        help=(
+            "Marca en rojo, al exportar, las filas de ARCHIVO_LISTO_SUBIDA con ambigüedad COD_CAR/SIES "
+            "y agrega la hoja ALERTAS_REVISION (reemplaza correr scripts/marcar_alertas_codcar.py después)."
+        ),
+    )
+    p.add_argument(
+        "--gobernanza-codcarpr-anoingreso",
+        choices=["true", "false"],
+        default="false",
+        help=(
+            "Corre en proceso la etapa de superposiciones CODCARPR × ANOINGRESO tras la matrícula "
+            "(requiere 'gobernanza CODCARPR_ANOINGRESO.xlsx' junto al input)."
+        ),
+    )
     p.add_argument(
         "--sit-fon-sol-patch-json",
         default=None,
@@ -5637,55 +6140,127 @@ def parse_args() -> argparse.Namespace:
             "Si no se informa, usa patches/mu2026/sit_fon_sol_patch_ruts.json cuando exista."
         ),
     )
-    return p.parse_args()
+    p.add_argument(
+        "--patch-dir",
+        default=None,
+        help=(
+            "Carpeta de patches JSON por RUT (todos los *.json se aplican en una pasada). "
+            "Por defecto patches/mu2026. --sit-fon-sol-patch-json reemplaza el patch SIT_FON_SOL de la carpeta."
+        ),
+    )
+    p.add_argument(
+        "--excel-max-filas-hoja",
+        type=int,
+        default=None,
+        help=(
+            "Umbral de filas por hoja del Excel de auditoría (por defecto el límite de Excel). "
+            "Hojas más grandes se dividen u omiten según --excel-hojas-grandes."
+        ),
+    )
+    p.add_argument(
+        "--excel-hojas-grandes",
+        choices=list(OVERSIZE_POLICIES),
+        default="dividir",
+        help="Qué hacer con hojas sobre el umbral: dividir en NOMBRE, NOMBRE_2, ... u omitirlas.",
+    )
+    p.add_argument(
+        "--export-workers",
+        type=int,
+        default=DEFAULT_EXPORT_WORKERS,
+        help="Hilos para escribir en paralelo CSV, xlsx y reportes de la fase de exportación MU.",
+    )
+    p.add_argument(
+        "--sin-perf-profile",
+        action="store_true",
+        help=(
+            "Desactiva la telemetría por etapa (tiempo, CPU, memoria, filas). "
+            "Por defecto se emite perf_profile.json en la carpeta de salida; "
+            "MU_PERF_TRACEMALLOC=1 agrega el peak de tracemalloc por etapa."
+        ),
+    )
+    return p.parse_args(argv)
 
 
-def main() -> None:
-    args = parse_args()
+@copy_on_write()
+def main(argv: list[str] | None = None) -> dict[str, object]:
+    """Punto de entrada CLI; ``argv`` permite invocarlo en proceso (auditoría maestra)."""
+    args = parse_args(argv)
     input_path = Path(args.input).expanduser().resolve()
     if not input_path.exists():
         raise FileNotFoundError(f"No se encontró archivo de entrada: {input_path}. Usa --input para indicar uno válido.")
 
     out = Path(args.output_dir).expanduser().resolve()
     reports: dict[str, object] = {}
+    profiler = activate_profiler(PerfProfiler(f"codigo_gobernanza_v2:{args.proceso}", enabled=not args.sin_perf_profile))
+    try:
 
-    if args.proceso in {"avance", "ambos"}:
-        report_avance = ejecutar_pipeline(input_path, out)
-        generar_comparacion_versiones(out)
-        generar_diccionario_columnas(out)
-        reports["avance"] = report_avance
-
-    if args.proceso in {"matricula", "ambos"}:
-        catalogo_manual_tsv_path = _resolve_optional_path(args.catalogo_manual_tsv, DEFAULT_CATALOGO_MANUAL_CANDIDATES)
-        puente_sies_tsv_path = args.puente_sies_tsv
-        gob_nac_tsv_path = _resolve_optional_path(args.gob_nac_tsv, DEFAULT_GOB_NAC_CANDIDATES)
-        gob_pais_est_sec_tsv_path = _resolve_optional_path(args.gob_pais_est_sec_tsv, DEFAULT_GOB_PAIS_EST_SEC_CANDIDATES)
-        gob_sede_tsv_path = _resolve_optional_path(args.gob_sede_tsv, DEFAULT_GOB_SEDE_CANDIDATES)
-        sit_fon_sol_patch_json_path = _resolve_optional_path(args.sit_fon_sol_patch_json, DEFAULT_SIT_FON_SOL_PATCH_CANDIDATES)
-        oferta_academica_xlsx_path = _resolve_optional_path(args.oferta_academica_xlsx, DEFAULT_OFERTA_ACADEMICA_XLSX_CANDIDATES)
-        report_mu = ejecutar_pipeline_matricula_unificada_legacy_like(
-            input_path,
-            out,
-            sheet_name=args.sheet,
-            catalogo_manual_tsv_path=catalogo_manual_tsv_path,
-            puente_sies_tsv_path=puente_sies_tsv_path,
-            oferta_academica_xlsx_path=oferta_academica_xlsx_path,
-            gob_nac_tsv_path=gob_nac_tsv_path,
-            gob_pais_est_sec_tsv_path=gob_pais_est_sec_tsv_path,
-            gob_sede_tsv_path=gob_sede_tsv_path,
-            sit_fon_sol_patch_json_path=sit_fon_sol_patch_json_path,
-            excluir_diplomados=(args.excluir_diplomados == "true"),
-            usar_gobernanza_v2=(args.usar_gobernanza_v2 == "true"),
-            filtro_base_datos_sheet=args.filtro_base_datos_sheet,
-        )
-        reports["matricula"] = report_mu
-
-    if args.proceso == "avance":
-        print(json.dumps(reports["avance"], indent=2, ensure_ascii=False))
-    elif args.proceso == "matricula":
-        print(json.dumps(reports["matricula"], indent=2, ensure_ascii=False))
-    else:
-        print(json.dumps(reports, indent=2, ensure_ascii=False))
+        if args.proceso in {"matricula", "ambos"}:
+            catalogo_manual_tsv_path = _resolve_optional_path(args.catalogo_manual_tsv, DEFAULT_CATALOGO_MANUAL_CANDIDATES)
+            puente_sies_tsv_path = args.puente_sies_tsv
+            gob_nac_tsv_path = _resolve_optional_path(args.gob_nac_tsv, DEFAULT_GOB_NAC_CANDIDATES)
+            gob_pais_est_sec_tsv_path = _resolve_optional_path(args.gob_pais_est_sec_tsv, DEFAULT_GOB_PAIS_EST_SEC_CANDIDATES)
+            gob_sede_tsv_path = _resolve_optional_path(args.gob_sede_tsv, DEFAULT_GOB_SEDE_CANDIDATES)
+            sit_fon_sol_patch_json_path = _resolve_optional_path(args.sit_fon_sol_patch_json, DEFAULT_SIT_FON_SOL_PATCH_CANDIDATES)
+            patch_dir = _resolve_optional_path(args.patch_dir, DEFAULT_PATCH_DIR_CANDIDATES)
+            oferta_academica_xlsx_path = _resolve_optional_path(args.oferta_academica_xlsx, DEFAULT_OFERTA_ACADEMICA_XLSX_CANDIDATES)
+            report_mu = ejecutar_pipeline_matricula_unificada_legacy_like(
+                input_path,
+                out,
+                sheet_name=args.sheet,
+                catalogo_manual_tsv_path=catalogo_manual_tsv_path,
+                puente_sies_tsv_path=puente_sies_tsv_path,
+                oferta_academica_xlsx_path=oferta_academica_xlsx_path,
+                gob_nac_tsv_path=gob_nac_tsv_path,
+                gob_pais_est_sec_tsv_path=gob_pais_est_sec_tsv_path,
+                gob_sede_tsv_path=gob_sede_tsv_path,
+                sit_fon_sol_patch_json_path=sit_fon_sol_patch_json_path,
+                patch_dir=patch_dir,
+                excluir_diplomados=(args.excluir_diplomados == "true"),
+                usar_gobernanza_v2=(args.usar_gobernanza_v2 == "true"),
+                filtro_base_datos_sheet=args.filtro_base_datos_sheet,
+                excel_max_filas_hoja=args.excel_max_filas_hoja,
+                excel_hojas_grandes=args.excel_hojas_grandes,
+                export_workers=args.export_workers,
+                marcar_alertas_codcar=(args.marcar_alertas_codcar == "true"),
+            )
+            reports["matricula"] = report_mu
+
+            if args.gobernanza_codcarpr_anoingreso == "true":
+                try:
+                    with perf_stage("gobernanza_codcarpr_anoingreso"):
+                        reports["gobernanza_codcarpr_anoingreso"] = ejecutar_gobernanza_codcarpr_anoingreso(
+                            input_path,
+                            out,
+                            Path(__file__).with_name("control"),
+                            # Hoja1/DatosAlumnos son datos de alumnos: el caché vive junto a las salidas.
+                            cache=CompiledIndexCache(out / UNIVERSO_CACHE_SUBDIR),
+                        )
+                except FileNotFoundError as exc:
+                    print(f"⚠️  Gobernanza CODCARPR × ANOINGRESO omitida: {exc}")
+
+        # Avance corre después de MU: con --proceso ambos su control regulatorio
+        # reutiliza la salida MU en memoria cuando las opciones MU coinciden con
+        # las del control; si no, lo recalcula en un directorio temporal.
+        if args.proceso in {"avance", "ambos"}:
+            report_avance = ejecutar_pipeline(input_path, out)
+            generar_comparacion_versiones(out)
+            generar_diccionario_columnas(out)
+            reports = {"avance": report_avance, **reports}
+
+        if args.proceso == "avance":
+            print(json.dumps(reports["avance"], indent=2, ensure_ascii=False))
+        elif args.proceso == "matricula":
+            print(json.dumps(reports["matricula"], indent=2, ensure_ascii=False))
+        else:
+            print(json.dumps(reports, indent=2, ensure_ascii=False))
+
+        if profiler.enabled:
+            perf_path = profiler.write_json(out / DEFAULT_PERF_PROFILE_FILENAME)
+            profiler.print_summary()
+            print(f"  ↳ Perfil de rendimiento: {perf_path}")
+    finally:
+        deactivate_profiler()
+    return reports
 
 
 if __name__ == "__main__":
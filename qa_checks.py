@@ -6,11 +6,12 @@ from datetime import date
 import json
 import os
 from pathlib import Path
-import re
 import pandas as pd
 
 # La validacion oficial no debe depender del runtime legacy archivado.
 from codigo_gobernanza_v2 import CARRERAS_AC_COLUMNS, MATRICULA_AC_COLUMNS, MATRICULA_UNIFICADA_COLUMNS
+from src.export import atomic_to_csv, atomic_write, atomic_write_json, atomic_write_text
+from src.identity import SiesCodeTable
 from src.patches.apply_patches import (
     DEFAULT_SIT_FON_SOL_PATCH_PATH,
     PATCH_AUDIT_STATUS_SIT_FON_SOL,
@@ -90,29 +91,9 @@ def check_puente_sies_compilado() -> dict[str, object]:
     n_codes = pd.to_numeric(df["N_CODES_SIES"], errors="coerce")
     assert n_codes.notna().all(), "N_CODES_SIES contiene valores no numéricos"
 
-    sies_code_re = re.compile(r"^I\d+S\d+C(?P<cod_car>\d+)J\d+V\d+$", re.IGNORECASE)
-    blank_tokens = {"", "NAN", "NONE", "NULL", "<NA>"}
-
-    def _shared_cod_car(row: pd.Series) -> object:
-        values = [row.get("CODIGOS_SIES_POTENCIALES", "")]
-        values.extend(row.get(f"CODIGO_CARRERA_SIES_{idx}", "") for idx in range(1, 6))
-        cod_cars: set[int] = set()
-        seen = False
-        for value in values:
-            for token in str("" if value is None else value).split("|"):
-                token = token.strip().upper()
-                if token in blank_tokens:
-                    continue
-                match = sies_code_re.match(token)
-                if not match:
-                    return pd.NA
-                seen = True
-                cod_cars.add(int(match.group("cod_car")))
-        if seen and len(cod_cars) == 1:
-            return next(iter(cod_cars))
-        return pd.NA
-
-    cod_car_derived = pd.to_numeric(df.apply(_shared_cod_car, axis=1), errors="coerce")
+    code_cols = ["CODIGOS_SIES_POTENCIALES"] + [f"CODIGO_CARRERA_SIES_{idx}" for idx in range(1, 6)]
+    code_cols = [c for c in code_cols if c in df.columns]
+    cod_car_derived = SiesCodeTable().shared_cod_car(*(df[c] for c in code_cols))
     cod_car_actual = pd.to_numeric(df["CODIGO_CARRERA"], errors="coerce")
     cod_car_bad = cod_car_derived.notna() & (cod_car_actual.isna() | cod_car_actual.ne(cod_car_derived))
     assert not cod_car_bad.any(), (
@@ -686,7 +667,7 @@ def generate_fase1_identity_reports(out: Path, control_dir: Path) -> dict[str, o
         fech_nac_1900_mask | (~fech_nac_valid_mask),
         ['CODCLI', 'N_DOC', 'DV', 'FECH_NAC', 'FECH_NAC_STATUS', 'DA_MATCH_MODO', 'INCLUIR_EN_MATRICULA_32'],
     ].copy()
-    reporte_fech_nac.to_csv(report_dir / 'reporte_fech_nac.tsv', sep='\t', index=False, encoding='utf-8')
+    atomic_to_csv(reporte_fech_nac, report_dir / 'reporte_fech_nac.tsv', sep='\t', index=False)
 
     reporte_nac_pais = included.loc[
         nac_default_mask
@@ -696,7 +677,7 @@ def generate_fase1_identity_reports(out: Path, control_dir: Path) -> dict[str, o
         | included['PAIS_EST_SEC_STATUS'].astype(str).str.contains('SOURCE_EMPTY|SIN_INSUMO', regex=True),
         ['CODCLI', 'N_DOC', 'DV', 'NAC', 'NAC_STATUS', 'PAIS_EST_SEC', 'PAIS_EST_SEC_STATUS', 'DA_MATCH_MODO', 'INCLUIR_EN_MATRICULA_32'],
     ].copy()
-    reporte_nac_pais.to_csv(report_dir / 'reporte_nac_pais_sec.tsv', sep='\t', index=False, encoding='utf-8')
+    atomic_to_csv(reporte_nac_pais, report_dir / 'reporte_nac_pais_sec.tsv', sep='\t', index=False)
 
     gate = {
         'A_TIPO_DOC': {
@@ -794,10 +775,7 @@ def generate_fase1_identity_reports(out: Path, control_dir: Path) -> dict[str, o
         'columnas_fase_1': gate,
     }
 
-    (report_dir / 'reporte_identidad_mu_2026.json').write_text(
-        json.dumps(summary, ensure_ascii=False, indent=2),
-        encoding='utf-8',
-    )
+    atomic_write_json(report_dir / 'reporte_identidad_mu_2026.json', summary)
 
     lines = [
         '# Reporte FASE 1 - Identidad MU 2026',
@@ -835,7 +813,7 @@ def generate_fase1_identity_reports(out: Path, control_dir: Path) -> dict[str, o
             f'{_si_no(payload["auditable_en_filas_incluidas"])} | {payload["estado_final"]} |'
         )
 
-    (report_dir / 'reporte_fase_1_identidad_mu_2026.md').write_text('\n'.join(lines), encoding='utf-8')
+    atomic_write_text(report_dir / 'reporte_fase_1_identidad_mu_2026.md', '\n'.join(lines))
     return summary
 
 
@@ -918,7 +896,7 @@ def generate_fase2_sies_oferta_reports(out: Path, control_dir: Path) -> dict[str
             'VERSION_FUENTE_FINAL',
         ],
     ].copy()
-    sies_pendientes.to_csv(report_dir / 'sies_pendientes.tsv', sep='\t', index=False, encoding='utf-8')
+    atomic_to_csv(sies_pendientes, report_dir / 'sies_pendientes.tsv', sep='\t', index=False)
 
     gate = {
         'K_COD_SED': {
@@ -991,10 +969,7 @@ def generate_fase2_sies_oferta_reports(out: Path, control_dir: Path) -> dict[str
         'columnas_fase_2': gate,
     }
 
-    (report_dir / 'reporte_sies_oferta_mu_2026.json').write_text(
-        json.dumps(summary, ensure_ascii=False, indent=2),
-        encoding='utf-8',
-    )
+    atomic_write_json(report_dir / 'reporte_sies_oferta_mu_2026.json', summary)
 
     lines = [
         '# Reporte FASE 2 - SIES Oferta MU 2026',
@@ -1034,7 +1009,7 @@ def generate_fase2_sies_oferta_reports(out: Path, control_dir: Path) -> dict[str
             f'{_si_no(payload["auditable_en_filas_incluidas"])} | {payload["estado_final"]} |'
         )
 
-    (report_dir / 'reporte_fase_2_sies_oferta_mu_2026.md').write_text('\n'.join(lines), encoding='utf-8')
+    atomic_write_text(report_dir / 'reporte_fase_2_sies_oferta_mu_2026.md', '\n'.join(lines))
     return summary
 
 
@@ -1238,14 +1213,8 @@ def generate_fase3_cronologia_reports(out: Path, control_dir: Path) -> dict[str,
         'fecha_matricula_non1900_fuera_2026_rows': summary['fecha_matricula_non1900_fuera_2026_rows'],
     }
 
-    (report_dir / 'reporte_cronologia_mu_2026.json').write_text(
-        json.dumps(summary, ensure_ascii=False, indent=2),
-        encoding='utf-8',
-    )
-    (report_dir / 'reporte_niv_fecha_mu_2026.json').write_text(
-        json.dumps(niv_fecha, ensure_ascii=False, indent=2),
-        encoding='utf-8',
-    )
+    atomic_write_json(report_dir / 'reporte_cronologia_mu_2026.json', summary)
+    atomic_write_json(report_dir / 'reporte_niv_fecha_mu_2026.json', niv_fecha)
 
     lines = [
         '# Reporte FASE 3 - Cronologia MU 2026',
@@ -1290,7 +1259,7 @@ def generate_fase3_cronologia_reports(out: Path, control_dir: Path) -> dict[str,
             f'{_si_no(payload["auditable_en_filas_incluidas"])} | {payload["estado_final"]} |'
         )
 
-    (report_dir / 'reporte_fase_3_cronologia_mu_2026.md').write_text('\n'.join(lines), encoding='utf-8')
+    atomic_write_text(report_dir / 'reporte_fase_3_cronologia_mu_2026.md', '\n'.join(lines))
     return summary
 
 
@@ -1505,7 +1474,7 @@ def generate_fase4_rendimiento_reports(out: Path, control_dir: Path) -> dict[str
         'ASI_APR_HIS',
         'ASI_APR_HIS_AUDIT_STATUS',
     ]
-    included[resumen_cols].to_csv(report_dir / 'resumen_historico_mu_2026.csv', index=False, encoding='utf-8')
+    atomic_to_csv(included[resumen_cols], report_dir / 'resumen_historico_mu_2026.csv', index=False)
 
     summary = {
         'rows_included_final': included_count,
@@ -1537,10 +1506,7 @@ def generate_fase4_rendimiento_reports(out: Path, control_dir: Path) -> dict[str
         'columnas_fase_4': gate,
     }
 
-    (report_dir / 'reporte_rendimiento_mu_2026.json').write_text(
-        json.dumps(summary, ensure_ascii=False, indent=2),
-        encoding='utf-8',
-    )
+    atomic_write_json(report_dir / 'reporte_rendimiento_mu_2026.json', summary)
 
     lines = [
         '# Reporte FASE 4 - Rendimiento academico MU 2026',
@@ -1591,7 +1557,7 @@ def generate_fase4_rendimiento_reports(out: Path, control_dir: Path) -> dict[str
         ]
     )
 
-    (report_dir / 'reporte_fase_4_rendimiento_mu_2026.md').write_text('\n'.join(lines), encoding='utf-8')
+    atomic_write_text(report_dir / 'reporte_fase_4_rendimiento_mu_2026.md', '\n'.join(lines))
     return summary
 
 
@@ -1810,10 +1776,7 @@ def generate_fase5_estado_admin_reports(out: Path, control_dir: Path) -> dict[st
         'columnas_fase_5': gate,
     }
 
-    (report_dir / 'reporte_estado_admin_mu_2026.json').write_text(
-        json.dumps(summary, ensure_ascii=False, indent=2),
-        encoding='utf-8',
-    )
+    atomic_write_json(report_dir / 'reporte_estado_admin_mu_2026.json', summary)
 
     lines = [
         '# Reporte FASE 5 - Estado administrativo MU 2026',
@@ -1867,7 +1830,7 @@ def generate_fase5_estado_admin_reports(out: Path, control_dir: Path) -> dict[st
         ]
     )
 
-    (report_dir / 'reporte_fase_5_estado_admin_mu_2026.md').write_text('\n'.join(lines), encoding='utf-8')
+    atomic_write_text(report_dir / 'reporte_fase_5_estado_admin_mu_2026.md', '\n'.join(lines))
     return summary
 
 
@@ -1966,7 +1929,7 @@ def generate_fase6_gate_final(out: Path, control_dir: Path, base_metrics: dict[s
 
     # Persistir tablero actualizado a disco
     fieldnames = list(tablero_rows[0].keys())
-    with tablero_path.open('w', encoding='utf-8', newline='') as fh:
+    with atomic_write(tablero_path, 'w', encoding='utf-8', newline='') as fh:
         writer = csv.DictWriter(fh, fieldnames=fieldnames, delimiter='\t')
         writer.writeheader()
         writer.writerows(tablero_rows)
@@ -2108,7 +2071,7 @@ def generate_fase6_gate_final(out: Path, control_dir: Path, base_metrics: dict[s
         'Riesgo de no resolver',
         'Prioridad',
     ]
-    pd.DataFrame(backlog_exec_rows, columns=backlog_columns).to_csv(backlog_path, sep='\t', index=False, encoding='utf-8')
+    atomic_to_csv(pd.DataFrame(backlog_exec_rows, columns=backlog_columns), backlog_path, sep='\t', index=False)
 
     cierre_rows: list[dict[str, str]] = []
     if cierre_path.exists():
@@ -2129,7 +2092,7 @@ def generate_fase6_gate_final(out: Path, control_dir: Path, base_metrics: dict[s
                         'Comentario': 'A/Y/Z cerrados técnicamente mediante evidencia control/auditoria_ayz/resumen_ayz.json con 0 errores y dictamen OK.',
                     }
                 )
-    pd.DataFrame(cierre_rows).to_csv(cierre_path, sep='\t', index=False, encoding='utf-8')
+    atomic_to_csv(pd.DataFrame(cierre_rows), cierre_path, sep='\t', index=False)
 
     phase_report_map = {
         'FASE 0': 'control/evidencias/D_primer_apellido.md + control/evidencias/F_nombre.md + control/evidencias/G_sexo.md + control/evidencias/P_for_ing_act.md',
@@ -2276,7 +2239,7 @@ def generate_fase6_gate_final(out: Path, control_dir: Path, base_metrics: dict[s
         ]
     )
 
-    (gate_dir / 'gate_final_mu_2026.md').write_text('\n'.join(lines), encoding='utf-8')
+    atomic_write_text(gate_dir / 'gate_final_mu_2026.md', '\n'.join(lines))
     return summary
 
 
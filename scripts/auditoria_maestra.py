@@ -13,16 +13,25 @@ Uso:
 from __future__ import annotations
 
 import argparse
+import contextlib
 import datetime
+import functools
+import io
+import hashlib
 import json
 import os
 import re
 import subprocess
 import sys
 import textwrap
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import pandas as pd
 
@@ -32,6 +41,12 @@ import pandas as pd
 REPO_DIR = Path(__file__).resolve().parent.parent
 PIPELINE_SCRIPT = REPO_DIR / "codigo_gobernanza_v2.py"
 VERIFICADOR_SCRIPT = REPO_DIR / "scripts" / "verificar_4_columnas_mu.py"
+# Cachés locales de la auditoría (fuera de control/, ignorados por git).
+AUDIT_CACHE_DIR = REPO_DIR / ".cache" / "auditoria"
+
+if str(REPO_DIR) not in sys.path:
+    sys.path.insert(0, str(REPO_DIR))
+from src.catalogs import CompiledIndexCache, sources_key  # noqa: E402
 
 COLUMNAS_MU32_ESPERADAS = [
     "TIPO_DOC", "N_DOC", "DV", "PRIMER_APELLIDO", "SEGUNDO_APELLIDO", "NOMBRE",
@@ -79,21 +94,132 @@ class LineageEntry:
     outputs: list[str] = field(default_factory=list)
 
 
+_XLSX_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def _xlsx_sheet_names(excel_path: Path) -> list[str]:
+    """Nombres de hoja desde ``xl/workbook.xml`` sin cargar el libro completo."""
+    with zipfile.ZipFile(excel_path) as zf:
+        root = ET.fromstring(zf.read("xl/workbook.xml"))
+    return [sheet.get("name", "") for sheet in root.iter(f"{_XLSX_MAIN_NS}sheet")]
+
+
+class AuditContext:
+    """Outputs y catálogos de una auditoría, leídos una sola vez y compartidos.
+
+    Las hojas del Excel y los TSV de gobernanza se memoizan por nombre; el
+    lock serializa la lectura para que los checks concurrentes no parseen
+    dos veces el mismo archivo. Los DataFrames devueltos son de solo lectura.
+    ``sheets`` precarga hojas ya en memoria (corrida del pipeline en proceso).
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        excel_name: str = "archivo_listo_para_sies.xlsx",
+        sheets: dict[str, pd.DataFrame] | None = None,
+    ) -> None:
+        self.output_dir = output_dir
+        self.excel_path = output_dir / excel_name
+        self._lock = threading.Lock()
+        self._xls: pd.ExcelFile | None = None
+        self._sheets: dict[str, pd.DataFrame] = dict(sheets or {})
+        self._catalogs: dict[Path, pd.DataFrame] = {}
+
+    def sheet_names(self) -> list[str]:
+        try:
+            return _xlsx_sheet_names(self.excel_path)
+        except (KeyError, zipfile.BadZipFile, ET.ParseError):
+            pass
+        with self._lock:
+            if self._xls is None:
+                self._xls = pd.ExcelFile(self.excel_path)
+            return list(self._xls.sheet_names)
+
+    def sheet(self, name: str) -> pd.DataFrame:
+        with self._lock:
+            if name not in self._sheets:
+                if self._xls is None:
+                    self._xls = pd.ExcelFile(self.excel_path)
+                self._sheets[name] = pd.read_excel(self._xls, sheet_name=name)
+            return self._sheets[name]
+
+    def catalog(self, path: Path) -> pd.DataFrame:
+        with self._lock:
+            if path not in self._catalogs:
+                self._catalogs[path] = pd.read_csv(path, sep="\t")
+            return self._catalogs[path]
+
+
 # ---------------------------------------------------------------------------
 # Utilidades
 # ---------------------------------------------------------------------------
-def _git_commit_hash() -> str:
+def _git_dir() -> Path | None:
+    """Directorio git del repo (``.git`` o el ``gitdir:`` de un worktree)."""
+    dot_git = REPO_DIR / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        text = dot_git.read_text(encoding="utf-8").strip()
+        if text.startswith("gitdir:"):
+            git_dir = Path(text.split(":", 1)[1].strip())
+            return git_dir if git_dir.is_absolute() else (REPO_DIR / git_dir).resolve()
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _git_head() -> str | None:
+    """SHA de HEAD leído directamente de ``.git`` (loose ref o packed-refs), sin lanzar git."""
+    git_dir = _git_dir()
+    if git_dir is None:
+        return None
     try:
-        return subprocess.check_output(
-            ["git", "rev-parse", "--short", "HEAD"],
-            cwd=str(REPO_DIR), stderr=subprocess.DEVNULL,
-        ).decode().strip()
-    except Exception:
-        return "N/A"
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        if not head.startswith("ref:"):
+            return head or None
+        ref = head.split(":", 1)[1].strip()
+        common_dir = git_dir
+        if (git_dir / "commondir").exists():
+            common_dir = (git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+        for base in (git_dir, common_dir):
+            if (base / ref).exists():
+                return (base / ref).read_text(encoding="utf-8").strip()
+        packed = common_dir / "packed-refs"
+        if packed.exists():
+            for line in packed.read_text(encoding="utf-8").splitlines():
+                sha, _, name = line.partition(" ")
+                if name == ref and not line.startswith(("#", "^")):
+                    return sha
+    except OSError:
+        return None
+    return None
+
+
+def _git_commit_hash() -> str:
+    head = _git_head()
+    return head[:7] if head else "N/A"
 
 
 def _git_modified_line_refs(files: list[str] | None = None) -> list[str]:
+    """Referencias ``archivo:Lx-Ly`` del diff local, cacheadas por HEAD + índice + contenido.
+
+    El diff se recalcula (``git diff``) solo si cambió HEAD, el índice git o
+    alguno de los archivos auditados.
+    """
     files = files or ["codigo_gobernanza_v2.py", "qa_checks.py"]
+    git_dir = _git_dir()
+    if git_dir is None:
+        return []
+    fuentes = [REPO_DIR / f for f in files if (REPO_DIR / f).exists()]
+    if (git_dir / "index").exists():
+        fuentes.append(git_dir / "index")
+    key = sources_key(fuentes, _git_head(), tuple(files))
+    return CompiledIndexCache(AUDIT_CACHE_DIR).load_or_build(
+        "git_diff_refs", key, lambda: _git_diff_line_refs(files)
+    )
+
+
+def _git_diff_line_refs(files: list[str]) -> list[str]:
     try:
         diff_txt = subprocess.check_output(
             ["git", "diff", "--unified=0", "--no-color", "--", *files],
@@ -131,7 +257,13 @@ def _now_iso() -> str:
 
 
 def _find_lines(text: str, pattern: str) -> list[tuple[int, str]]:
-    """Busca pattern (regex) en text y devuelve [(lineno, line), ...]."""
+    """Busca pattern (regex) en text y devuelve [(lineno, line), ...].
+
+    Los patrones conocidos de la auditoría se resuelven desde un único barrido
+    del texto (``_scan_code``); el resto se busca línea a línea.
+    """
+    if pattern in _scan_patterns():
+        return list(_scan_code(text)[pattern])
     matches = []
     for i, line in enumerate(text.splitlines(), 1):
         if re.search(pattern, line, re.IGNORECASE):
@@ -139,6 +271,44 @@ def _find_lines(text: str, pattern: str) -> list[tuple[int, str]]:
     return matches
 
 
+def _scan_lines(text: str, patterns: list[str]) -> dict[str, list[tuple[int, str]]]:
+    """Un solo recorrido de líneas para todos los patrones.
+
+    La alternación combinada descarta las líneas que no calzan con ningún
+    patrón; solo las candidatas se prueban contra cada patrón individual.
+    """
+    compiled = [(pat, re.compile(pat, re.IGNORECASE)) for pat in patterns]
+    combined = re.compile("|".join(f"(?:{pat})" for pat in patterns), re.IGNORECASE)
+    hits: dict[str, list[tuple[int, str]]] = {pat: [] for pat in patterns}
+    for i, line in enumerate(text.splitlines(), 1):
+        if not combined.search(line):
+            continue
+        stripped = line.strip()
+        for pat, rx in compiled:
+            if rx.search(line):
+                hits[pat].append((i, stripped))
+    return hits
+
+
+_SCAN_MEMO: dict[str, dict[str, list[tuple[int, str]]]] = {}
+
+
+def _scan_code(text: str) -> dict[str, list[tuple[int, str]]]:
+    """Resultado de ``_scan_lines`` cacheado por hash de contenido + patrones.
+
+    Se reutiliza en memoria dentro de la corrida y en disco
+    (``.cache/auditoria/linaje_codigo_*.pkl``) entre auditorías.
+    """
+    patterns = _scan_patterns()
+    digest = hashlib.sha256(json.dumps(patterns).encode("utf-8"))
+    digest.update(text.encode("utf-8"))
+    key = digest.hexdigest()
+    if key not in _SCAN_MEMO:
+        cache = CompiledIndexCache(AUDIT_CACHE_DIR)
+        _SCAN_MEMO[key] = cache.load_or_build("linaje_codigo", key, lambda: _scan_lines(text, patterns))
+    return _SCAN_MEMO[key]
+
+
 # ---------------------------------------------------------------------------
 # Parte 2  — Auto-evaluación de lógica del código (Mapa de Linaje)
 # ---------------------------------------------------------------------------
@@ -350,20 +520,34 @@ def construir_linaje(code_text: str) -> list[LineageEntry]:
     return entries
 
 
+_PUNTOS_CLAVE_PATTERNS: dict[str, str] = {
+    "filtro_periodo": r"ANO_ANTERIOR|ano_anterior|2025.*periodo|REGIMEN.*SEMESTRAL",
+    "recalculo_4_columnas": r"PROM_PRI_SEM.*=|PROM_SEG_SEM.*=|ASI_INS_HIS.*=|ASI_APR_HIS.*=",
+    "regla_VIG0_4cols": r"VIG.*==?\s*0.*PROM.*0|VIG.*0.*ASI.*0|force.*VIG.*0.*col",
+    "carga_catalogos_TSV": r"_load_governance_tsv|_load_tsv_table|gobernanza_catalogos",
+    "columnas_DA": r"DA_ESTADOACADEMICO|DA_SITUACION|VIG_ESPERADO_DA|FLAG_INCONSISTENCIA",
+    "columnas_TSV_duracion": r"NOMBRE_CARRERA_TSV|DURACION_ESTUDIOS_TSV|DURACION_TITULACION_TSV|DURACION_TOTAL_TSV",
+    "escritura_excel": r"ExcelWriter|to_excel|_write_excel_atomic",
+    "validacion_bloqueante": r"BLOCKER|bloqueante|severity.*BLOCKER",
+}
+_PATRON_ANIO_ANTERIOR_DINAMICO = r"anio_anterior_prom.*=.*periodo_filtro_anio.*-.*1|anio_ref_override"
+
+
+def _scan_patterns() -> list[str]:
+    """Todos los patrones que la auditoría busca en el código, sin repetir."""
+    patterns: list[str] = []
+    for spec in _LINEAGE_PATTERNS.values():
+        for kind in ("fuentes_pat", "transform_pat", "reglas_pat"):
+            patterns.extend(pat for pat, _ in spec.get(kind, []))
+    patterns.extend(_PUNTOS_CLAVE_PATTERNS.values())
+    patterns.append(_PATRON_ANIO_ANTERIOR_DINAMICO)
+    return list(dict.fromkeys(patterns))
+
+
 def detectar_puntos_clave(code_text: str) -> dict[str, list[tuple[int, str]]]:
     """Detecta ubicaciones clave del pipeline en el código."""
     detections: dict[str, list[tuple[int, str]]] = {}
-    patterns = {
-        "filtro_periodo": r"ANO_ANTERIOR|ano_anterior|2025.*periodo|REGIMEN.*SEMESTRAL",
-        "recalculo_4_columnas": r"PROM_PRI_SEM.*=|PROM_SEG_SEM.*=|ASI_INS_HIS.*=|ASI_APR_HIS.*=",
-        "regla_VIG0_4cols": r"VIG.*==?\s*0.*PROM.*0|VIG.*0.*ASI.*0|force.*VIG.*0.*col",
-        "carga_catalogos_TSV": r"_load_governance_tsv|_load_tsv_table|gobernanza_catalogos",
-        "columnas_DA": r"DA_ESTADOACADEMICO|DA_SITUACION|VIG_ESPERADO_DA|FLAG_INCONSISTENCIA",
-        "columnas_TSV_duracion": r"NOMBRE_CARRERA_TSV|DURACION_ESTUDIOS_TSV|DURACION_TITULACION_TSV|DURACION_TOTAL_TSV",
-        "escritura_excel": r"ExcelWriter|to_excel|_write_excel_atomic",
-        "validacion_bloqueante": r"BLOCKER|bloqueante|severity.*BLOCKER",
-    }
-    for key, pat in patterns.items():
+    for key, pat in _PUNTOS_CLAVE_PATTERNS.items():
         detections[key] = _find_lines(code_text, pat)[:10]
     return detections
 
@@ -371,10 +555,25 @@ def detectar_puntos_clave(code_text: str) -> dict[str, list[tuple[int, str]]]:
 # ---------------------------------------------------------------------------
 # Parte 3 — Auditoría empírica (outputs)
 # ---------------------------------------------------------------------------
-def auditar_outputs(output_dir: Path, excel_name: str = "archivo_listo_para_sies.xlsx") -> list[Check]:
+def _iniciar_verificador(excel_path: Path) -> subprocess.Popen | None:
+    """Lanza el verificador externo en segundo plano mientras corren los demás checks."""
+    if not VERIFICADOR_SCRIPT.exists():
+        return None
+    return subprocess.Popen(
+        [sys.executable, str(VERIFICADOR_SCRIPT), "--excel", str(excel_path)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+
+
+def auditar_outputs(
+    output_dir: Path,
+    excel_name: str = "archivo_listo_para_sies.xlsx",
+    ctx: AuditContext | None = None,
+) -> list[Check]:
     """Valida los outputs existentes en output_dir."""
     checks: list[Check] = []
-    excel_path = output_dir / excel_name
+    ctx = ctx or AuditContext(output_dir, excel_name)
+    excel_path = ctx.excel_path
 
     # 3.1 Existencia del Excel
     c = Check("Existencia Excel principal")
@@ -389,13 +588,13 @@ def auditar_outputs(output_dir: Path, excel_name: str = "archivo_listo_para_sies
         return checks
 
     # 3.2 Hojas presentes
-    xls = pd.ExcelFile(excel_path)
+    sheet_names = ctx.sheet_names()
     c = Check("Hojas requeridas presentes")
     required_sheets = {"MATRICULA_UNIFICADA_32", "ARCHIVO_LISTO_SUBIDA"}
-    missing_sheets = required_sheets - set(xls.sheet_names)
+    missing_sheets = required_sheets - set(sheet_names)
     if not missing_sheets:
         c.estado = "OK"
-        c.detalle = f"Hojas encontradas: {', '.join(sorted(xls.sheet_names))}"
+        c.detalle = f"Hojas encontradas: {', '.join(sorted(sheet_names))}"
     else:
         c.estado = "FAIL"
         c.detalle = f"Faltan hojas: {missing_sheets}"
@@ -403,9 +602,11 @@ def auditar_outputs(output_dir: Path, excel_name: str = "archivo_listo_para_sies
     if c.estado == "FAIL":
         return checks
 
+    verificador = _iniciar_verificador(excel_path)
+
     # Cargar hojas
-    mu32 = pd.read_excel(xls, sheet_name="MATRICULA_UNIFICADA_32")
-    arch = pd.read_excel(xls, sheet_name="ARCHIVO_LISTO_SUBIDA")
+    mu32 = ctx.sheet("MATRICULA_UNIFICADA_32")
+    arch = ctx.sheet("ARCHIVO_LISTO_SUBIDA")
 
     # 3.3 Columnas MU32 (orden exacto)
     c = Check("Columnas MU32 regulatorias")
@@ -486,19 +687,17 @@ def auditar_outputs(output_dir: Path, excel_name: str = "archivo_listo_para_sies
 
     # 3.8 Ejecutar verificador externo
     c = Check("Verificador scripts/verificar_4_columnas_mu.py")
-    if VERIFICADOR_SCRIPT.exists():
+    if verificador is not None:
         try:
-            result = subprocess.run(
-                [sys.executable, str(VERIFICADOR_SCRIPT), "--excel", str(excel_path)],
-                capture_output=True, text=True, timeout=120,
-            )
-            output = (result.stdout + result.stderr).strip()
-            if result.returncode == 0:
+            stdout, stderr = verificador.communicate(timeout=120)
+            output = (stdout + stderr).strip()
+            if verificador.returncode == 0:
                 c.estado = "OK"
             else:
                 c.estado = "FAIL"
             c.detalle = output[:500]
         except Exception as e:
+            verificador.kill()
             c.estado = "FAIL"
             c.detalle = f"Error ejecutando verificador: {e}"
     else:
@@ -577,15 +776,16 @@ def coherencia_logica_vs_evidencia(
     output_dir: Path,
     fail_on_inconsistente: bool = False,
     fail_only_suspendido: bool = False,
+    ctx: AuditContext | None = None,
 ) -> list[Check]:
     """Cruza inferencias del código vs datos observados."""
     checks: list[Check] = []
-    excel_path = output_dir / "archivo_listo_para_sies.xlsx"
-    if not excel_path.exists():
+    ctx = ctx or AuditContext(output_dir)
+    if not ctx.excel_path.exists():
         checks.append(Check("Coherencia lógica", "SKIP", "Excel no disponible"))
         return checks
 
-    arch = pd.read_excel(excel_path, sheet_name="ARCHIVO_LISTO_SUBIDA")
+    arch = ctx.sheet("ARCHIVO_LISTO_SUBIDA")
 
     # 4.1 Año anterior por período (dinámico)
     c = Check("Año anterior por período (dinámico)")
@@ -624,7 +824,7 @@ def coherencia_logica_vs_evidencia(
         c.detalle = f"anio_anterior_prom={anio_anterior_detectado} (periodo_filtro_anio no disponible en JSON)"
     else:
         # Fallback: buscar patrón dinámico en código
-        hits_dyn = _find_lines(code_text, r"anio_anterior_prom.*=.*periodo_filtro_anio.*-.*1|anio_ref_override")
+        hits_dyn = _find_lines(code_text, _PATRON_ANIO_ANTERIOR_DINAMICO)
         if hits_dyn:
             c.estado = "OK"
             c.detalle = f"Cálculo dinámico en L{hits_dyn[0][0]}: {hits_dyn[0][1][:80]}"
@@ -706,7 +906,7 @@ def coherencia_logica_vs_evidencia(
     c = Check("Catálogos gobernanza sin combos nuevos")
     gob_da_path = REPO_DIR / "gobernanza_catalogos" / "gob_datosalumnos_estadoacademico_situacion.tsv"
     if gob_da_path.exists() and "DA_ESTADOACADEMICO" in arch.columns and "DA_SITUACION" in arch.columns:
-        cat = pd.read_csv(gob_da_path, sep="\t")
+        cat = ctx.catalog(gob_da_path)
         cat_keys = set(
             zip(cat["ESTADOACADEMICO"].astype(str).str.upper().str.strip(),
                 cat["SITUACION"].astype(str).str.upper().str.strip())
@@ -733,7 +933,7 @@ def coherencia_logica_vs_evidencia(
     c = Check("GOB bloqueante: FOR_ING_ACT vs catálogo")
     gob_fia_path = REPO_DIR / "gobernanza_for_ing_act.tsv"
     if gob_fia_path.exists() and "FOR_ING_ACT" in arch.columns:
-        cat_fia = pd.read_csv(gob_fia_path, sep="\t")
+        cat_fia = ctx.catalog(gob_fia_path)
         codigos_validos = set(cat_fia["FOR_ING_ACT"].dropna().astype(int))
         vals_datos = pd.to_numeric(arch["FOR_ING_ACT"], errors="coerce").dropna().astype(int)
         fuera = set(vals_datos.unique()) - codigos_validos
@@ -783,7 +983,7 @@ def coherencia_logica_vs_evidencia(
     c = Check("GOB bloqueante: COD_SED vs catálogo sede")
     gob_sede_path = REPO_DIR / "gobernanza_sede.tsv"
     if gob_sede_path.exists() and "COD_SED" in arch.columns:
-        cat_sede = pd.read_csv(gob_sede_path, sep="\t")
+        cat_sede = ctx.catalog(gob_sede_path)
         codigos_sede_validos = set(cat_sede["COD_SED"].dropna().astype(int))
         vals_sed = pd.to_numeric(arch["COD_SED"], errors="coerce").dropna().astype(int)
         fuera = set(vals_sed.unique()) - codigos_sede_validos
@@ -803,7 +1003,7 @@ def coherencia_logica_vs_evidencia(
     c = Check("GOB bloqueante: NAC vs catálogo nacionalidades")
     gob_nac_path = REPO_DIR / "gobernanza_nac.tsv"
     if gob_nac_path.exists() and "NAC" in arch.columns:
-        cat_nac = pd.read_csv(gob_nac_path, sep="\t")
+        cat_nac = ctx.catalog(gob_nac_path)
         codigos_nac_validos = set(cat_nac["COD_NAC"].dropna().astype(int))
         vals_nac = pd.to_numeric(arch["NAC"], errors="coerce").dropna().astype(int)
         fuera = set(vals_nac.unique()) - codigos_nac_validos
@@ -823,7 +1023,7 @@ def coherencia_logica_vs_evidencia(
     c = Check("GOB bloqueante: PAIS_EST_SEC vs catálogo")
     gob_pais_path = REPO_DIR / "gobernanza_pais_est_sec.tsv"
     if gob_pais_path.exists() and "PAIS_EST_SEC" in arch.columns:
-        cat_pais = pd.read_csv(gob_pais_path, sep="\t")
+        cat_pais = ctx.catalog(gob_pais_path)
         codigos_pais_validos = set(cat_pais["COD_PAIS_EST_SEC"].dropna().astype(int))
         vals_pais = pd.to_numeric(arch["PAIS_EST_SEC"], errors="coerce").dropna().astype(int)
         fuera = set(vals_pais.unique()) - codigos_pais_validos
@@ -843,7 +1043,7 @@ def coherencia_logica_vs_evidencia(
     c = Check("GOB bloqueante: NIV_ACA vs catálogo niveles")
     gob_niv_path = REPO_DIR / "gobernanza_niveles.tsv"
     if gob_niv_path.exists() and "NIV_ACA" in arch.columns:
-        cat_niv = pd.read_csv(gob_niv_path, sep="\t")
+        cat_niv = ctx.catalog(gob_niv_path)
         niveles_validos = set(cat_niv["NIVEL_CARRERA"].dropna().astype(int))
         vals_niv = pd.to_numeric(arch["NIV_ACA"], errors="coerce").dropna().astype(int)
         fuera = set(vals_niv.unique()) - niveles_validos
@@ -862,6 +1062,33 @@ def coherencia_logica_vs_evidencia(
     return checks
 
 
+# ---------------------------------------------------------------------------
+# Ejecución concurrente de checks independientes
+# ---------------------------------------------------------------------------
+def ejecutar_checks_concurrentes(
+    tareas: dict[str, Callable[[], Any]],
+    max_workers: int | None = None,
+) -> tuple[dict[str, Any], dict[str, float]]:
+    """Ejecuta cada tarea en un hilo y retorna (resultados, duraciones en s) por nombre.
+
+    Los resultados conservan el orden de ``tareas``; una excepción en una
+    tarea se propaga igual que en la ejecución secuencial.
+    """
+    duraciones: dict[str, float] = {}
+
+    def _medir(nombre: str, fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            duraciones[nombre] = time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(tareas) or 1) as pool:
+        futuros = {nombre: pool.submit(_medir, nombre, fn) for nombre, fn in tareas.items()}
+        resultados = {nombre: fut.result() for nombre, fut in futuros.items()}
+    return resultados, {nombre: duraciones[nombre] for nombre in tareas}
+
+
 # ---------------------------------------------------------------------------
 # Parte 5 — Reporte y Dictamen
 # ---------------------------------------------------------------------------
@@ -1062,6 +1289,27 @@ def generar_reporte(
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
+def _ejecutar_pipeline_en_proceso(argv: list[str]) -> tuple[dict[str, Any], dict[str, pd.DataFrame]]:
+    """Corre el pipeline MU en este intérprete y retorna (reporte, hojas auditadas en memoria).
+
+    Evita un segundo arranque de Python y la relectura del xlsx: la auditoría
+    consume directamente MATRICULA_UNIFICADA_32 y ARCHIVO_LISTO_SUBIDA. La
+    salida del pipeline se captura y solo se muestra si falla.
+    """
+    import codigo_gobernanza_v2 as pipeline
+
+    salida = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(salida):
+            reports = pipeline.main(argv)
+    except BaseException:
+        print(salida.getvalue()[-500:])
+        raise
+    report_mu = reports.get("matricula", {})
+    artefactos = pipeline.mu_run_artifacts(report_mu.get("mu_run_id", ""))
+    return report_mu, dict(artefactos.sheets) if artefactos else {}
+
+
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(
         description="Auditoría Maestra — Gate de Entrega MU 2026",
@@ -1107,95 +1355,83 @@ def main() -> int:
     }
 
     # --- Parte 1: Ejecución controlada ---
+    sheets_en_memoria: dict[str, pd.DataFrame] = {}
     if args.ejecutar_pipeline:
-        print("\n📦 Parte 1: Ejecutando pipeline...")
-        cmd = [sys.executable, str(PIPELINE_SCRIPT), "--proceso", "matricula",
-               "--usar-gobernanza-v2", "true", "--output-dir", str(output_dir)]
+        print("\n📦 Parte 1: Ejecutando pipeline (en proceso)...")
+        argv = ["--proceso", "matricula", "--usar-gobernanza-v2", "true", "--output-dir", str(output_dir)]
         if args.input:
-            cmd.extend(["--input", args.input])
+            argv.extend(["--input", args.input])
             meta["Input"] = args.input
         if args.filtro_base_datos_sheet:
-            cmd.extend(["--filtro-base-datos-sheet", args.filtro_base_datos_sheet])
+            argv.extend(["--filtro-base-datos-sheet", args.filtro_base_datos_sheet])
             meta["Filtro-Base-Datos"] = args.filtro_base_datos_sheet
+        if args.anio is not None and args.sem is not None:
+            meta["ANIO_SOLICITADO"] = str(args.anio)
+            meta["SEM_SOLICITADO"] = str(args.sem)
         try:
-            # Pasar período por stdin (pipeline pregunta por input() si no hay flags)
-            stdin_payload = None
-            if args.anio is not None and args.sem is not None:
-                stdin_payload = f"{args.anio}\n{args.sem}\n"
-                meta["ANIO_SOLICITADO"] = str(args.anio)
-                meta["SEM_SOLICITADO"] = str(args.sem)
-
-            result = subprocess.run(
-                cmd,
-                input=stdin_payload,
-                capture_output=True,
-                text=True,
-                timeout=600
-            )
-            if result.returncode != 0:
-                print(f"  ❌ Pipeline falló (exit {result.returncode})")
-                print(result.stderr[:500] if result.stderr else result.stdout[:500])
-                return 2
-            print("  ✅ Pipeline ejecutado OK")
-            # Validar que el JSON generado corresponde al período solicitado (gate robusto)
-            try:
-                import json
-                rep_path = output_dir / "reporte_matricula.json"
-                if rep_path.exists():
-                    rep = json.loads(rep_path.read_text(encoding="utf-8"))
-                    if args.anio is not None and rep.get("periodo_filtro_anio") != args.anio:
-                        print(f"  ❌ JSON no corresponde al año solicitado: {args.anio} vs {rep.get('periodo_filtro_anio')}")
-                        return 2
-                    if args.sem is not None and rep.get("periodo_filtro_sem") != args.sem:
-                        print(f"  ❌ JSON no corresponde al semestre solicitado: {args.sem} vs {rep.get('periodo_filtro_sem')}")
-                        return 2
-                else:
-                    print("  ⚠️ No existe reporte_matricula.json para validar período")
-            except Exception as e:
-                print(f"  ⚠️ No se pudo validar reporte_matricula.json: {e}")
-
-            meta["Pipeline-Exit"] = "0"
-        except Exception as e:
-            print(f"  ❌ Error ejecutando pipeline: {e}")
+            rep, sheets_en_memoria = _ejecutar_pipeline_en_proceso(argv)
+        except BaseException as e:  # SystemExit de argparse incluido
+            if isinstance(e, KeyboardInterrupt):
+                raise
+            print(f"  ❌ Pipeline falló: {e!r}")
+            return 2
+        print("  ✅ Pipeline ejecutado OK")
+        # Validar que el reporte generado corresponde al período solicitado (gate robusto)
+        if args.anio is not None and rep.get("periodo_filtro_anio") != args.anio:
+            print(f"  ❌ Reporte no corresponde al año solicitado: {args.anio} vs {rep.get('periodo_filtro_anio')}")
             return 2
+        if args.sem is not None and rep.get("periodo_filtro_sem") != args.sem:
+            print(f"  ❌ Reporte no corresponde al semestre solicitado: {args.sem} vs {rep.get('periodo_filtro_sem')}")
+            return 2
+        meta["Pipeline-Exit"] = "0"
     else:
         print("\n⏭️  Parte 1: Modo --solo-validar (sin ejecutar pipeline)")
         meta["Input"] = "(outputs existentes)"
 
-    # --- Parte 2: Auto-evaluación lógica del código ---
-    print("\n🔍 Parte 2: Auto-evaluación de lógica del código...")
+    # --- Partes 2-4: checks independientes sobre un contexto cargado una vez ---
     if PIPELINE_SCRIPT.exists():
         code_text = PIPELINE_SCRIPT.read_text(encoding="utf-8")
         meta["Pipeline-Script"] = str(PIPELINE_SCRIPT)
         meta["Pipeline-Líneas"] = str(len(code_text.splitlines()))
-        linaje = construir_linaje(code_text)
-        detections = detectar_puntos_clave(code_text)
+    else:
+        code_text = ""
+    ctx = AuditContext(output_dir, sheets=sheets_en_memoria)
+    resultados, duraciones = ejecutar_checks_concurrentes({
+        "linaje": lambda: (construir_linaje(code_text), detectar_puntos_clave(code_text)) if code_text else ([], {}),
+        "outputs": lambda: auditar_outputs(output_dir, ctx=ctx),
+        "coherencia": lambda: coherencia_logica_vs_evidencia(
+            code_text, output_dir,
+            fail_on_inconsistente=args.fail_on_inconsistente,
+            fail_only_suspendido=args.fail_only_on_suspendido,
+            ctx=ctx,
+        ),
+    })
+    linaje, detections = resultados["linaje"]
+    checks_empiricos = resultados["outputs"]
+    checks_coherencia = resultados["coherencia"]
+
+    print("\n🔍 Parte 2: Auto-evaluación de lógica del código...")
+    if code_text:
         print(f"  ✅ Linaje construido para {len(linaje)} columnas críticas")
         print(f"  ✅ {sum(len(v) for v in detections.values())} puntos clave detectados")
     else:
         print(f"  ❌ No se encontró {PIPELINE_SCRIPT}")
-        code_text = ""
-        linaje = []
-        detections = {}
 
-    # --- Parte 3: Auditoría empírica ---
     print("\n📊 Parte 3: Auditoría empírica de outputs...")
-    checks_empiricos = auditar_outputs(output_dir)
     for c in checks_empiricos:
         icon = {"OK": "✅", "FAIL": "❌", "WARN": "⚠️", "SKIP": "⏭️"}.get(c.estado, "❓")
         print(f"  {icon} {c.nombre}: {c.detalle[:100]}")
 
-    # --- Parte 4: Coherencia lógica vs evidencia ---
     print("\n🔗 Parte 4: Coherencia lógica vs evidencia...")
-    checks_coherencia = coherencia_logica_vs_evidencia(
-        code_text, output_dir,
-        fail_on_inconsistente=args.fail_on_inconsistente,
-        fail_only_suspendido=args.fail_only_on_suspendido,
-    )
     for c in checks_coherencia:
         icon = {"OK": "✅", "FAIL": "❌", "WARN": "⚠️", "SKIP": "⏭️"}.get(c.estado, "❓")
         print(f"  {icon} {c.nombre}: {c.detalle[:100]}")
 
+    print("\n⏱️  Duración por check (concurrentes):")
+    for nombre, segundos in duraciones.items():
+        print(f"  ↳ {nombre}: {segundos:.2f}s")
+    meta["Duración-Checks"] = ", ".join(f"{n}={s:.2f}s" for n, s in duraciones.items())
+
     # --- Parte 5: Reporte y dictamen ---
     all_checks = checks_empiricos + checks_coherencia
     report_path = output_dir / "auditoria_maestra.md"
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Compila los catálogos de gobernanza MU 2026 en un único bundle versionado.
+
+Valida DURACION_ESTUDIOS.tsv, PUENTE_SIES_COMPILADO.tsv, gobernanza_*.tsv,
+gobernanza_catalogos/gob_*.tsv, control/config_*.json y el patch SIT_FON_SOL
+contra su contrato mínimo y escribe control/catalogos/gobernanza_bundle.pkl,
+que el pipeline y los motores cargan al iniciar con una sola lectura.
+Un catálogo inválido aborta aquí (exit 1), antes de cualquier corrida.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.catalogs import GOVERNANCE_BUNDLE_ENV, GOVERNANCE_BUNDLE_FILENAME, compile_governance_bundle  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compila el bundle de catálogos de gobernanza MU 2026.")
+    parser.add_argument(
+        "--output",
+        default=f"control/catalogos/{GOVERNANCE_BUNDLE_FILENAME}",
+        help="Ruta del bundle (relativa a la raíz del repo).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    output = Path(args.output)
+    output = output if output.is_absolute() else (REPO_ROOT / output).resolve()
+
+    # Los derivados se calculan desde las fuentes, no desde un bundle previo.
+    os.environ[GOVERNANCE_BUNDLE_ENV] = "0"
+    import codigo_gobernanza_v2 as gob
+
+    try:
+        bundle = compile_governance_bundle(
+            REPO_ROOT,
+            output,
+            derived={"catalogo_puente_duracion": gob._compile_catalog_and_bridge_from_duracion},
+        )
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        return 1
+    print(f"✅ Bundle de gobernanza compilado: {output}")
+    print(json.dumps({"schema": bundle.schema[:16], **bundle.stats()}, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -105,7 +105,11 @@ def _parse_anio_ingreso_condition(value: object) -> tuple[int | None, int | None
 
 
 def _load_duracion_rows(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False)
+    return _duracion_rows_from_frame(pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False))
+
+
+def _duracion_rows_from_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Filas base (una por CODCARPR) desde DURACION_ESTUDIOS ya cargado como texto."""
     required = {"CODIGO_UNICO", "NOMBRE_CARRERA", "JORNADA", "CODCARPR_CANONICO", "CODCARPR_ALIAS_LIST"}
     missing = required - set(df.columns)
     if missing:
@@ -234,17 +238,24 @@ def _load_override_rows(path: Path | None) -> pd.DataFrame:
     return out.drop_duplicates().reset_index(drop=True)
 
 
+def _add_observed_status(observed: dict[str, set[str]], archivo_subida: pd.DataFrame) -> None:
+    """Agrega los SIES_MATCH_STATUS vistos por SOURCE_KEY_3 en una hoja ARCHIVO_LISTO_SUBIDA."""
+    if not {"SOURCE_KEY_3", "SIES_MATCH_STATUS"}.issubset(archivo_subida.columns):
+        return
+    df = archivo_subida[["SOURCE_KEY_3", "SIES_MATCH_STATUS"]].astype(object).fillna("")
+    for key, status in zip(df["SOURCE_KEY_3"], df["SIES_MATCH_STATUS"]):
+        k = _normalize_text(key)
+        if not k:
+            continue
+        observed.setdefault(k, set()).add(_normalize_text(status))
+
+
 def _load_observed_universe(repo_root: Path, workbook: Path | None) -> dict[str, set[str]]:
     observed: dict[str, set[str]] = {}
 
     if workbook and workbook.exists():
-        df = pd.read_excel(workbook, sheet_name="ARCHIVO_LISTO_SUBIDA", dtype=str).fillna("")
-        if {"SOURCE_KEY_3", "SIES_MATCH_STATUS"}.issubset(df.columns):
-            for key, status in zip(df["SOURCE_KEY_3"], df["SIES_MATCH_STATUS"]):
-                k = _normalize_text(key)
-                if not k:
-                    continue
-                observed.setdefault(k, set()).add(_normalize_text(status))
+        df = pd.read_excel(workbook, sheet_name="ARCHIVO_LISTO_SUBIDA", dtype=str)
+        _add_observed_status(observed, df)
 
     block_patterns = [
         "resultados/sies_combinaciones_nuevas_bloqueantes.tsv",
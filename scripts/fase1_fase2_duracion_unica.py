@@ -32,7 +32,25 @@ def load() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     return dur, mat, pue
 
 
-def apply_contract_columns(dur: pd.DataFrame, mat: pd.DataFrame) -> pd.DataFrame:
+def referencia_codcarpr(mat: pd.DataFrame) -> pd.DataFrame:
+    """Índice CODIGO_SIES_FINAL -> CODCARPR distintos de la matriz (compartido por Fase 1+2 y Fase 3).
+
+    ``CODCARPR_REF_LIST`` une los no vacíos ordenados; ``TIENE_VACIO`` conserva si
+    la matriz trae CODCARPR vacío para el código (Fase 1+2 lo cuenta, Fase 3 no).
+    """
+    pares = mat[['CODIGO_SIES_FINAL', 'CODCARPR']].drop_duplicates()
+    vacio = pares['CODCARPR'].eq('')
+    llenos = pares[~vacio].sort_values(['CODIGO_SIES_FINAL', 'CODCARPR'], kind='mergesort')
+    ref = llenos.groupby('CODIGO_SIES_FINAL', sort=True)['CODCARPR'].agg(['size', '|'.join])
+    ref.columns = ['N_CODCARPR_REF', 'CODCARPR_REF_LIST']
+    ref = ref.reindex(pd.Index(pares['CODIGO_SIES_FINAL'].unique(), name='CODIGO_SIES_FINAL'))
+    ref['N_CODCARPR_REF'] = ref['N_CODCARPR_REF'].fillna(0).astype(int)
+    ref['CODCARPR_REF_LIST'] = ref['CODCARPR_REF_LIST'].fillna('')
+    ref['TIENE_VACIO'] = ref.index.isin(pares.loc[vacio, 'CODIGO_SIES_FINAL'])
+    return ref
+
+
+def apply_contract_columns(dur: pd.DataFrame, mat: pd.DataFrame, ref: pd.DataFrame | None = None) -> pd.DataFrame:
     out = dur.copy()
     for c in CONTRACT_COLS:
         if c not in out.columns:
@@ -42,31 +60,22 @@ def apply_contract_columns(dur: pd.DataFrame, mat: pd.DataFrame) -> pd.DataFrame
     out['FUENTE_GOBERNANZA'] = out['FUENTE_GOBERNANZA'].replace('', 'DURACION_ESTUDIOS')
     out['ESTADO_REGISTRO'] = out['ESTADO_REGISTRO'].replace('', 'ACTIVO')
 
-    # CODCARPR_CANONICO: solo si hay 1 unico CODCARPR para el CODIGO_SIES_FINAL.
-    canon = (
-        mat.groupby('CODIGO_SIES_FINAL')['CODCARPR']
-        .agg(lambda s: sorted(set(s)))
-        .to_dict()
-    )
-
-    def pick_canon(codigo: str) -> str:
-        vals = canon.get(codigo, [])
-        return vals[0] if len(vals) == 1 else ''
+    if ref is None:
+        ref = referencia_codcarpr(mat)
+    codigo = out['CODIGO_UNICO']
+    n_ref = codigo.map(ref['N_CODCARPR_REF']).fillna(0).astype(int)
+    lista = codigo.map(ref['CODCARPR_REF_LIST']).fillna('')
+    vacio = codigo.map(ref['TIENE_VACIO']).eq(True)
+    # Conjunto de la matriz incluyendo el CODCARPR vacío, si lo hay.
+    n_total = n_ref + vacio.astype(int)
 
-    out['CODCARPR_CANONICO'] = out.apply(
-        lambda r: r['CODCARPR_CANONICO'] if r['CODCARPR_CANONICO'] else pick_canon(r['CODIGO_UNICO']),
-        axis=1,
-    )
+    # CODCARPR_CANONICO: solo si hay 1 unico CODCARPR para el CODIGO_SIES_FINAL.
+    canon = lista.where(n_total.eq(1), '')
+    out['CODCARPR_CANONICO'] = out['CODCARPR_CANONICO'].mask(out['CODCARPR_CANONICO'].eq(''), canon)
 
     # Alias list: solo cuando hay multiples CODCARPR en matriz para el mismo codigo unico.
-    def alias_list(codigo: str) -> str:
-        vals = canon.get(codigo, [])
-        return '|'.join(vals) if len(vals) > 1 else ''
-
-    out['CODCARPR_ALIAS_LIST'] = out.apply(
-        lambda r: r['CODCARPR_ALIAS_LIST'] if r['CODCARPR_ALIAS_LIST'] else alias_list(r['CODIGO_UNICO']),
-        axis=1,
-    )
+    alias = ('|' + lista).where(vacio, lista).where(n_total.gt(1), '')
+    out['CODCARPR_ALIAS_LIST'] = out['CODCARPR_ALIAS_LIST'].mask(out['CODCARPR_ALIAS_LIST'].eq(''), alias)
 
     # Regla de desambiguacion por defecto, editable.
     out['REGLA_DESAMBIGUACION'] = out['REGLA_DESAMBIGUACION'].replace('', 'MATRIZ_VIGENTE_O_REVISION_MANUAL')
@@ -120,17 +129,26 @@ def build_report(dur: pd.DataFrame, mat: pd.DataFrame, pue: pd.DataFrame, backfi
     return pd.DataFrame(rows, columns=['metrica', 'valor'])
 
 
+def run_fase1_fase2(
+    dur: pd.DataFrame,
+    mat: pd.DataFrame,
+    pue: pd.DataFrame,
+    ref: pd.DataFrame | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Fase 1+2 en memoria: (DURACION con contrato, cola de backfill, reporte)."""
+    dur2 = apply_contract_columns(dur, mat, ref)
+    backfill = build_backfill_queue(dur2, mat)
+    report = build_report(dur2, mat, pue, backfill)
+    return dur2, backfill, report
+
+
 def main() -> None:
     ensure_dirs()
     dur, mat, pue = load()
 
-    dur2 = apply_contract_columns(dur, mat)
+    dur2, backfill, report = run_fase1_fase2(dur, mat, pue)
     dur2.to_csv(DUR_PATH, sep='\t', index=False)
-
-    backfill = build_backfill_queue(dur2, mat)
     backfill.to_csv(BACKFILL_PATH, sep='\t', index=False)
-
-    report = build_report(dur2, mat, pue, backfill)
     report.to_csv(REPORTE_PATH, sep='\t', index=False)
 
     print('FASE 1+2 DURACION UNICA')
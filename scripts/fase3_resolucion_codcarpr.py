@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import sys
 from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.fase1_fase2_duracion_unica import referencia_codcarpr  # noqa: E402
 
 BASE = Path(__file__).resolve().parents[1]
 DUR_PATH = BASE / 'DURACION_ESTUDIOS.tsv'
@@ -28,43 +36,23 @@ def load() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     return dur, mat, pue
 
 
-def build_resolution_catalog(dur: pd.DataFrame, mat: pd.DataFrame) -> pd.DataFrame:
-    ref = (
-        mat.groupby('CODIGO_SIES_FINAL')['CODCARPR']
-        .agg(lambda s: sorted(set(v for v in s if v)))
-        .to_dict()
-    )
-
-    rows = []
-    for row in dur.itertuples(index=False):
-        codigo = row.CODIGO_UNICO
-        cods = ref.get(codigo, [])
-        n = len(cods)
-        if n == 0:
-            estado = 'SIN_REFERENCIA_MATRIZ'
-            canon = ''
-            alias = ''
-        elif n == 1:
-            estado = 'UNICO'
-            canon = cods[0]
-            alias = ''
-        else:
-            estado = 'AMBIGUO'
-            canon = ''
-            alias = '|'.join(cods)
-
-        rows.append({
-            'CODIGO_UNICO': codigo,
-            'CODCARPR_CANONICO_FASE3': canon,
-            'CODCARPR_ALIAS_LIST_FASE3': alias,
-            'ESTADO_RESOLUCION_FASE3': estado,
-            'N_CODCARPR_REF': str(n),
-            'CODCARPR_REF_LIST': '|'.join(cods),
-            'FUENTE_REFERENCIA': 'MATRIZ_DESAMBIGUACION_SIES_FINAL',
-        })
-
-    cat = pd.DataFrame(rows)
-    return cat
+def build_resolution_catalog(dur: pd.DataFrame, mat: pd.DataFrame, ref: pd.DataFrame | None = None) -> pd.DataFrame:
+    if ref is None:
+        ref = referencia_codcarpr(mat)
+    codigo = dur['CODIGO_UNICO'].reset_index(drop=True)
+    # Fase 3 ignora CODCARPR vacíos de la matriz.
+    n = codigo.map(ref['N_CODCARPR_REF']).fillna(0).astype(int)
+    cods = codigo.map(ref['CODCARPR_REF_LIST']).fillna('')
+
+    return pd.DataFrame({
+        'CODIGO_UNICO': codigo,
+        'CODCARPR_CANONICO_FASE3': cods.where(n.eq(1), ''),
+        'CODCARPR_ALIAS_LIST_FASE3': cods.where(n.gt(1), ''),
+        'ESTADO_RESOLUCION_FASE3': np.select([n.eq(0), n.eq(1)], ['SIN_REFERENCIA_MATRIZ', 'UNICO'], default='AMBIGUO'),
+        'N_CODCARPR_REF': n.astype(str),
+        'CODCARPR_REF_LIST': cods,
+        'FUENTE_REFERENCIA': 'MATRIZ_DESAMBIGUACION_SIES_FINAL',
+    })
 
 
 def apply_resolution_to_duracion(dur: pd.DataFrame, cat: pd.DataFrame) -> pd.DataFrame:
@@ -74,55 +62,44 @@ def apply_resolution_to_duracion(dur: pd.DataFrame, cat: pd.DataFrame) -> pd.Dat
         if c not in out.columns:
             out[c] = ''
 
-    if 'CODCARPR_RESOLUCION_ESTADO' not in out.columns:
-        out['CODCARPR_RESOLUCION_ESTADO'] = ''
-
-    cidx = cat.set_index('CODIGO_UNICO')
-
-    def canon_for(codigo: str, previo: str) -> str:
-        if previo:
-            return previo
-        val = cidx.at[codigo, 'CODCARPR_CANONICO_FASE3'] if codigo in cidx.index else ''
-        return val
+    cidx = cat.drop_duplicates('CODIGO_UNICO').set_index('CODIGO_UNICO')
+    codigo = out['CODIGO_UNICO']
 
-    def alias_for(codigo: str, previo: str) -> str:
-        if previo:
-            return previo
-        val = cidx.at[codigo, 'CODCARPR_ALIAS_LIST_FASE3'] if codigo in cidx.index else ''
-        return val
+    for col, col_cat in [('CODCARPR_CANONICO', 'CODCARPR_CANONICO_FASE3'), ('CODCARPR_ALIAS_LIST', 'CODCARPR_ALIAS_LIST_FASE3')]:
+        resuelto = codigo.map(cidx[col_cat]).fillna('')
+        out[col] = out[col].mask(out[col].eq(''), resuelto)
+    out['CODCARPR_RESOLUCION_ESTADO'] = codigo.map(cidx['ESTADO_RESOLUCION_FASE3']).fillna('SIN_REFERENCIA_MATRIZ')
 
-    def estado_for(codigo: str) -> str:
-        if codigo not in cidx.index:
-            return 'SIN_REFERENCIA_MATRIZ'
-        return cidx.at[codigo, 'ESTADO_RESOLUCION_FASE3']
+    return out
 
-    out['CODCARPR_CANONICO'] = [canon_for(c, p) for c, p in zip(out['CODIGO_UNICO'], out['CODCARPR_CANONICO'])]
-    out['CODCARPR_ALIAS_LIST'] = [alias_for(c, p) for c, p in zip(out['CODIGO_UNICO'], out['CODCARPR_ALIAS_LIST'])]
-    out['CODCARPR_RESOLUCION_ESTADO'] = [estado_for(c) for c in out['CODIGO_UNICO']]
 
-    return out
+def load_stage(columns: list[str] | None = None) -> pd.DataFrame | None:
+    """ARCHIVO_LISTO_SUBIDA del output (solo ``columns`` si se indican); None si no existe."""
+    if not OUT_XLSX_PATH.exists():
+        return None
+    usecols = None if columns is None else (lambda c: c in set(columns))
+    return pd.read_excel(OUT_XLSX_PATH, sheet_name='ARCHIVO_LISTO_SUBIDA', dtype=str, usecols=usecols).fillna('')
 
 
-def validate_with_output_xlsx(cat: pd.DataFrame) -> dict[str, str]:
+def validate_with_output_xlsx(cat: pd.DataFrame, stage: pd.DataFrame | None = None) -> dict[str, str]:
     metrics: dict[str, str] = {}
-    if not OUT_XLSX_PATH.exists():
+    if stage is None:
+        stage = load_stage(['CODIGO_CARRERA_SIES_FINAL'])
+    if stage is None:
         metrics['output_xlsx_present'] = 'False'
         return metrics
 
-    stage = pd.read_excel(OUT_XLSX_PATH, sheet_name='ARCHIVO_LISTO_SUBIDA', dtype=str).fillna('')
     if 'CODIGO_CARRERA_SIES_FINAL' not in stage.columns:
         metrics['output_xlsx_present'] = 'True'
         metrics['output_col_present'] = 'False'
         return metrics
 
     codigos_out = set(v for v in stage['CODIGO_CARRERA_SIES_FINAL'] if v)
-    cat_idx = cat.set_index('CODIGO_UNICO')
+    cat_codes = set(cat['CODIGO_UNICO'])
+    unicos = set(cat.loc[cat['ESTADO_RESOLUCION_FASE3'].eq('UNICO'), 'CODIGO_UNICO'])
 
-    miss = sorted(c for c in codigos_out if c not in cat_idx.index)
-    not_unique = sorted(
-        c for c in codigos_out
-        if c in cat_idx.index and cat_idx.at[c, 'ESTADO_RESOLUCION_FASE3'] != 'UNICO'
-    )
+    miss = codigos_out - cat_codes
+    not_unique = (codigos_out & cat_codes) - unicos
 
     metrics['output_xlsx_present'] = 'True'
     metrics['output_col_present'] = 'True'
@@ -156,21 +133,30 @@ def build_report(dur: pd.DataFrame, mat: pd.DataFrame, pue: pd.DataFrame, cat: p
     return pd.DataFrame(rows, columns=['metrica', 'valor'])
 
 
+def run_fase3(
+    dur: pd.DataFrame,
+    mat: pd.DataFrame,
+    pue: pd.DataFrame,
+    stage: pd.DataFrame | None = None,
+    ref: pd.DataFrame | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Fase 3 en memoria: (catalogo, DURACION resuelta, ambiguos, reporte)."""
+    cat = build_resolution_catalog(dur, mat, ref)
+    dur2 = apply_resolution_to_duracion(dur, cat)
+    amb = cat[cat['ESTADO_RESOLUCION_FASE3'] != 'UNICO'].copy()
+    out_metrics = validate_with_output_xlsx(cat, stage)
+    rep = build_report(dur2, mat, pue, cat, out_metrics)
+    return cat, dur2, amb, rep
+
+
 def main() -> None:
     ensure_dirs()
     dur, mat, pue = load()
 
-    cat = build_resolution_catalog(dur, mat)
+    cat, dur2, amb, rep = run_fase3(dur, mat, pue)
     cat.to_csv(CATALOGO_PATH, sep='\t', index=False)
-
-    dur2 = apply_resolution_to_duracion(dur, cat)
     dur2.to_csv(DUR_PATH, sep='\t', index=False)
-
-    amb = cat[cat['ESTADO_RESOLUCION_FASE3'] != 'UNICO'].copy()
     amb.to_csv(AMB_PATH, sep='\t', index=False)
-
-    out_metrics = validate_with_output_xlsx(cat)
-    rep = build_report(dur2, mat, pue, cat, out_metrics)
     rep.to_csv(REP_PATH, sep='\t', index=False)
 
     print('FASE 3 RESOLUCION CODCARPR')
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from pathlib import Path
-import re
+
+import numpy as np
 import pandas as pd
 
 
@@ -13,6 +14,8 @@ DETALLE_PATH = BASE / 'control' / 'reportes' / 'fase4_adaptador_detalle.tsv'
 REPORTE_PATH = BASE / 'control' / 'reportes' / 'reporte_fase4_adaptador_paralelo.tsv'
 PEND_PATH = BASE / 'control' / 'pendientes' / 'fase4_adaptador_pendientes.tsv'
 
+STAGE_COLS = ['CODCLI', 'CODCARPR_NORM', 'JOR', 'CODIGO_CARRERA_SIES_FINAL', 'INCLUIR_EN_MATRICULA_32']
+
 
 def ensure_dirs() -> None:
     DETALLE_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -20,106 +23,70 @@ def ensure_dirs() -> None:
     PEND_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
-def parse_jornada_from_codigo(codigo_unico: str) -> str:
-    m = re.search(r'J(\d+)V\d+$', str(codigo_unico))
-    return m.group(1) if m else ''
-
-
-def explode_alias(canon: str, alias: str) -> list[str]:
-    cods = set()
-    c = str(canon).strip()
-    if c:
-        cods.add(c)
-    a = str(alias).strip()
-    if a:
-        for x in a.split('|'):
-            x = x.strip()
-            if x:
-                cods.add(x)
-    return sorted(cods)
-
-
-def build_duracion_lookup(dur: pd.DataFrame) -> dict[tuple[str, str], list[str]]:
-    """(CODCARPR, JOR_NUM) -> [CODIGO_UNICO candidatos con estado UNICO]."""
-    lookup: dict[tuple[str, str], list[str]] = {}
-    df = dur[dur['CODCARPR_RESOLUCION_ESTADO'].eq('UNICO')].copy()
-
-    for row in df.itertuples(index=False):
-        cod_unico = row.CODIGO_UNICO
-        jor_num = parse_jornada_from_codigo(cod_unico)
-        codcarprs = explode_alias(row.CODCARPR_CANONICO, row.CODCARPR_ALIAS_LIST)
-        for cp in codcarprs:
-            key = (cp, jor_num)
-            lookup.setdefault(key, [])
-            if cod_unico not in lookup[key]:
-                lookup[key].append(cod_unico)
+def build_duracion_lookup(dur: pd.DataFrame) -> pd.DataFrame:
+    """Índice (CODCARPR, JOR_NUM) -> CODIGO_UNICO candidatos con estado UNICO.
 
+    ``CANDIDATOS_DURACION`` une los candidatos en orden de aparición en DURACION.
+    """
+    df = dur.loc[dur['CODCARPR_RESOLUCION_ESTADO'].eq('UNICO'), ['CODIGO_UNICO', 'CODCARPR_CANONICO', 'CODCARPR_ALIAS_LIST']]
+    cods = (df['CODCARPR_CANONICO'].astype(str) + '|' + df['CODCARPR_ALIAS_LIST'].astype(str)).str.split('|')
+    pares = pd.DataFrame({
+        'CODIGO_UNICO': df['CODIGO_UNICO'],
+        'JOR_NUM': df['CODIGO_UNICO'].astype(str).str.extract(r'J(\d+)V\d+$', expand=False).fillna(''),
+        'CODCARPR': cods,
+    }).explode('CODCARPR')
+    pares['CODCARPR'] = pares['CODCARPR'].str.strip()
+    pares = pares[pares['CODCARPR'].ne('')].drop_duplicates(['CODCARPR', 'JOR_NUM', 'CODIGO_UNICO'])
+
+    lookup = pares.groupby(['CODCARPR', 'JOR_NUM'], sort=False)['CODIGO_UNICO'].agg(['size', '|'.join])
+    lookup.columns = ['N_CANDIDATOS_DURACION', 'CANDIDATOS_DURACION']
     return lookup
 
 
-def main() -> None:
-    ensure_dirs()
-
-    dur = pd.read_csv(DUR_PATH, sep='\t', dtype=str).fillna('')
-    stage = pd.read_excel(OUT_XLSX_PATH, sheet_name='ARCHIVO_LISTO_SUBIDA', dtype=str).fillna('')
-
-    needed = ['CODCLI', 'CODCARPR_NORM', 'JOR', 'CODIGO_CARRERA_SIES_FINAL', 'INCLUIR_EN_MATRICULA_32']
-    missing = [c for c in needed if c not in stage.columns]
+def build_detalle(stage: pd.DataFrame, lookup: pd.DataFrame) -> pd.DataFrame:
+    missing = [c for c in STAGE_COLS if c not in stage.columns]
     if missing:
         raise RuntimeError(f'Faltan columnas en output para Fase4: {missing}')
 
-    lookup = build_duracion_lookup(dur)
-
-    rows = []
-    for r in stage.itertuples(index=False):
-        codcli = r.CODCLI
-        codcarpr = str(r.CODCARPR_NORM).strip()
-        jor = str(r.JOR).strip()
-        actual = str(r.CODIGO_CARRERA_SIES_FINAL).strip()
-        incluir = str(r.INCLUIR_EN_MATRICULA_32).strip()
-
-        cands = lookup.get((codcarpr, jor), [])
-        if len(cands) == 1:
-            proposed = cands[0]
-            source = 'DURACION_UNICO'
-            estado = 'RESUELTO_DURACION'
-        elif len(cands) > 1:
-            proposed = ''
-            source = 'DURACION_MULTIPLE'
-            estado = 'REQUIERE_REVISION_DURACION'
-        elif actual:
-            proposed = actual
-            source = 'FALLBACK_PIPELINE_ACTUAL'
-            estado = 'RESUELTO_FALLBACK'
-        else:
-            proposed = ''
-            source = 'SIN_RESOLUCION'
-            estado = 'PENDIENTE'
-
-        rows.append({
-            'CODCLI': codcli,
-            'CODCARPR_NORM': codcarpr,
-            'JOR': jor,
-            'INCLUIR_EN_MATRICULA_32': incluir,
-            'CODIGO_SIES_ACTUAL': actual,
-            'CODIGO_SIES_PROPUESTO_F4': proposed,
-            'FUENTE_PROPUESTA_F4': source,
-            'ESTADO_F4': estado,
-            'N_CANDIDATOS_DURACION': str(len(cands)),
-            'CANDIDATOS_DURACION': '|'.join(cands),
-            'COINCIDE_CON_ACTUAL': 'SI' if proposed and actual and proposed == actual else 'NO',
-        })
-
-    detalle = pd.DataFrame(rows)
-    detalle.to_csv(DETALLE_PATH, sep='\t', index=False)
-
-    pendientes = detalle[detalle['ESTADO_F4'].isin(['PENDIENTE', 'REQUIERE_REVISION_DURACION'])].copy()
-    pendientes.to_csv(PEND_PATH, sep='\t', index=False)
-
+    codcarpr = stage['CODCARPR_NORM'].astype(str).str.strip()
+    jor = stage['JOR'].astype(str).str.strip()
+    actual = stage['CODIGO_CARRERA_SIES_FINAL'].astype(str).str.strip()
+
+    pos = lookup.index.get_indexer(pd.MultiIndex.from_arrays([codcarpr, jor]))
+    hit = pos >= 0
+    if lookup.empty:
+        # Sin filas UNICO en DURACION no hay candidatos (y no hay posición que tomar).
+        n_cands = np.zeros(len(stage), dtype=int)
+        cands = np.full(len(stage), '', dtype=object)
+    else:
+        take = np.where(hit, pos, 0)
+        n_cands = np.where(hit, lookup['N_CANDIDATOS_DURACION'].to_numpy()[take], 0)
+        cands = np.where(hit, lookup['CANDIDATOS_DURACION'].to_numpy()[take], '')
+    tiene_actual = actual.ne('').to_numpy()
+
+    conds = [n_cands == 1, n_cands > 1, tiene_actual]
+    proposed = pd.Series(np.select(conds, [cands, '', actual], default=''), index=stage.index)
+    detalle = pd.DataFrame({
+        'CODCLI': stage['CODCLI'],
+        'CODCARPR_NORM': codcarpr,
+        'JOR': jor,
+        'INCLUIR_EN_MATRICULA_32': stage['INCLUIR_EN_MATRICULA_32'].astype(str).str.strip(),
+        'CODIGO_SIES_ACTUAL': actual,
+        'CODIGO_SIES_PROPUESTO_F4': proposed,
+        'FUENTE_PROPUESTA_F4': np.select(conds, ['DURACION_UNICO', 'DURACION_MULTIPLE', 'FALLBACK_PIPELINE_ACTUAL'], default='SIN_RESOLUCION'),
+        'ESTADO_F4': np.select(conds, ['RESUELTO_DURACION', 'REQUIERE_REVISION_DURACION', 'RESUELTO_FALLBACK'], default='PENDIENTE'),
+        'N_CANDIDATOS_DURACION': n_cands.astype(str),
+        'CANDIDATOS_DURACION': cands,
+        'COINCIDE_CON_ACTUAL': np.where(proposed.ne('') & actual.ne('') & proposed.eq(actual), 'SI', 'NO'),
+    })
+    return detalle.reset_index(drop=True)
+
+
+def build_report(detalle: pd.DataFrame) -> pd.DataFrame:
     comp = detalle[(detalle['CODIGO_SIES_PROPUESTO_F4'] != '') & (detalle['CODIGO_SIES_ACTUAL'] != '')]
     coincide = int((comp['COINCIDE_CON_ACTUAL'] == 'SI').sum())
 
-    rep = pd.DataFrame([
+    return pd.DataFrame([
         ('total_filas_output', str(len(detalle))),
         ('filas_incluir_mu32_si', str(int((detalle['INCLUIR_EN_MATRICULA_32'] == 'SI').sum()))),
         ('resueltas_por_duracion_unico', str(int((detalle['FUENTE_PROPUESTA_F4'] == 'DURACION_UNICO').sum()))),
@@ -130,6 +97,32 @@ def main() -> None:
         ('coinciden_con_actual', str(coincide)),
         ('tasa_coincidencia_pct', f"{(coincide / len(comp) * 100):.2f}" if len(comp) else '0.00'),
     ], columns=['metrica', 'valor'])
+
+
+def run_fase4(
+    dur: pd.DataFrame,
+    stage: pd.DataFrame,
+    lookup: pd.DataFrame | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Fase 4 en memoria: (detalle, pendientes, reporte)."""
+    if lookup is None:
+        lookup = build_duracion_lookup(dur)
+    detalle = build_detalle(stage, lookup)
+    pendientes = detalle[detalle['ESTADO_F4'].isin(['PENDIENTE', 'REQUIERE_REVISION_DURACION'])].copy()
+    return detalle, pendientes, build_report(detalle)
+
+
+def main() -> None:
+    ensure_dirs()
+
+    dur = pd.read_csv(DUR_PATH, sep='\t', dtype=str).fillna('')
+    stage = pd.read_excel(
+        OUT_XLSX_PATH, sheet_name='ARCHIVO_LISTO_SUBIDA', dtype=str, usecols=lambda c: c in STAGE_COLS
+    ).fillna('')
+
+    detalle, pendientes, rep = run_fase4(dur, stage)
+    detalle.to_csv(DETALLE_PATH, sep='\t', index=False)
+    pendientes.to_csv(PEND_PATH, sep='\t', index=False)
     rep.to_csv(REPORTE_PATH, sep='\t', index=False)
 
     print('FASE 4 ADAPTADOR PARALELO CODCARPR')
@@ -0,0 +1,108 @@
+"""Orquestador Fase 1+2 -> Fase 3 -> Fase 4 (CODCARPR / DURACION_ESTUDIOS).
+
+Equivale a correr en secuencia ``fase1_fase2_duracion_unica.py``,
+``fase3_resolucion_codcarpr.py`` y ``fase4_adaptador_paralelo_codcarpr.py``,
+pero cada insumo se lee una sola vez: DURACION_ESTUDIOS, matriz y puente
+desde TSV, y de ``archivo_listo_para_sies.xlsx`` solo las columnas que usan
+Fase 3 y Fase 4. La referencia matriz -> CODCARPR y el lookup de duración
+se construyen una vez y pasan entre fases en memoria; DURACION_ESTUDIOS.tsv
+se escribe una sola vez con el estado final.
+
+Uso:
+    python scripts/fases_codcarpr_duracion.py [--sin-fase4]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import fase1_fase2_duracion_unica as f12  # noqa: E402
+from scripts import fase3_resolucion_codcarpr as f3  # noqa: E402
+from scripts import fase4_adaptador_paralelo_codcarpr as f4  # noqa: E402
+from src.export import atomic_to_csv  # noqa: E402
+
+STAGE_COLS = sorted(set(f4.STAGE_COLS) | {'CODIGO_CARRERA_SIES_FINAL'})
+
+
+@dataclass
+class InsumosFases:
+    dur: pd.DataFrame
+    mat: pd.DataFrame
+    pue: pd.DataFrame
+    stage: pd.DataFrame | None
+
+
+def cargar_insumos(con_stage: bool = True) -> InsumosFases:
+    dur, mat, pue = f12.load()
+    stage = f3.load_stage(STAGE_COLS) if con_stage else None
+    return InsumosFases(dur=dur, mat=mat, pue=pue, stage=stage)
+
+
+def ejecutar_fases(insumos: InsumosFases, fase4: bool = True) -> dict[str, pd.DataFrame]:
+    """Corre las fases en memoria y devuelve cada artefacto por nombre (sin escribir)."""
+    ref = f12.referencia_codcarpr(insumos.mat)
+
+    dur12, backfill, rep12 = f12.run_fase1_fase2(insumos.dur, insumos.mat, insumos.pue, ref)
+    cat, dur3, amb, rep3 = f3.run_fase3(dur12, insumos.mat, insumos.pue, insumos.stage, ref)
+    artefactos = {
+        'duracion': dur3,
+        'backfill': backfill,
+        'reporte_fase1_fase2': rep12,
+        'catalogo_fase3': cat,
+        'ambiguos_fase3': amb,
+        'reporte_fase3': rep3,
+    }
+
+    if fase4 and insumos.stage is not None:
+        lookup = f4.build_duracion_lookup(dur3)
+        detalle, pendientes, rep4 = f4.run_fase4(dur3, insumos.stage, lookup)
+        artefactos.update({'detalle_fase4': detalle, 'pendientes_fase4': pendientes, 'reporte_fase4': rep4})
+    return artefactos
+
+
+SALIDAS = {
+    'duracion': f12.DUR_PATH,
+    'backfill': f12.BACKFILL_PATH,
+    'reporte_fase1_fase2': f12.REPORTE_PATH,
+    'catalogo_fase3': f3.CATALOGO_PATH,
+    'ambiguos_fase3': f3.AMB_PATH,
+    'reporte_fase3': f3.REP_PATH,
+    'detalle_fase4': f4.DETALLE_PATH,
+    'pendientes_fase4': f4.PEND_PATH,
+    'reporte_fase4': f4.REPORTE_PATH,
+}
+
+
+def escribir_artefactos(artefactos: dict[str, pd.DataFrame]) -> None:
+    for nombre, df in artefactos.items():
+        path = SALIDAS[nombre]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_to_csv(df, path, sep='\t', index=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Fase 1+2, 3 y 4 CODCARPR/duracion con lectura unica de insumos')
+    parser.add_argument('--sin-fase4', action='store_true', help='Omitir Fase 4 (detalle y pendientes por CODCLI)')
+    args = parser.parse_args()
+
+    insumos = cargar_insumos(con_stage=True)
+    if insumos.stage is None and not args.sin_fase4:
+        print(f'⚠️ Fase 4 omitida: no existe {f3.OUT_XLSX_PATH}')
+    artefactos = ejecutar_fases(insumos, fase4=not args.sin_fase4)
+    escribir_artefactos(artefactos)
+
+    print('FASES CODCARPR / DURACION')
+    for nombre, df in artefactos.items():
+        print(f'  ✅ {nombre}: {SALIDAS[nombre]} ({len(df)} filas)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Loop de remediación SIN_MATCH_SIES en memoria (reemplaza run_loop_remediacion_codcli.sh).
+
+Carga una sola vez ARCHIVO_LISTO_SUBIDA del último output y DURACION_ESTUDIOS.tsv.
+En cada iteración:
+  1. Remedia DURACION en memoria (alias CODCARPR desde SIN_MATCH_SIES).
+  2. Recompila el puente SIES desde esa DURACION, sin escribir a disco.
+  3. Re-ejecuta solo el cruce catálogo/puente y la resolución SIES_MATCH_STATUS.
+Se detiene al converger: sin pendientes, sin cambios en DURACION, sin mejora,
+bajo el umbral o al llegar a --max-iter. Los artefactos se escriben solo al
+final: DURACION (con respaldo), planes por iteración, puente compilado, bundle
+de gobernanza si existe y una corrida completa del pipeline MU.
+
+Uso:
+  python3 scripts/loop_remediacion_codcli.py --input /ruta/PROMEDIOSDEALUMNOS_7804.xlsx
+  python3 scripts/loop_remediacion_codcli.py --dry-run
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import io
+import shutil
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import compile_puente_sies_compilado as puente  # noqa: E402
+from scripts.remediar_duracion_desde_sin_match import (  # noqa: E402
+    apply_aliases,
+    build_candidates,
+    preparar_duracion,
+    preparar_sin_match,
+)
+from src.catalogs import GOVERNANCE_BUNDLE_FILENAME, compile_governance_bundle  # noqa: E402
+from src.export import atomic_to_csv, atomic_write_json  # noqa: E402
+
+ACCIONES_ALIAS = {"APLICAR_ALIAS", "APLICAR_ALIAS_Y_DUP_NOMBRE"}
+
+
+@dataclass
+class Iteracion:
+    """Deltas de una iteración; MATCH/AMBIGUO se cuentan tras el cruce con el puente (antes de Fase 3)."""
+
+    iteracion: int
+    sin_match_antes: int
+    sin_match_despues: int
+    delta: int
+    grupos_alias: int
+    cambios_duracion: int
+    match_sies: int
+    ambiguo_sies: int
+    segundos: float
+
+
+@dataclass
+class ResultadoLoop:
+    iteraciones: list[Iteracion] = field(default_factory=list)
+    planes: list[pd.DataFrame] = field(default_factory=list)
+    motivo_paro: str = ""
+    duracion: pd.DataFrame | None = None
+    puente: pd.DataFrame | None = None
+
+    @property
+    def cambios(self) -> int:
+        return sum(it.cambios_duracion for it in self.iteraciones)
+
+
+def _cargar_archivo_subida(excel_path: Path) -> pd.DataFrame:
+    """ARCHIVO_LISTO_SUBIDA como texto (llaves intactas) con ES_DIPLOMADO booleano."""
+    df = pd.read_excel(excel_path, sheet_name="ARCHIVO_LISTO_SUBIDA", dtype=str)
+    if "ES_DIPLOMADO" in df.columns:
+        df["ES_DIPLOMADO"] = df["ES_DIPLOMADO"].fillna("").str.strip().str.upper().isin({"TRUE", "1", "SI"})
+    return df
+
+
+def _duracion_texto(dur: pd.DataFrame) -> pd.DataFrame:
+    """DURACION como la leen pipeline y compilador tras escribirla (``keep_default_na=False``)."""
+    return dur.drop(columns=["CARRERA_N", "JORNADA_N"], errors="ignore").fillna("").reset_index(drop=True)
+
+
+def _puente_como_tsv(compiled: pd.DataFrame) -> pd.DataFrame:
+    """Puente compilado con los tipos del TSV en disco (texto, sin NA), sin tocar el disco."""
+    buf = io.StringIO()
+    compiled.to_csv(buf, sep="\t", index=False)
+    buf.seek(0)
+    return pd.read_csv(buf, sep="\t", dtype=str, keep_default_na=False)
+
+
+def _compilar_puente(dur_texto: pd.DataFrame, observados: dict[str, set[str]]) -> pd.DataFrame:
+    base_rows = puente._duracion_rows_from_frame(dur_texto)
+    return puente._compile_catalog(base_rows, puente._load_override_rows(None), observed_status_map=observados)
+
+
+def ejecutar_loop(
+    archivo_subida: pd.DataFrame,
+    duracion: pd.DataFrame,
+    observados: dict[str, set[str]],
+    pipeline,
+    max_iter: int = 5,
+    umbral_sin_match: int = 1000,
+    excluir_diplomados: bool = True,
+) -> ResultadoLoop:
+    """Itera remediación → puente → resolución SIES en memoria hasta converger.
+
+    ``pipeline`` es el módulo ``codigo_gobernanza_v2``, del que solo se usan las
+    etapas de cruce con catálogo/puente. COD_CAR se conserva del output base:
+    la cascada completa corre una sola vez en la corrida final.
+    """
+    resultado = ResultadoLoop(duracion=preparar_duracion(duracion))
+    archivo = archivo_subida
+    for i in range(1, max_iter + 1):
+        t0 = time.perf_counter()
+        sin = preparar_sin_match(archivo)
+        if sin.empty:
+            resultado.motivo_paro = "sin_pendientes"
+            break
+        plan = build_candidates(sin, resultado.duracion)
+        plan["ITERACION"] = i
+        dur_nueva, cambios = apply_aliases(resultado.duracion, plan)
+        resultado.planes.append(plan)
+        if cambios == 0:
+            resultado.motivo_paro = "sin_cambios_duracion"
+            break
+
+        dur_texto = _duracion_texto(dur_nueva)
+        compiled = _compilar_puente(dur_texto, observados)
+        df_bridge, _ = pipeline._prepare_puente_compilado(_puente_como_tsv(compiled))
+        df_manual, _ = pipeline._compile_catalog_and_bridge_from_duracion(dur_texto)
+        archivo, _ = pipeline._merge_puente_sies(archivo, df_manual, df_bridge, excluir_diplomados)
+        resultado.duracion = dur_nueva
+        resultado.puente = compiled
+
+        status = archivo["SIES_MATCH_STATUS"]
+        n_despues = len(preparar_sin_match(archivo))
+        it = Iteracion(
+            iteracion=i,
+            sin_match_antes=len(sin),
+            sin_match_despues=n_despues,
+            delta=n_despues - len(sin),
+            grupos_alias=int(plan["ACCION"].isin(ACCIONES_ALIAS).sum()),
+            cambios_duracion=cambios,
+            match_sies=int(status.eq("MATCH_SIES").sum()),
+            ambiguo_sies=int(status.eq("AMBIGUO_SIES").sum()),
+            segundos=round(time.perf_counter() - t0, 3),
+        )
+        resultado.iteraciones.append(it)
+        print(
+            f"  ↳ Iteración {i}: SIN_MATCH {it.sin_match_antes} → {it.sin_match_despues} "
+            f"(Δ {it.delta:+d}), alias {it.grupos_alias}, cambios DURACION {cambios}, {it.segundos:.2f}s"
+        )
+        if n_despues == 0:
+            resultado.motivo_paro = "sin_pendientes"
+            break
+        if it.delta >= 0:
+            resultado.motivo_paro = "sin_mejora"
+            break
+        if n_despues < umbral_sin_match:
+            resultado.motivo_paro = "bajo_umbral"
+            break
+    else:
+        resultado.motivo_paro = "max_iter"
+    return resultado
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Loop de remediación SIN_MATCH_SIES en memoria")
+    p.add_argument("--input", default=None, help="Excel de entrada para la corrida final del pipeline (opcional)")
+    p.add_argument("--excel", default="resultados/archivo_listo_para_sies.xlsx", help="Output previo con ARCHIVO_LISTO_SUBIDA")
+    p.add_argument("--duracion", default="DURACION_ESTUDIOS.tsv")
+    p.add_argument("--output-dir", default="resultados", help="Carpeta de outputs de la corrida final")
+    p.add_argument("--max-iter", type=int, default=5)
+    p.add_argument("--umbral-sin-match", type=int, default=1000, help="Paro temprano cuando SIN_MATCH_SIES baja de este valor")
+    p.add_argument("--reporte", default="control/reportes/loop_remediacion_codcli.json")
+    p.add_argument("--dry-run", action="store_true", help="Solo reporta iteraciones; no escribe DURACION ni outputs")
+    return p.parse_args()
+
+
+def _resolver(path: str) -> Path:
+    p = Path(path).expanduser()
+    return p if p.is_absolute() else (REPO_ROOT / p).resolve()
+
+
+def main() -> int:
+    args = parse_args()
+    excel_path = _resolver(args.excel)
+    dur_path = _resolver(args.duracion)
+    if not excel_path.exists():
+        print(f"❌ No existe output previo: {excel_path}")
+        return 2
+
+    print("📥 Cargando fuentes (una vez)...")
+    archivo = _cargar_archivo_subida(excel_path)
+    duracion = pd.read_csv(dur_path, sep="\t", dtype=str)
+    observados = puente._load_observed_universe(REPO_ROOT, None)
+    puente._add_observed_status(observados, archivo)
+
+    import codigo_gobernanza_v2 as pipeline
+
+    print(f"🔁 Remediación en memoria (máx. {args.max_iter} iteraciones)...")
+    resultado = ejecutar_loop(archivo, duracion, observados, pipeline, args.max_iter, args.umbral_sin_match)
+    print(f"  ✅ Paro: {resultado.motivo_paro} | cambios DURACION acumulados: {resultado.cambios}")
+
+    reporte: dict[str, object] = {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "excel_base": str(excel_path),
+        "motivo_paro": resultado.motivo_paro,
+        "iteraciones": [asdict(it) for it in resultado.iteraciones],
+        "dry_run": bool(args.dry_run),
+    }
+    if args.dry_run or resultado.cambios == 0:
+        print("ℹ️  Sin escrituras (dry-run o sin cambios en DURACION).")
+        atomic_write_json(_resolver(args.reporte), reporte)
+        return 0
+
+    # Escrituras finales: una sola vez, tras converger.
+    stamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    backup = REPO_ROOT / "control" / "backups" / f"DURACION_ESTUDIOS_backup_pre_loop_{stamp}.tsv"
+    backup.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(dur_path, backup)
+    dur_final = _duracion_texto(resultado.duracion)
+    atomic_to_csv(dur_final, dur_path, sep="\t", index=False)
+    for plan in resultado.planes:
+        i = int(plan["ITERACION"].iloc[0]) if not plan.empty else 0
+        plan_path = REPO_ROOT / "control" / "reportes" / f"plan_remediacion_duracion_desde_sin_match_iter{i}_auto.tsv"
+        atomic_to_csv(plan.drop(columns=["ITERACION"]), plan_path, sep="\t", index=False)
+    puente_path = REPO_ROOT / "control" / "catalogos" / "PUENTE_SIES_COMPILADO.tsv"
+    atomic_to_csv(resultado.puente, puente_path, sep="\t", index=False, encoding="utf-8")
+    bundle_path = REPO_ROOT / "control" / "catalogos" / GOVERNANCE_BUNDLE_FILENAME
+    if bundle_path.exists():
+        compile_governance_bundle(
+            REPO_ROOT,
+            bundle_path,
+            derived={"catalogo_puente_duracion": lambda: pipeline._compile_catalog_and_bridge_from_duracion(dur_final)},
+        )
+    print(f"  📄 DURACION actualizada ({backup.name} como respaldo), puente y planes escritos")
+    reporte.update({"respaldo_duracion": str(backup), "puente": str(puente_path)})
+
+    if args.input:
+        print("📦 Corrida final del pipeline MU (en proceso)...")
+        # Bundle y matriz SIES se cargaron con la DURACION previa: releerlos con la nueva.
+        pipeline.reset_governance_state()
+        try:
+            reports = pipeline.main([
+                "--input", args.input, "--output-dir", str(_resolver(args.output_dir)),
+                "--proceso", "matricula", "--usar-gobernanza-v2", "true",
+            ])
+        except RuntimeError as exc:
+            print(f"  ❌ Corrida final bloqueada: {exc}")
+            reporte["corrida_final"] = f"ERROR: {exc}"
+            atomic_write_json(_resolver(args.reporte), reporte)
+            return 1
+        artefactos = pipeline.mu_run_artifacts(reports.get("matricula", {}).get("mu_run_id", ""))
+        if artefactos is not None:
+            final = artefactos.sheets["ARCHIVO_LISTO_SUBIDA"]
+            reporte["corrida_final"] = {
+                "COD_CAR_OK": int(final["COD_CAR"].notna().sum()),
+                "COD_CAR_NULL": int(final["COD_CAR"].isna().sum()),
+                "SIN_MATCH_SIES": int(final["SIES_MATCH_STATUS"].eq("SIN_MATCH_SIES").sum()),
+            }
+            print(f"  ✅ {reporte['corrida_final']}")
+    atomic_write_json(_resolver(args.reporte), reporte)
+    print(f"  📄 Reporte: {_resolver(args.reporte)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
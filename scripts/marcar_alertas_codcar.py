@@ -1,88 +1,105 @@
+"""Marca en rojo las filas de ARCHIVO_LISTO_SUBIDA que requieren revisión COD_CAR/SIES.
+
+La vía preferida es en la exportación: ``codigo_gobernanza_v2.py
+--marcar-alertas-codcar true`` usa las reglas de ``src.governance.alertas_codcar``
+para marcar las filas mientras el writer en streaming las escribe, sin volver
+a abrir el libro.
+
+Este script queda para workbooks ya exportados: agrega una sola regla de
+formato condicional sobre la hoja (Excel la evalúa; no se pinta celda por
+celda), recrea ALERTAS_REVISION con las filas en alerta y guarda sobre un
+temporal. El respaldo se hace por rename del original (sin copiar bytes).
+"""
+from __future__ import annotations
+
+import os
+import sys
 from pathlib import Path
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
 
-def main():
-    excel_path = Path("resultados/archivo_listo_para_sies.xlsx")
-    backup_path = Path("resultados/archivo_listo_para_sies_BACKUP.xlsx")
+import pandas as pd
 
-    if not excel_path.exists():
-        raise SystemExit(f"❌ No existe: {excel_path}")
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.export import atomic_path  # noqa: E402
+from src.governance.alertas_codcar import (  # noqa: E402
+    ALERTA_OPT,
+    ALERTA_REQUIRED,
+    HOJA_ALERTAS,
+    HOJA_SUBIDA,
+    RED_FILL_COLOR,
+    construir_hoja_alertas,
+    formula_alerta_codcar,
+    motivo_alerta_codcar,
+)
 
-    backup_path.parent.mkdir(parents=True, exist_ok=True)
-    if not backup_path.exists():
-        backup_path.write_bytes(excel_path.read_bytes())
-        print(f"✅ Backup creado: {backup_path}")
-    else:
-        print(f"ℹ️ Backup ya existe: {backup_path}")
+
+def marcar_alertas_workbook(excel_path: Path, backup_path: Path) -> int:
+    from openpyxl import load_workbook
+    from openpyxl.formatting.rule import FormulaRule
+    from openpyxl.styles import PatternFill
+    from openpyxl.utils import get_column_letter
 
     wb = load_workbook(excel_path)
-    if "ARCHIVO_LISTO_SUBIDA" not in wb.sheetnames:
-        raise SystemExit("❌ No existe hoja ARCHIVO_LISTO_SUBIDA en el Excel.")
+    if HOJA_SUBIDA not in wb.sheetnames:
+        raise SystemExit(f"❌ No existe hoja {HOJA_SUBIDA} en el Excel.")
 
-    ws = wb["ARCHIVO_LISTO_SUBIDA"]
+    ws = wb[HOJA_SUBIDA]
     headers = [c.value for c in next(ws.iter_rows(min_row=1, max_row=1))]
     idx = {h: i + 1 for i, h in enumerate(headers) if h}
+    needed = [c for c in ALERTA_REQUIRED + ALERTA_OPT if c in idx]
+    # Solo las columnas de la regla y las clave, leídas por columna.
+    datos = pd.DataFrame(
+        {
+            c: list(next(ws.iter_cols(min_col=idx[c], max_col=idx[c], min_row=2, max_row=ws.max_row, values_only=True), ()))
+            for c in needed
+        }
+    )
+    try:
+        motivo = motivo_alerta_codcar(datos)
+    except ValueError as exc:
+        raise SystemExit(f"❌ {exc}") from exc
+
+    letras = {c: get_column_letter(idx[c]) for c in ALERTA_REQUIRED}
+    formula = formula_alerta_codcar(letras)
+    rango = f"A2:{get_column_letter(max(ws.max_column, 1))}{max(ws.max_row, 2)}"
+    ya_existe = any(formula in (rule.formula or []) for cf in ws.conditional_formatting for rule in cf.rules)
+    if not ya_existe:
+        red = PatternFill(start_color=RED_FILL_COLOR, end_color=RED_FILL_COLOR, fill_type="solid")
+        ws.conditional_formatting.add(rango, FormulaRule(formula=[formula], fill=red))
 
-    required = ["SIES_MATCH_STATUS", "SIES_MATCH_DIAG", "MANUAL_MATCH_STATUS", "COD_CAR_AUDIT_STATUS"]
-    missing = [c for c in required if c not in idx]
-    if missing:
-        raise SystemExit(f"❌ Faltan columnas para marcar ambigüedad COD_CAR: {missing}")
-
-    opt = ["CODCLI", "N_DOC", "DV", "COD_CAR", "CODCARPR_NORM", "SOURCE_KEY_3", "MATCH_KEY_3", "KEY_3_NO_JORNADA"]
-    opt_present = [c for c in opt if c in idx]
+    # Re-crear hoja ALERTAS_REVISION
+    if HOJA_ALERTAS in wb.sheetnames:
+        del wb[HOJA_ALERTAS]
+    ws2 = wb.create_sheet(HOJA_ALERTAS)
+    alertas = construir_hoja_alertas(datos, motivo)
+    ws2.append(list(alertas.columns))
+    for fila in alertas.itertuples(index=False):
+        ws2.append([None if pd.isna(v) else v for v in fila])
+
+    with atomic_path(excel_path) as tmp_path:
+        wb.save(tmp_path)
+        if not backup_path.exists():
+            # El original pasa a ser el respaldo; el guardado nuevo ocupa su lugar.
+            os.replace(excel_path, backup_path)
+            print(f"✅ Backup creado: {backup_path}")
+        else:
+            print(f"ℹ️ Backup ya existe: {backup_path}")
+    return int(motivo.ne("").sum())
 
-    def get(r, col):
-        v = ws.cell(row=r, column=idx[col]).value
-        return "" if v is None else str(v).strip()
 
-    amb_sies_status = {"AMBIGUO_SIES", "SIN_MATCH_SIES"}
-    amb_sies_diag = {
-        "MATCH_SIES_AMBIGUO",
-        "SIN_CODCARPR_EN_PUENTE_SIES",
-        "PROBABLE_PROBLEMA_JORNADA_SIES",
-        "PROBABLE_PROBLEMA_NOMBRE_SIES",
-    }
+def main():
+    excel_path = Path("resultados/archivo_listo_para_sies.xlsx")
+    backup_path = Path("resultados/archivo_listo_para_sies_BACKUP.xlsx")
 
-    red = PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid")
+    if not excel_path.exists():
+        raise SystemExit(f"❌ No existe: {excel_path}")
 
-    # Re-crear hoja ALERTAS_REVISION
-    if "ALERTAS_REVISION" in wb.sheetnames:
-        del wb["ALERTAS_REVISION"]
-    ws2 = wb.create_sheet("ALERTAS_REVISION")
-    ws2.append(["ROW", "MOTIVO"] + opt_present)
-
-    def requiere_revision(r):
-        sies_status = get(r, "SIES_MATCH_STATUS").upper()
-        sies_diag = get(r, "SIES_MATCH_DIAG").upper()
-        manual_status = get(r, "MANUAL_MATCH_STATUS").upper()
-        codcar_audit = get(r, "COD_CAR_AUDIT_STATUS").upper()
-
-        if sies_status in amb_sies_status:
-            return True, f"SIES_MATCH_STATUS={sies_status}"
-        if sies_diag in amb_sies_diag:
-            return True, f"SIES_MATCH_DIAG={sies_diag}"
-        if manual_status == "SIN_MATCH_MANUAL":
-            return True, "MANUAL_MATCH_STATUS=SIN_MATCH_MANUAL"
-        if codcar_audit == "SIN_FUENTE_FINAL":
-            return True, "COD_CAR_AUDIT_STATUS=SIN_FUENTE_FINAL"
-        return False, ""
-
-    marked = 0
-    for r in range(2, ws.max_row + 1):
-        ok, motivo = requiere_revision(r)
-        if ok:
-            for c in range(1, ws.max_column + 1):
-                ws.cell(row=r, column=c).fill = red
-            marked += 1
-            ws2.append([r, motivo] + [get(r, c) for c in opt_present])
-
-    ws2.append([])
-    ws2.append(["RESUMEN", f"FILAS_MARCADAS_EN_ROJO={marked}"])
-
-    wb.save(excel_path)
-    print(f"✅ Listo: {marked} filas marcadas en rojo. Hoja ALERTAS_REVISION creada.")
+    marked = marcar_alertas_workbook(excel_path, backup_path)
+    print(f"✅ Listo: {marked} filas marcadas en rojo. Hoja {HOJA_ALERTAS} creada.")
     print(f"📄 Excel actualizado: {excel_path}")
 
+
 if __name__ == "__main__":
     main()
@@ -26,11 +26,27 @@ FOR_TRACE = BASE / "control" / "for_ing_act_trace_long.tsv"
 OUT_DIR  = BASE / "resultados"
 CTRL_DIR = BASE / "control"
 
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+from src.export import (  # noqa: E402
+    atomic_path,
+    atomic_to_csv,
+    atomic_write_text,
+    compressed_path,
+    existing_artifact_path,
+    trace_compression_from_env,
+)
+from src.catalogs import load_active_governance_bundle  # noqa: E402
+from src.perf import PerfProfiler, activate_profiler, deactivate_profiler, perf_profile_enabled  # noqa: E402
+
 TS = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-# ── load config ──────────────────────────────────────────────────────────
-with open(CFG_PATH) as f:
-    CFG = json.load(f)
+# ── load config (desde el bundle de gobernanza si está vigente) ───────────
+_BUNDLE, _ = load_active_governance_bundle(BASE)
+CFG = _BUNDLE.document(CFG_PATH) if _BUNDLE is not None else None
+if CFG is None:
+    with open(CFG_PATH) as f:
+        CFG = json.load(f)
 
 ANIO_ACT_RANGE = tuple(CFG["campos"]["ANIO_ING_ACT"]["rango"])
 ANIO_ACT_FALLBACK = CFG["campos"]["ANIO_ING_ACT"]["fallback_ultimo_recurso"]
@@ -79,7 +95,7 @@ def load_data():
         h1_f["CODCARR"] = h1_f["CODCARR"].astype(str).str.upper().str.strip()
 
     # Cargar trace FOR_ING_ACT
-    trace_for = pd.read_csv(FOR_TRACE, sep="\t")
+    trace_for = pd.read_csv(existing_artifact_path(FOR_TRACE), sep="\t")
 
     return da_f, h1_f, trace_for
 
@@ -510,15 +526,17 @@ TRACE_COLS = [
 ]
 
 
-def write_trace_tsv(da: pd.DataFrame, path: Path):
+def write_trace_tsv(da: pd.DataFrame, path: Path) -> Path:
     cols = [c for c in TRACE_COLS if c in da.columns]
-    da[cols].to_csv(path, sep="\t", index=False)
+    compression = trace_compression_from_env()
+    path = atomic_to_csv(da[cols], compressed_path(path, compression), compression=compression, sep="\t", index=False)
     print(f"  ✓ Trace TSV: {path}  ({len(da)} filas)")
+    return path
 
 
 def write_audit_xlsx(da: pd.DataFrame, findings: list, path: Path):
     cols = [c for c in TRACE_COLS if c in da.columns]
-    with pd.ExcelWriter(path, engine="openpyxl") as w:
+    with atomic_path(path) as tmp_path, pd.ExcelWriter(tmp_path, engine="openpyxl") as w:
         da[cols].to_excel(w, sheet_name="TRAZABILIDAD", index=False)
 
         # Resumen ANIO_ING_ACT
@@ -688,7 +706,7 @@ def write_governance_report(da: pd.DataFrame, findings: list, path: Path):
         f"*Generado por motor_campos_ing.py — {TS}*",
     ]
 
-    path.write_text("\n".join(lines), encoding="utf-8")
+    atomic_write_text(path, "\n".join(lines))
     print(f"  ✓ Governance Report: {path}")
     return dictamen
 
@@ -703,52 +721,66 @@ def main():
     print(f"  Config: {CFG_PATH}")
     print(f"  FOR   : {FOR_TRACE}")
     print()
-
-    # 1. Carga
-    print("1. Cargando datos...")
-    da, h1, trace_for = load_data()
-    print(f"   DatosAlumnos filtrados: {len(da)}")
-    print(f"   Hoja1 filtrada:         {len(h1)}")
-    print(f"   FOR_ING_ACT trace:      {len(trace_for)}")
-    print()
-
-    # 2. ANIO_ING_ACT
-    print("2. Derivando ANIO_ING_ACT...")
-    da = derive_anio_ing_act(da)
-    print(f"   Distribución reglas: {da['ANIO_ING_ACT_REGLA'].value_counts().to_dict()}")
-    print()
-
-    # 3. SEM_ING_ACT
-    print("3. Derivando SEM_ING_ACT...")
-    da = derive_sem_ing_act(da)
-    print(f"   Distribución reglas: {da['SEM_ING_ACT_REGLA'].value_counts().to_dict()}")
-    print()
-
-    # 4. ANIO_ING_ORI + SEM_ING_ORI
-    print("4. Derivando ANIO_ING_ORI + SEM_ING_ORI...")
-    da = derive_campos_ori(da, h1, trace_for)
-    print(f"   Reglas ANIO_ORI: {da['ANIO_ING_ORI_REGLA'].value_counts().to_dict()}")
-    print(f"   Reglas SEM_ORI:  {da['SEM_ING_ORI_REGLA'].value_counts().to_dict()}")
-    print()
-
-    # 5. Validaciones
-    print("5. Ejecutando validaciones...")
-    findings = run_validations(da)
-    for f in findings:
-        print(f"   [{f['severidad']}] {f['id']}: {f['msg']}")
-    print()
-
-    # 6. Artefactos
-    print("6. Generando artefactos...")
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    write_trace_tsv(da, CTRL_DIR / "campos_ing_trace_long.tsv")
-    write_audit_xlsx(da, findings, OUT_DIR / "AUDIT_CAMPOS_ING.xlsx")
-    dictamen = write_governance_report(da, findings,
-                                       CTRL_DIR / "campos_ing_governance_report.md")
-    print()
-    print(f"═══ DICTAMEN: {dictamen} ═══")
-
-    return 0 if "BLOQUEANTE" not in dictamen else 1
+    profiler = activate_profiler(PerfProfiler("motor_campos_ing", enabled=perf_profile_enabled()))
+    try:
+        perf = profiler.sequence("motor_campos_ing")
+
+        # 1. Carga
+        print("1. Cargando datos...")
+        da, h1, trace_for = load_data()
+        perf.lap("carga", rows_out=len(da))
+        print(f"   DatosAlumnos filtrados: {len(da)}")
+        print(f"   Hoja1 filtrada:         {len(h1)}")
+        print(f"   FOR_ING_ACT trace:      {len(trace_for)}")
+        print()
+
+        # 2. ANIO_ING_ACT
+        print("2. Derivando ANIO_ING_ACT...")
+        da = derive_anio_ing_act(da)
+        perf.lap("anio_ing_act", rows_out=len(da))
+        print(f"   Distribución reglas: {da['ANIO_ING_ACT_REGLA'].value_counts().to_dict()}")
+        print()
+
+        # 3. SEM_ING_ACT
+        print("3. Derivando SEM_ING_ACT...")
+        da = derive_sem_ing_act(da)
+        perf.lap("sem_ing_act", rows_out=len(da))
+        print(f"   Distribución reglas: {da['SEM_ING_ACT_REGLA'].value_counts().to_dict()}")
+        print()
+
+        # 4. ANIO_ING_ORI + SEM_ING_ORI
+        print("4. Derivando ANIO_ING_ORI + SEM_ING_ORI...")
+        da = derive_campos_ori(da, h1, trace_for)
+        perf.lap("campos_ori", rows_out=len(da))
+        print(f"   Reglas ANIO_ORI: {da['ANIO_ING_ORI_REGLA'].value_counts().to_dict()}")
+        print(f"   Reglas SEM_ORI:  {da['SEM_ING_ORI_REGLA'].value_counts().to_dict()}")
+        print()
+
+        # 5. Validaciones
+        print("5. Ejecutando validaciones...")
+        findings = run_validations(da)
+        perf.lap("validaciones", rows_out=len(da))
+        for f in findings:
+            print(f"   [{f['severidad']}] {f['id']}: {f['msg']}")
+        print()
+
+        # 6. Artefactos
+        print("6. Generando artefactos...")
+        OUT_DIR.mkdir(parents=True, exist_ok=True)
+        write_trace_tsv(da, CTRL_DIR / "campos_ing_trace_long.tsv")
+        write_audit_xlsx(da, findings, OUT_DIR / "AUDIT_CAMPOS_ING.xlsx")
+        dictamen = write_governance_report(da, findings,
+                                           CTRL_DIR / "campos_ing_governance_report.md")
+        perf.lap("artefactos", rows_out=len(da))
+        if profiler.enabled:
+            profiler.write_json(OUT_DIR / "perf_profile_motor_campos_ing.json")
+            profiler.print_summary()
+        print()
+        print(f"═══ DICTAMEN: {dictamen} ═══")
+
+        return 0 if "BLOQUEANTE" not in dictamen else 1
+    finally:
+        deactivate_profiler()
 
 
 if __name__ == "__main__":
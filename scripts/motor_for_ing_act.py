@@ -25,9 +25,24 @@ CFG_PATH  = BASE / "control" / "config_for_ing_act.json"
 OUT_DIR   = BASE / "resultados"
 CTRL_DIR  = BASE / "control"
 
-# ── load config ──────────────────────────────────────────────────────────
-with open(CFG_PATH) as f:
-    CFG = json.load(f)
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+from src.export import (  # noqa: E402
+    atomic_path,
+    atomic_to_csv,
+    atomic_write_text,
+    compressed_path,
+    trace_compression_from_env,
+)
+from src.catalogs import load_active_governance_bundle  # noqa: E402
+from src.perf import PerfProfiler, activate_profiler, deactivate_profiler, perf_profile_enabled  # noqa: E402
+
+# ── load config (desde el bundle de gobernanza si está vigente) ───────────
+_BUNDLE, _ = load_active_governance_bundle(BASE)
+CFG = _BUNDLE.document(CFG_PATH) if _BUNDLE is not None else None
+if CFG is None:
+    with open(CFG_PATH) as f:
+        CFG = json.load(f)
 
 SOPORTADOS       = set(CFG["codigos_soportados"])
 BLOQUEADOS       = set(CFG["codigos_bloqueados"])
@@ -335,15 +350,17 @@ TRACE_COLS = [
 ]
 
 
-def write_trace_tsv(da: pd.DataFrame, path: Path):
+def write_trace_tsv(da: pd.DataFrame, path: Path) -> Path:
     cols = [c for c in TRACE_COLS if c in da.columns]
-    da[cols].to_csv(path, sep="\t", index=False)
+    compression = trace_compression_from_env()
+    path = atomic_to_csv(da[cols], compressed_path(path, compression), compression=compression, sep="\t", index=False)
     print(f"  ✓ Trace TSV: {path}  ({len(da)} filas)")
+    return path
 
 
 def write_audit_xlsx(da: pd.DataFrame, findings: list, path: Path):
     cols = [c for c in TRACE_COLS if c in da.columns]
-    with pd.ExcelWriter(path, engine="openpyxl") as w:
+    with atomic_path(path) as tmp_path, pd.ExcelWriter(tmp_path, engine="openpyxl") as w:
         da[cols].to_excel(w, sheet_name="AUDITORIA", index=False)
         # Resumen
         resumen = da["FOR_ING_ACT"].value_counts().sort_index().reset_index()
@@ -461,7 +478,7 @@ def write_governance_report(da: pd.DataFrame, findings: list, path: Path):
         f"- [x] Reporte de gobernanza emitido con dictamen final",
     ]
 
-    path.write_text("\n".join(lines), encoding="utf-8")
+    atomic_write_text(path, "\n".join(lines))
     print(f"  ✓ Governance report: {path}")
 
 
@@ -473,53 +490,67 @@ def main():
     print("=" * 80)
     print("Motor FOR_ING_ACT — MU 2026")
     print("=" * 80)
-
-    # 1. Carga
-    print("\n[1/6] Carga y normalización...")
-    da, h1, ruts_bd = load_data()
-    print(f"  DatosAlumnos filtrados: {len(da)} | Hoja1 filtrados: {len(h1)}")
-
-    # 2. Flags
-    print("\n[2/6] Derivación de flags _DA...")
-    da = derive_flags(da, h1)
-    for flag in ["ES_CONTINUIDAD_DA","ES_TECNICO_DA","TIENE_TNS_PREV_DA",
-                 "ES_CAMBIO_INTERNO_DA","ES_CAMBIO_EXTERNO_DA"]:
-        print(f"  {flag}: True={int((da[flag]==1).sum())}")
-
-    # 3. Árbol
-    print("\n[3/6] Aplicación árbol de decisión (11→2→4→3→1)...")
-    da = apply_decision_tree(da)
-    print("  Distribución:")
-    for code, n in da["FOR_ING_ACT"].value_counts().sort_index().items():
-        print(f"    FOR_ING_ACT={code}: {n} ({n/len(da)*100:.1f}%)")
-
-    # 4. Validaciones
-    print("\n[4/6] Validaciones...")
-    findings = run_validations(da)
-    for f in findings:
-        icon = {"BLOQUEANTE":"🔴","ERROR":"🟠","WARNING":"🟡"}.get(f["severidad"],"⚪")
-        print(f"  {icon} [{f['id']}] {f['severidad']}: {f['msg']}")
-
-    # 5. Artefactos
-    print("\n[5/6] Generación de artefactos...")
-    OUT_DIR.mkdir(exist_ok=True)
-    CTRL_DIR.mkdir(exist_ok=True)
-
-    write_trace_tsv(da, CTRL_DIR / "for_ing_act_trace_long.tsv")
-    write_audit_xlsx(da, findings, OUT_DIR / "AUDIT_FOR_ING_ACT.xlsx")
-    write_governance_report(da, findings, CTRL_DIR / "for_ing_act_governance_report.md")
-
-    # 6. Dictamen
-    bloqueantes = [f for f in findings if f["severidad"] in ("BLOQUEANTE","ERROR")]
-    print("\n[6/6] DICTAMEN:")
-    if bloqueantes:
-        print("  ❌ NO LISTO — hay errores bloqueantes/errores")
-    else:
-        print("  ⚠️ LISTO CON OBSERVACIONES")
-        print("     (FOR_ING_ACT=4 bloqueado por falta de fuente; validaciones V1/V3 diferidas)")
-
-    print("\n" + "=" * 80)
-    return da, findings
+    profiler = activate_profiler(PerfProfiler("motor_for_ing_act", enabled=perf_profile_enabled()))
+    try:
+        perf = profiler.sequence("motor_for_ing_act")
+
+        # 1. Carga
+        print("\n[1/6] Carga y normalización...")
+        da, h1, ruts_bd = load_data()
+        print(f"  DatosAlumnos filtrados: {len(da)} | Hoja1 filtrados: {len(h1)}")
+        perf.lap("carga", rows_out=len(da))
+
+        # 2. Flags
+        print("\n[2/6] Derivación de flags _DA...")
+        da = derive_flags(da, h1)
+        perf.lap("flags_da", rows_out=len(da))
+        for flag in ["ES_CONTINUIDAD_DA","ES_TECNICO_DA","TIENE_TNS_PREV_DA",
+                     "ES_CAMBIO_INTERNO_DA","ES_CAMBIO_EXTERNO_DA"]:
+            print(f"  {flag}: True={int((da[flag]==1).sum())}")
+
+        # 3. Árbol
+        print("\n[3/6] Aplicación árbol de decisión (11→2→4→3→1)...")
+        da = apply_decision_tree(da)
+        perf.lap("arbol_decision", rows_out=len(da))
+        print("  Distribución:")
+        for code, n in da["FOR_ING_ACT"].value_counts().sort_index().items():
+            print(f"    FOR_ING_ACT={code}: {n} ({n/len(da)*100:.1f}%)")
+
+        # 4. Validaciones
+        print("\n[4/6] Validaciones...")
+        findings = run_validations(da)
+        perf.lap("validaciones", rows_out=len(da))
+        for f in findings:
+            icon = {"BLOQUEANTE":"🔴","ERROR":"🟠","WARNING":"🟡"}.get(f["severidad"],"⚪")
+            print(f"  {icon} [{f['id']}] {f['severidad']}: {f['msg']}")
+
+        # 5. Artefactos
+        print("\n[5/6] Generación de artefactos...")
+        OUT_DIR.mkdir(exist_ok=True)
+        CTRL_DIR.mkdir(exist_ok=True)
+
+        write_trace_tsv(da, CTRL_DIR / "for_ing_act_trace_long.tsv")
+        write_audit_xlsx(da, findings, OUT_DIR / "AUDIT_FOR_ING_ACT.xlsx")
+        write_governance_report(da, findings, CTRL_DIR / "for_ing_act_governance_report.md")
+        perf.lap("artefactos", rows_out=len(da))
+        if profiler.enabled:
+            profiler.write_json(OUT_DIR / "perf_profile_motor_for_ing_act.json")
+
+        # 6. Dictamen
+        bloqueantes = [f for f in findings if f["severidad"] in ("BLOQUEANTE","ERROR")]
+        print("\n[6/6] DICTAMEN:")
+        if bloqueantes:
+            print("  ❌ NO LISTO — hay errores bloqueantes/errores")
+        else:
+            print("  ⚠️ LISTO CON OBSERVACIONES")
+            print("     (FOR_ING_ACT=4 bloqueado por falta de fuente; validaciones V1/V3 diferidas)")
+
+        if profiler.enabled:
+            profiler.print_summary()
+        print("\n" + "=" * 80)
+        return da, findings
+    finally:
+        deactivate_profiler()
 
 
 if __name__ == "__main__":
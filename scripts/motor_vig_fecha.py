@@ -26,14 +26,30 @@ GOB_EA   = BASE / "gobernanza_catalogos" / "gob_datosalumnos_estadoacademico_sit
 OUT_DIR  = BASE / "resultados"
 CTRL_DIR = BASE / "control"
 
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+from src.export import (  # noqa: E402
+    atomic_path,
+    atomic_to_csv,
+    atomic_write_json,
+    atomic_write_text,
+    compressed_path,
+    trace_compression_from_env,
+)
+from src.catalogs import load_active_governance_bundle  # noqa: E402
+from src.perf import PerfProfiler, activate_profiler, deactivate_profiler, perf_profile_enabled  # noqa: E402
+
 TS = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 FECHA_CORTE = pd.Timestamp("2026-04-30")
 FECHA_RANGO_MIN = pd.Timestamp("2020-01-01")
 FALLBACK_1900 = "01/01/1900"
 
-# ── load config ──────────────────────────────────────────────────────────
-with open(CFG_PATH) as f:
-    CFG = json.load(f)
+# ── load config (desde el bundle de gobernanza si está vigente) ───────────
+_BUNDLE, _ = load_active_governance_bundle(BASE)
+CFG = _BUNDLE.document(CFG_PATH) if _BUNDLE is not None else None
+if CFG is None:
+    with open(CFG_PATH) as f:
+        CFG = json.load(f)
 
 VIG_CATALOGO = set(CFG["campos"]["VIG"]["catalogo"])
 VIG_MAPEO = CFG["campos"]["VIG"]["mapeo_estadoacademico"]
@@ -290,14 +306,15 @@ TRACE_COLS = [
 ]
 
 
-def write_trace_tsv(da: pd.DataFrame, path: Path):
+def write_trace_tsv(da: pd.DataFrame, path: Path) -> Path:
     cols = [c for c in TRACE_COLS if c in da.columns]
-    da[cols].to_csv(path, sep="\t", index=False)
+    compression = trace_compression_from_env()
+    return atomic_to_csv(da[cols], compressed_path(path, compression), compression=compression, sep="\t", index=False)
 
 
 def write_audit_xlsx(da: pd.DataFrame, findings: list, path: Path):
     """Genera Excel de auditoría con formato visual (rojo para VIG=0)."""
-    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+    with atomic_path(path) as tmp_path, pd.ExcelWriter(tmp_path, engine="openpyxl") as writer:
         # Sheet 1: TRAZABILIDAD
         cols = [c for c in TRACE_COLS if c in da.columns]
         da[cols].to_excel(writer, sheet_name="TRAZABILIDAD", index=False)
@@ -330,19 +347,15 @@ def write_audit_xlsx(da: pd.DataFrame, findings: list, path: Path):
             hall_df = pd.DataFrame({"ID": ["NINGUNO"], "SEVERIDAD": ["OK"], "MENSAJE": ["Sin hallazgos"], "N": [0]})
         hall_df.to_excel(writer, sheet_name="HALLAZGOS", index=False)
 
-    # Aplicar formato rojo a filas VIG=0
-    _apply_red_formatting(path, da)
+        # Aplicar formato rojo a filas VIG=0 antes de guardar (sin releer el libro)
+        _apply_red_formatting(writer.sheets["TRAZABILIDAD"])
 
 
-def _apply_red_formatting(path: Path, da: pd.DataFrame):
+def _apply_red_formatting(ws):
     """Marca en rojo las filas con VIG=0 en la hoja TRAZABILIDAD."""
     try:
-        from openpyxl import load_workbook
         from openpyxl.styles import PatternFill, Font
 
-        wb = load_workbook(path)
-        ws = wb["TRAZABILIDAD"]
-
         red_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
         red_font = Font(color="9C0006")
 
@@ -364,8 +377,6 @@ def _apply_red_formatting(path: Path, da: pd.DataFrame):
                     cell = ws.cell(row=row_idx, column=col_idx)
                     cell.fill = red_fill
                     cell.font = red_font
-
-        wb.save(path)
     except ImportError:
         pass  # openpyxl no disponible
 
@@ -474,7 +485,7 @@ def write_governance_report(da: pd.DataFrame, findings: list, path: Path):
         f"- INFO: {len(info)}",
     ]
 
-    path.write_text("\n".join(lines), encoding="utf-8")
+    atomic_write_text(path, "\n".join(lines))
     return dictamen
 
 
@@ -487,64 +498,75 @@ def main():
     print(f" Motor VIG + FECHA_MATRICULA — MU 2026")
     print(f" {TS}")
     print(f"{'═'*60}")
-
-    # 1. Carga
-    da = load_data()
-    print(f"\n✅ Cargados {len(da)} registros filtrados")
-    print(f"   ESTADOACADEMICO distribución:")
-    for ea, count in da["ESTADOACADEMICO"].value_counts().items():
-        print(f"     {ea}: {count}")
-
-    # 2. Derivar VIG
-    da = derive_vig(da)
-    print(f"\n✅ VIG derivado:")
-    for vig_val, count in da["VIG"].value_counts().sort_index().items():
-        print(f"     VIG={vig_val}: {count}")
-
-    # 3. Derivar FECHA_MATRICULA
-    da = derive_fecha_matricula(da)
-    n_1900 = (da["FECHA_MATRICULA"] == FALLBACK_1900).sum()
-    n_real = len(da) - n_1900
-    print(f"\n✅ FECHA_MATRICULA derivado:")
-    print(f"     Fecha real: {n_real}")
-    print(f"     Fallback 1900: {n_1900}")
-
-    # 4. Validaciones
-    findings = run_validations(da)
-    print(f"\n{'─'*40}")
-    print(f" Validaciones: {len(findings)} hallazgos")
-    for f in findings:
-        print(f"   [{f['severidad']}] {f['id']}: {f['msg']}")
-
-    # 5. Artefactos
-    CTRL_DIR.mkdir(parents=True, exist_ok=True)
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-
-    trace_path = CTRL_DIR / "vig_fecha_trace_long.tsv"
-    write_trace_tsv(da, trace_path)
-    print(f"\n📄 {trace_path}")
-
-    audit_path = OUT_DIR / "AUDIT_VIG_FECHA.xlsx"
-    write_audit_xlsx(da, findings, audit_path)
-    print(f"📄 {audit_path}")
-
-    report_path = CTRL_DIR / "vig_fecha_governance_report.md"
-    dictamen = write_governance_report(da, findings, report_path)
-    print(f"📄 {report_path}")
-
-    # Golden cases
-    golden = _generate_golden_cases(da)
-    golden_path = CTRL_DIR / "vig_fecha_golden_cases.json"
-    with open(golden_path, "w") as f:
-        json.dump(golden, f, indent=2, ensure_ascii=False, default=str)
-    print(f"📄 {golden_path}")
-
-    print(f"\n{'═'*60}")
-    print(f" ═══ DICTAMEN: {dictamen} ═══")
-    print(f"{'═'*60}")
-
-    bloq = [f for f in findings if f["severidad"] == "BLOQUEANTE"]
-    return 1 if bloq else 0
+    profiler = activate_profiler(PerfProfiler("motor_vig_fecha", enabled=perf_profile_enabled()))
+    try:
+        perf = profiler.sequence("motor_vig_fecha")
+
+        # 1. Carga
+        da = load_data()
+        perf.lap("carga", rows_out=len(da))
+        print(f"\n✅ Cargados {len(da)} registros filtrados")
+        print(f"   ESTADOACADEMICO distribución:")
+        for ea, count in da["ESTADOACADEMICO"].value_counts().items():
+            print(f"     {ea}: {count}")
+
+        # 2. Derivar VIG
+        da = derive_vig(da)
+        perf.lap("derivar_vig", rows_out=len(da))
+        print(f"\n✅ VIG derivado:")
+        for vig_val, count in da["VIG"].value_counts().sort_index().items():
+            print(f"     VIG={vig_val}: {count}")
+
+        # 3. Derivar FECHA_MATRICULA
+        da = derive_fecha_matricula(da)
+        perf.lap("derivar_fecha_matricula", rows_out=len(da))
+        n_1900 = (da["FECHA_MATRICULA"] == FALLBACK_1900).sum()
+        n_real = len(da) - n_1900
+        print(f"\n✅ FECHA_MATRICULA derivado:")
+        print(f"     Fecha real: {n_real}")
+        print(f"     Fallback 1900: {n_1900}")
+
+        # 4. Validaciones
+        findings = run_validations(da)
+        perf.lap("validaciones", rows_out=len(da))
+        print(f"\n{'─'*40}")
+        print(f" Validaciones: {len(findings)} hallazgos")
+        for f in findings:
+            print(f"   [{f['severidad']}] {f['id']}: {f['msg']}")
+
+        # 5. Artefactos
+        CTRL_DIR.mkdir(parents=True, exist_ok=True)
+        OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+        trace_path = write_trace_tsv(da, CTRL_DIR / "vig_fecha_trace_long.tsv")
+        print(f"\n📄 {trace_path}")
+
+        audit_path = OUT_DIR / "AUDIT_VIG_FECHA.xlsx"
+        write_audit_xlsx(da, findings, audit_path)
+        print(f"📄 {audit_path}")
+
+        report_path = CTRL_DIR / "vig_fecha_governance_report.md"
+        dictamen = write_governance_report(da, findings, report_path)
+        print(f"📄 {report_path}")
+
+        # Golden cases
+        golden = _generate_golden_cases(da)
+        golden_path = CTRL_DIR / "vig_fecha_golden_cases.json"
+        atomic_write_json(golden_path, golden, default=str)
+        print(f"📄 {golden_path}")
+        perf.lap("artefactos", rows_out=len(da))
+        if profiler.enabled:
+            profiler.write_json(OUT_DIR / "perf_profile_motor_vig_fecha.json")
+            profiler.print_summary()
+
+        print(f"\n{'═'*60}")
+        print(f" ═══ DICTAMEN: {dictamen} ═══")
+        print(f"{'═'*60}")
+
+        bloq = [f for f in findings if f["severidad"] == "BLOQUEANTE"]
+        return 1 if bloq else 0
+    finally:
+        deactivate_profiler()
 
 
 def _generate_golden_cases(da: pd.DataFrame) -> list[dict]:
@@ -15,6 +15,18 @@ from pathlib import Path
 import pandas as pd
 
 
+PLAN_COLUMNS = [
+    "CODCARPR_NORM",
+    "ROWS_SIN_MATCH",
+    "CARRERA_N",
+    "CARRERA_RAW",
+    "JORNADA_N",
+    "ACCION",
+    "COD_CAR_UNICO",
+    "N_FILAS_DURACION_TARGET",
+]
+
+
 def norm_text(v: object) -> str:
     if pd.isna(v):
         return ""
@@ -47,6 +59,22 @@ def join_aliases(values: list[str]) -> str:
     return "|".join(sorted(set(values)))
 
 
+def preparar_sin_match(df: pd.DataFrame) -> pd.DataFrame:
+    """Filas SIN_MATCH_SIES sin COD_CAR de ARCHIVO_LISTO_SUBIDA, con llaves normalizadas."""
+    sin = df[(df["COD_CAR"].isna()) & (df["SIES_MATCH_STATUS"] == "SIN_MATCH_SIES")].copy()
+    sin["CARRERA_N"] = sin["NOMBRE_CARRERA_FUENTE"].map(norm_text)
+    sin["CARRERA_RAW"] = sin["NOMBRE_CARRERA_FUENTE"].fillna("").astype(str).str.strip()
+    sin["JORNADA_N"] = sin["JORNADA_FUENTE"].map(jornada_to_num)
+    return sin
+
+
+def preparar_duracion(dur: pd.DataFrame) -> pd.DataFrame:
+    dur = dur.copy()
+    dur["CARRERA_N"] = dur["NOMBRE_CARRERA"].map(norm_text)
+    dur["JORNADA_N"] = dur["JORNADA"].astype(str).str.strip()
+    return dur
+
+
 def build_candidates(df_sin: pd.DataFrame, dur: pd.DataFrame) -> pd.DataFrame:
     rows: list[dict[str, object]] = []
 
@@ -138,6 +166,8 @@ def build_candidates(df_sin: pd.DataFrame, dur: pd.DataFrame) -> pd.DataFrame:
             }
         )
 
+    if not rows:
+        return pd.DataFrame(columns=PLAN_COLUMNS)
     return pd.DataFrame(rows).sort_values(["ACCION", "ROWS_SIN_MATCH"], ascending=[True, False]).reset_index(drop=True)
 
 
@@ -209,16 +239,10 @@ def main() -> None:
     plan_path = Path(args.output_plan)
     plan_path.parent.mkdir(parents=True, exist_ok=True)
 
-    dur = pd.read_csv(dur_path, sep="\t", dtype=str)
+    dur = preparar_duracion(pd.read_csv(dur_path, sep="\t", dtype=str))
     df = pd.read_excel(excel_path, sheet_name="ARCHIVO_LISTO_SUBIDA")
 
-    sin = df[(df["COD_CAR"].isna()) & (df["SIES_MATCH_STATUS"] == "SIN_MATCH_SIES")].copy()
-    sin["CARRERA_N"] = sin["NOMBRE_CARRERA_FUENTE"].map(norm_text)
-    sin["CARRERA_RAW"] = sin["NOMBRE_CARRERA_FUENTE"].fillna("").astype(str).str.strip()
-    sin["JORNADA_N"] = sin["JORNADA_FUENTE"].map(jornada_to_num)
-
-    dur["CARRERA_N"] = dur["NOMBRE_CARRERA"].map(norm_text)
-    dur["JORNADA_N"] = dur["JORNADA"].astype(str).str.strip()
+    sin = preparar_sin_match(df)
 
     plan = build_candidates(sin, dur)
     plan.to_csv(plan_path, sep="\t", index=False)
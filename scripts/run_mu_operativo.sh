@@ -11,9 +11,7 @@ source /Users/alexi/Documents/GitHub/CV_ALEXI/.venv/bin/activate
 
 mkdir -p "$OUT" "$OUT/SUBIDA"
 
-printf "%s\n%s\n" "$ANIO" "$SEM" | python codigo_gobernanza_v2.py --proceso matricula --usar-gobernanza-v2 true --input "$INPUT" --output-dir "$OUT"
-
-python3 scripts/marcar_alertas_codcar.py
+printf "%s\n%s\n" "$ANIO" "$SEM" | python codigo_gobernanza_v2.py --proceso matricula --usar-gobernanza-v2 true --marcar-alertas-codcar true --input "$INPUT" --output-dir "$OUT"
 
 open -a "Microsoft Excel" "$OUT/archivo_listo_para_sies.xlsx"
 
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Tests for src/export/atomic — escritura atómica por rename en el directorio destino."""
+import gzip
+import os
+import stat
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.export import (
+    atomic_path,
+    atomic_to_csv,
+    atomic_write,
+    atomic_write_json,
+    compressed_path,
+    existing_artifact_path,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test atomic_write
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestAtomicWrite(unittest.TestCase):
+    """Reemplazo atómico, compresión opcional y limpieza ante error."""
+
+    def test_csv_and_json_roundtrip(self):
+        df = pd.DataFrame({"CODCLI": ["A1", "B2"], "VIG": [1, 0]})
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = atomic_to_csv(df, Path(tmp) / "sub" / "x.tsv", sep="\t", index=False)
+            pd.testing.assert_frame_equal(pd.read_csv(csv_path, sep="\t"), df)
+            json_path = atomic_write_json(Path(tmp) / "r.json", {"año": 2026})
+            self.assertEqual(json_path.read_text(encoding="utf-8"), '{\n  "año": 2026\n}')
+            self.assertEqual(sorted(p.name for p in Path(tmp).rglob("*")), ["r.json", "sub", "x.tsv"])
+
+    def test_gzip_trace_readable_by_pandas(self):
+        df = pd.DataFrame({"RUT": [1, 2, 3]})
+        with tempfile.TemporaryDirectory() as tmp:
+            plain = Path(tmp) / "trace_long.tsv"
+            gz = atomic_to_csv(df, compressed_path(plain, "gzip"), compression="gzip", sep="\t", index=False)
+            self.assertEqual(gz.name, "trace_long.tsv.gz")
+            self.assertEqual(existing_artifact_path(plain), gz)
+            with gzip.open(gz, "rt", encoding="utf-8") as fh:
+                self.assertTrue(fh.readline().startswith("RUT"))
+            pd.testing.assert_frame_equal(pd.read_csv(existing_artifact_path(plain), sep="\t"), df)
+
+    def test_failure_keeps_previous_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "reporte.md"
+            target.write_text("previo", encoding="utf-8")
+            with self.assertRaises(RuntimeError):
+                with atomic_write(target) as fh:
+                    fh.write("parcial")
+                    raise RuntimeError("falla a mitad de escritura")
+            self.assertEqual(target.read_text(encoding="utf-8"), "previo")
+            self.assertEqual([p.name for p in Path(tmp).iterdir()], ["reporte.md"])
+
+    @unittest.skipIf(os.name == "nt", "permisos POSIX")
+    def test_permisos_como_archivo_normal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            mask = os.umask(0o022)
+            try:
+                nuevo = atomic_write_json(Path(tmp) / "nuevo.json", {})
+                self.assertEqual(stat.S_IMODE(nuevo.stat().st_mode), 0o644)
+
+                existente = Path(tmp) / "existente.tsv"
+                existente.write_text("x", encoding="utf-8")
+                existente.chmod(0o640)
+                with atomic_path(existente) as tmp_path:
+                    tmp_path.write_text("y", encoding="utf-8")
+                self.assertEqual(stat.S_IMODE(existente.stat().st_mode), 0o640)
+            finally:
+                os.umask(mask)
+
+
+if __name__ == "__main__":
+    unittest.main()
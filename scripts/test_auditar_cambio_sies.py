@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Tests for tools/auditar_cambio_sies_cicib.py — reglas por catálogo y máscaras vectorizadas."""
+import importlib.util
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from src.export import parquet_engine_available
+
+_spec = importlib.util.spec_from_file_location("auditar_cambio_sies_cicib", ROOT / "tools" / "auditar_cambio_sies_cicib.py")
+aud = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(aud)
+
+REGLAS_TSV = (
+    "PREFIJO\tREGLA\tNOMBRE_CARRERA\tJORNADA\tCODIGO_SIES_ESPERADO\n"
+    "CICIB\tA\tIngeniería en Ciberseguridad\tD\tI1J1\n"
+    "CICIB\tB\tINGENIERIA EN CIBERSEGURIDAD\tV\tI1J2\n"
+    "ENF\tA\tENFERMERIA\tD\tE1J1\n"
+)
+
+
+def _archivo(final_codes: list) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "CODCLI": ["1", "2", "3", "4", "5"],
+            "N_DOC": ["11.111.111", "22222222", "33333333", "44444444", "55555555"],
+            "DV": ["1", "k", "3", "4", "5"],
+            "NOMBRE_CARRERA_FUENTE": ["ingenieria  en ciberseguridad", "INGENIERIA EN CIBERSEGURIDAD", "Enfermería", "ENFERMERIA", "DERECHO"],
+            "JORNADA_FUENTE": ["d", "V", "D", "D", "D"],
+            "CODCARPR_NORM": ["CICIB", "CICIB", None, "ENF", "DER"],
+            "SOURCE_KEY_3": ["K1", "K2", "K3", "K4", "K5"],
+            "N_CODES_SIES": ["1", "2", "1", "1", "1"],
+            "CODIGO_CARRERA_SIES_FINAL": final_codes,
+            "SIES_MATCH_STATUS": ["MATCH_SIES", "AMBIGUO_SIES", "MATCH_SIES", "MATCH_SIES", "MATCH_SIES"],
+            "SIES_MATCH_DIAG": [None] * 5,
+        }
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test catálogo de reglas
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestReglas(unittest.TestCase):
+    """El TSV de reglas se normaliza igual que la fuente y filtra por prefijo."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "reglas.tsv"
+        self.path.write_text(REGLAS_TSV, encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_catalogo_repo_cicib(self):
+        reglas = aud.load_reglas(aud.DEFAULT_REGLAS_PATH, ["cicib"])
+        self.assertEqual(reglas["REGLA"].tolist(), list("ABCDE"))
+        self.assertEqual(set(reglas["PREFIJO"]), {"CICIB"})
+
+    def test_universo_y_causas(self):
+        reglas = aud.load_reglas(self.path)
+        antes = aud.build_before_table(_archivo(["I1J1", None, "X", "E1J1", "D1"]), reglas)
+        self.assertEqual(antes["CODCLI"].tolist(), ["1", "2", "3", "4"])
+        self.assertEqual(antes["PREFIJO"].tolist(), ["CICIB", "CICIB", "ENF", "ENF"])
+        self.assertEqual(antes["CODIGO_ESPERADO"].tolist(), ["I1J1", "I1J2", "E1J1", "E1J1"])
+        self.assertEqual(antes["RUT"].tolist()[:2], ["11111111-1", "22222222-K"])
+        self.assertEqual(
+            antes["CAUSA_RAIZ"].tolist(),
+            ["OK", "MATCH_AMBIGUO", "BLOQUEANTE_CODCARPR_NORM_VACIO", "OK"],
+        )
+
+    def test_prefijo_desconocido(self):
+        with self.assertRaisesRegex(ValueError, "sin reglas"):
+            aud.load_reglas(self.path, ["XYZ"])
+
+    def test_regla_duplicada(self):
+        self.path.write_text(REGLAS_TSV + "OTRA\tZ\tENFERMERIA\tD\tE9\n", encoding="utf-8")
+        with self.assertRaisesRegex(ValueError, "duplicadas"):
+            aud.load_reglas(self.path)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test antes/después sobre artefactos proyectados
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestAuditoria(unittest.TestCase):
+    """Carga solo BASE_COLS del artefacto y clasifica ESTADO por RUT sin iterrows."""
+
+    def test_tsv_antes_despues(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            reglas_path = root / "reglas.tsv"
+            reglas_path.write_text(REGLAS_TSV, encoding="utf-8")
+            antes_path, despues_path = root / "antes.tsv", root / "despues.tsv"
+            _archivo(["I1J1", "I1J1", "X", "E1J1", "D1"]).assign(EXTRA="x").to_csv(antes_path, sep="\t", index=False)
+            _archivo(["I1J1", "I1J2", None, "E1J1", "D1"]).to_csv(despues_path, sep="\t", index=False)
+
+            antes = aud.load_archivo_subida(antes_path)
+            self.assertEqual(antes.columns.tolist(), aud.BASE_COLS)
+
+            reglas = aud.load_reglas(reglas_path)
+            before = aud.build_before_table(antes, reglas)
+            evidence = aud.build_evidence(before, aud.build_universe(aud.load_archivo_subida(despues_path), reglas))
+            rut = aud.build_rut_audit(evidence)
+            summary = aud.build_summary(before, evidence, rut)
+
+        # Un SIES nulo después es NO_ENCONTRADO, no un código "NAN".
+        self.assertEqual(rut["ESTADO"].tolist(), ["OK_YA_CORRECTO", "OK_CAMBIADO", "NO_ENCONTRADO", "OK_YA_CORRECTO"])
+        self.assertEqual((summary["cambiados"], summary["fallidos"]), (1, 1))
+        self.assertEqual(summary["por_prefijo"], {"CICIB": 2, "ENF": 2})
+
+    @unittest.skipUnless(parquet_engine_available(), "requiere pyarrow o fastparquet")
+    def test_directorio_prefiere_parquet(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _archivo(["I1J1"] * 5).to_parquet(root / aud.ARCHIVO_SUBIDA_PARQUET, index=False)
+            df = aud.load_archivo_subida(root)
+        self.assertEqual(df.columns.tolist(), aud.BASE_COLS)
+        self.assertTrue(df["KEY_3_NO_JORNADA"].isna().all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Tests for auditoria_maestra — contexto cargado una vez y checks concurrentes."""
+import tempfile
+import time
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts import auditoria_maestra as am
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test AuditContext y ejecución concurrente
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestAuditContext(unittest.TestCase):
+    """Cada hoja y catálogo se lee una sola vez; los checks corren en paralelo."""
+
+    def test_sheet_and_catalog_read_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            arch = pd.DataFrame({"VIG": [1, 0], "FOR_ING_ACT": [1, 2]})
+            arch.to_excel(out / "archivo_listo_para_sies.xlsx", sheet_name="ARCHIVO_LISTO_SUBIDA", index=False)
+            (out / "cat.tsv").write_text("FOR_ING_ACT\n1\n2\n", encoding="utf-8")
+            ctx = am.AuditContext(out)
+            with mock.patch.object(am.pd, "read_excel", wraps=pd.read_excel) as read_excel, \
+                    mock.patch.object(am.pd, "read_csv", wraps=pd.read_csv) as read_csv:
+                resultados, _ = am.ejecutar_checks_concurrentes(
+                    {f"t{i}": lambda: ctx.sheet("ARCHIVO_LISTO_SUBIDA") for i in range(4)}
+                )
+                ctx.catalog(out / "cat.tsv")
+                ctx.catalog(out / "cat.tsv")
+            self.assertEqual(read_excel.call_count, 1)
+            self.assertEqual(read_csv.call_count, 1)
+            self.assertTrue(all(df is resultados["t0"] for df in resultados.values()))
+            self.assertEqual(ctx.sheet_names(), ["ARCHIVO_LISTO_SUBIDA"])
+
+    def test_concurrent_results_keep_order_and_durations(self):
+        t0 = time.perf_counter()
+        resultados, duraciones = am.ejecutar_checks_concurrentes({
+            "b": lambda: (time.sleep(0.2), "B")[1],
+            "a": lambda: (time.sleep(0.2), "A")[1],
+        })
+        self.assertLess(time.perf_counter() - t0, 0.35)
+        self.assertEqual(list(resultados.items()), [("b", "B"), ("a", "A")])
+        self.assertEqual(list(duraciones), ["b", "a"])
+        self.assertGreaterEqual(min(duraciones.values()), 0.19)
+
+    def test_error_in_check_propagates(self):
+        def falla():
+            raise ValueError("boom")
+        with self.assertRaises(ValueError):
+            am.ejecutar_checks_concurrentes({"ok": lambda: 1, "falla": falla})
+
+
+if __name__ == "__main__":
+    unittest.main()
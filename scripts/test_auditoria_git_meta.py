@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests for auditoria_maestra — metadatos git leídos desde .git sin subprocess."""
+import subprocess
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts import auditoria_maestra as am
+
+
+def _repo_falso(root: Path, head: str, refs: dict[str, str] | None = None, packed: str = "") -> None:
+    git = root / ".git"
+    (git / "refs" / "heads").mkdir(parents=True)
+    (git / "HEAD").write_text(head + "\n", encoding="utf-8")
+    for ref, sha in (refs or {}).items():
+        (git / ref).write_text(sha + "\n", encoding="utf-8")
+    if packed:
+        (git / "packed-refs").write_text(packed, encoding="utf-8")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test lectura de HEAD desde .git
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestGitHeadDesdeDotGit(unittest.TestCase):
+    """HEAD se resuelve por loose ref, packed-refs o HEAD desacoplado."""
+
+    def setUp(self):
+        am._git_head.cache_clear()
+        self.addCleanup(am._git_head.cache_clear)
+
+    def _head(self, root: Path) -> str | None:
+        with mock.patch.object(am, "REPO_DIR", root):
+            am._git_head.cache_clear()
+            return am._git_head()
+
+    def test_loose_ref(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _repo_falso(Path(tmp), "ref: refs/heads/main", {"refs/heads/main": "a" * 40})
+            self.assertEqual(self._head(Path(tmp)), "a" * 40)
+
+    def test_packed_ref(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            packed = "# pack-refs with: peeled\n" + "b" * 40 + " refs/heads/main\n^" + "c" * 40 + "\n"
+            _repo_falso(Path(tmp), "ref: refs/heads/main", packed=packed)
+            self.assertEqual(self._head(Path(tmp)), "b" * 40)
+
+    def test_detached_head_and_missing_repo(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _repo_falso(Path(tmp), "d" * 40)
+            self.assertEqual(self._head(Path(tmp)), "d" * 40)
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(self._head(Path(tmp)))
+
+    def test_commit_hash_matches_git_without_subprocess(self):
+        try:
+            esperado = subprocess.check_output(
+                ["git", "rev-parse", "HEAD"], cwd=str(am.REPO_DIR), stderr=subprocess.DEVNULL
+            ).decode().strip()
+        except Exception:
+            self.skipTest("git no disponible")
+        with mock.patch.object(am.subprocess, "check_output", side_effect=AssertionError("sin subprocess")):
+            self.assertEqual(am._git_commit_hash(), esperado[:7])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests for auditoria_maestra — barrido único y caché del linaje por hash."""
+import re
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts import auditoria_maestra as am
+
+CODIGO = """\
+archivo["VIG"] = 0  # force VIG 0 por regla DA
+df["PROM_PRI_SEM"] = round(prom * 100)
+x = combine_first(PROM_PRI_SEM)
+vig_esperado = merge(catalogo)
+    df = _load_governance_tsv(path)
+"""
+
+
+def _find_lines_por_patron(text: str, pattern: str) -> list[tuple[int, str]]:
+    return [(i, line.strip()) for i, line in enumerate(text.splitlines(), 1) if re.search(pattern, line, re.IGNORECASE)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test barrido único de patrones
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLinajeBarridoUnico(unittest.TestCase):
+    """Mismos hits que la búsqueda patrón a patrón; re-auditar usa la caché."""
+
+    def test_scan_matches_per_pattern_search(self):
+        patterns = am._scan_patterns()
+        hits = am._scan_lines(CODIGO, patterns)
+        for pat in patterns:
+            self.assertEqual(hits[pat], _find_lines_por_patron(CODIGO, pat), pat)
+
+    def test_linaje_cached_by_content_hash(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(am, "AUDIT_CACHE_DIR", Path(tmp)):
+            am._SCAN_MEMO.clear()
+            linaje = am.construir_linaje(CODIGO)
+            self.assertEqual(len(list(Path(tmp).glob("linaje_codigo_*.pkl"))), 1)
+            am._SCAN_MEMO.clear()
+            with mock.patch.object(am, "_scan_lines", side_effect=AssertionError("no debe re-escanear")):
+                self.assertEqual(am.construir_linaje(CODIGO), linaje)
+                self.assertEqual(am.detectar_puntos_clave(CODIGO)["carga_catalogos_TSV"][0][0], 5)
+            vig = next(e for e in linaje if e.columna == "VIG")
+            self.assertIn("Forzado a 0 por regla DA", vig.transformaciones)
+            am._SCAN_MEMO.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
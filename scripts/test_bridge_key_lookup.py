@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Tests for _lookup_catalog_key_3 — llave exacta + fallback de continuidad en una pasada."""
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from codigo_gobernanza_v2 import _lookup_catalog_key_3, _normalize_continuidad_name_for_sies
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test _lookup_catalog_key_3
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLookupCatalogKey3(unittest.TestCase):
+    """Posición por llave exacta, luego por continuidad; tipo de match por fila."""
+
+    def test_exact_then_fallback(self):
+        catalog = pd.Index(["D|IEAUD|AUDITORIA", "V|IEIND|INGENIERIA INDUSTRIAL", None])
+        exact = pd.Series(
+            ["D|IEAUD|AUDITORIA", "D|IEAUD|CONTINUIDAD AUDITORIA", "D|XX|OTRA"],
+            index=[30, 10, 20],
+        )
+        fallback = pd.Series(["D|IEAUD|AUDITORIA", "D|IEAUD|AUDITORIA", "D|XX|OTRA"], index=exact.index)
+        pos, tipo = _lookup_catalog_key_3(exact, fallback, catalog)
+        self.assertEqual(pos, [0, 0, -1])
+        self.assertEqual(tipo.tolist(), ["EXACTO", "FALLBACK_NOMBRE", "SIN_MATCH"])
+        self.assertEqual(list(tipo.index), [30, 10, 20])
+
+    def test_fallback_name_is_catalog_name(self):
+        self.assertEqual(_normalize_continuidad_name_for_sies("Continuidad Auditoria"), "AUDITORIA")
+
+
+if __name__ == "__main__":
+    unittest.main()
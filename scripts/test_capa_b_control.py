@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Tests for Capa B legacy — resumen histórico y MU de control vectorizados."""
+import re
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import codigo_gobernanza_v2 as gob
+
+
+def _resumen_fila_a_fila(valid: pd.DataFrame) -> pd.DataFrame:
+    """Implementación previa (un ciclo por grupo), usada como referencia."""
+    anio_ref = int(pd.to_numeric(valid["ANO"], errors="coerce").dropna().max())
+    rows = []
+    for (rut, cod), sub in valid[valid["CODIGO_UNICO"].notna()].groupby(["RUT_NORM", "CODIGO_UNICO"]):
+        s_ref = sub[sub["ANO"] == anio_ref]
+        estado_ref = s_ref["DESCRIPCION_ESTADO"].astype(str).str.upper()
+        estado_hist = sub["DESCRIPCION_ESTADO"].astype(str).str.upper()
+        rows.append(
+            {
+                "RUT_NORM": rut,
+                "CODIGO_UNICO": cod,
+                "CURSO_1ER_SEM": "SI" if (s_ref["PERIODO"] == 1).any() else "NO",
+                "CURSO_2DO_SEM": "SI" if (s_ref["PERIODO"] == 2).any() else "NO",
+                "UNIDADES_CURSADAS": s_ref["CODRAMO"].nunique(),
+                "UNIDADES_APROBADAS": s_ref["CODRAMO"][estado_ref.str.contains("APROB", na=False)].nunique(),
+                "UNID_CURSADAS_TOTAL": sub["CODRAMO"].nunique(),
+                "UNID_APROBADAS_TOTAL": sub["CODRAMO"][
+                    estado_hist.str.contains(r"APROB|CONVALID|RECONOC|EQUIV|HOMOLOG", regex=True, na=False)
+                ].nunique(),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _modalidad_jor_fila_a_fila(mat_ac: pd.DataFrame, df_equiv: pd.DataFrame) -> list[tuple]:
+    """Implementación previa (iterrows + resolver_ambiguedad_sies), solo MODALIDAD/JOR."""
+    jmap = {}
+    for _, r in df_equiv[["CODIGO_UNICO", "JORNADA"]].dropna().drop_duplicates().iterrows():
+        j = str(r["JORNADA"]).strip().lower()
+        jmap[r["CODIGO_UNICO"]] = next((v for k, v in gob._JORNADA_LEGACY_JOR if k in j), pd.NA)
+    out = []
+    for _, row in mat_ac.iterrows():
+        version = row.get("VERSION", "")
+        if not version or pd.isna(version):
+            plan = row.get("PLAN_ESTUDIOS", "")
+            match = re.search(r"(V\d+)", plan.upper()) if plan and isinstance(plan, str) else None
+            version = match.group(1) if match else "V1"
+        sies = gob.resolver_ambiguedad_sies(row.get("CODIGO_UNICO", ""), row.get("JORNADA", ""), version)[0]
+        out.append((sies, jmap.get(row["CODIGO_UNICO"], pd.NA) if sies is None else pd.NA))
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test construir_resumen_historico
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestResumenHistorico(unittest.TestCase):
+    """La agregación agrupada reproduce el resumen calculado grupo a grupo."""
+
+    def test_parity_with_group_loop(self):
+        hist = pd.DataFrame(
+            {
+                "RUT_NORM": ["1-9", "1-9", "1-9", "1-9", "2-7", "2-7", "3-5", None],
+                "CODIGO_UNICO": ["A", "A", "A", "B", "A", "A", None, "A"],
+                "ANO": [2025, 2025, 2024, 2024, 2025, 2025, 2025, 2025],
+                "PERIODO": [1, 2, 1, 1, 2, 2, 1, 1],
+                "CODRAMO": ["R1", "R2", "R3", "R1", "R1", "R1", "R9", "R1"],
+                "DESCRIPCION_ESTADO": ["APROBADO", "REPROBADO", "CONVALIDADO", None, "APROBADO", "APROBADO", "X", "X"],
+            }
+        )
+        esperado = _resumen_fila_a_fila(hist)
+        obtenido = gob.construir_resumen_historico(hist)
+        pd.testing.assert_frame_equal(obtenido, esperado, check_dtype=False)
+        self.assertEqual(obtenido.columns.tolist(), gob.RESUMEN_HISTORICO_COLUMNS)
+
+    def test_sin_validos_devuelve_columnas(self):
+        hist = pd.DataFrame({"RUT_NORM": ["1-9"], "CODIGO_UNICO": [None], "ANO": [2025], "PERIODO": [1]})
+        self.assertEqual(gob.construir_resumen_historico(hist).columns.tolist(), gob.RESUMEN_HISTORICO_COLUMNS)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test construir_matricula_unificada_control
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestMatriculaUnificadaControl(unittest.TestCase):
+    """MODALIDAD por join contra la matriz y JOR heredado como fallback."""
+
+    def test_parity_with_iterrows(self):
+        if not gob._matriz_desambiguacion():
+            self.skipTest("DURACION_ESTUDIOS.tsv no disponible")
+        codcarpr, jornada, version = next(iter(gob._matriz_desambiguacion()))
+        mat_ac = pd.DataFrame(
+            {
+                "CODIGO_UNICO": [codcarpr, f" {codcarpr.lower()} ", codcarpr, "ZZZ", "YYY", None, codcarpr],
+                "JORNADA": [jornada, jornada, jornada, "D", "V", "D", ""],
+                "VERSION": [version, None, "", None, "V9", None, version],
+                "PLAN_ESTUDIOS": [None, f"Plan_{version}_2024", "sin version", 7, None, None, None],
+            }
+        )
+        equiv = pd.DataFrame(
+            {
+                "CODIGO_UNICO": ["ZZZ", "ZZZ", "YYY", codcarpr],
+                "JORNADA": ["Diurno", "Vespertino", "Semipresencial", "Diurno"],
+            }
+        )
+        mu = gob.construir_matricula_unificada_control(mat_ac, equiv)
+        self.assertEqual(mu.columns.tolist(), gob.MATRICULA_UNIFICADA_COLUMNS)
+        obtenido = [
+            (None if pd.isna(m) else m, None if pd.isna(j) else j) for m, j in zip(mu["MODALIDAD"], mu["JOR"])
+        ]
+        esperado = [
+            (None if pd.isna(m) else m, None if pd.isna(j) else j) for m, j in _modalidad_jor_fila_a_fila(mat_ac, equiv)
+        ]
+        self.assertEqual(obtenido, esperado)
+        self.assertEqual(obtenido[3], (None, "2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
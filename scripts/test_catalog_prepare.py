@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Tests for _prepare_catalog_manual / _prepare_puente_sies — llaves vectorizadas."""
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import codigo_gobernanza_v2 as gob
+from src.catalogs import CompiledIndexCache
+
+
+def _base() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "GRUPO_TRAZA": [" ab1", "AB1", "x9", "AB1"],
+            "JORNADA": ["d ", "D", "v", "D"],
+            "CODCARPR": ["ié ind", "IE  IND", "q", "ie ind"],
+            "NOMBRE_L": ["Ingeniería  civil", "INGENIERIA CIVIL", None, "Ingenieria Civil"],
+            "CODIGO_CARRERA_SIES": ["I1S1C5J1V1", " I1S1C5J1V2 ", "", "I1S1C5J1V1"],
+        }
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test llaves y ambigüedad
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestPrepareCatalogos(unittest.TestCase):
+    """Llaves equivalentes a _build_key_3 y códigos SIES agrupados por llave."""
+
+    def test_catalog_manual_keys_match_scalar_builders(self):
+        base = _base()
+        out = gob._prepare_catalog_manual(base[["GRUPO_TRAZA", "JORNADA", "CODCARPR", "NOMBRE_L"]])
+        esperado = [gob._build_key_3(j, c, n) for j, c, n in zip(base["JORNADA"], base["CODCARPR"], base["NOMBRE_L"])]
+        self.assertEqual(set(out["MANUAL_KEY_3"]), set(esperado))
+        self.assertEqual(len(out), 3)  # filas 2 y 4 coinciden tras normalizar
+        self.assertEqual(out["FAMILIA_TRAZA"].tolist(), ["AB", "AB", "X"])
+        self.assertEqual(out.columns.tolist()[-4:], ["FAMILIA_TRAZA", "FAMILIA_CODCARPR", "MANUAL_KEY_3", "MANUAL_KEY_NO_JORNADA"])
+
+    def test_puente_groups_codes_per_key(self):
+        puente = gob._prepare_puente_sies(_base()).set_index("BRIDGE_KEY_3")
+        ambiguo = puente.loc["D|IE IND|INGENIERIA CIVIL"]
+        self.assertEqual(ambiguo["N_CODES_SIES"], 2)
+        self.assertEqual(ambiguo["CODIGOS_SIES_POTENCIALES"], "I1S1C5J1V1 | I1S1C5J1V2")
+        self.assertEqual(ambiguo["GRUPO_TRAZA"], "ab1 | AB1")
+        self.assertEqual(ambiguo["CODIGO_CARRERA"], 5)
+        sin_codigo = puente.loc["V|Q|"]
+        self.assertEqual((sin_codigo["N_CODES_SIES"], sin_codigo["CODIGOS_SIES_POTENCIALES"]), (0, ""))
+        self.assertTrue(pd.isna(sin_codigo["CODIGO_CARRERA_SIES_1"]))
+
+    def test_duracion_catalog_memoized(self):
+        if not any(p.exists() for p in gob._duracion_tsv_candidates()):
+            self.skipTest("DURACION_ESTUDIOS.tsv no disponible")
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(gob, "_governance_bundle", return_value=None):
+            manual, puente = gob._build_catalog_and_bridge_from_duracion(CompiledIndexCache(Path(tmp)))
+            cache = CompiledIndexCache(Path(tmp))
+            manual_2, puente_2 = gob._build_catalog_and_bridge_from_duracion(cache)
+            self.assertTrue(cache.hits["catalogo_puente_duracion"])
+            pd.testing.assert_frame_equal(manual_2, manual)
+            pd.testing.assert_frame_equal(puente_2, puente)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Tests for src/dtypes — categorías compartidas para columnas de gobernanza."""
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.dtypes import SharedCategories, apply_category_policy, copy_on_write, decategorize, map_categories
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test política de dtypes
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestCategoryPolicy(unittest.TestCase):
+    """Dtype compartido entre frames y resultados idénticos al flujo en texto."""
+
+    def test_shared_dtype_and_skips(self):
+        a = pd.DataFrame({"JORNADA": ["D", "V", "D", "D"], "SEDE": [1, 2, 1, 1], "CODCLI": ["1", "2", "3", "4"]})
+        b = pd.DataFrame({"JORNADA": ["V", "S", "S", None]})
+        shared = SharedCategories()
+        convertidas = apply_category_policy([a, b], shared, columns=["JORNADA", "SEDE", "CODCLI"])
+        self.assertEqual(convertidas, ["JORNADA"])
+        self.assertEqual(a["JORNADA"].dtype, b["JORNADA"].dtype)
+        self.assertEqual(list(a["JORNADA"].cat.categories), ["", "D", "V", "S"])
+        self.assertEqual(a["SEDE"].dtype, "int64")
+        self.assertEqual(b["JORNADA"].fillna("").tolist(), ["V", "S", "S", ""])
+        self.assertFalse(isinstance(decategorize(a["JORNADA"]).dtype, pd.CategoricalDtype))
+
+    def test_map_categories_matches_map(self):
+        raw = pd.Series([" diurna ", "Vespertina", None, " diurna "])
+        norm = lambda v: "" if pd.isna(v) else v.strip().upper()
+        cat = raw.astype(pd.CategoricalDtype(["", " diurna ", "Vespertina"]))
+        esperado = raw.map(norm)
+        obtenido = map_categories(cat, norm)
+        self.assertEqual(obtenido.tolist(), esperado.tolist())
+        self.assertEqual(("|" + obtenido).iloc[0], "|DIURNA")
+
+
+class TestCopyOnWrite(unittest.TestCase):
+    """CoW solo dentro del bloque o de la función decorada (pandas 2.x)."""
+
+    @unittest.skipIf(int(pd.__version__.split(".")[0]) >= 3, "pandas >= 3: CoW es el único modo")
+    def test_restaura_modo_previo(self):
+        previo = pd.get_option("mode.copy_on_write")
+
+        @copy_on_write()
+        def _modo():
+            return pd.get_option("mode.copy_on_write")
+
+        self.assertTrue(_modo())
+        self.assertEqual(pd.get_option("mode.copy_on_write"), previo)
+
+    def test_decorador_devuelve_resultado(self):
+        self.assertEqual(copy_on_write()(lambda x: x + 1)(1), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Tests for src/export — exportación Excel en streaming."""
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.export import build_row_highlight, write_workbook_streaming, xlsxwriter_available
+
+
+def _sample() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "CODCLI": ["20251IINF001", "20251IINF002", "20251IINF003", "20251IINF004", "20251IINF005"],
+            "N_DOC": pd.array([11, 12, None, 14, 15], dtype="Int64"),
+            "NOTA": [5.5, np.nan, 4.0, 6.1, 3.9],
+            "FECHA": pd.to_datetime(["2025-12-01", None, "2025-12-03", "2025-12-04", "2025-12-05"]),
+        },
+        index=[10, 11, 12, 13, 14],
+    )
+
+
+def _red_cells(path: Path, sheet: str) -> list[tuple[int, int]]:
+    from openpyxl import load_workbook
+
+    ws = load_workbook(path)[sheet]
+    return [
+        (cell.row, cell.column)
+        for row in ws.iter_rows(min_row=2)
+        for cell in row
+        if cell.fill is not None and cell.fill.fill_type == "solid"
+    ]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test write_workbook_streaming
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestWriteWorkbookStreaming(unittest.TestCase):
+    """Round-trip, marcas rojas y umbral de filas por hoja."""
+
+    engines = ["openpyxl"] + (["xlsxwriter"] if xlsxwriter_available() else [])
+
+    def test_roundtrip_matches_pandas(self):
+        df = _sample()
+        for engine in self.engines:
+            with self.subTest(engine=engine), tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / "out.xlsx"
+                write_workbook_streaming({"HOJA": df}, path, engine=engine, chunk_rows=2)
+                back = pd.read_excel(path, sheet_name="HOJA")
+                expected = df.reset_index(drop=True).astype({"N_DOC": "float64"})
+                pd.testing.assert_frame_equal(back, expected, check_dtype=False)
+
+    def test_red_highlight_by_index_label(self):
+        df = _sample()
+        mask = pd.Series([False, True, False, True, False], index=df.index)
+        highlight = build_row_highlight("HOJA", df, mask, ["CODCLI", "NO_EXISTE"])
+        for engine in self.engines:
+            with self.subTest(engine=engine), tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / "out.xlsx"
+                write_workbook_streaming({"HOJA": df}, path, highlights=[highlight], engine=engine)
+                self.assertEqual(_red_cells(path, "HOJA"), [(3, 1), (5, 1)])
+
+    def test_varias_marcas_misma_hoja(self):
+        df = _sample()
+        codcli = build_row_highlight("HOJA", df, pd.Series([False, True, False, False, False], index=df.index), ["CODCLI"])
+        fila = build_row_highlight("HOJA", df, pd.Series([False, True, True, False, False], index=df.index), list(df.columns))
+        n_cols = len(df.columns)
+        for engine in self.engines:
+            with self.subTest(engine=engine), tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / "out.xlsx"
+                write_workbook_streaming({"HOJA": df}, path, highlights=[codcli, fila], engine=engine)
+                esperado = [(r, c) for r in (3, 4) for c in range(1, n_cols + 1)]
+                self.assertEqual(_red_cells(path, "HOJA"), esperado)
+
+    def test_oversize_split_and_skip(self):
+        df = _sample()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "split.xlsx"
+            stats = write_workbook_streaming({"GRANDE": df, "CHICA": df.head(1)}, path, max_rows_per_sheet=2)
+            self.assertEqual(stats[0].parts, ["GRANDE", "GRANDE_2", "GRANDE_3"])
+            parts = pd.read_excel(path, sheet_name=stats[0].parts)
+            self.assertEqual(sum(len(p) for p in parts.values()), len(df))
+
+            path = Path(tmp) / "skip.xlsx"
+            stats = write_workbook_streaming(
+                {"GRANDE": df, "CHICA": df.head(1)}, path, max_rows_per_sheet=2, oversize_policy="omitir"
+            )
+            self.assertTrue(stats[0].skipped)
+            self.assertEqual(pd.ExcelFile(path).sheet_names, ["CHICA"])
+
+
+if __name__ == "__main__":
+    unittest.main()
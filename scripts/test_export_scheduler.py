@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Tests for src/export/scheduler — exportación concurrente con reporte consolidado."""
+import tempfile
+import threading
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.export import ExportScheduler, atomic_write_text
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test ExportScheduler
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestExportScheduler(unittest.TestCase):
+    """El artefacto rápido no espera al lento y los errores se consolidan."""
+
+    def test_fast_task_ready_before_slow_task_finishes(self):
+        release = threading.Event()
+        ready: list[str] = []
+        with tempfile.TemporaryDirectory() as tmp:
+            sched = ExportScheduler(max_workers=2, on_ready=lambda r: ready.append(r.name))
+            sched.submit("xlsx", release.wait, 5)
+            csv = sched.submit("csv", atomic_write_text, Path(tmp) / "mu.csv", "a;b\n")
+            csv.result(timeout=5)
+            self.assertEqual(ready, ["csv"])
+            release.set()
+            report = sched.wait()
+        self.assertEqual([t.name for t in report.tasks], ["xlsx", "csv"])
+        self.assertTrue(report.to_dict()["ok"])
+
+    def test_errors_are_consolidated(self):
+        def _boom(msg):
+            raise OSError(msg)
+
+        sched = ExportScheduler(max_workers=3)
+        sched.submit("xlsx", _boom, "disco lleno")
+        sched.submit("json", _boom, "permiso", critical=False)
+        sched.submit("csv", lambda: None)
+        report = sched.wait()
+        summary = report.to_dict()
+        self.assertEqual((summary["errores_criticos"], summary["errores_no_criticos"]), (1, 1))
+        with self.assertRaisesRegex(RuntimeError, "xlsx: OSError: disco lleno") as ctx:
+            report.raise_for_errors()
+        self.assertNotIn("json", str(ctx.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
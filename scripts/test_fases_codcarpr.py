@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Tests for scripts/fases_codcarpr_duracion.py — Fase 1+2, 3 y 4 sobre frames compartidos."""
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts import fase1_fase2_duracion_unica as f12
+from scripts import fase3_resolucion_codcarpr as f3
+from scripts import fase4_adaptador_paralelo_codcarpr as f4
+from scripts import fases_codcarpr_duracion as orq
+
+DUR = pd.DataFrame(
+    {
+        "CODIGO_UNICO": ["I1J1V1", "I2J2V1", "I3J1V1", "I4J4V1", "I5J1V2"],
+        "CODCARPR_CANONICO": ["", "", "", "PREV", ""],
+        "CODCARPR_ALIAS_LIST": ["", "", "", "", ""],
+    }
+)
+MAT = pd.DataFrame(
+    {
+        "CODIGO_SIES_FINAL": ["I1J1V1", "I2J2V1", "I2J2V1", "I3J1V1", "I3J1V1", "I4J4V1", "I5J1V2", "I9J1V1"],
+        "CODCARPR": ["ADM", "ENF", "ENF2", "", "DER", "PSI", "ADM", "KIN"],
+        "TIPO_CARRERA": "P",
+        "JORNADA": "1",
+        "VERSION": "1",
+        "CONFIANZA": "ALTA",
+        "NOTAS": "",
+    }
+)
+PUE = pd.DataFrame({"CODIGO_CARRERA_SIES": ["I1J1V1", "I9J1V1"]})
+STAGE = pd.DataFrame(
+    {
+        "CODCLI": ["1", "2", "3", "4"],
+        "CODCARPR_NORM": ["ADM", " ENF ", "DER", "ZZZ"],
+        "JOR": ["1", "2", "1", "1"],
+        "CODIGO_CARRERA_SIES_FINAL": ["I1J1V1", "", "I3J1V1", ""],
+        "INCLUIR_EN_MATRICULA_32": ["SI", "SI", "NO", "SI"],
+    }
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test referencia matriz y fases 1+2 / 3
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestFasesDuracion(unittest.TestCase):
+    """La referencia compartida respeta el CODCARPR vacío solo en Fase 1+2."""
+
+    def test_fase1_cuenta_vacio(self):
+        dur2, backfill, _ = f12.run_fase1_fase2(DUR, MAT, PUE)
+        self.assertEqual(dur2["CODCARPR_CANONICO"].tolist(), ["ADM", "", "", "PREV", "ADM"])
+        self.assertEqual(dur2["CODCARPR_ALIAS_LIST"].tolist(), ["", "ENF|ENF2", "|DER", "", ""])
+        self.assertEqual(backfill["CODIGO_UNICO"].tolist(), ["I9J1V1"])
+
+    def test_fase3_ignora_vacio(self):
+        cat, dur3, amb, rep = f3.run_fase3(DUR, MAT, PUE, STAGE)
+        self.assertEqual(
+            cat["ESTADO_RESOLUCION_FASE3"].tolist(), ["UNICO", "AMBIGUO", "UNICO", "UNICO", "UNICO"]
+        )
+        self.assertEqual(dur3["CODCARPR_CANONICO"].tolist(), ["ADM", "", "DER", "PREV", "ADM"])
+        self.assertEqual(amb["CODIGO_UNICO"].tolist(), ["I2J2V1"])
+        metricas = dict(zip(rep["metrica"], rep["valor"]))
+        self.assertEqual((metricas["output_codigos_unicos"], metricas["output_codigos_no_unicos"]), ("2", "0"))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test lookup de duración y orquestador
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestFase4(unittest.TestCase):
+    """El lookup (CODCARPR, JOR_NUM) se construye una vez y resuelve por get_indexer."""
+
+    def test_lookup_y_detalle(self):
+        artefactos = orq.ejecutar_fases(orq.InsumosFases(dur=DUR, mat=MAT, pue=PUE, stage=STAGE))
+        lookup = f4.build_duracion_lookup(artefactos["duracion"])
+        self.assertEqual(lookup.loc[("ADM", "1"), "CANDIDATOS_DURACION"], "I1J1V1|I5J1V2")
+
+        detalle = artefactos["detalle_fase4"]
+        self.assertEqual(
+            detalle["ESTADO_F4"].tolist(),
+            ["REQUIERE_REVISION_DURACION", "PENDIENTE", "RESUELTO_DURACION", "PENDIENTE"],
+        )
+        self.assertEqual(detalle["CODIGO_SIES_PROPUESTO_F4"].tolist(), ["", "", "I3J1V1", ""])
+        self.assertEqual(detalle["COINCIDE_CON_ACTUAL"].tolist(), ["NO", "NO", "SI", "NO"])
+        self.assertEqual(len(artefactos["pendientes_fase4"]), 3)
+
+    def test_sin_stage_omite_fase4(self):
+        artefactos = orq.ejecutar_fases(orq.InsumosFases(dur=DUR, mat=MAT, pue=PUE, stage=None))
+        self.assertNotIn("detalle_fase4", artefactos)
+        metricas = dict(zip(artefactos["reporte_fase3"]["metrica"], artefactos["reporte_fase3"]["valor"]))
+        self.assertEqual(metricas["output_xlsx_present"], "False")
+
+    def test_lookup_vacio(self):
+        lookup = f4.build_duracion_lookup(DUR.assign(CODCARPR_RESOLUCION_ESTADO="AMBIGUO"))
+        self.assertTrue(lookup.empty)
+        detalle = f4.build_detalle(STAGE, lookup)
+        self.assertEqual(
+            detalle["ESTADO_F4"].tolist(), ["RESUELTO_FALLBACK", "PENDIENTE", "RESUELTO_FALLBACK", "PENDIENTE"]
+        )
+        self.assertEqual(detalle["N_CANDIDATOS_DURACION"].tolist(), ["0"] * 4)
+
+    def test_columnas_faltantes(self):
+        with self.assertRaisesRegex(RuntimeError, "Fase4"):
+            f4.build_detalle(STAGE.drop(columns=["JOR"]), f4.build_duracion_lookup(DUR.assign(CODCARPR_RESOLUCION_ESTADO="")))
+
+
+if __name__ == "__main__":
+    unittest.main()
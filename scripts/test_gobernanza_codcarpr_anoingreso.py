@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Tests for src/governance/codcarpr_anoingreso.py y su CLI scripts/gobernanza_codcarpr_anoingreso.py."""
+import io
+import tempfile
+import unittest
+from unittest import mock
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts import gobernanza_codcarpr_anoingreso as cli
+from src.governance import codcarpr_anoingreso as gob
+from src.catalogs import CompiledIndexCache
+
+HOJA1_GOB = pd.DataFrame(
+    {
+        "CODCARPR": ["ADMP", "ADMV", "ADMX", "ENF"],
+        "JORNADA": ["d", "D ", "D", "V"],
+        "NOMBRE_L": ["ADMINISTRACION  PUBLICA", "administracion publica", "ADMINISTRACION PUBLICA", "ENFERMERIA"],
+        2024: [5.0, 5.0, None, 3.0],
+        "2025": [2.0, 9.0, 1.0, None],
+        "OBS": ["", "", "", ""],
+    }
+)
+
+
+def _silencioso(fn, *args, **kwargs):
+    with redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test superposiciones y rango por cohorte
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestSuperposiciones(unittest.TestCase):
+    """groupby().agg reproduce el orden VAL descendente con empates estables."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.long = _silencioso(gob.paso1_excel_a_tsv_long, HOJA1_GOB, Path(self.tmp.name))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_claves_y_orden(self):
+        sup = _silencioso(gob.paso2_detectar_superposiciones, self.long)
+        self.assertEqual(sup["ANOINGRESO"].tolist(), [2024, 2025])
+        self.assertEqual(sup["N_CODCARPR"].tolist(), [2, 3])
+        # Empate 2024 (5 vs 5): orden alfabético del TSV long.
+        self.assertEqual(sup["CODCARPR_LIST"].tolist(), ["ADMP|ADMV", "ADMV|ADMP|ADMX"])
+        self.assertEqual(sup.loc[1, "CODCARPR_VALS"], "ADMV:9|ADMP:2|ADMX:1")
+
+    def test_rango_anoingreso(self):
+        rango = _silencioso(gob.paso2_rango_anoingreso, self.long).set_index("CODCARPR")
+        self.assertEqual(rango.loc["ADMP", ["ANOINGRESO_MIN", "ANOINGRESO_MAX", "N_ANOS"]].tolist(), [2024, 2025, 2])
+        self.assertEqual(rango.loc["ENF", "VAL_TOTAL"], 3.0)
+
+    def test_cruce_universo(self):
+        sup = _silencioso(gob.paso2_detectar_superposiciones, self.long)
+        hoja1 = pd.DataFrame(
+            {
+                "CODCLI": ["1", "1", "2", "3"],
+                "CODCARR": ["ADMP"] * 4,
+                "CARRERA": ["Administracion publica"] * 4,
+                "JORNADA": ["D", "D", "d", "D"],
+                "PLAN_DE_ESTUDIO": ["P1"] * 4,
+            }
+        )
+        da = pd.DataFrame({"CODCLI": ["1", "2", "3"], "ANOINGRESO": ["2025", "2024", "2023"]})
+        afectados = _silencioso(gob.paso3_cruce_universo_real, hoja1, da, sup)
+        # JORNADA/CARRERA se normalizan solo para cruzar; la salida conserva el valor original.
+        self.assertEqual(afectados["CODCLI"].tolist(), ["1", "2"])
+        self.assertEqual(afectados["JORNADA"].tolist(), ["D", "d"])
+        self.assertEqual(afectados["N_CODCARPR"].tolist(), [3, 2])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test etapa en proceso con caché de universo
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestEtapa(unittest.TestCase):
+    """La etapa corre sin subprocess y reutiliza Hoja1/DatosAlumnos desde el caché."""
+
+    def test_etapa_completa(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            input_xlsx = root / "input.xlsx"
+            with pd.ExcelWriter(input_xlsx, engine="openpyxl") as w:
+                pd.DataFrame(
+                    {
+                        "CODCLI": [1, 2],
+                        "CODCARR": ["ADMP", "ENF"],
+                        "CARRERA": ["ADMINISTRACION PUBLICA", "ENFERMERIA"],
+                        "JORNADA": ["D", "V"],
+                        "PLAN_DE_ESTUDIO": ["P1", "P2"],
+                    }
+                ).to_excel(w, sheet_name="Hoja1", index=False)
+                pd.DataFrame({"CODCLI": [1, 2], "ANOINGRESO": [2025, 2024]}).to_excel(w, sheet_name="DatosAlumnos", index=False)
+            HOJA1_GOB.to_excel(root / gob.GOBERNANZA_XLSX_NAME, index=False)
+
+            cache = CompiledIndexCache(root / "cache")
+            resumen = _silencioso(gob.ejecutar_gobernanza_codcarpr_anoingreso, input_xlsx, root / "out", root / "ctl", cache=cache)
+            self.assertTrue(resumen["ok"])
+            self.assertEqual((resumen["n_claves_superpuestas"], resumen["n_codcli_afectados"]), (2, 1))
+            self.assertFalse(cache.hits["universo_codcarpr_anoingreso"])
+
+            _silencioso(gob.ejecutar_gobernanza_codcarpr_anoingreso, input_xlsx, root / "out", root / "ctl", cache=cache)
+            self.assertTrue(cache.hits["universo_codcarpr_anoingreso"])
+            hojas = pd.ExcelFile(root / "out" / "codcli_superposiciones_codcarpr_por_anoingreso.xlsx").sheet_names
+            self.assertIn("RANGO_ANOINGRESO", hojas)
+
+    def test_cli_cache_bajo_output_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            argv = ["gob", "--input", str(root / "x.xlsx"), "--output-dir", str(root / "out")]
+            with mock.patch.object(sys, "argv", argv), mock.patch.object(cli, "ejecutar_gobernanza_codcarpr_anoingreso") as etapa:
+                cli.main()
+            self.assertEqual(etapa.call_args.kwargs["cache"].directory, root / "out" / ".cache")
+
+    def test_sin_excel_gobernanza(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(FileNotFoundError):
+                _silencioso(gob.ejecutar_gobernanza_codcarpr_anoingreso, Path(tmp) / "x.xlsx", Path(tmp), Path(tmp))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Tests for src/catalogs/bundle.py — bundle de gobernanza compilado."""
+import json
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.catalogs import (
+    GOVERNANCE_BUNDLE_ENV,
+    BundleSource,
+    compile_governance_bundle,
+    load_active_governance_bundle,
+    load_governance_bundle,
+)
+
+SOURCES = (
+    BundleSource("gob_sede.tsv", required=("SEDE_NORM", "COD_SED")),
+    BundleSource("control/config.json", kind="json", required=("campos",)),
+    BundleSource("patch.json", kind="json", optional=True),
+)
+
+
+def _write_sources(root: Path) -> None:
+    (root / "control").mkdir()
+    (root / "gob_sede.tsv").write_text("SEDE_NORM\tCOD_SED\nCENTRAL\t1\nNORTE\t\n", encoding="utf-8")
+    (root / "control" / "config.json").write_text(json.dumps({"campos": {"VIG": [0, 1]}}), encoding="utf-8")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test compilación y carga
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestGovernanceBundle(unittest.TestCase):
+    """Una lectura al iniciar; fuentes modificadas o contrato distinto invalidan el bundle."""
+
+    def test_compile_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _write_sources(root)
+            out = root / "bundle.pkl"
+            compile_governance_bundle(root, out, SOURCES, derived={"llaves": lambda: {"CENTRAL": 1}})
+            bundle, estado = load_governance_bundle(out, root, SOURCES)
+            self.assertEqual(estado, "cargado")
+            sede = bundle.table(root / "gob_sede.tsv")
+            self.assertEqual(sede["COD_SED"].tolist(), ["1", ""])  # dtype=str, keep_default_na=False
+            self.assertEqual(bundle.document(str(root / "control" / "config.json")), {"campos": {"VIG": [0, 1]}})
+            self.assertIsNone(bundle.table("/fuera/del/repo.tsv"))
+            self.assertEqual(bundle.derived["llaves"], {"CENTRAL": 1})
+
+    def test_stale_and_incompatible(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _write_sources(root)
+            out = root / "bundle.pkl"
+            compile_governance_bundle(root, out, SOURCES)
+            # Cambia el mtime pero no el contenido: sigue vigente.
+            os.utime(root / "gob_sede.tsv", ns=(1, 1))
+            self.assertEqual(load_governance_bundle(out, root, SOURCES)[1], "cargado")
+            self.assertEqual(load_governance_bundle(out, root, SOURCES[:2])[1], "incompatible")
+            # Cambió el código de los derivados (versión nueva) aunque las fuentes sigan iguales.
+            self.assertEqual(load_governance_bundle(out, root, SOURCES, derived_version=2)[1], "incompatible")
+            (root / "gob_sede.tsv").write_text("SEDE_NORM\tCOD_SED\nCENTRAL\t2\n", encoding="utf-8")
+            self.assertEqual(load_governance_bundle(out, root, SOURCES), (None, "desactualizado"))
+            self.assertEqual(load_governance_bundle(root / "nada.pkl", root, SOURCES), (None, "ausente"))
+
+    def test_invalid_catalogs_abort_compile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _write_sources(root)
+            (root / "gob_sede.tsv").write_text("SEDE\tCOD_SED\nX\t1\n", encoding="utf-8")
+            (root / "control" / "config.json").unlink()
+            with self.assertRaises(ValueError) as ctx:
+                compile_governance_bundle(root, root / "bundle.pkl", SOURCES)
+            self.assertIn("gob_sede.tsv: faltan ['SEDE_NORM']", str(ctx.exception))
+            self.assertIn("control/config.json: no existe", str(ctx.exception))
+            self.assertFalse((root / "bundle.pkl").exists())
+
+    def test_env_disables_bundle(self):
+        with mock.patch.dict(os.environ, {GOVERNANCE_BUNDLE_ENV: "0"}):
+            self.assertEqual(load_active_governance_bundle(Path("/no/existe")), (None, "desactivado"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Tests for src/identity — ids enteros por corrida para joins RUT/CODCLI."""
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.identity import ID_DTYPE, IdentityIndex
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test IdentityIndex
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestIdentityIndex(unittest.TestCase):
+    """Ids estables entre llamadas y join por id equivalente al join por texto."""
+
+    def test_ids_stable_and_decodable(self):
+        ix = IdentityIndex()
+        first = ix.rut_ids(["123K", "456", "123K", None])
+        second = ix.rut_ids(["456", "789", float("nan")])
+        self.assertEqual(first.dtype, ID_DTYPE)
+        self.assertEqual(first.tolist(), [0, 1, 0, 2])
+        self.assertEqual(second.tolist(), [1, 3, 2])
+        self.assertEqual(ix.rut.decode([0, 3]).tolist(), ["123K", "789"])
+
+    def test_pair_ids_match_string_join(self):
+        left = pd.DataFrame({"RUT": ["1", "1", "2", "3"], "CARR": ["A", "B", "A", "A"]})
+        right = pd.DataFrame({"RUT": ["1", "2", "2"], "CARR": ["B", "A", "B"], "V": [10, 20, 30]})
+        esperado = left.merge(right, on=["RUT", "CARR"], how="left")["V"]
+        ix = IdentityIndex()
+        left["_ID"] = ix.pair_ids(left["RUT"], left["CARR"])
+        right["_ID"] = ix.pair_ids(right["RUT"], right["CARR"])
+        obtenido = left.merge(right[["_ID", "V"]], on="_ID", how="left")["V"]
+        pd.testing.assert_series_equal(obtenido, esperado)
+        self.assertEqual(ix.stats()["RUT_CODCARPR"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Tests for src/catalogs — índices compilados persistidos por hash de fuente."""
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.catalogs import CompiledIndexCache, sources_key
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test CompiledIndexCache
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestCompiledIndexCache(unittest.TestCase):
+    """Reutiliza mientras la fuente no cambie; recompila y poda al cambiar."""
+
+    def test_hit_rebuild_and_prune(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "oferta.tsv"
+            source.write_text("CODIGO_UNICO\nI1S1C1J1V1\n", encoding="utf-8")
+            cache_dir = Path(tmp) / "catalogos"
+            builds = []
+
+            def build():
+                builds.append(1)
+                return {"I1S1C1J1V1": {"JORNADA": 1}}
+
+            key = sources_key([source], "hoja", 1)
+            first = CompiledIndexCache(cache_dir).load_or_build("indice_oferta", key, build)
+            cache = CompiledIndexCache(cache_dir)
+            self.assertEqual(cache.load_or_build("indice_oferta", key, build), first)
+            self.assertEqual((len(builds), cache.hits), (1, {"indice_oferta": True}))
+
+            source.write_text("CODIGO_UNICO\nI1S1C1J1V2\n", encoding="utf-8")
+            new_key = sources_key([source], "hoja", 1)
+            self.assertNotEqual(new_key, key)
+            CompiledIndexCache(cache_dir).load_or_build("indice_oferta", new_key, build)
+            self.assertEqual(len(builds), 2)
+            self.assertEqual([p.name for p in cache_dir.iterdir()], [f"indice_oferta_{new_key[:16]}.pkl"])
+
+    def test_corrupt_file_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CompiledIndexCache(Path(tmp))
+            cache.path_for("indice_homologacion", "ab" * 32).write_bytes(b"no es pickle")
+            value = cache.load_or_build("indice_homologacion", "ab" * 32, lambda: {("IEIND", "D"): "I1S1C1J1V1"})
+            self.assertEqual(value, {("IEIND", "D"): "I1S1C1J1V1"})
+            self.assertFalse(cache.hits["indice_homologacion"])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test índices de oferta y homologación
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestIndicesOfertaHomologacion(unittest.TestCase):
+    """Construcción vectorizada equivalente a la asignación fila a fila."""
+
+    def test_oferta_index(self):
+        from codigo_gobernanza_v2 import _compile_oferta_index
+
+        dim = pd.DataFrame(
+            {
+                "CODIGO_UNICO": [" i1s1c7j1v1", "X", "I1S1C7J1V1", ""],
+                "JORNADA": [1, 2, 3, 4],
+                "CODIGO_CARRERA": [99, 55, 99, 1],
+            }
+        )
+        idx = _compile_oferta_index(dim)
+        self.assertEqual(sorted(idx), ["I1S1C7J1V1", "X"])
+        self.assertEqual(idx["I1S1C7J1V1"]["JORNADA"], 3)
+        self.assertEqual(idx["I1S1C7J1V1"]["CODIGO_CARRERA"], 7)
+        self.assertEqual(idx["X"]["CODIGO_CARRERA"], 55)
+        self.assertIsNone(idx["X"]["TIPO_PLAN_CARRERA"])
+
+    def test_homologacion_index(self):
+        from codigo_gobernanza_v2 import _load_cuadro_homologacion
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "input.xlsx"
+            with pd.ExcelWriter(path) as writer:
+                pd.DataFrame({"A": [1]}).to_excel(writer, sheet_name="Hoja1", index=False)
+                pd.DataFrame(
+                    {
+                        "CODCARPR": ["ieind ", "IEAUD", ""],
+                        "JORNADA_DA": ["d", "V", "D"],
+                        "CODIGO_SIES": ["I1S1C5J1V1", "I1S1C6J2V1", "I1S1C7J1V1"],
+                    }
+                ).to_excel(writer, sheet_name="CUADRO HOMOLOGACIÓN", index=False)
+            cache = CompiledIndexCache(Path(tmp) / "catalogos")
+            homol = _load_cuadro_homologacion(path, cache)
+            # Celda vacía → NaN → "NAN" (mismo texto que la carga fila a fila).
+            self.assertEqual(
+                homol,
+                {("IEIND", "D"): "I1S1C5J1V1", ("IEAUD", "V"): "I1S1C6J2V1", ("NAN", "D"): "I1S1C7J1V1"},
+            )
+            self.assertEqual(_load_cuadro_homologacion(path, cache), homol)
+            self.assertTrue(cache.hits["indice_homologacion"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Tests for loop_remediacion_codcli — convergencia en memoria sin re-ejecutar el pipeline."""
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import codigo_gobernanza_v2 as gob
+from scripts import loop_remediacion_codcli as loop
+
+NOMBRE = "INGENIERIA EN ADMINISTRACION DE EMPRESAS"
+
+
+def _duracion() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "CODIGO_UNICO": ["I162S2C76J1V1"],
+            "NOMBRE_CARRERA": [NOMBRE],
+            "JORNADA": ["1"],
+            "CODCARPR_CANONICO": ["IADM"],
+            "CODCARPR_ALIAS_LIST": [pd.NA],
+            "FUENTE_GOBERNANZA": ["DURACION_ESTUDIOS"],
+            "ESTADO_REGISTRO": ["ACTIVO"],
+        }
+    )
+
+
+def _archivo(codcarprs: list[str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "SOURCE_KEY_3": [f"D|{c}|{NOMBRE}" for c in codcarprs],
+            "KEY_3_NO_JORNADA": [f"|{c}|{NOMBRE}" for c in codcarprs],
+            "JORNADA_FUENTE": ["D"] * len(codcarprs),
+            "CODCARPR_NORM": codcarprs,
+            "NOMBRE_CARRERA_FUENTE": [NOMBRE] * len(codcarprs),
+            "ES_DIPLOMADO": [False] * len(codcarprs),
+            "COD_CAR": [pd.NA] * len(codcarprs),
+            "SIES_MATCH_STATUS": ["SIN_MATCH_SIES"] * len(codcarprs),
+        }
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test loop de remediación en memoria
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLoopRemediacionEnMemoria(unittest.TestCase):
+    """Remedia, recompila el puente y re-resuelve SIES sin correr el pipeline completo."""
+
+    def setUp(self):
+        patcher = mock.patch.object(gob, "_governance_bundle", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_alias_converges_in_one_iteration(self):
+        with mock.patch.object(gob, "ejecutar_pipeline_matricula_unificada_legacy_like") as full_run:
+            res = loop.ejecutar_loop(_archivo(["IADMX", "IADMX"]), _duracion(), {}, gob)
+        full_run.assert_not_called()
+        self.assertEqual(res.motivo_paro, "sin_pendientes")
+        self.assertEqual(len(res.iteraciones), 1)
+        it = res.iteraciones[0]
+        self.assertEqual((it.sin_match_antes, it.sin_match_despues, it.delta), (2, 0, -2))
+        self.assertEqual(it.match_sies, 2)
+        self.assertIn("IADMX", res.duracion.loc[0, "CODCARPR_ALIAS_LIST"])
+        self.assertIn("D|IADMX|" + NOMBRE, set(res.puente["BRIDGE_KEY_3"]))
+
+    def test_stops_without_duracion_changes(self):
+        res = loop.ejecutar_loop(_archivo(["ZZZ"]).assign(NOMBRE_CARRERA_FUENTE="OTRA CARRERA"), _duracion(), {}, gob)
+        self.assertEqual(res.motivo_paro, "sin_cambios_duracion")
+        self.assertEqual(res.iteraciones, [])
+        self.assertEqual(res.cambios, 0)
+        self.assertEqual(res.planes[0]["ACCION"].tolist(), ["SIN_CANDIDATO_DURACION"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Tests for src/governance/alertas_codcar.py y scripts/marcar_alertas_codcar.py — alertas y formato condicional."""
+import io
+import tempfile
+import unittest
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts import marcar_alertas_codcar as alertas
+from src.governance import alertas_codcar as reglas
+
+
+def _subida() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "CODCLI": ["1", "2", "3", "4", "5"],
+            "SIES_MATCH_STATUS": ["ambiguo_sies ", "MATCH_SIES", "MATCH_SIES", None, "MATCH_SIES"],
+            "SIES_MATCH_DIAG": ["MATCH_SIES_AMBIGUO", "PROBABLE_PROBLEMA_NOMBRE_SIES", "", "", ""],
+            "MANUAL_MATCH_STATUS": ["", "", "", "SIN_MATCH_MANUAL", ""],
+            "COD_CAR_AUDIT_STATUS": ["", "", "", "", "OK"],
+        }
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test reglas de alerta
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestMotivoAlerta(unittest.TestCase):
+    """La primera condición que calza define MOTIVO, normalizando espacios y mayúsculas."""
+
+    def test_precedencia(self):
+        motivo = reglas.motivo_alerta_codcar(_subida())
+        self.assertEqual(
+            motivo.tolist(),
+            [
+                "SIES_MATCH_STATUS=AMBIGUO_SIES",
+                "SIES_MATCH_DIAG=PROBABLE_PROBLEMA_NOMBRE_SIES",
+                "",
+                "MANUAL_MATCH_STATUS=SIN_MATCH_MANUAL",
+                "",
+            ],
+        )
+
+    def test_hoja_alertas(self):
+        df = _subida()
+        hoja = reglas.construir_hoja_alertas(df, reglas.motivo_alerta_codcar(df))
+        self.assertEqual(hoja.columns.tolist(), ["ROW", "MOTIVO", "CODCLI"])
+        self.assertEqual(hoja["ROW"].tolist()[:3], [2, 3, 5])
+        self.assertTrue(hoja.iloc[3].isna().all())
+        self.assertEqual(hoja.iloc[4].tolist()[:2], ["RESUMEN", "FILAS_MARCADAS_EN_ROJO=3"])
+        self.assertTrue(pd.isna(hoja.iloc[4, 2]))
+
+    def test_columnas_faltantes(self):
+        with self.assertRaisesRegex(ValueError, "COD_CAR_AUDIT_STATUS"):
+            reglas.motivo_alerta_codcar(_subida().drop(columns=["COD_CAR_AUDIT_STATUS"]))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test workbook ya exportado
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestMarcarWorkbook(unittest.TestCase):
+    """Una regla condicional por hoja, respaldo por rename y re-ejecución idempotente."""
+
+    def test_regla_y_respaldo(self):
+        from openpyxl import load_workbook
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            excel = root / "archivo.xlsx"
+            backup = root / "archivo_BACKUP.xlsx"
+            with pd.ExcelWriter(excel, engine="openpyxl") as w:
+                _subida().to_excel(w, sheet_name=alertas.HOJA_SUBIDA, index=False)
+            original = excel.read_bytes()
+
+            for _ in range(2):
+                with redirect_stdout(io.StringIO()):
+                    marcadas = alertas.marcar_alertas_workbook(excel, backup)
+            self.assertEqual(marcadas, 3)
+            self.assertEqual(backup.read_bytes(), original)
+
+            wb = load_workbook(excel)
+            reglas = [r for cf in wb[alertas.HOJA_SUBIDA].conditional_formatting for r in cf.rules]
+            self.assertEqual(len(reglas), 1)
+            self.assertIn('TRIM($B2)="AMBIGUO_SIES"', reglas[0].formula[0])
+            self.assertEqual(wb[alertas.HOJA_ALERTAS]["A2"].value, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Tests: reutilización en memoria de la salida MU32 por el control de avance."""
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import codigo_gobernanza_v2 as gob
+
+
+def _mu32_sample() -> pd.DataFrame:
+    df = pd.DataFrame({c: [pd.NA, pd.NA] for c in gob.MATRICULA_UNIFICADA_COLUMNS})
+    df[gob.MATRICULA_UNIFICADA_COLUMNS[0]] = [1, 1]
+    df[gob.MATRICULA_UNIFICADA_COLUMNS[1]] = [12345678, 7654321]
+    df[gob.MATRICULA_UNIFICADA_COLUMNS[2]] = ["5", "K"]
+    df[gob.MATRICULA_UNIFICADA_COLUMNS[-1]] = pd.array([1, 0], dtype="Int64")
+    return df
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test MuRunArtifacts
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestMuRunArtifacts(unittest.TestCase):
+    """Paridad memoria vs CSV y registro por input + opciones MU, retirado al consumir."""
+
+    def tearDown(self):
+        gob._MU_RUN_ARTIFACTS.clear()
+
+    def test_control_frame_matches_csv_reload(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / gob.MU_PREGRADO_CSV_FILENAME
+            csv_text = gob._write_mu_csv_atomic(_mu32_sample(), csv_path)
+            self.assertEqual(csv_text, csv_path.read_text(encoding="utf-8"))
+
+            input_file = Path(tmp) / "input.xlsx"
+            input_file.write_bytes(b"x")
+            opciones = {"usar_gobernanza_v2": True}
+            gob._remember_mu_run(gob._mu_run_id(input_file, opciones), csv_text, {"ok": True}, True)
+            mu_run = gob._take_mu_run(input_file, opciones)
+            self.assertIsNotNone(mu_run)
+            pd.testing.assert_frame_equal(
+                mu_run.control_frame(),
+                gob._load_mu_control_from_pregrado_csv(csv_path),
+            )
+            # Consumida una vez: el registro queda vacío.
+            self.assertIsNone(gob._take_mu_run(input_file, opciones))
+
+    def test_lookup_misses_when_input_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_file = Path(tmp) / "input.xlsx"
+            input_file.write_bytes(b"x")
+            gob._remember_mu_run(gob._mu_run_id(input_file, {}), "", {}, True)
+            input_file.write_bytes(b"xy")
+            self.assertIsNone(gob._take_mu_run(input_file, {}))
+            self.assertIsNone(gob._take_mu_run(Path(tmp) / "no_existe.xlsx", {}))
+
+    def test_lookup_misses_when_options_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            input_file = root / "input.xlsx"
+            input_file.write_bytes(b"x")
+            catalogo = root / "catalogo.tsv"
+            catalogo.write_text("A\n", encoding="utf-8")
+            patches = root / "patches"
+            patches.mkdir()
+            opciones = {"catalogo_manual_tsv_path": str(catalogo), "patch_dir": str(patches), "usar_gobernanza_v2": True}
+            run_id = gob._mu_run_id(input_file, opciones)
+
+            self.assertNotEqual(run_id, gob._mu_run_id(input_file, {**opciones, "usar_gobernanza_v2": False}))
+            self.assertNotEqual(run_id, gob._mu_run_id(input_file, {**opciones, "filtro_base_datos_sheet": "2025"}))
+            (patches / "extra.json").write_text("{}", encoding="utf-8")
+            self.assertNotEqual(run_id, gob._mu_run_id(input_file, opciones))
+            catalogo.write_text("AB\n", encoding="utf-8")
+            self.assertNotEqual(gob._mu_run_id(input_file, opciones), run_id)
+            # Las opciones de exportación no cambian la corrida.
+            actual = gob._mu_run_id(input_file, opciones)
+            self.assertEqual(actual, gob._mu_run_id(input_file, {**opciones, "export_workers": 8}))
+
+    def test_mu_run_artifacts_por_id(self):
+        gob._remember_mu_run("a" * 16, "", {}, True)
+        gob._remember_mu_run("b" * 16, "", {}, True)
+        # Una corrida nueva descarta la pendiente; sin id no hay "última corrida".
+        self.assertIsNone(gob.mu_run_artifacts("a" * 16))
+        self.assertEqual(gob.mu_run_artifacts("b" * 16).run_id, "b" * 16)
+        self.assertIsNone(gob.mu_run_artifacts("b" * 16))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test --proceso ambos: control de avance vs salidas MU del usuario
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _libro_hoja1(path: Path) -> None:
+    pd.DataFrame(
+        {
+            "RUT": [12345678, 7654321],
+            "DIG": ["5", "K"],
+            "CODCARR": ["IINF", "ICRE"],
+            "PLAN_DE_ESTUDIO": ["V1", "V1"],
+            "ANO": [2025, 2025],
+            "PERIODO": [1, 1],
+            "CODRAMO": ["MAT1", "MAT2"],
+        }
+    ).to_excel(path, sheet_name="Hoja1", index=False)
+
+
+class TestControlAmbos(unittest.TestCase):
+    """Con ``ambos`` el control reutiliza la corrida MU o recalcula fuera de output_dir."""
+
+    def setUp(self):
+        self.corridas: list[tuple[Path, bool]] = []
+
+    def tearDown(self):
+        gob._MU_RUN_ARTIFACTS.clear()
+
+    def _mu_falso(self, input_file, output_dir, **opciones):
+        # Mismo contrato que el pipeline MU: escribe en output_dir y registra la corrida.
+        v2 = bool(opciones.get("usar_gobernanza_v2"))
+        self.corridas.append((Path(output_dir), v2))
+        df = _mu32_sample()
+        df[gob.MATRICULA_UNIFICADA_COLUMNS[0]] = [2 if v2 else 1] * len(df)
+        csv_text = gob._write_mu_csv_atomic(df, Path(output_dir) / gob.MU_PREGRADO_CSV_FILENAME)
+        with pd.ExcelFile(input_file) as xls:
+            hojas = gob._mu_sheet_options(xls.sheet_names, opciones.get("sheet_name"), opciones.get("filtro_base_datos_sheet"))
+        report = {"usar_gobernanza_v2": v2, "mu_run_id": gob._mu_run_id(input_file, {**opciones, **hojas})}
+        (Path(output_dir) / "reporte_matricula.json").write_text(json.dumps(report), encoding="utf-8")
+        gob._remember_mu_run(report["mu_run_id"], csv_text, report, v2)
+        return report
+
+    def _main_ambos(self, tmp: Path, *extra: str) -> dict[str, object]:
+        input_file = tmp / "input.xlsx"
+        _libro_hoja1(input_file)
+        issue = [gob.Issue("WARN", "matricula_unificada", "forzar fallback MU")]
+        with mock.patch.object(gob, "ejecutar_pipeline_matricula_unificada_legacy_like", side_effect=self._mu_falso), \
+                mock.patch.object(gob, "validar_matricula_unificada", return_value=issue), \
+                contextlib.redirect_stdout(io.StringIO()):
+            return gob.main([
+                "--input", str(input_file), "--output-dir", str(tmp / "out"),
+                "--proceso", "ambos", "--sin-perf-profile", *extra,
+            ])
+
+    def test_opciones_distintas_no_pisan_salidas_del_usuario(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp).resolve() / "out"
+            reports = self._main_ambos(Path(tmp).resolve())
+
+            self.assertEqual(self.corridas[0], (out, False))
+            self.assertEqual(len(self.corridas), 2)
+            control_dir, control_v2 = self.corridas[1]
+            self.assertTrue(control_v2)
+            self.assertNotEqual(control_dir, out)
+            self.assertFalse(control_dir.exists())
+
+            reporte_mu = json.loads((out / "reporte_matricula.json").read_text(encoding="utf-8"))
+            self.assertFalse(reporte_mu["usar_gobernanza_v2"])
+            mu_usuario = gob._load_mu_control_from_pregrado_csv(out / gob.MU_PREGRADO_CSV_FILENAME)
+            self.assertTrue((mu_usuario[gob.MATRICULA_UNIFICADA_COLUMNS[0]].astype(int) == 1).all())
+            self.assertFalse(reports["avance"]["matricula_unificada_fallback_reutilizado"])
+            # La corrida del usuario sigue disponible para otros consumidores.
+            self.assertIsNotNone(gob.mu_run_artifacts(reporte_mu["mu_run_id"]))
+
+    def test_opciones_equivalentes_reutilizan_la_corrida(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp).resolve() / "out"
+            reports = self._main_ambos(Path(tmp).resolve(), "--usar-gobernanza-v2", "true", "--sheet", "Hoja1")
+
+            self.assertEqual(self.corridas, [(out, True)])
+            self.assertTrue(reports["avance"]["matricula_unificada_fallback_reutilizado"])
+            self.assertEqual(reports["avance"]["matricula_unificada_source"], "pipeline_matricula_v2")
+
+
+if __name__ == "__main__":
+    unittest.main()
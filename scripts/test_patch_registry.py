@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Tests for src/patches/apply_patches.py — registro de patches por RUT."""
+import json
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.patches import (
+    PATCH_COLUMN_RULES,
+    PATCH_SOURCE_SIT_FON_SOL,
+    PatchColumnRule,
+    PatchRegistry,
+    discover_patch_files,
+    normalize_rut_ids,
+    resolve_patch_targets,
+)
+
+RULES = {
+    **PATCH_COLUMN_RULES,
+    "SUS_PRE": PatchColumnRule("SUS_PRE", frozenset({0, 1}), "PATCH_SUS_PRE", "OVERRIDE_POR_RUT", "PATCH_APLICADO"),
+}
+
+
+def _write_patch(root: Path, name: str, correcciones: list[dict]) -> Path:
+    path = root / name
+    path.write_text(json.dumps({"estado": "PROVISORIO", "correcciones": correcciones}), encoding="utf-8")
+    return path
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "N_DOC": ["8074726", "9023349-K", "102030400", "5555555", None],
+            "CODCLI": ["A1", "A2", "A3", "A4", "A5"],
+            "SIT_FON_SOL": ["1", "2", "0", "1", "1"],
+            "SIT_FON_SOL_FUENTE_FINAL": "INPUT",
+            "SUS_PRE": ["1", "1", "1", "0", "1"],
+        }
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test normalización vectorizada de RUT
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestNormalizeRutIds(unittest.TestCase):
+    """Guion, puntos y DV concatenado se resuelven igual que la regla por fila."""
+
+    def test_formatos(self):
+        values = pd.Series(["12.345.678-5", "123456785", "123456780", "nan", "", None, "-99"])
+        ids = normalize_rut_ids(values, [12345678])
+        self.assertEqual(ids.tolist()[:3], [12345678, 12345678, 123456780])
+        self.assertTrue(ids.iloc[3:6].isna().all())
+        self.assertEqual(ids.iloc[6], 99)
+
+    def test_resolve_patch_targets_elige_columna(self):
+        df = pd.DataFrame({"RUT": ["1", "2"], "N_DOC": ["8074726", "x"]})
+        _, mask, col, matches, matched, missing = resolve_patch_targets(df, {"8074726": 0, "7": 0}, ["RUT", "N_DOC"])
+        self.assertEqual(col, "N_DOC")
+        self.assertEqual(matches, {"RUT": 0, "N_DOC": 1})
+        self.assertEqual(mask.tolist(), [True, False])
+        self.assertEqual((matched, missing), (["8074726"], ["7"]))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test registro multi-patch
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestPatchRegistry(unittest.TestCase):
+    """Todos los JSON de la carpeta se aplican en una pasada con reporte combinado."""
+
+    def test_aplica_varios_patches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _write_patch(root, "a_sit_fon_sol.json", [{"rut": "8074726", "SIT_FON_SOL": 0}, {"rut": "9023349", "SIT_FON_SOL": 0}])
+            _write_patch(root, "b_sus_pre.json", [{"rut": "10203040", "SUS_PRE": 0}, {"rut": "77", "SUS_PRE": 0}])
+            (root / "a_sit_fon_sol.json.bak.20260101").write_text("{}", encoding="utf-8")
+            self.assertEqual([p.name for p in discover_patch_files(root)], ["a_sit_fon_sol.json", "b_sus_pre.json"])
+
+            out, report = PatchRegistry.from_dir(root, rules=RULES).apply(_frame(), rut_columns_candidates=["N_DOC", "CODCLI"])
+
+        self.assertEqual(out["SIT_FON_SOL"].tolist(), [0, 0, 0, 1, 1])
+        self.assertEqual(out["SUS_PRE"].tolist(), [1, 1, 0, 0, 1])
+        self.assertEqual(out["SIT_FON_SOL_PATCH_FLAG"].tolist(), ["SI", "SI", "NO", "NO", "NO"])
+        self.assertEqual(out["SIT_FON_SOL_FUENTE_FINAL"].tolist()[:3], [PATCH_SOURCE_SIT_FON_SOL] * 2 + ["INPUT"])
+        self.assertEqual(out["SUS_PRE_PATCH_RUT"].tolist()[2], "10203040")
+
+        self.assertEqual(report["n_patches"], 2)
+        self.assertEqual(report["rut_column_selected"], "N_DOC")
+        self.assertEqual((report["n_rows_targeted"], report["n_rows_affected"]), (3, 3))
+        sit, sus = report["patches"]
+        self.assertEqual((sit["n_rows_targeted"], sit["n_rows_affected"]), (2, 2))
+        self.assertEqual(sit["sit_fon_sol_distribution_before_target"], {"1": 1, "2": 1})
+        self.assertEqual((sus["n_rut_matched"], sus["rut_missing_sample"]), (1, ["77"]))
+
+    def test_conflicto_entre_patches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _write_patch(root, "a.json", [{"rut": "8074726", "SIT_FON_SOL": 0}])
+            _write_patch(root, "b.json", [{"rut": "8074726-K", "SIT_FON_SOL": 2}])
+            registry = PatchRegistry.from_dir(root)
+            with self.assertRaisesRegex(ValueError, "conflicto"):
+                registry.apply(_frame())
+
+    def test_columna_no_registrada(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _write_patch(Path(tmp), "a.json", [{"rut": "1", "NIV_ACA": 1}])
+            with self.assertRaisesRegex(ValueError, "no registrada"):
+                PatchRegistry.from_paths([path])
+
+    def test_documentos_del_bundle(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _write_patch(Path(tmp), "a.json", [{"rut": "1", "SIT_FON_SOL": 0}])
+            doc = {"estado": "BUNDLE", "correcciones": [{"rut": "8074726", "SIT_FON_SOL": 0}]}
+            registry = PatchRegistry.from_paths([path], documents=lambda p: doc if p == path.resolve() else None)
+            path.unlink()
+            out, _ = registry.apply(_frame())
+        self.assertEqual(registry.specs[0].payload["estado"], "BUNDLE")
+        self.assertEqual(out["SIT_FON_SOL"].tolist()[0], 0)
+
+    def test_sin_patches_marca_flags(self):
+        out, report = PatchRegistry().apply(_frame())
+        self.assertEqual(set(out["SIT_FON_SOL_PATCH_FLAG"]), {"NO"})
+        self.assertEqual((report["n_patches"], report["patches"]), (0, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
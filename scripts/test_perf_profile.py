@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Tests for src/perf — telemetría por etapa (tiempo, CPU, memoria, filas)."""
+import json
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.perf import PerfProfiler, activate_profiler, deactivate_profiler, perf_sequence
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test PerfProfiler
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestPerfProfiler(unittest.TestCase):
+    """Tests for PerfProfiler / StageSequence."""
+
+    def test_stage_records_rows_and_times(self):
+        prof = PerfProfiler("t", use_tracemalloc=False)
+        with prof.stage("bloque", rows_in=10) as ctx:
+            ctx["rows_out"] = 7
+        rec = prof.records[0]
+        self.assertEqual(rec.name, "bloque")
+        self.assertEqual((rec.rows_in, rec.rows_out, rec.rows_dropped), (10, 7, 3))
+        self.assertGreaterEqual(rec.wall_s, 0)
+        self.assertGreaterEqual(rec.cpu_s, 0)
+
+    def test_sequence_chains_row_funnel(self):
+        prof = PerfProfiler("t", use_tracemalloc=False)
+        seq = prof.sequence("mu", rows_in=100)
+        seq.lap("filtro", rows_out=80)
+        seq.lap("dedupe", rows_out=75)
+        names = [r.name for r in prof.records]
+        self.assertEqual(names, ["mu.filtro", "mu.dedupe"])
+        self.assertEqual(prof.records[1].rows_in, 80)
+        self.assertEqual(prof.records[1].rows_dropped, 5)
+
+    def test_tracemalloc_peak_when_enabled(self):
+        prof = PerfProfiler("t", use_tracemalloc=True)
+        try:
+            with prof.stage("alloc"):
+                _buf = [0] * 200_000
+            self.assertIsNotNone(prof.records[0].py_alloc_peak_mb)
+            self.assertGreater(prof.records[0].py_alloc_peak_mb, 0)
+        finally:
+            activate_profiler(prof)
+            deactivate_profiler()
+
+    def test_inactive_profiler_is_noop(self):
+        deactivate_profiler()
+        seq = perf_sequence("x")
+        self.assertIsNone(seq.lap("a", rows_out=1))
+
+    def test_write_json_attaches_previous_wall(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "perf_profile.json"
+            first = PerfProfiler("t", use_tracemalloc=False)
+            first.sequence("mu").lap("a", rows_out=1)
+            first.write_json(path)
+
+            second = PerfProfiler("t", use_tracemalloc=False)
+            second.sequence("mu").lap("a", rows_out=1)
+            second.write_json(path)
+
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            self.assertEqual(payload["run"], "t")
+            self.assertEqual(payload["stages"][0]["name"], "mu.a")
+            self.assertIsNotNone(payload["stages"][0]["wall_s_prev"])
+            self.assertTrue(any("TOTAL t" in line for line in second.summary_lines()))
+
+
+if __name__ == "__main__":
+    unittest.main()
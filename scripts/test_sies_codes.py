@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Tests for src/identity/sies — códigos SIES internados y parseados una vez."""
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.identity import SIES_COMPONENTS, SiesCodeTable
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test SiesCodeTable
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestSiesCodeTable(unittest.TestCase):
+    """Un parseo por código distinto; componentes y C compartido por id."""
+
+    def test_components_by_interned_id(self):
+        table = SiesCodeTable.from_codes(["I162S2C101J4V1", "I162S2C101J4V1"])
+        self.assertEqual(len(table), 1)
+        values = pd.Series([" i162s2c101j4v1", None, "X", "I1S01C3J1V2"], index=[7, 8, 9, 10])
+        comps = table.components(values)
+        self.assertEqual(list(comps.columns), list(SIES_COMPONENTS))
+        self.assertEqual(list(comps.index), [7, 8, 9, 10])
+        self.assertEqual(comps.loc[7].tolist(), [162, 2, 101, 4, 1])
+        self.assertTrue(comps.loc[[8, 9]].isna().all().all())
+        self.assertEqual(comps.loc[10, "COD_SED"], 1)
+        self.assertEqual(table.stats(), {"codigos": 4, "codigos_validos": 2})
+        self.assertEqual(table.parts("I1S01C3J1V2"), (1, 1, 3, 1, 2))
+        self.assertIsNone(table.parts("NAN"))
+
+    def test_shared_cod_car(self):
+        table = SiesCodeTable()
+        potenciales = pd.Series(
+            ["I1S1C5J1V1 | I1S2C5J1V1", "I1S1C5J1V1|MALO", "", None, "I1S1C5J1V1|I1S1C6J1V1"],
+            index=[4, 3, 2, 1, 0],
+        )
+        extra = pd.Series([None, None, "I1S3C7J1V1", np.nan, None], index=potenciales.index)
+        shared = table.shared_cod_car(potenciales, extra)
+        self.assertEqual(str(shared.dtype), "Int64")
+        self.assertEqual(list(shared.index), [4, 3, 2, 1, 0])
+        self.assertEqual(shared.tolist(), [5, pd.NA, 7, pd.NA, pd.NA])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test heurística de ambigüedad con la tabla internada
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestHeuristicaConTabla(unittest.TestCase):
+    """Las reglas de sede y C/J/V consultan componentes por código internado."""
+
+    def test_regla_sede_y_cod_car_jor_version(self):
+        from codigo_gobernanza_v2 import FINAL_SIES_CODE_COL, _resolver_ambiguedades_sies_heuristica
+
+        ambiguos = pd.DataFrame(
+            {
+                "CODCARPR_NORM": ["IEIND", "IEIND"],
+                "JORNADA_FUENTE": ["D", "D"],
+                "CODIGOS_SIES_POTENCIALES": [
+                    "I1S1C5J1V1 | I1S2C5J1V1",
+                    "I1S1C5J1V1 | I1S1C5J1V2 | I1S1C6J2V1",
+                ],
+                "COD_SED": [2, pd.NA],
+                "COD_CAR": [pd.NA, 5],
+                "JOR": [pd.NA, 1],
+                "VERSION": [pd.NA, 2],
+                "SIES_MATCH_STATUS": ["AMBIGUO_SIES", "AMBIGUO_SIES"],
+                FINAL_SIES_CODE_COL: [pd.NA, pd.NA],
+            }
+        )
+        table = SiesCodeTable()
+        out = _resolver_ambiguedades_sies_heuristica(ambiguos, {}, {}, sies_codes=table)
+        self.assertEqual(out[FINAL_SIES_CODE_COL].tolist(), ["I1S2C5J1V1", "I1S1C5J1V2"])
+        self.assertEqual(out["SIES_RESOLUCION_HEURISTICA"].tolist(), ["REGLA_SEDE", "REGLA_COD_CAR_JOR_VERSION"])
+        self.assertEqual(table.stats()["codigos"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
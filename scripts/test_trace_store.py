@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for src/trace — columnas de traza apartadas y su formato largo."""
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.trace import TRACE_LONG_COLUMNS, TraceStore
+
+
+def _wide() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "CODCLI": ["A1", "B2", "C3"],
+            "VIG_FUENTE_FINAL": ["DA", None, "REGLA"],
+            "VIG": [1, 0, 1],
+            "UZ_HIST_FILAS_TOTAL": [4, np.nan, 2],
+            "NOTA": ["", "x", ""],
+        },
+        index=[10, 11, 12],
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Test TraceStore
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestTraceStore(unittest.TestCase):
+    """Detach/materialize preservan la hoja ancha; la traza larga omite vacíos."""
+
+    def test_detach_and_materialize_roundtrip(self):
+        wide = _wide()
+        store = TraceStore()
+        narrow = store.detach(wide, "decision_carga", ["CODCLI", "VIG"])
+        self.assertEqual(list(narrow.columns), ["CODCLI", "VIG"])
+        self.assertEqual(store.columns, ["VIG_FUENTE_FINAL", "UZ_HIST_FILAS_TOTAL", "NOTA"])
+        narrow.loc[11, "VIG"] = 2
+        narrow["ESTADO_CARGA_PREGRADO"] = "OK"
+        out = store.materialize(narrow)
+        expected = wide.assign(VIG=[1, 2, 1], ESTADO_CARGA_PREGRADO="OK")
+        pd.testing.assert_frame_equal(out, expected)
+        with self.assertRaises(ValueError):
+            store.detach(narrow, "decision_carga", ["CODCLI"])
+
+    def test_detach_por_etapas(self):
+        wide = _wide()
+        store = TraceStore()
+        narrow = store.detach(wide, "resolucion_sies", ["CODCLI", "VIG", "VIG_FUENTE_FINAL"])
+        narrow["FLAG"] = "OK"
+        narrow = store.detach(narrow, "decision_carga", ["CODCLI", "VIG"])
+        self.assertEqual(store.stats()["etapas"], {"resolucion_sies": 2, "decision_carga": 2})
+        pd.testing.assert_frame_equal(store.materialize(narrow), wide.assign(FLAG="OK"))
+        with self.assertRaisesRegex(ValueError, "re-creadas"):
+            store.detach(narrow.assign(NOTA=""), "normalizacion", ["CODCLI", "VIG"])
+        with self.assertRaisesRegex(ValueError, "NOTA"):
+            store.materialize(narrow.assign(NOTA=""))
+
+    def test_long_format_and_write(self):
+        store = TraceStore()
+        store.detach(_wide(), "decision_carga", ["CODCLI", "VIG"])
+        long = store.to_long()
+        self.assertEqual(tuple(long.columns), TRACE_LONG_COLUMNS)
+        self.assertEqual(
+            list(zip(long["ROW_ID"], long["CODCLI"], long["CAMPO"])),
+            [
+                (10, "A1", "VIG_FUENTE_FINAL"), (10, "A1", "UZ_HIST_FILAS_TOTAL"),
+                (11, "B2", "NOTA"),
+                (12, "C3", "VIG_FUENTE_FINAL"), (12, "C3", "UZ_HIST_FILAS_TOTAL"),
+            ],
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = store.write(Path(tmp) / "traza.tsv", "gzip", chunk_rows=2)
+            self.assertEqual(path.name, "traza.tsv.gz")
+            back = pd.read_csv(path, sep="\t", dtype=str)
+        self.assertEqual(back["VALOR"].tolist(), ["DA", "4.0", "x", "REGLA", "2.0"])
+        self.assertEqual(store.stats(), {"etapas": {"decision_carga": 3}, "columnas_apartadas": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+"""Compiled catalog indexes persisted by source-file hash and the governance bundle."""
+
+from .bundle import (
+    BUNDLE_FORMAT_VERSION,
+    GOVERNANCE_BUNDLE_ENV,
+    GOVERNANCE_BUNDLE_FILENAME,
+    GOVERNANCE_DERIVED_VERSION,
+    GOVERNANCE_SOURCES,
+    BundleSource,
+    GovernanceBundle,
+    compile_governance_bundle,
+    default_bundle_path,
+    load_active_governance_bundle,
+    load_governance_bundle,
+    schema_hash,
+)
+from .index_cache import (
+    INDEX_CACHE_SUFFIX,
+    CompiledIndexCache,
+    file_sha256,
+    sources_key,
+)
+
+__all__ = [
+    "BUNDLE_FORMAT_VERSION",
+    "BundleSource",
+    "CompiledIndexCache",
+    "GOVERNANCE_BUNDLE_ENV",
+    "GOVERNANCE_BUNDLE_FILENAME",
+    "GOVERNANCE_DERIVED_VERSION",
+    "GOVERNANCE_SOURCES",
+    "GovernanceBundle",
+    "INDEX_CACHE_SUFFIX",
+    "compile_governance_bundle",
+    "default_bundle_path",
+    "file_sha256",
+    "load_active_governance_bundle",
+    "load_governance_bundle",
+    "schema_hash",
+    "sources_key",
+]
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Mapping
+
+import pandas as pd
+
+from src.export import atomic_write_bytes
+
+from .index_cache import file_sha256
+
+BUNDLE_FORMAT_VERSION = 1
+# Versión de los derivados (catalogo_puente_duracion): subirla al cambiar
+# _compile_catalog_and_bridge_from_duracion invalida bundles previos.
+GOVERNANCE_DERIVED_VERSION = 1
+GOVERNANCE_BUNDLE_FILENAME = "gobernanza_bundle.pkl"
+GOVERNANCE_BUNDLE_ENV = "MU_GOVERNANCE_BUNDLE"
+
+
+@dataclass(frozen=True)
+class BundleSource:
+    """Fuente de gobernanza: ruta relativa a la raíz del repo y su contrato mínimo.
+
+    ``required`` son columnas obligatorias (TSV) o llaves de primer nivel (JSON).
+    """
+
+    path: str
+    kind: str = "tsv"
+    required: tuple[str, ...] = ()
+    optional: bool = False
+
+
+GOVERNANCE_SOURCES: tuple[BundleSource, ...] = (
+    BundleSource("DURACION_ESTUDIOS.tsv", required=("CODIGO_UNICO", "NOMBRE_CARRERA", "JORNADA")),
+    BundleSource(
+        "control/catalogos/PUENTE_SIES_COMPILADO.tsv",
+        required=(
+            "SOURCE_KEY_3",
+            "BRIDGE_KEY_3",
+            "BRIDGE_KEY_NO_JORNADA",
+            "GRUPO_TRAZA",
+            "FAMILIA_TRAZA",
+            "FAMILIA_CODCARPR",
+            "JORNADA",
+            "CODCARPR",
+            "NOMBRE_L",
+            "N_CODES_SIES",
+            "CODIGOS_SIES_POTENCIALES",
+            "CODIGO_CARRERA_SIES_1",
+        ),
+    ),
+    BundleSource("gobernanza_nac.tsv", required=("NACIONALIDAD_NORM", "COD_NAC")),
+    BundleSource(
+        "gobernanza_pais_est_sec.tsv",
+        required=("COMUNACOLEGIO_NORM", "CIUDADCOLEGIO_NORM", "COD_PAIS_EST_SEC"),
+    ),
+    BundleSource("gobernanza_sede.tsv", required=("SEDE_NORM", "COD_SED", "NOMBRE_SEDE")),
+    BundleSource("gobernanza_for_ing_act.tsv", required=("FOR_ING_ACT", "DESCRIPCION_MANUAL")),
+    BundleSource(
+        "gobernanza_catalogos/gob_promedios_hoja1_estado_academico_descripcion.tsv",
+        required=("ESTADO_ACADEMICO", "DESCRIPCION_ESTADO", "VIG_ESPERADO"),
+    ),
+    BundleSource(
+        "gobernanza_catalogos/gob_datosalumnos_estadoacademico_situacion.tsv",
+        required=("ESTADOACADEMICO", "SITUACION", "VIG_ESPERADO"),
+    ),
+    BundleSource("control/config_campos_ing.json", kind="json", required=("campos",)),
+    BundleSource("control/config_for_ing_act.json", kind="json", required=("codigos_soportados",)),
+    BundleSource("control/config_vig_fecha.json", kind="json", required=("campos",)),
+    BundleSource("patches/mu2026/sit_fon_sol_patch_ruts.json", kind="json", required=("correcciones",), optional=True),
+)
+
+
+def schema_hash(sources: tuple[BundleSource, ...] = GOVERNANCE_SOURCES, derived_version: object = GOVERNANCE_DERIVED_VERSION) -> str:
+    """Hash del contrato (formato + fuentes + columnas exigidas) que el código espera.
+
+    ``derived_version`` es la versión del código que calcula ``derived``
+    (``GOVERNANCE_DERIVED_VERSION``): al subirla el bundle previo queda
+    incompatible aunque las fuentes no hayan cambiado.
+    """
+    payload = [BUNDLE_FORMAT_VERSION, derived_version] + [(s.path, s.kind, list(s.required), s.optional) for s in sources]
+    return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class GovernanceBundle:
+    """Catálogos de gobernanza validados y leídos una vez, en un único archivo.
+
+    Las tablas TSV se guardan como las consumen los loaders del pipeline
+    (``dtype=str``, ``keep_default_na=False``) y los JSON ya parseados;
+    ``derived`` guarda artefactos precompilados (p. ej. llaves normalizadas).
+    Las fuentes se indexan por ruta relativa a ``root``.
+    """
+
+    root: Path
+    schema: str
+    tables: dict[str, pd.DataFrame] = field(default_factory=dict)
+    documents: dict[str, object] = field(default_factory=dict)
+    derived: dict[str, object] = field(default_factory=dict)
+    fingerprints: dict[str, dict[str, object]] = field(default_factory=dict)
+    created_at: str = ""
+
+    def _key(self, path: str | Path) -> str | None:
+        try:
+            return Path(path).expanduser().resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+    def table(self, path: str | Path) -> pd.DataFrame | None:
+        key = self._key(path)
+        return self.tables.get(key) if key else None
+
+    def document(self, path: str | Path) -> object | None:
+        key = self._key(path)
+        return self.documents.get(key) if key else None
+
+    def stale_sources(self) -> list[str]:
+        """Fuentes modificadas desde la compilación (stat; sha256 solo si el stat cambió)."""
+        stale = []
+        for rel, fp in self.fingerprints.items():
+            path = self.root / rel
+            if not path.exists():
+                stale.append(rel)
+                continue
+            st = path.stat()
+            if (st.st_size, st.st_mtime_ns) == (fp["size"], fp["mtime_ns"]):
+                continue
+            if file_sha256(path) != fp["sha256"]:
+                stale.append(rel)
+        return stale
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "fuentes": len(self.fingerprints),
+            "tablas": len(self.tables),
+            "documentos": len(self.documents),
+            "derivados": sorted(self.derived),
+            "compilado": self.created_at,
+        }
+
+
+def _read_source(path: Path, source: BundleSource) -> tuple[object, list[str]]:
+    if source.kind == "json":
+        doc = json.loads(path.read_text(encoding="utf-8"))
+        present = list(doc) if isinstance(doc, dict) else []
+        return doc, [k for k in source.required if k not in present]
+    df = pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False)
+    return df, [c for c in source.required if c not in df.columns]
+
+
+def compile_governance_bundle(
+    root: Path,
+    output: Path,
+    sources: tuple[BundleSource, ...] = GOVERNANCE_SOURCES,
+    derived: Mapping[str, Callable[[], object]] | None = None,
+    derived_version: object = GOVERNANCE_DERIVED_VERSION,
+) -> GovernanceBundle:
+    """Valida todas las fuentes y escribe el bundle de forma atómica.
+
+    Cualquier fuente obligatoria ausente o sin sus columnas/llaves exigidas
+    aborta con ``ValueError`` (listando todos los problemas) sin tocar el
+    bundle anterior.
+    """
+    root = Path(root).resolve()
+    bundle = GovernanceBundle(root=root, schema=schema_hash(sources, derived_version))
+    problems: list[str] = []
+    for source in sources:
+        path = root / source.path
+        if not path.exists():
+            if not source.optional:
+                problems.append(f"{source.path}: no existe")
+            continue
+        try:
+            value, missing = _read_source(path, source)
+        except Exception as exc:
+            problems.append(f"{source.path}: ilegible ({exc})")
+            continue
+        if missing:
+            problems.append(f"{source.path}: faltan {missing}")
+            continue
+        (bundle.documents if source.kind == "json" else bundle.tables)[source.path] = value
+        st = path.stat()
+        bundle.fingerprints[source.path] = {
+            "sha256": file_sha256(path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+    if problems:
+        raise ValueError("Catálogos de gobernanza inválidos:\n  - " + "\n  - ".join(problems))
+
+    for name, build in (derived or {}).items():
+        bundle.derived[name] = build()
+    bundle.created_at = datetime.now().isoformat(timespec="seconds")
+    atomic_write_bytes(output, pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL))
+    return bundle
+
+
+def load_governance_bundle(
+    path: Path,
+    root: Path,
+    sources: tuple[BundleSource, ...] = GOVERNANCE_SOURCES,
+    derived_version: object = GOVERNANCE_DERIVED_VERSION,
+) -> tuple[GovernanceBundle | None, str]:
+    """Lee el bundle (una lectura) y lo valida contra el contrato y las fuentes.
+
+    Retorna ``(bundle, "cargado")`` o ``(None, estado)`` con estado
+    ``ausente``, ``ilegible``, ``incompatible`` o ``desactualizado``; en esos
+    casos el llamador vuelve a leer cada catálogo por separado.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None, "ausente"
+    try:
+        with open(path, "rb") as fh:
+            bundle = pickle.load(fh)
+    except Exception as exc:
+        print(f"⚠️  Bundle de gobernanza ilegible ({path}): {exc}")
+        return None, "ilegible"
+    if not isinstance(bundle, GovernanceBundle) or bundle.schema != schema_hash(sources, derived_version):
+        print(f"⚠️  Bundle de gobernanza incompatible con el contrato actual: {path}. Ejecuta make compile-governance.")
+        return None, "incompatible"
+    bundle.root = Path(root).resolve()
+    stale = bundle.stale_sources()
+    if stale:
+        print(f"⚠️  Bundle de gobernanza desactualizado ({', '.join(stale)}). Ejecuta make compile-governance.")
+        return None, "desactualizado"
+    return bundle, "cargado"
+
+
+def default_bundle_path(root: Path) -> Path:
+    return Path(root) / "control" / "catalogos" / GOVERNANCE_BUNDLE_FILENAME
+
+
+def load_active_governance_bundle(root: Path, derived_version: object = GOVERNANCE_DERIVED_VERSION) -> tuple[GovernanceBundle | None, str]:
+    """Bundle de la raíz ``root``; ``MU_GOVERNANCE_BUNDLE=0`` lo desactiva y otra ruta lo reemplaza."""
+    override = os.environ.get(GOVERNANCE_BUNDLE_ENV, "").strip()
+    if override.lower() in {"0", "off", "no", "false"}:
+        return None, "desactivado"
+    path = Path(override).expanduser() if override else default_bundle_path(root)
+    return load_governance_bundle(path, root, derived_version=derived_version)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+import pickle
+from pathlib import Path
+from typing import Callable, Iterable, TypeVar
+
+from src.export import atomic_write_bytes
+
+T = TypeVar("T")
+
+INDEX_CACHE_SUFFIX = ".pkl"
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sources_key(sources: Iterable[Path | str], *extra: object) -> str:
+    """Hash combinado del contenido de las fuentes + parámetros que alteran el índice."""
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(file_sha256(Path(source)).encode("ascii"))
+    for value in extra:
+        digest.update(repr(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CompiledIndexCache:
+    """Índices compilados persistidos por hash de sus fuentes.
+
+    Cada índice vive en ``<directorio>/<nombre>_<hash16>.pkl``. Si las fuentes
+    no cambiaron, la corrida solo deserializa el archivo; si cambiaron, se
+    reconstruye, se escribe de forma atómica y se eliminan las versiones
+    anteriores del mismo índice. Un archivo ilegible se trata como ausente.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.hits: dict[str, bool] = {}
+
+    def path_for(self, name: str, key: str) -> Path:
+        return self.directory / f"{name}_{key[:16]}{INDEX_CACHE_SUFFIX}"
+
+    def load_or_build(self, name: str, key: str, build: Callable[[], T]) -> T:
+        path = self.path_for(name, key)
+        if path.exists():
+            try:
+                with open(path, "rb") as fh:
+                    value = pickle.load(fh)
+                self.hits[name] = True
+                return value
+            except Exception:
+                pass
+        value = build()
+        self.hits[name] = False
+        try:
+            atomic_write_bytes(path, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            for stale in self.directory.glob(f"{name}_*{INDEX_CACHE_SUFFIX}"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError as exc:
+            print(f"⚠️  No se pudo persistir índice compilado '{name}': {exc}")
+        return value
@@ -0,0 +1,21 @@
+"""Dtype policy (shared categoricals, Copy-on-Write) for MU 2026 frames."""
+
+from .policy import (
+    CATEGORY_POLICY_COLUMNS,
+    MAX_UNIQUE_RATIO,
+    SharedCategories,
+    apply_category_policy,
+    copy_on_write,
+    decategorize,
+    map_categories,
+)
+
+__all__ = [
+    "CATEGORY_POLICY_COLUMNS",
+    "MAX_UNIQUE_RATIO",
+    "SharedCategories",
+    "apply_category_policy",
+    "copy_on_write",
+    "decategorize",
+    "map_categories",
+]
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+
+# Columnas de gobernanza de baja cardinalidad que la fuente trae como texto.
+# Solo se incluyen columnas que el pipeline lee pero no reescribe in situ:
+# las que se copian a una columna de salida mutable se des-categorizan allí.
+CATEGORY_POLICY_COLUMNS = (
+    "JORNADA",
+    "CARRERA",
+    "NOMBRE_L",
+    "NOMBRE_CARRERA",
+    "CODCARR",
+    "CODCARPR",
+    "ESTADO",
+    "DESCRIPCION_ESTADO",
+    "ESTADO_ACADEMICO",
+    "SITUACION",
+    "CONVALIDADO",
+    "REGIMEN",
+    "SEDE",
+    "NACIONALIDAD",
+)
+MAX_UNIQUE_RATIO = 0.5
+
+
+@contextmanager
+def copy_on_write() -> Iterator[bool]:
+    """Copy-on-Write durante el bloque (pandas 2.x); en pandas >= 3 es el único modo.
+
+    El pipeline MU asume CoW: las selecciones y filtros no se copian a la
+    defensiva y ``copy(deep=False)`` basta para aislar un frame del original.
+    Al salir se restaura el modo previo, así importar el pipeline o usar sus
+    helpers no cambia la configuración de pandas del proceso. También sirve
+    como decorador de los puntos de entrada.
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        yield True
+        return
+    previo = pd.get_option("mode.copy_on_write")
+    pd.set_option("mode.copy_on_write", True)
+    try:
+        yield True
+    finally:
+        pd.set_option("mode.copy_on_write", previo)
+
+
+class SharedCategories:
+    """Diccionario de categorías por nombre de columna para una corrida.
+
+    Los frames que pasan juntos por ``apply_category_policy`` reciben el
+    mismo ``CategoricalDtype`` en las columnas homónimas. En el pipeline MU
+    se aplica solo a la fuente (``src_work``, cuyas columnas reutiliza
+    ``src``): el ahorro está en memoria y en normalizar una vez por categoría
+    (``map_categories``). Los joins con histórico, DatosAlumnos y puente no
+    usan estas columnas; van sobre ids ``int32`` de ``IdentityIndex``.
+    ``""`` siempre es categoría para que ``fillna("")`` siga siendo válido.
+    """
+
+    def __init__(self) -> None:
+        self._categories: dict[str, pd.Index] = {}
+
+    def register(self, name: str, values: pd.Series) -> None:
+        nuevos = pd.Index(values.dropna().unique(), dtype=object)
+        actual = self._categories.get(name, pd.Index([""], dtype=object))
+        self._categories[name] = actual.append(nuevos.difference(actual, sort=False))
+
+    def dtype(self, name: str) -> pd.CategoricalDtype:
+        return pd.CategoricalDtype(self._categories.get(name, pd.Index([""], dtype=object)))
+
+    def stats(self) -> dict[str, int]:
+        return {name: len(cats) for name, cats in self._categories.items()}
+
+
+def _is_low_cardinality_text(series: pd.Series, max_unique_ratio: float) -> bool:
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.empty:
+        return False
+    if infer_dtype(series, skipna=True) != "string":
+        return False
+    return series.nunique(dropna=True) <= max(1, int(len(series) * max_unique_ratio))
+
+
+def apply_category_policy(
+    frames: Iterable[pd.DataFrame],
+    shared: SharedCategories,
+    columns: Iterable[str] = CATEGORY_POLICY_COLUMNS,
+    max_unique_ratio: float = MAX_UNIQUE_RATIO,
+) -> list[str]:
+    """Convierte in situ a ``category`` las columnas de texto de baja cardinalidad.
+
+    Primero registra los valores de todos los frames y luego castea con el
+    dtype compartido. Retorna las columnas convertidas en al menos un frame.
+    """
+    frames = list(frames)
+    targets: list[tuple[pd.DataFrame, str]] = []
+    for df in frames:
+        for col in columns:
+            if col in df.columns and _is_low_cardinality_text(df[col], max_unique_ratio):
+                shared.register(col, df[col])
+                targets.append((df, col))
+    for df, col in targets:
+        df[col] = df[col].astype(shared.dtype(col))
+    return sorted({col for _, col in targets})
+
+
+def map_categories(series: pd.Series, func: Callable[[object], object]) -> pd.Series:
+    """``series.map(func)`` evaluando ``func`` una vez por categoría.
+
+    El resultado es una serie densa (no categórica), apta para concatenar o
+    reasignar como cualquier columna de texto.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.map(func)
+    cats = series.cat.categories
+    lookup = np.empty(len(cats) + 1, dtype=object)
+    lookup[:-1] = [func(v) for v in cats]
+    lookup[-1] = func(np.nan)
+    codes = series.cat.codes.to_numpy()
+    return pd.Series(lookup[codes].tolist(), index=series.index, name=series.name)
+
+
+def decategorize(series: pd.Series) -> pd.Series:
+    """Vuelve al dtype base antes de copiar a una columna que se reescribe."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(series.cat.categories.dtype)
+    return series
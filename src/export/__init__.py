@@ -0,0 +1,61 @@
+"""Export backends for MU 2026 artifacts."""
+
+from .atomic import (
+    COMPRESSIONS,
+    PARQUET_ENGINES,
+    TRACE_COMPRESSION_ENV,
+    atomic_path,
+    atomic_to_csv,
+    atomic_to_parquet,
+    atomic_write,
+    atomic_write_bytes,
+    atomic_write_json,
+    atomic_write_text,
+    compressed_path,
+    existing_artifact_path,
+    parquet_engine_available,
+    trace_compression_from_env,
+)
+from .excel_stream import (
+    EXCEL_MAX_DATA_ROWS,
+    OVERSIZE_POLICIES,
+    RowHighlight,
+    SheetExportStats,
+    build_row_highlight,
+    write_workbook_streaming,
+    xlsxwriter_available,
+)
+from .scheduler import (
+    DEFAULT_EXPORT_WORKERS,
+    ExportReport,
+    ExportScheduler,
+    ExportTaskResult,
+)
+
+__all__ = [
+    "COMPRESSIONS",
+    "DEFAULT_EXPORT_WORKERS",
+    "EXCEL_MAX_DATA_ROWS",
+    "ExportReport",
+    "ExportScheduler",
+    "ExportTaskResult",
+    "OVERSIZE_POLICIES",
+    "PARQUET_ENGINES",
+    "RowHighlight",
+    "SheetExportStats",
+    "TRACE_COMPRESSION_ENV",
+    "atomic_path",
+    "atomic_to_csv",
+    "atomic_to_parquet",
+    "atomic_write",
+    "atomic_write_bytes",
+    "atomic_write_json",
+    "atomic_write_text",
+    "build_row_highlight",
+    "compressed_path",
+    "existing_artifact_path",
+    "parquet_engine_available",
+    "trace_compression_from_env",
+    "write_workbook_streaming",
+    "xlsxwriter_available",
+]
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import io
+import json
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+import pandas as pd
+
+COMPRESSIONS = ("gzip", "zstd")
+_SUFFIX_BY_COMPRESSION = {"gzip": ".gz", "zstd": ".zst"}
+TRACE_COMPRESSION_ENV = "MU_TRACE_COMPRESSION"
+PARQUET_ENGINES = ("pyarrow", "fastparquet")
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persiste la entrada de directorio tras ``os.replace`` (no-op donde no aplica)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+_UMASK_LOCK = threading.Lock()
+
+
+def _current_umask() -> int:
+    """umask del proceso sin modificarlo (``/proc``); si no está disponible, lectura bajo lock."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    with _UMASK_LOCK:
+        mask = os.umask(0o022)
+        os.umask(mask)
+    return mask
+
+
+def _target_mode(final_path: Path) -> int:
+    """Permisos del destino existente o los de un archivo nuevo (``0o666 & ~umask``)."""
+    try:
+        return stat.S_IMODE(os.stat(final_path).st_mode)
+    except OSError:
+        return 0o666 & ~_current_umask()
+
+
+def _infer_compression(path: Path, compression: str | None) -> str | None:
+    if compression == "infer":
+        for name, suffix in _SUFFIX_BY_COMPRESSION.items():
+            if path.name.endswith(suffix):
+                return name
+        return None
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Compresión no soportada: {compression!r} (usar {COMPRESSIONS})")
+    return compression
+
+
+def compressed_path(path: Path, compression: str | None) -> Path:
+    """``x.tsv`` → ``x.tsv.gz`` / ``x.tsv.zst`` según compresión (idempotente)."""
+    path = Path(path)
+    suffix = _SUFFIX_BY_COMPRESSION.get(compression or "")
+    if not suffix or path.name.endswith(suffix):
+        return path
+    return path.with_name(path.name + suffix)
+
+
+def trace_compression_from_env() -> str | None:
+    """Compresión opcional de trazas (``MU_TRACE_COMPRESSION=gzip|zstd``)."""
+    value = os.environ.get(TRACE_COMPRESSION_ENV, "").strip().lower()
+    return value if value in COMPRESSIONS else None
+
+
+def existing_artifact_path(path: Path) -> Path:
+    """Ruta existente del artefacto, aceptando su variante comprimida."""
+    path = Path(path)
+    if path.exists():
+        return path
+    for compression in COMPRESSIONS:
+        candidate = compressed_path(path, compression)
+        if candidate.exists():
+            return candidate
+    return path
+
+
+@contextmanager
+def atomic_path(final_path: Path) -> Iterator[Path]:
+    """Ruta temporal hermana de ``final_path``; al salir sin error: fsync + ``os.replace``.
+
+    Para librerías que exigen una ruta (ExcelWriter, openpyxl ``save``,
+    xlsxwriter). El temporal vive en el mismo directorio, por lo que el
+    reemplazo es un rename atómico y no una segunda copia del archivo.
+    """
+    final_path = Path(final_path)
+    final_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=final_path.parent,
+        prefix=f".{final_path.name}.",
+        suffix=".tmp" + final_path.suffix,
+    )
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        yield tmp_path
+        # mkstemp crea con 0600; el artefacto final conserva los permisos esperados.
+        os.chmod(tmp_path, _target_mode(final_path))
+        with open(tmp_path, "rb") as fh:
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _fsync_dir(final_path.parent)
+
+
+@contextmanager
+def atomic_write(
+    final_path: Path,
+    mode: str = "w",
+    encoding: str | None = "utf-8",
+    newline: str | None = None,
+    compression: str | None = None,
+) -> Iterator[IO]:
+    """Abre un temporal en el directorio destino; al cerrar: fsync + ``os.replace``.
+
+    ``compression`` acepta ``"gzip"``, ``"zstd"`` (requiere ``zstandard``) o
+    ``"infer"`` desde el sufijo de ``final_path``. Ante una excepción el
+    destino no se toca y el temporal se elimina.
+    """
+    if mode not in {"w", "wb"}:
+        raise ValueError("atomic_write solo admite modo 'w' o 'wb'")
+    final_path = Path(final_path)
+    compression = _infer_compression(final_path, compression)
+    with atomic_path(final_path) as tmp_path:
+        with open(tmp_path, "wb") as raw:
+            if compression == "gzip":
+                stream: IO[bytes] = gzip.GzipFile(filename=final_path.name, mode="wb", fileobj=raw, mtime=0)
+            elif compression == "zstd":
+                try:
+                    import zstandard
+                except ImportError as exc:  # pragma: no cover - depende del entorno
+                    raise RuntimeError("Compresión zstd requiere el paquete opcional 'zstandard'") from exc
+                stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+            else:
+                stream = raw
+            if mode == "w":
+                handle: IO = io.TextIOWrapper(stream, encoding=encoding or "utf-8", newline=newline)
+            else:
+                handle = stream
+            try:
+                yield handle
+            finally:
+                handle.flush()
+                if handle is not stream:
+                    handle.detach()
+                if stream is not raw:
+                    stream.close()
+            raw.flush()
+
+
+def atomic_write_text(
+    final_path: Path,
+    text: str,
+    encoding: str = "utf-8",
+    newline: str | None = None,
+    compression: str | None = None,
+) -> Path:
+    with atomic_write(final_path, "w", encoding=encoding, newline=newline, compression=compression) as fh:
+        fh.write(text)
+    return Path(final_path)
+
+
+def atomic_write_bytes(final_path: Path, data: bytes, compression: str | None = None) -> Path:
+    with atomic_write(final_path, "wb", encoding=None, compression=compression) as fh:
+        fh.write(data)
+    return Path(final_path)
+
+
+def atomic_write_json(final_path: Path, payload: object, indent: int | None = 2, **json_kwargs) -> Path:
+    json_kwargs.setdefault("ensure_ascii", False)
+    return atomic_write_text(final_path, json.dumps(payload, indent=indent, **json_kwargs))
+
+
+def atomic_to_csv(df: pd.DataFrame, final_path: Path, compression: str | None = None, **to_csv_kwargs) -> Path:
+    """``DataFrame.to_csv`` en una sola pasada sobre el temporal del destino."""
+    encoding = to_csv_kwargs.pop("encoding", "utf-8")
+    with atomic_write(final_path, "w", encoding=encoding, newline="", compression=compression) as fh:
+        df.to_csv(fh, **to_csv_kwargs)
+    return Path(final_path)
+
+
+def parquet_engine_available() -> bool:
+    return any(importlib.util.find_spec(engine) is not None for engine in PARQUET_ENGINES)
+
+
+def atomic_to_parquet(df: pd.DataFrame, final_path: Path, **to_parquet_kwargs) -> Path:
+    """``DataFrame.to_parquet`` sobre un temporal hermano (requiere pyarrow o fastparquet)."""
+    with atomic_path(final_path) as tmp_path:
+        df.to_parquet(tmp_path, **to_parquet_kwargs)
+    return Path(final_path)
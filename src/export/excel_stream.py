@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import importlib.util
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Límite duro de Excel: 1.048.576 filas por hoja (incluye encabezado).
+EXCEL_MAX_DATA_ROWS = 1_048_575
+SHEET_NAME_MAX_LEN = 31
+OVERSIZE_POLICIES = ("dividir", "omitir")
+DEFAULT_CHUNK_ROWS = 5_000
+
+RED_FILL_COLOR = "FFC7CE"
+RED_FONT_COLOR = "9C0006"
+DATETIME_NUMBER_FORMAT = "yyyy-mm-dd hh:mm:ss"
+
+
+def xlsxwriter_available() -> bool:
+    return importlib.util.find_spec("xlsxwriter") is not None
+
+
+@dataclass
+class RowHighlight:
+    """Celdas a marcar en rojo dentro de una hoja, resueltas por posición."""
+
+    sheet: str
+    rows: np.ndarray  # bool por fila (posicional, mismo largo que el DataFrame)
+    columns: Sequence[str]
+
+
+@dataclass
+class SheetExportStats:
+    name: str
+    rows: int
+    parts: list[str] = field(default_factory=list)
+    skipped: bool = False
+
+
+def build_row_highlight(
+    sheet: str,
+    df: pd.DataFrame,
+    mask: pd.Series | None,
+    columns: Sequence[str],
+    fallback_column: str = "CODCLI",
+) -> RowHighlight | None:
+    """Alinea una máscara por índice con las posiciones del DataFrame exportado."""
+    if mask is None or not bool(mask.any()):
+        return None
+    rows = mask.reindex(df.index, fill_value=False).fillna(False).to_numpy(dtype=bool)
+    cols = [c for c in columns if c in df.columns]
+    if not cols:
+        cols = [fallback_column if fallback_column in df.columns else df.columns[0]]
+    return RowHighlight(sheet=sheet, rows=rows, columns=cols)
+
+
+def _chunk_rows(df: pd.DataFrame, chunk_rows: int) -> Iterator[list[tuple]]:
+    """Filas listas para Excel, convertidas por columna en bloques acotados."""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start : start + chunk_rows]
+        columns = []
+        for _, col in chunk.items():
+            if isinstance(col.dtype, pd.DatetimeTZDtype):
+                col = col.dt.tz_localize(None)
+            values = col.astype(object)
+            columns.append(values.where(col.notna(), None).tolist())
+        yield list(zip(*columns)) if columns else [() for _ in range(len(chunk))]
+
+
+def _cell_value(value: object) -> object:
+    if value is None or isinstance(value, (str, int, float, bool, pd.Timestamp)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _plan_sheet_parts(
+    name: str,
+    n_rows: int,
+    max_rows: int,
+    policy: str,
+) -> list[tuple[str, int, int]]:
+    """Particiones (nombre, inicio, fin) de una hoja según el umbral de filas."""
+    if n_rows <= max_rows:
+        return [(name[:SHEET_NAME_MAX_LEN], 0, n_rows)]
+    if policy == "omitir":
+        return []
+    parts: list[tuple[str, int, int]] = []
+    for i, start in enumerate(range(0, n_rows, max_rows), start=1):
+        suffix = "" if i == 1 else f"_{i}"
+        parts.append((name[: SHEET_NAME_MAX_LEN - len(suffix)] + suffix, start, min(start + max_rows, n_rows)))
+    return parts
+
+
+class _XlsxWriterBackend:
+    def __init__(self, path: Path) -> None:
+        import xlsxwriter
+
+        self.book = xlsxwriter.Workbook(
+            str(path),
+            {
+                "constant_memory": True,
+                "default_date_format": DATETIME_NUMBER_FORMAT,
+                "nan_inf_to_errors": True,
+                "strings_to_numbers": False,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+            },
+        )
+        self.header_fmt = self.book.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        self.red_fmt = self.book.add_format({"bg_color": f"#{RED_FILL_COLOR}", "font_color": f"#{RED_FONT_COLOR}"})
+        self.ws = None
+        self.row = 0
+
+    def add_sheet(self, name: str, header: Sequence[str]) -> None:
+        self.ws = self.book.add_worksheet(name)
+        self.ws.write_row(0, 0, [str(c) for c in header], self.header_fmt)
+        self.row = 1
+
+    def write_row(self, values: Sequence[object], red_cols: Sequence[int] = ()) -> None:
+        self.ws.write_row(self.row, 0, [_cell_value(v) for v in values])
+        for c in red_cols:
+            self.ws.write(self.row, c, _cell_value(values[c]), self.red_fmt)
+        self.row += 1
+
+    def close(self) -> None:
+        self.book.close()
+
+
+class _OpenpyxlWriteOnlyBackend:
+    def __init__(self, path: Path) -> None:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+        self.path = path
+        self.book = Workbook(write_only=True)
+        self._cell = WriteOnlyCell
+        thin = Side(style="thin")
+        self.header_font = Font(bold=True)
+        self.header_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        self.header_align = Alignment(horizontal="center", vertical="top")
+        self.red_fill = PatternFill(start_color=RED_FILL_COLOR, end_color=RED_FILL_COLOR, fill_type="solid")
+        self.red_font = Font(color=RED_FONT_COLOR)
+        self.ws = None
+
+    def add_sheet(self, name: str, header: Sequence[str]) -> None:
+        self.ws = self.book.create_sheet(title=name)
+        cells = []
+        for col in header:
+            cell = self._cell(self.ws, value=str(col))
+            cell.font = self.header_font
+            cell.border = self.header_border
+            cell.alignment = self.header_align
+            cells.append(cell)
+        self.ws.append(cells)
+
+    def _value(self, value: object) -> object:
+        value = _cell_value(value)
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        if isinstance(value, float) and not np.isfinite(value):
+            return None
+        return value
+
+    def write_row(self, values: Sequence[object], red_cols: Sequence[int] = ()) -> None:
+        row = [self._value(v) for v in values]
+        for c in red_cols:
+            cell = self._cell(self.ws, value=row[c])
+            cell.fill = self.red_fill
+            cell.font = self.red_font
+            row[c] = cell
+        self.ws.append(row)
+
+    def close(self) -> None:
+        self.book.save(self.path)
+
+
+def _sheet_marks(highlights: Sequence[RowHighlight], columns: Sequence[str]) -> list[tuple[np.ndarray, list[int]]]:
+    """(filas, posiciones de columna) por marca; descarta marcas sin columnas presentes."""
+    col_pos = {c: i for i, c in enumerate(columns)}
+    marks = []
+    for h in highlights:
+        cols = [col_pos[c] for c in h.columns if c in col_pos]
+        if cols:
+            marks.append((h.rows, cols))
+    return marks
+
+
+def _red_cols_at(marks: list[tuple[np.ndarray, list[int]]], pos: int) -> list[int]:
+    if len(marks) == 1:
+        return marks[0][1]
+    return sorted({c for rows, cols in marks if rows[pos] for c in cols})
+
+
+def write_workbook_streaming(
+    sheets: Mapping[str, pd.DataFrame],
+    path: Path,
+    highlights: Sequence[RowHighlight] = (),
+    max_rows_per_sheet: int | None = None,
+    oversize_policy: str = "dividir",
+    engine: str | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> list[SheetExportStats]:
+    """Escribe un workbook fila a fila (memoria acotada por bloque, no por libro).
+
+    Usa xlsxwriter en modo ``constant_memory`` si está instalado y, si no,
+    openpyxl ``write_only``. Las marcas rojas se aplican mientras se escribe
+    cada fila (sin recorrer la hoja al final); varias marcas sobre la misma
+    hoja se combinan por fila (unión de columnas). Hojas con más filas que
+    ``max_rows_per_sheet`` se dividen en ``NOMBRE``, ``NOMBRE_2``, ... o se
+    omiten según ``oversize_policy``.
+    """
+    if oversize_policy not in OVERSIZE_POLICIES:
+        raise ValueError(f"oversize_policy inválido: {oversize_policy!r} (usar {OVERSIZE_POLICIES})")
+    max_rows = min(int(max_rows_per_sheet or EXCEL_MAX_DATA_ROWS), EXCEL_MAX_DATA_ROWS)
+    if max_rows < 1:
+        raise ValueError("max_rows_per_sheet debe ser >= 1")
+    if engine is None:
+        engine = "xlsxwriter" if xlsxwriter_available() else "openpyxl"
+    backend = _XlsxWriterBackend(path) if engine == "xlsxwriter" else _OpenpyxlWriteOnlyBackend(path)
+
+    highlights_by_sheet: dict[str, list[RowHighlight]] = {}
+    for h in highlights:
+        highlights_by_sheet.setdefault(h.sheet, []).append(h)
+    stats: list[SheetExportStats] = []
+    try:
+        for name, df in sheets.items():
+            sheet_stats = SheetExportStats(name=name, rows=len(df))
+            stats.append(sheet_stats)
+            parts = _plan_sheet_parts(name, len(df), max_rows, oversize_policy)
+            if not parts:
+                sheet_stats.skipped = True
+                continue
+            marks = _sheet_marks(highlights_by_sheet.get(name, []), df.columns)
+            marked_rows = np.logical_or.reduce([rows for rows, _ in marks]) if marks else None
+            for part_name, start, end in parts:
+                sheet_stats.parts.append(part_name)
+                backend.add_sheet(part_name, list(df.columns))
+                pos = start
+                for rows in _chunk_rows(df.iloc[start:end], chunk_rows):
+                    for values in rows:
+                        if marked_rows is not None and marked_rows[pos]:
+                            backend.write_row(values, _red_cols_at(marks, pos))
+                        else:
+                            backend.write_row(values)
+                        pos += 1
+        if not any(s.parts for s in stats):
+            # Un xlsx necesita al menos una hoja visible.
+            backend.add_sheet("VACIO", ["SIN_HOJAS_EXPORTADAS"])
+    finally:
+        backend.close()
+    return stats
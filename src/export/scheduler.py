@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+DEFAULT_EXPORT_WORKERS = 4
+
+
+@dataclass
+class ExportTaskResult:
+    name: str
+    critical: bool
+    ok: bool
+    wall_s: float
+    error: str | None = None
+    error_type: str | None = None
+    traceback: str | None = None
+
+
+@dataclass
+class ExportReport:
+    """Resultado consolidado de la fase de exportación."""
+
+    tasks: list[ExportTaskResult] = field(default_factory=list)
+    wall_s: float = 0.0
+
+    @property
+    def failed(self) -> list[ExportTaskResult]:
+        return [t for t in self.tasks if not t.ok]
+
+    @property
+    def failed_critical(self) -> list[ExportTaskResult]:
+        return [t for t in self.failed if t.critical]
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "wall_s": round(self.wall_s, 4),
+            "ok": not self.failed,
+            "errores_criticos": len(self.failed_critical),
+            "errores_no_criticos": len(self.failed) - len(self.failed_critical),
+            "tareas": [{k: v for k, v in asdict(t).items() if k != "traceback"} for t in self.tasks],
+        }
+
+    def raise_for_errors(self) -> None:
+        """Falla una sola vez con todas las exportaciones críticas caídas."""
+        failed = self.failed_critical
+        if not failed:
+            return
+        detail = "; ".join(f"{t.name}: {t.error_type}: {t.error}" for t in failed)
+        raise RuntimeError(f"EXPORTACION_FALLIDA ({len(failed)} artefacto(s) crítico(s)): {detail}")
+
+
+class ExportScheduler:
+    """Ejecuta escrituras independientes en paralelo y consolida sus errores.
+
+    Cada tarea se anuncia apenas termina (``on_ready``), de modo que un
+    artefacto rápido —el CSV de carga— queda disponible sin esperar al xlsx.
+    Las tareas no críticas (reportes JSON) registran su error sin abortar.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_EXPORT_WORKERS,
+        on_ready: Callable[[ExportTaskResult], None] | None = None,
+    ) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="mu_export")
+        self._futures: list[tuple[str, bool, Future]] = []
+        self._results: dict[str, ExportTaskResult] = {}
+        self._lock = threading.Lock()
+        self._on_ready = on_ready
+        self._t0 = time.perf_counter()
+
+    def submit(self, name: str, fn: Callable[..., object], *args, critical: bool = True, **kwargs) -> Future:
+        def _run() -> object:
+            t0 = time.perf_counter()
+            try:
+                value = fn(*args, **kwargs)
+            except BaseException as exc:
+                result = ExportTaskResult(
+                    name=name,
+                    critical=critical,
+                    ok=False,
+                    wall_s=round(time.perf_counter() - t0, 4),
+                    error=str(exc),
+                    error_type=type(exc).__name__,
+                    traceback=traceback.format_exc(),
+                )
+                self._record(result)
+                raise
+            self._record(ExportTaskResult(name=name, critical=critical, ok=True, wall_s=round(time.perf_counter() - t0, 4)))
+            return value
+
+        future = self._pool.submit(_run)
+        self._futures.append((name, critical, future))
+        return future
+
+    def _record(self, result: ExportTaskResult) -> None:
+        with self._lock:
+            self._results[result.name] = result
+        if self._on_ready is not None:
+            self._on_ready(result)
+
+    def wait(self) -> ExportReport:
+        """Espera todas las tareas (aunque alguna falle) y retorna el reporte."""
+        for _, _, future in self._futures:
+            future.exception()
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            tasks = [self._results[name] for name, _, _ in self._futures if name in self._results]
+        return ExportReport(tasks=tasks, wall_s=time.perf_counter() - self._t0)
+
+    def __enter__(self) -> "ExportScheduler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,41 @@
+"""Governance stages shared by the MU 2026 pipeline and its CLI scripts."""
+
+from .alertas_codcar import (
+    HOJA_ALERTAS,
+    HOJA_SUBIDA,
+    construir_hoja_alertas,
+    formula_alerta_codcar,
+    motivo_alerta_codcar,
+)
+from .codcarpr_anoingreso import (
+    CLAVE_SUPERPOSICION,
+    GOBERNANZA_XLSX_NAME,
+    UNIVERSO_CACHE_SUBDIR,
+    cargar_universo,
+    ejecutar_gobernanza_codcarpr_anoingreso,
+    paso1_excel_a_tsv_long,
+    paso2_detectar_superposiciones,
+    paso2_rango_anoingreso,
+    paso3_cruce_universo_real,
+    paso4_generar_outputs,
+    validaciones_finales,
+)
+
+__all__ = [
+    "CLAVE_SUPERPOSICION",
+    "GOBERNANZA_XLSX_NAME",
+    "HOJA_ALERTAS",
+    "HOJA_SUBIDA",
+    "UNIVERSO_CACHE_SUBDIR",
+    "cargar_universo",
+    "construir_hoja_alertas",
+    "ejecutar_gobernanza_codcarpr_anoingreso",
+    "formula_alerta_codcar",
+    "motivo_alerta_codcar",
+    "paso1_excel_a_tsv_long",
+    "paso2_detectar_superposiciones",
+    "paso2_rango_anoingreso",
+    "paso3_cruce_universo_real",
+    "paso4_generar_outputs",
+    "validaciones_finales",
+]
@@ -0,0 +1,94 @@
+"""Reglas de alerta COD_CAR/SIES sobre ARCHIVO_LISTO_SUBIDA.
+
+Una fila requiere revisión si el match SIES es ambiguo o sin match, si el
+diagnóstico SIES apunta a un problema conocido, si no calzó con el catálogo
+manual o si COD_CAR quedó sin fuente final. ``motivo_alerta_codcar`` aplica
+las reglas vectorizadas y ``formula_alerta_codcar`` las expresa como una
+sola regla de formato condicional de Excel.
+
+Las usan ``codigo_gobernanza_v2.py --marcar-alertas-codcar true`` (al
+exportar) y ``scripts/marcar_alertas_codcar.py`` (workbooks ya exportados).
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+HOJA_SUBIDA = "ARCHIVO_LISTO_SUBIDA"
+HOJA_ALERTAS = "ALERTAS_REVISION"
+
+ALERTA_REQUIRED = ["SIES_MATCH_STATUS", "SIES_MATCH_DIAG", "MANUAL_MATCH_STATUS", "COD_CAR_AUDIT_STATUS"]
+ALERTA_OPT = ["CODCLI", "N_DOC", "DV", "COD_CAR", "CODCARPR_NORM", "SOURCE_KEY_3", "MATCH_KEY_3", "KEY_3_NO_JORNADA"]
+
+AMB_SIES_STATUS = ("AMBIGUO_SIES", "SIN_MATCH_SIES")
+AMB_SIES_DIAG = (
+    "MATCH_SIES_AMBIGUO",
+    "SIN_CODCARPR_EN_PUENTE_SIES",
+    "PROBABLE_PROBLEMA_JORNADA_SIES",
+    "PROBABLE_PROBLEMA_NOMBRE_SIES",
+)
+MANUAL_SIN_MATCH = "SIN_MATCH_MANUAL"
+CODCAR_SIN_FUENTE = "SIN_FUENTE_FINAL"
+
+RED_FILL_COLOR = "FFFF0000"
+
+
+def _texto(series: pd.Series) -> pd.Series:
+    return series.fillna("").astype(str).str.strip()
+
+
+def motivo_alerta_codcar(df: pd.DataFrame) -> pd.Series:
+    """MOTIVO por fila ("" si no requiere revisión); la primera condición que calza gana."""
+    missing = [c for c in ALERTA_REQUIRED if c not in df.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas para marcar ambigüedad COD_CAR: {missing}")
+
+    sies_status = _texto(df["SIES_MATCH_STATUS"]).str.upper()
+    sies_diag = _texto(df["SIES_MATCH_DIAG"]).str.upper()
+    manual_status = _texto(df["MANUAL_MATCH_STATUS"]).str.upper()
+    codcar_audit = _texto(df["COD_CAR_AUDIT_STATUS"]).str.upper()
+
+    motivo = np.select(
+        [
+            sies_status.isin(AMB_SIES_STATUS),
+            sies_diag.isin(AMB_SIES_DIAG),
+            manual_status.eq(MANUAL_SIN_MATCH),
+            codcar_audit.eq(CODCAR_SIN_FUENTE),
+        ],
+        [
+            "SIES_MATCH_STATUS=" + sies_status,
+            "SIES_MATCH_DIAG=" + sies_diag,
+            f"MANUAL_MATCH_STATUS={MANUAL_SIN_MATCH}",
+            f"COD_CAR_AUDIT_STATUS={CODCAR_SIN_FUENTE}",
+        ],
+        default="",
+    )
+    return pd.Series(motivo, index=df.index, dtype=object)
+
+
+def construir_hoja_alertas(df: pd.DataFrame, motivo: pd.Series, fila_inicial: int = 2) -> pd.DataFrame:
+    """Hoja ALERTAS_REVISION: ROW (fila Excel), MOTIVO y columnas clave presentes, más RESUMEN."""
+    opt_present = [c for c in ALERTA_OPT if c in df.columns]
+    marcadas = motivo.ne("").to_numpy()
+    alertas = pd.DataFrame({"ROW": np.flatnonzero(marcadas) + fila_inicial, "MOTIVO": motivo.to_numpy()[marcadas]})
+    for c in opt_present:
+        alertas[c] = _texto(df[c]).to_numpy()[marcadas]
+    resumen = pd.DataFrame(
+        [{"ROW": None}, {"ROW": "RESUMEN", "MOTIVO": f"FILAS_MARCADAS_EN_ROJO={int(marcadas.sum())}"}],
+        columns=alertas.columns,
+    )
+    return pd.concat([alertas.astype(object), resumen], ignore_index=True)
+
+
+def formula_alerta_codcar(letras: dict[str, str], fila: int = 2) -> str:
+    """Fórmula de formato condicional equivalente a ``motivo_alerta_codcar`` (Excel compara sin mayúsculas)."""
+    def _en(col: str, valores) -> list[str]:
+        return [f'TRIM(${letras[col]}{fila})="{v}"' for v in valores]
+
+    partes = (
+        _en("SIES_MATCH_STATUS", AMB_SIES_STATUS)
+        + _en("SIES_MATCH_DIAG", AMB_SIES_DIAG)
+        + _en("MANUAL_MATCH_STATUS", [MANUAL_SIN_MATCH])
+        + _en("COD_CAR_AUDIT_STATUS", [CODCAR_SIN_FUENTE])
+    )
+    return f"OR({','.join(partes)})"
@@ -0,0 +1,376 @@
+"""Gobernanza CODCARPR por cohorte (ANOINGRESO) como etapa importable.
+
+Detecta superposiciones de CODCARPR por (NOMBRE_L, JORNADA, ANOINGRESO)
+desde Hoja1 del Excel de gobernanza y las cruza con el universo real
+(Hoja1/DatosAlumnos del input). No modifica el pipeline regulatorio ni la
+estructura del CSV final MU32.
+
+La usan ``codigo_gobernanza_v2.py --gobernanza-codcarpr-anoingreso true`` y
+el CLI ``scripts/gobernanza_codcarpr_anoingreso.py``.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from src.catalogs import CompiledIndexCache, sources_key
+
+GOBERNANZA_XLSX_NAME = 'gobernanza CODCARPR_ANOINGRESO.xlsx'
+UNIVERSO_CACHE_SUBDIR = '.cache'
+UNIVERSO_CACHE_VERSION = 1
+CLAVE_SUPERPOSICION = ['NOMBRE_L', 'JORNADA', 'ANOINGRESO']
+HOJA1_COLS = ['CODCLI', 'CODCARR', 'CARRERA', 'JORNADA', 'PLAN_DE_ESTUDIO']
+DA_COLS = ['CODCLI', 'ANOINGRESO']
+
+
+# ---------------------------------------------------------------------------
+# Normalización
+# ---------------------------------------------------------------------------
+
+def _norm_jornada(s: pd.Series) -> pd.Series:
+    return s.astype('string').fillna('').str.strip().str.upper().astype(object)
+
+
+def _norm_nombre(s: pd.Series) -> pd.Series:
+    return _norm_jornada(s).str.replace(r'\s+', ' ', regex=True)
+
+
+def _extract_year_columns(columns: list[object]) -> list[object]:
+    years: list[tuple[int, object]] = []
+    for c in columns:
+        if isinstance(c, str):
+            txt = c.strip()
+            if txt.isdigit() and len(txt) == 4:
+                y = int(txt)
+                if 1900 <= y <= 2100:
+                    years.append((y, c))
+                continue
+        if isinstance(c, (int, float)) and float(c) == int(c):
+            y = int(c)
+            if 1900 <= y <= 2100:
+                years.append((y, c))
+    years_sorted = [orig for _, orig in sorted(years, key=lambda x: x[0])]
+    return years_sorted
+
+
+# ---------------------------------------------------------------------------
+# Paso 0 — Localizar Excel de gobernanza
+# ---------------------------------------------------------------------------
+
+def _locate_gobernanza_xlsx(input_path: Path) -> Path:
+    """Busca 'gobernanza CODCARPR_ANOINGRESO.xlsx' junto al input del pipeline."""
+    gob_path = input_path.parent / GOBERNANZA_XLSX_NAME
+    if not gob_path.exists():
+        raise FileNotFoundError(f'No se encontró {gob_path}')
+    return gob_path
+
+
+# ---------------------------------------------------------------------------
+# Paso 1 — Excel → TSV long (una sola vez)
+# ---------------------------------------------------------------------------
+
+def _tsv_text(s: pd.Series) -> pd.Series:
+    """Texto tal como queda tras escribir y releer el TSV long (NA se conserva)."""
+    return s.astype(object).where(s.isna(), s.astype(str))
+
+
+def paso1_excel_a_tsv_long(hoja1_gob: pd.DataFrame, control_dir: Path) -> pd.DataFrame:
+    """Despivotar Hoja1 de gobernanza (ya leída) a formato long y guardar TSV."""
+    # Identificar columnas-año (headers numéricos enteros)
+    year_cols = _extract_year_columns(list(hoja1_gob.columns))
+    if not year_cols:
+        raise ValueError('No se detectaron columnas-año en Hoja1 de gobernanza')
+    id_cols = ['CODCARPR', 'JORNADA', 'NOMBRE_L']
+
+    long = hoja1_gob.melt(id_vars=id_cols, value_vars=year_cols,
+                          var_name='ANOINGRESO', value_name='VAL')
+    long['ANOINGRESO'] = pd.to_numeric(long['ANOINGRESO'], errors='coerce').astype('Int64')
+    long['VAL'] = pd.to_numeric(long['VAL'], errors='coerce')
+
+    # Filtrar VAL > 0
+    long = long[long['ANOINGRESO'].notna() & long['VAL'].notna() & (long['VAL'] > 0)].copy()
+    long['ANOINGRESO'] = long['ANOINGRESO'].astype(int)
+
+    # Normalización obligatoria (CODCARPR como texto, igual que al releer el TSV)
+    long['CODCARPR'] = _tsv_text(long['CODCARPR'])
+    long['JORNADA'] = _norm_jornada(long['JORNADA'])
+    long['NOMBRE_L'] = _norm_nombre(long['NOMBRE_L'])
+
+    long = long.sort_values(['NOMBRE_L', 'JORNADA', 'ANOINGRESO', 'CODCARPR']).reset_index(drop=True)
+
+    tsv_path = control_dir / 'gob_codcarpr_anioingreso_long.tsv'
+    long.to_csv(tsv_path, sep='\t', index=False)
+    print(f'  ✅ TSV long generado: {tsv_path} ({len(long)} filas)')
+    return long
+
+
+# ---------------------------------------------------------------------------
+# Paso 2 — Detectar superposiciones desde TSV long
+# ---------------------------------------------------------------------------
+
+def paso2_detectar_superposiciones(long: pd.DataFrame) -> pd.DataFrame:
+    """Agrupa por (NOMBRE_L, JORNADA, ANOINGRESO) y detecta N_CODCARPR > 1.
+
+    CODCARPR_LIST/CODCARPR_VALS listan los CODCARPR por VAL descendente; los
+    empates conservan el orden alfabético del TSV long (orden estable).
+    """
+    distintos = long.drop_duplicates(CLAVE_SUPERPOSICION + ['CODCARPR'])
+    conflicto = distintos.duplicated(CLAVE_SUPERPOSICION, keep=False)
+    claves = distintos.loc[conflicto, CLAVE_SUPERPOSICION].drop_duplicates()
+    if claves.empty:
+        print('  ✅ Superposiciones: 0 claves con >1 CODCARPR')
+        return pd.DataFrame(columns=CLAVE_SUPERPOSICION + ['N_CODCARPR', 'CODCARPR_LIST', 'CODCARPR_VALS'])
+
+    rows = long.merge(claves, on=CLAVE_SUPERPOSICION, how='inner', sort=False)
+    rows = rows.sort_values(
+        CLAVE_SUPERPOSICION + ['VAL'], ascending=[True, True, True, False], kind='mergesort',
+    )
+    rows['_VALS'] = rows['CODCARPR'] + ':' + rows['VAL'].astype(int).astype(str)
+    vals = rows.groupby(CLAVE_SUPERPOSICION, sort=True).agg(
+        N_CODCARPR=('CODCARPR', 'nunique'),
+        CODCARPR_VALS=('_VALS', '|'.join),
+    )
+    unicos = rows.drop_duplicates(CLAVE_SUPERPOSICION + ['CODCARPR'])
+    vals['CODCARPR_LIST'] = unicos.groupby(CLAVE_SUPERPOSICION, sort=True)['CODCARPR'].agg('|'.join)
+    sup = vals.reset_index()[CLAVE_SUPERPOSICION + ['N_CODCARPR', 'CODCARPR_LIST', 'CODCARPR_VALS']]
+    print(f'  ✅ Superposiciones: {len(sup)} claves con >1 CODCARPR')
+    return sup
+
+
+def paso2_rango_anoingreso(long: pd.DataFrame) -> pd.DataFrame:
+    """Vigencia por CODCARPR: primer/último ANOINGRESO con matrícula y total acumulado."""
+    rango = long.groupby(['CODCARPR', 'JORNADA', 'NOMBRE_L'], as_index=False, sort=True).agg(
+        ANOINGRESO_MIN=('ANOINGRESO', 'min'),
+        ANOINGRESO_MAX=('ANOINGRESO', 'max'),
+        N_ANOS=('ANOINGRESO', 'nunique'),
+        VAL_TOTAL=('VAL', 'sum'),
+    )
+    print(f'  ✅ Rango ANOINGRESO: {len(rango)} combinaciones CODCARPR/JORNADA/NOMBRE_L')
+    return rango
+
+
+# ---------------------------------------------------------------------------
+# Paso 3 — Cruce con universo real del pipeline
+# ---------------------------------------------------------------------------
+
+def _leer_universo(input_xlsx: Path) -> tuple[pd.DataFrame, pd.DataFrame]:
+    xls = pd.ExcelFile(input_xlsx)
+    h1 = pd.read_excel(xls, sheet_name='Hoja1', usecols=HOJA1_COLS)
+    da = pd.read_excel(xls, sheet_name='DatosAlumnos', usecols=DA_COLS)
+    return h1, da
+
+
+def cargar_universo(
+    input_xlsx: Path,
+    cache: CompiledIndexCache | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Hoja1 y DatosAlumnos (solo columnas usadas), leídas una vez por versión del workbook."""
+    if cache is None:
+        return _leer_universo(input_xlsx)
+    key = sources_key([input_xlsx], HOJA1_COLS, DA_COLS, UNIVERSO_CACHE_VERSION)
+    return cache.load_or_build('universo_codcarpr_anoingreso', key, lambda: _leer_universo(input_xlsx))
+
+
+def paso3_cruce_universo_real(
+    hoja1: pd.DataFrame,
+    datos_alumnos: pd.DataFrame,
+    sup: pd.DataFrame,
+) -> pd.DataFrame:
+    """Cruza superposiciones de gobernanza contra CODCLI reales."""
+
+    # --- Hoja1: deduplicar por CODCLI ---
+    h1 = hoja1[HOJA1_COLS].drop_duplicates(subset=['CODCLI'])
+    h1 = h1.assign(CARRERA_N=_norm_nombre(h1['CARRERA']), JORNADA_N=_norm_jornada(h1['JORNADA']))
+
+    # --- DatosAlumnos: ANOINGRESO por CODCLI ---
+    da = datos_alumnos[DA_COLS].drop_duplicates(subset=['CODCLI'])
+    da = da.assign(ANOINGRESO=pd.to_numeric(da['ANOINGRESO'], errors='coerce').astype('Int64'))
+
+    # Merge
+    uni = h1.merge(da, on='CODCLI', how='inner')
+    print(f'  → Universo real (Hoja1 ∩ DatosAlumnos): {len(uni)} CODCLI')
+
+    # Cruce por llave compuesta (carrera, jornada, cohorte) contra las superposiciones
+    sup_lookup = sup.rename(columns={'NOMBRE_L': 'CARRERA_N', 'JORNADA': 'JORNADA_N'})
+    sup_lookup = sup_lookup.astype({'ANOINGRESO': 'Int64'})
+    afectados = uni.merge(
+        sup_lookup[['CARRERA_N', 'JORNADA_N', 'ANOINGRESO', 'N_CODCARPR', 'CODCARPR_LIST', 'CODCARPR_VALS']],
+        on=['CARRERA_N', 'JORNADA_N', 'ANOINGRESO'],
+        how='inner',
+    )
+    afectados['ANOINGRESO_FUENTE'] = 'DatosAlumnos:ANOINGRESO'
+    afectados['REQUIERE_REVISION'] = 'SI'
+
+    # Columnas finales
+    afectados = afectados[[
+        'CODCLI', 'CODCARR', 'CARRERA', 'JORNADA', 'PLAN_DE_ESTUDIO',
+        'ANOINGRESO', 'ANOINGRESO_FUENTE',
+        'N_CODCARPR', 'CODCARPR_LIST', 'CODCARPR_VALS', 'REQUIERE_REVISION',
+    ]].sort_values(['CARRERA', 'JORNADA', 'ANOINGRESO', 'CODCLI']).reset_index(drop=True)
+
+    print(f'  ✅ CODCLI afectados por superposición: {len(afectados)}')
+    return afectados
+
+
+# ---------------------------------------------------------------------------
+# Paso 4 — Generar artefactos de gobernanza
+# ---------------------------------------------------------------------------
+
+def paso4_generar_outputs(
+    afectados: pd.DataFrame,
+    sup: pd.DataFrame,
+    hoja1_gob: pd.DataFrame,
+    output_dir: Path,
+    rango: pd.DataFrame | None = None,
+) -> dict[str, Path]:
+    """Genera Excel y TSV de superposiciones + Excel de gobernanza con Hoja2."""
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths: dict[str, Path] = {}
+
+    # --- A) Excel de superposiciones ---
+    sup_xlsx = output_dir / 'codcli_superposiciones_codcarpr_por_anoingreso.xlsx'
+    claves_sup = sup.rename(columns={'NOMBRE_L': 'NOMBRE_L_N', 'JORNADA': 'JORNADA_N'})
+
+    with pd.ExcelWriter(sup_xlsx, engine='openpyxl') as w:
+        afectados.to_excel(w, sheet_name='CODCLI_SUPERPOSICION', index=False)
+        claves_sup.to_excel(w, sheet_name='CLAVES_SUPERPOSICION', index=False)
+        if rango is not None:
+            rango.to_excel(w, sheet_name='RANGO_ANOINGRESO', index=False)
+    paths['sup_xlsx'] = sup_xlsx
+    print(f'  ✅ Excel superposiciones: {sup_xlsx}')
+
+    # --- B) TSV equivalente ---
+    sup_tsv = output_dir / 'codcli_superposiciones_codcarpr_por_anoingreso.tsv'
+    afectados.to_csv(sup_tsv, sep='\t', index=False)
+    paths['sup_tsv'] = sup_tsv
+    print(f'  ✅ TSV superposiciones: {sup_tsv}')
+
+    # --- C) Excel de gobernanza con Hoja2 ---
+    gob_out = output_dir / 'gobernanza_CODCARPR_ANOINGRESO_con_Hoja2.xlsx'
+
+    # Construir Hoja2 desde afectados
+    hoja2 = afectados[[
+        'PLAN_DE_ESTUDIO', 'ANOINGRESO', 'JORNADA', 'CARRERA',
+        'CODCLI', 'CODCARPR_LIST', 'CODCARPR_VALS',
+    ]].copy()
+    hoja2['CODCARPR_RESUELTO'] = ''
+    hoja2['MOTIVO'] = ''
+    hoja2['ESTADO'] = ''
+
+    with pd.ExcelWriter(gob_out, engine='openpyxl') as w:
+        hoja1_gob.to_excel(w, sheet_name='Hoja1', index=False)
+        hoja2.to_excel(w, sheet_name='DESAMBIGUACION_SUPERPOSICION', index=False)
+    paths['gob_xlsx'] = gob_out
+    print(f'  ✅ Excel gobernanza con Hoja2: {gob_out}')
+
+    return paths
+
+
+# ---------------------------------------------------------------------------
+# Validaciones finales
+# ---------------------------------------------------------------------------
+
+def validaciones_finales(
+    afectados: pd.DataFrame,
+    sup: pd.DataFrame,
+    control_dir: Path,
+    output_dir: Path,
+) -> bool:
+    print('\n' + '=' * 60)
+    print('  VALIDACIONES FINALES')
+    print('=' * 60)
+
+    n_claves = len(sup)
+    n_codcli = len(afectados)
+    fuente_ok = (afectados['ANOINGRESO_FUENTE'] == 'DatosAlumnos:ANOINGRESO').all() if len(afectados) > 0 else True
+
+    print(f'  • Claves superpuestas detectadas:       {n_claves}')
+    print(f'  • CODCLI afectados:                     {n_codcli}')
+    print(f'  • ANOINGRESO_FUENTE 100% DatosAlumnos:  {"SI" if fuente_ok else "NO"}')
+
+    expected = {
+        'TSV long': control_dir / 'gob_codcarpr_anioingreso_long.tsv',
+        'Excel superposiciones': output_dir / 'codcli_superposiciones_codcarpr_por_anoingreso.xlsx',
+        'TSV superposiciones': output_dir / 'codcli_superposiciones_codcarpr_por_anoingreso.tsv',
+        'Excel gobernanza Hoja2': output_dir / 'gobernanza_CODCARPR_ANOINGRESO_con_Hoja2.xlsx',
+    }
+    all_ok = True
+    for label, p in expected.items():
+        exists = p.exists()
+        icon = '✅' if exists else '❌'
+        print(f'  {icon} {label}: {p.name}')
+        if not exists:
+            all_ok = False
+
+    if all_ok and fuente_ok:
+        print(f'\n  ✅ GOBERNANZA CODCARPR OK — {n_claves} claves, {n_codcli} CODCLI afectados')
+    else:
+        print(f'\n  ❌ GOBERNANZA CODCARPR CON PROBLEMAS')
+    print('=' * 60)
+    return all_ok and fuente_ok
+
+
+# ---------------------------------------------------------------------------
+# Etapa
+# ---------------------------------------------------------------------------
+
+def ejecutar_gobernanza_codcarpr_anoingreso(
+    input_path: Path,
+    output_dir: Path,
+    control_dir: Path,
+    gob_xlsx: Path | None = None,
+    cache: CompiledIndexCache | None = None,
+) -> dict[str, object]:
+    """Etapa completa (pasos 0–4 + validaciones) sin subprocess; devuelve un resumen."""
+    input_path = Path(input_path)
+    output_dir = Path(output_dir)
+    control_dir = Path(control_dir)
+
+    print('=' * 60)
+    print('  GOBERNANZA CODCARPR × ANOINGRESO')
+    print('=' * 60)
+
+    # Paso 0
+    print('\n📂 Paso 0: Localizar Excel de gobernanza...')
+    gob_xlsx = Path(gob_xlsx) if gob_xlsx else _locate_gobernanza_xlsx(input_path)
+    hoja1_gob = pd.read_excel(gob_xlsx, sheet_name=0)
+    print(f'  ✅ Encontrado: {gob_xlsx.name}')
+
+    # Paso 1
+    print('\n📊 Paso 1: Excel → TSV long...')
+    control_dir.mkdir(parents=True, exist_ok=True)
+    long = paso1_excel_a_tsv_long(hoja1_gob, control_dir)
+
+    # Paso 2
+    print('\n🔍 Paso 2: Detectar superposiciones...')
+    sup = paso2_detectar_superposiciones(long)
+    rango = paso2_rango_anoingreso(long)
+
+    resumen: dict[str, object] = {
+        'gobernanza_xlsx': str(gob_xlsx),
+        'n_filas_long': int(len(long)),
+        'n_claves_superpuestas': int(len(sup)),
+        'n_codcarpr_rango': int(len(rango)),
+        'n_codcli_afectados': 0,
+    }
+    if len(sup) == 0:
+        print('\n  ℹ️  Sin superposiciones detectadas. No se generan artefactos adicionales.')
+        resumen['ok'] = validaciones_finales(pd.DataFrame(), sup, control_dir, output_dir)
+        return resumen
+
+    # Paso 3
+    print('\n🔗 Paso 3: Cruce con universo real...')
+    hoja1, datos_alumnos = cargar_universo(input_path, cache)
+    afectados = paso3_cruce_universo_real(hoja1, datos_alumnos, sup)
+
+    # Paso 4
+    print('\n📝 Paso 4: Generar artefactos de gobernanza...')
+    paths = paso4_generar_outputs(afectados, sup, hoja1_gob, output_dir, rango=rango)
+
+    # Validaciones
+    resumen['n_codcli_afectados'] = int(len(afectados))
+    resumen['artefactos'] = {name: str(path) for name, path in paths.items()}
+    resumen['ok'] = validaciones_finales(afectados, sup, control_dir, output_dir)
+    return resumen
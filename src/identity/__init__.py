@@ -0,0 +1,25 @@
+"""Run-scoped integer identity keys and interned SIES codes for MU 2026."""
+
+from .index import (
+    ID_DTYPE,
+    IdentityIndex,
+    KeyVocabulary,
+)
+from .sies import (
+    SIES_BLANK_TOKENS,
+    SIES_CODE_PATTERN,
+    SIES_COMPONENTS,
+    SiesCodeTable,
+    normalize_sies_codes,
+)
+
+__all__ = [
+    "ID_DTYPE",
+    "IdentityIndex",
+    "KeyVocabulary",
+    "SIES_BLANK_TOKENS",
+    "SIES_CODE_PATTERN",
+    "SIES_COMPONENTS",
+    "SiesCodeTable",
+    "normalize_sies_codes",
+]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+ID_DTYPE = np.int32
+
+
+class KeyVocabulary:
+    """Diccionario incremental valor normalizado → id entero (``int32``).
+
+    Cada valor distinto recibe un id estable dentro de la corrida, en orden de
+    aparición. Los valores se codifican tal cual llegan (ya normalizados por el
+    llamador): ``""`` y NA son etiquetas como cualquier otra, de modo que un
+    join por id empareja exactamente lo mismo que el join por texto.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._labels = pd.Index([], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def encode(self, values: Iterable[object]) -> np.ndarray:
+        local, uniques = pd.factorize(pd.Index(values, dtype=object), use_na_sentinel=False)
+        mapping = self._labels.get_indexer(uniques)
+        nuevos = mapping == -1
+        if nuevos.any():
+            start = len(self._labels)
+            self._labels = self._labels.append(pd.Index(uniques[nuevos], dtype=object))
+            mapping[nuevos] = np.arange(start, len(self._labels))
+        return mapping.astype(ID_DTYPE, copy=False)[local]
+
+    def decode(self, ids: Iterable[int]) -> np.ndarray:
+        """Materializa las etiquetas de texto (solo al exportar)."""
+        return self._labels.take(np.asarray(ids, dtype=np.intp)).to_numpy(dtype=object)
+
+
+class IdentityIndex:
+    """Índice de identidad por corrida: RUT, CODCLI y par (RUT, CODCARPR) → int32.
+
+    Se construye una vez y se comparte entre los joins internos del pipeline MU
+    (histórico, DatosAlumnos por CODCLI y fallback por RUT), que así operan
+    sobre columnas enteras en vez de re-concatenar y comparar texto.
+    """
+
+    def __init__(self) -> None:
+        self.rut = KeyVocabulary("RUT_NORM")
+        self.codcli = KeyVocabulary("CODCLI")
+        self.codcarpr = KeyVocabulary("CODCARPR_NORM")
+        self.rut_codcarpr = KeyVocabulary("RUT_CODCARPR")
+
+    def rut_ids(self, values: Iterable[object]) -> np.ndarray:
+        return self.rut.encode(values)
+
+    def codcli_ids(self, values: Iterable[object]) -> np.ndarray:
+        return self.codcli.encode(values)
+
+    def pair_ids(self, ruts: Iterable[object], codcarprs: Iterable[object]) -> np.ndarray:
+        """Id sustituto del par (RUT_NORM, CODCARPR_NORM)."""
+        rut = self.rut.encode(ruts).astype(np.int64)
+        carr = self.codcarpr.encode(codcarprs).astype(np.int64)
+        return self.rut_codcarpr.encode((rut << 32) | carr)
+
+    def stats(self) -> dict[str, int]:
+        return {vocab.name: len(vocab) for vocab in (self.rut, self.codcli, self.codcarpr, self.rut_codcarpr)}
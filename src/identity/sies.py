@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .index import KeyVocabulary
+
+SIES_CODE_PATTERN = r"^I(?P<INSTITUCION>\d+)S(?P<COD_SED>\d+)C(?P<COD_CAR>\d+)J(?P<JOR>\d+)V(?P<VERSION>\d+)$"
+SIES_COMPONENTS = ("INSTITUCION", "COD_SED", "COD_CAR", "JOR", "VERSION")
+SIES_BLANK_TOKENS = frozenset({"", "NAN", "NONE", "NULL", "<NA>"})
+
+
+def normalize_sies_codes(values: Iterable[object]) -> pd.Series:
+    """``strip().upper()`` de cada código; NA se conserva."""
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    series = series.astype(object)
+    mask = series.notna()
+    out = pd.Series(pd.NA, index=series.index, dtype=object)
+    out[mask] = series[mask].astype(str).str.strip().str.upper()
+    return out
+
+
+class SiesCodeTable:
+    """Códigos SIES internados: cada código distinto se parsea una sola vez.
+
+    ``intern`` asigna un id ``int32`` por código normalizado y, para los
+    códigos nuevos, extrae (INSTITUCION, COD_SED, COD_CAR, JOR, VERSION) con
+    un único ``str.extract``. Las etapas consultan componentes por id en vez
+    de volver a aplicar la regex fila a fila. Códigos inválidos o vacíos
+    quedan con componentes NA.
+    """
+
+    def __init__(self) -> None:
+        self._vocab = KeyVocabulary("CODIGO_SIES")
+        self._parsed = np.empty((0, len(SIES_COMPONENTS)), dtype=np.int64)
+        self._valid = np.empty(0, dtype=bool)
+        self._parts: dict[str, tuple[int, ...] | None] = {}
+
+    @classmethod
+    def from_codes(cls, *collections: Iterable[object]) -> "SiesCodeTable":
+        table = cls()
+        for values in collections:
+            table.intern(values)
+        return table
+
+    def __len__(self) -> int:
+        return len(self._vocab)
+
+    def intern(self, values: Iterable[object]) -> np.ndarray:
+        ids = self._vocab.encode(normalize_sies_codes(values))
+        pending = len(self._vocab) - len(self._valid)
+        if pending:
+            nuevos = self._vocab.decode(np.arange(len(self._valid), len(self._vocab)))
+            extracted = pd.Series(nuevos, dtype=object).str.extract(SIES_CODE_PATTERN)
+            valid = extracted.notna().all(axis=1).to_numpy()
+            parsed = np.zeros((pending, len(SIES_COMPONENTS)), dtype=np.int64)
+            if valid.any():
+                parsed[valid] = extracted[valid].astype(np.int64).to_numpy()
+            self._parsed = np.vstack([self._parsed, parsed])
+            self._valid = np.concatenate([self._valid, valid])
+        return ids
+
+    def components(self, values: pd.Series) -> pd.DataFrame:
+        """Componentes (``Int64``) alineados al índice de ``values``."""
+        ids = self.intern(values)
+        valid = self._valid[ids]
+        parsed = self._parsed[ids]
+        return pd.DataFrame(
+            {name: pd.arrays.IntegerArray(parsed[:, pos], ~valid) for pos, name in enumerate(SIES_COMPONENTS)},
+            index=values.index,
+        )
+
+    def component(self, values: pd.Series, name: str) -> pd.Series:
+        return self.components(values)[name]
+
+    def parts(self, code: object) -> tuple[int, ...] | None:
+        """Componentes de un código escalar (caché por texto), o ``None`` si es inválido."""
+        key = str(code)
+        if key not in self._parts:
+            (code_id,) = self.intern([code])
+            self._parts[key] = tuple(int(v) for v in self._parsed[code_id]) if self._valid[code_id] else None
+        return self._parts[key]
+
+    def shared_cod_car(self, *columns: pd.Series) -> pd.Series:
+        """COD_CAR común a todos los tokens (``A | B``) de las columnas, por fila.
+
+        NA si la fila no tiene tokens, si algún token no es un código SIES
+        válido o si los tokens apuntan a más de un COD_CAR.
+        """
+        index = columns[0].index
+        position = np.arange(len(index))
+        tokens = []
+        for col in columns:
+            text = normalize_sies_codes(col.set_axis(position)).fillna("")
+            tokens.append(text.str.split("|").explode())
+        token = pd.concat(tokens).str.strip()
+        token = token[~token.isin(SIES_BLANK_TOKENS)]
+        cod_car = self.component(token, "COD_CAR")
+        grouped = cod_car.groupby(level=0)
+        ok = ~cod_car.isna().groupby(level=0).any() & grouped.nunique().eq(1)
+        shared = grouped.first().where(ok).reindex(position)
+        return pd.Series(shared.to_numpy(dtype=object), index=index).astype("Int64")
+
+    def stats(self) -> dict[str, int]:
+        return {"codigos": len(self), "codigos_validos": int(self._valid.sum())}
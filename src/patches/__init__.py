@@ -1,25 +1,43 @@
 """Patch utilities for MU 2026 runtime overrides."""
 
 from .apply_patches import (
+    DEFAULT_PATCH_DIR,
     DEFAULT_RUT_COLUMN_CANDIDATES,
     DEFAULT_SIT_FON_SOL_PATCH_PATH,
     PATCH_AUDIT_STATUS_SIT_FON_SOL,
+    PATCH_COLUMN_RULES,
     PATCH_METHOD_SIT_FON_SOL,
+    PATCH_REPORT_FILENAME,
     PATCH_SOURCE_SIT_FON_SOL,
+    PatchColumnRule,
+    PatchRegistry,
+    PatchSpec,
     apply_sit_fon_sol_patch,
+    discover_patch_files,
     load_json_patch,
     load_json_patch_payload,
+    load_patch_spec,
+    normalize_rut_ids,
     resolve_patch_targets,
 )
 
 __all__ = [
+    "DEFAULT_PATCH_DIR",
     "DEFAULT_RUT_COLUMN_CANDIDATES",
     "DEFAULT_SIT_FON_SOL_PATCH_PATH",
     "PATCH_AUDIT_STATUS_SIT_FON_SOL",
+    "PATCH_COLUMN_RULES",
     "PATCH_METHOD_SIT_FON_SOL",
+    "PATCH_REPORT_FILENAME",
     "PATCH_SOURCE_SIT_FON_SOL",
+    "PatchColumnRule",
+    "PatchRegistry",
+    "PatchSpec",
     "apply_sit_fon_sol_patch",
+    "discover_patch_files",
     "load_json_patch",
     "load_json_patch_payload",
+    "load_patch_spec",
+    "normalize_rut_ids",
     "resolve_patch_targets",
 ]
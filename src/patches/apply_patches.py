@@ -1,25 +1,36 @@
 from __future__ import annotations
 
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Mapping, Sequence
+from typing import Callable, Iterable, Mapping, Sequence
 
+import numpy as np
 import pandas as pd
 
-DEFAULT_SIT_FON_SOL_PATCH_PATH = Path("patches/mu2026/sit_fon_sol_patch_ruts.json")
+DEFAULT_PATCH_DIR = Path("patches/mu2026")
+DEFAULT_SIT_FON_SOL_PATCH_PATH = DEFAULT_PATCH_DIR / "sit_fon_sol_patch_ruts.json"
 DEFAULT_RUT_COLUMN_CANDIDATES = ("RUT", "RUT_NUM", "N_DOC", "NUM_DOCUMENTO", "CODCLI")
 
 PATCH_SOURCE_SIT_FON_SOL = "PATCH_JSON_SIT_FON_SOL_MU2026"
 PATCH_METHOD_SIT_FON_SOL = "OVERRIDE_POR_RUT_LISTADO"
 PATCH_AUDIT_STATUS_SIT_FON_SOL = "PATCH_PROVISORIO_AUDITABLE_APLICADO"
-
-
-def load_json_patch_payload(path: str | Path) -> dict[str, object]:
-    patch_path = Path(path).expanduser().resolve()
-    if not patch_path.exists():
-        raise FileNotFoundError(f"No se encontró patch JSON: {patch_path}")
-
-    payload = json.loads(patch_path.read_text(encoding="utf-8"))
+PATCH_REPORT_FILENAME = "reporte_patches_mu2026.json"
+
+# Llaves de una corrección que no son columnas a parchar.
+PATCH_META_KEYS = frozenset({"rut", "RUT", "motivo", "observacion"})
+# RUT con más dígitos no cabe en int64; se trata como no resoluble.
+_RUT_MAX_DIGITS = 18
+_DV_FACTORS = np.array([2, 3, 4, 5, 6, 7], dtype=np.int64)
+
+
+def load_json_patch_payload(path: str | Path, payload: object | None = None) -> dict[str, object]:
+    """Lee y valida el patch; con ``payload`` (p. ej. del bundle de gobernanza) solo valida."""
+    if payload is None:
+        patch_path = Path(path).expanduser().resolve()
+        if not patch_path.exists():
+            raise FileNotFoundError(f"No se encontró patch JSON: {patch_path}")
+        payload = json.loads(patch_path.read_text(encoding="utf-8"))
     if not isinstance(payload, dict):
         raise ValueError("Patch JSON inválido: se esperaba un objeto raíz")
     if "correcciones" not in payload or not isinstance(payload["correcciones"], list):
@@ -99,32 +110,77 @@ def load_json_patch(path: str | Path) -> dict[str, int]:
     return _extract_patch_map(payload)
 
 
-def _normalize_rut_from_df(value: object, patch_ruts: set[str]) -> str:
-    raw = str(value or "").strip().upper()
-    if not raw or raw in {"NAN", "NONE", "<NA>"}:
-        return ""
+def _digits_to_rut_id(digits: pd.Series) -> pd.Series:
+    valid = digits.str.len().between(1, _RUT_MAX_DIGITS).fillna(False)
+    return pd.to_numeric(digits.where(valid), errors="coerce").astype("Int64")
 
-    if "-" in raw:
-        base_raw = raw.split("-", maxsplit=1)[0]
-        base_digits = _extract_rut_digits(base_raw)
-        if base_digits:
-            return base_digits
 
-    digits = _extract_rut_digits(raw)
-    if not digits:
-        return ""
-    if digits in patch_ruts:
-        return digits
+def _expected_dv_codes(bodies: np.ndarray) -> np.ndarray:
+    """Dígito verificador módulo 11 por cuerpo de RUT (``10`` = K, ``11`` → ``0``)."""
+    rest = bodies.astype(np.int64, copy=True)
+    total = np.zeros(len(rest), dtype=np.int64)
+    for idx in range(_RUT_MAX_DIGITS):
+        total += (rest % 10) * _DV_FACTORS[idx % len(_DV_FACTORS)]
+        rest //= 10
+    dv = 11 - (total % 11)
+    return np.where(dv == 11, 0, dv)
+
+
+def normalize_rut_ids(values: pd.Series, patch_ids: Iterable[int]) -> pd.Series:
+    """Normaliza una columna de RUT a id entero (``Int64``) de forma vectorizada.
+
+    ``"12345678-5"`` → cuerpo antes del guion; texto con puntos → solo dígitos;
+    ``"123456785"`` (RUT + DV concatenado) → se quita el DV solo si es válido y
+    el cuerpo está en ``patch_ids``. Vacíos y ``NAN``/``NONE`` quedan como NA.
+    """
+    ids = np.asarray(sorted({int(v) for v in patch_ids}), dtype=np.int64)
+    raw = values.astype("string").str.strip().str.upper()
+    raw = raw.mask(raw.isin(["", "NAN", "NONE", "<NA>"]))
+    digits = raw.str.replace(r"\D", "", regex=True)
+    base_digits = raw.str.split("-", n=1).str[0].str.replace(r"\D", "", regex=True)
+    by_hyphen = raw.str.contains("-", regex=False).fillna(False) & base_digits.str.len().gt(0).fillna(False)
+
+    out = _digits_to_rut_id(digits)
+    out = out.mask(by_hyphen, _digits_to_rut_id(base_digits))
+
+    candidates = (~by_hyphen & out.notna() & ~out.isin(ids) & digits.str.len().ge(2).fillna(False)).to_numpy(dtype=bool)
+    if candidates.any() and len(ids):
+        full = out.to_numpy(dtype=np.int64, na_value=0)
+        bodies = full // 10
+        strip = candidates & np.isin(bodies, ids)
+        if strip.any():
+            strip[strip] = _expected_dv_codes(bodies[strip]) == full[strip] % 10
+            out = out.mask(pd.Series(strip, index=out.index), pd.Series(bodies, index=out.index).astype("Int64"))
+    return out
+
+
+def _resolve_rut_ids(
+    df: pd.DataFrame,
+    patch_ids: Iterable[int],
+    rut_columns_candidates: Sequence[str],
+) -> tuple[pd.Series, str, dict[str, int]]:
+    """Elige la columna de RUT con más coincidencias y devuelve sus ids normalizados."""
+    ids = np.asarray(sorted({int(v) for v in patch_ids}), dtype=np.int64)
+    existing_candidates = [col for col in rut_columns_candidates if col in df.columns]
+    if not existing_candidates:
+        raise ValueError(
+            "No se encontró columna compatible de RUT. "
+            f"Candidatas evaluadas: {list(rut_columns_candidates)}"
+        )
+
+    matches_by_column: dict[str, int] = {}
+    ids_by_column: dict[str, pd.Series] = {}
+    for col in existing_candidates:
+        col_ids = normalize_rut_ids(df[col], ids)
+        ids_by_column[col] = col_ids
+        matches_by_column[col] = int(col_ids.isin(ids).sum())
 
-    # Caso tipo "80747268" (RUT + DV concatenado): remover DV solo si
-    # coincide con dígito verificador válido y ese RUT existe en el patch.
-    if len(digits) >= 2:
-        candidate_body = digits[:-1]
-        candidate_dv = digits[-1]
-        if candidate_body and _expected_dv_for_rut_body(candidate_body) == candidate_dv and candidate_body in patch_ruts:
-            return candidate_body
+    selected_column = max(existing_candidates, key=lambda col: (matches_by_column[col], -existing_candidates.index(col)))
+    return ids_by_column[selected_column], selected_column, matches_by_column
 
-    return digits
+
+def _rut_ids_as_text(rut_ids: pd.Series) -> pd.Series:
+    return rut_ids.astype("string").fillna("").astype("object")
 
 
 def resolve_patch_targets(
@@ -141,29 +197,304 @@ def resolve_patch_targets(
         empty_mask = pd.Series(False, index=df.index)
         return empty_series, empty_mask, "", {}, [], []
 
-    existing_candidates = [col for col in rut_columns_candidates if col in df.columns]
-    if not existing_candidates:
-        raise ValueError(
-            "No se encontró columna compatible de RUT. "
-            f"Candidatas evaluadas: {list(rut_columns_candidates)}"
-        )
-
-    matches_by_column: dict[str, int] = {}
-    normalized_by_column: dict[str, pd.Series] = {}
-    for col in existing_candidates:
-        norm_col = df[col].map(lambda value: _normalize_rut_from_df(value, patch_ruts)).astype("object")
-        normalized_by_column[col] = norm_col
-        matches_by_column[col] = int(norm_col.isin(patch_ruts).sum())
+    patch_ids = {int(rut) for rut in patch_ruts}
+    rut_ids, selected_column, matches_by_column = _resolve_rut_ids(df, patch_ids, rut_columns_candidates)
+    target_mask = rut_ids.isin(patch_ids).fillna(False).astype(bool)
+    selected_rut_series = _rut_ids_as_text(rut_ids)
 
-    selected_column = max(existing_candidates, key=lambda col: (matches_by_column[col], -existing_candidates.index(col)))
-    selected_rut_series = normalized_by_column[selected_column]
-    target_mask = selected_rut_series.isin(patch_ruts)
-
-    matched_ruts = sorted(set(selected_rut_series[target_mask].astype(str)))
+    matched_ruts = sorted(set(selected_rut_series[target_mask]))
     missing_patch_ruts = sorted(patch_ruts - set(matched_ruts))
     return selected_rut_series, target_mask, selected_column, matches_by_column, matched_ruts, missing_patch_ruts
 
 
+# ==============================
+# REGISTRO DE PATCHES (un join y una pasada para todos los JSON)
+# ==============================
+@dataclass(frozen=True)
+class PatchColumnRule:
+    """Columna parchable: catálogo de valores válidos y etiquetas de trazabilidad."""
+
+    column: str
+    allowed_values: frozenset[int]
+    source: str
+    method: str
+    audit_status: str
+
+
+PATCH_COLUMN_RULES: dict[str, PatchColumnRule] = {
+    "SIT_FON_SOL": PatchColumnRule(
+        column="SIT_FON_SOL",
+        allowed_values=frozenset({0, 1, 2}),
+        source=PATCH_SOURCE_SIT_FON_SOL,
+        method=PATCH_METHOD_SIT_FON_SOL,
+        audit_status=PATCH_AUDIT_STATUS_SIT_FON_SOL,
+    ),
+}
+
+
+@dataclass
+class PatchSpec:
+    """Un patch JSON validado: metadatos y correcciones en formato largo (RUT, COLUMNA, VALOR)."""
+
+    path: Path
+    payload: dict[str, object]
+    updates: pd.DataFrame
+
+    @property
+    def name(self) -> str:
+        return self.path.stem
+
+    @property
+    def columns(self) -> list[str]:
+        return list(dict.fromkeys(self.updates["COLUMNA"]))
+
+    @property
+    def rut_ids(self) -> np.ndarray:
+        return np.unique(self.updates["RUT"].to_numpy(dtype=np.int64))
+
+
+def load_patch_spec(
+    path: str | Path,
+    rules: Mapping[str, PatchColumnRule] = PATCH_COLUMN_RULES,
+    payload: object | None = None,
+) -> PatchSpec:
+    """Carga un patch JSON y valida cada corrección contra el registro de columnas."""
+    payload = load_json_patch_payload(path, payload)
+    rows: list[tuple[int, str, int]] = []
+    seen: dict[tuple[int, str], int] = {}
+    for idx, item in enumerate(payload["correcciones"], start=1):
+        if not isinstance(item, Mapping):
+            raise ValueError(f"Patch JSON inválido: corrección #{idx} no es objeto")
+        rut_raw = item.get("rut", item.get("RUT"))
+        if rut_raw is None:
+            raise ValueError(f"Patch JSON inválido: corrección #{idx} sin campo 'rut'")
+        rut_id = int(_normalize_patch_rut(rut_raw))
+
+        columns = [key for key in item if key not in PATCH_META_KEYS]
+        if not columns:
+            raise ValueError(f"Patch JSON inválido: corrección #{idx} sin columnas a parchar")
+        for col in columns:
+            rule = rules.get(col)
+            if rule is None:
+                raise ValueError(
+                    f"Patch JSON inválido: columna '{col}' no registrada en corrección #{idx} "
+                    f"(registradas: {sorted(rules)})"
+                )
+            try:
+                value = int(str(item[col]).strip())
+            except ValueError as exc:
+                raise ValueError(f"Patch JSON inválido: {col} no numérico en corrección #{idx}: {item[col]!r}") from exc
+            if value not in rule.allowed_values:
+                raise ValueError(
+                    f"Patch JSON inválido: {col} fuera de catálogo "
+                    f"{'/'.join(str(v) for v in sorted(rule.allowed_values))} en corrección #{idx}: {value}"
+                )
+            key = (rut_id, col)
+            if key in seen and seen[key] != value:
+                raise ValueError(
+                    f"Patch JSON inválido: RUT {rut_id} tiene valores {col} conflictivos ({seen[key]} vs {value})"
+                )
+            if key not in seen:
+                seen[key] = value
+                rows.append((rut_id, col, value))
+
+    updates = pd.DataFrame(rows, columns=["RUT", "COLUMNA", "VALOR"]).astype({"RUT": "int64", "VALOR": "int64"})
+    return PatchSpec(path=Path(path).expanduser().resolve(), payload=payload, updates=updates)
+
+
+def discover_patch_files(patch_dir: str | Path) -> list[Path]:
+    """Patch JSON del directorio en orden estable (ignora respaldos ``*.json.bak.*``)."""
+    root = Path(patch_dir).expanduser()
+    if not root.is_dir():
+        return []
+    return sorted(p for p in root.glob("*.json") if p.is_file())
+
+
+def _distribution(values: pd.Series) -> dict[str, int]:
+    counts = values.astype("string").fillna("<NA>").value_counts(dropna=False).to_dict()
+    return {str(k): int(v) for k, v in counts.items()}
+
+
+@dataclass
+class PatchRegistry:
+    """Conjunto de patches que se resuelve con un único join por RUT y se aplica en una pasada.
+
+    Cada par (RUT, columna) pertenece a un solo patch: si dos patches asignan
+    valores distintos al mismo par se rechaza el registro completo.
+    """
+
+    specs: list[PatchSpec] = field(default_factory=list)
+    rules: Mapping[str, PatchColumnRule] = field(default_factory=lambda: PATCH_COLUMN_RULES)
+
+    @classmethod
+    def from_paths(
+        cls,
+        paths: Iterable[str | Path],
+        rules: Mapping[str, PatchColumnRule] = PATCH_COLUMN_RULES,
+        documents: Callable[[Path], object | None] | None = None,
+    ) -> "PatchRegistry":
+        """``documents`` entrega el JSON ya parseado por ruta (bundle); si devuelve None se lee el archivo."""
+        unique = list(dict.fromkeys(Path(p).expanduser().resolve() for p in paths))
+        return cls(
+            specs=[load_patch_spec(p, rules, documents(p) if documents else None) for p in unique],
+            rules=rules,
+        )
+
+    @classmethod
+    def from_dir(
+        cls,
+        patch_dir: str | Path = DEFAULT_PATCH_DIR,
+        rules: Mapping[str, PatchColumnRule] = PATCH_COLUMN_RULES,
+    ) -> "PatchRegistry":
+        return cls.from_paths(discover_patch_files(patch_dir), rules)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def spec_for_column(self, column: str) -> PatchSpec | None:
+        return next((spec for spec in self.specs if column in spec.columns), None)
+
+    def updates(self) -> pd.DataFrame:
+        """Correcciones de todos los patches en formato largo, con el patch de origen."""
+        frames = [spec.updates.assign(PATCH=idx) for idx, spec in enumerate(self.specs)]
+        if not frames:
+            return pd.DataFrame({"RUT": pd.Series(dtype="int64"), "COLUMNA": [], "VALOR": pd.Series(dtype="int64"), "PATCH": pd.Series(dtype="int64")})
+        long = pd.concat(frames, ignore_index=True)
+        n_valores = long.groupby(["RUT", "COLUMNA"], sort=False)["VALOR"].nunique()
+        conflictos = n_valores[n_valores.gt(1)]
+        if not conflictos.empty:
+            (rut, col) = conflictos.index[0]
+            origen = sorted(self.specs[i].name for i in long.loc[long["RUT"].eq(rut) & long["COLUMNA"].eq(col), "PATCH"].unique())
+            raise ValueError(
+                f"Patches en conflicto: RUT {rut} recibe valores {col} distintos en {origen} "
+                f"({len(conflictos)} pares RUT/columna en conflicto)"
+            )
+        return long.drop_duplicates(["RUT", "COLUMNA"], keep="first").reset_index(drop=True)
+
+    def apply(
+        self,
+        df: pd.DataFrame,
+        rut_columns_candidates: Sequence[str] = DEFAULT_RUT_COLUMN_CANDIDATES,
+        trace: bool = True,
+    ) -> tuple[pd.DataFrame, dict[str, object]]:
+        """Aplica todos los patches: un join por RUT entero y una asignación por columna.
+
+        Con ``trace=True`` escribe por columna ``<COL>_PATCH_FLAG`` (``SI``/``NO``),
+        ``<COL>_PATCH_RUT`` y, en filas objetivo, ``<COL>_FUENTE_FINAL``,
+        ``<COL>_METODO_FINAL`` y ``<COL>_AUDIT_STATUS``. Devuelve el frame y un
+        reporte combinado con las estadísticas por patch en ``patches``.
+        """
+        long = self.updates()
+        columns = list(dict.fromkeys(long["COLUMNA"]))
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"No existe columna objetivo {missing} para aplicar patches")
+
+        out = df.copy()
+        if trace:
+            for col in self.rules:
+                if col in out.columns:
+                    out[f"{col}_PATCH_FLAG"] = "NO"
+                    out[f"{col}_PATCH_RUT"] = pd.NA
+
+        report: dict[str, object] = {
+            "n_patches": len(self.specs),
+            "patch_paths": [str(spec.path) for spec in self.specs],
+            "columnas": columns,
+            "n_rut_total": int(long["RUT"].nunique()),
+            "n_rows_total": int(len(out)),
+            "rut_column_selected": "",
+            "rut_matches_by_column": {},
+            "n_rows_targeted": 0,
+            "n_rows_affected": 0,
+            "patches": [],
+        }
+        if long.empty:
+            return out, report
+
+        rut_ids, selected_column, matches_by_column = _resolve_rut_ids(out, long["RUT"].unique(), rut_columns_candidates)
+        rut_text = _rut_ids_as_text(rut_ids)
+        # Join único: cada fila ubica su RUT en la tabla ancha de correcciones.
+        wide_values = long.pivot(index="RUT", columns="COLUMNA", values="VALOR")
+        wide_patch = long.pivot(index="RUT", columns="COLUMNA", values="PATCH")
+        pos = wide_values.index.get_indexer(rut_ids.fillna(-1).to_numpy(dtype=np.int64))
+        row_has_patch = pos >= 0
+        safe_pos = np.where(row_has_patch, pos, 0)
+
+        targeted_any = np.zeros(len(out), dtype=bool)
+        affected_any = np.zeros(len(out), dtype=bool)
+        per_patch_targeted = np.zeros((len(self.specs), len(out)), dtype=bool)
+        per_patch_affected = np.zeros((len(self.specs), len(out)), dtype=bool)
+        distributions: dict[tuple[int, str], tuple[dict[str, int], dict[str, int]]] = {}
+        for col in columns:
+            col_values = wide_values[col].to_numpy()[safe_pos]
+            col_patch = wide_patch[col].to_numpy()[safe_pos]
+            mask = row_has_patch & ~pd.isna(col_values)
+            mask_s = pd.Series(mask, index=out.index)
+
+            current = pd.to_numeric(out[col], errors="coerce").astype("Int64")
+            new_values = pd.Series(col_values, index=out.index).where(mask_s)
+            updated = current.mask(mask_s, pd.to_numeric(new_values, errors="coerce").astype("Int64"))
+            changed = (mask_s & current.ne(updated).fillna(False)).to_numpy()
+            out[col] = updated
+
+            rule = self.rules[col]
+            if trace:
+                out.loc[mask_s, f"{col}_FUENTE_FINAL"] = rule.source
+                out.loc[mask_s, f"{col}_METODO_FINAL"] = rule.method
+                out.loc[mask_s, f"{col}_AUDIT_STATUS"] = rule.audit_status
+                out.loc[mask_s, f"{col}_PATCH_FLAG"] = "SI"
+                out.loc[mask_s, f"{col}_PATCH_RUT"] = rut_text[mask_s]
+
+            targeted_any |= mask
+            affected_any |= changed
+            for idx in range(len(self.specs)):
+                owned = mask & (col_patch == idx)
+                if not owned.any():
+                    distributions[(idx, col)] = ({}, {})
+                    continue
+                per_patch_targeted[idx] |= owned
+                per_patch_affected[idx] |= changed & owned
+                distributions[(idx, col)] = (
+                    _distribution(current[owned]),
+                    _distribution(updated[owned]),
+                )
+
+        for idx, spec in enumerate(self.specs):
+            patch_ruts = {str(rut) for rut in spec.rut_ids}
+            matched = sorted(set(rut_text[per_patch_targeted[idx]]))
+            missing_ruts = sorted(patch_ruts - set(matched))
+            stats: dict[str, object] = {
+                "patch_name": spec.name,
+                "patch_path": str(spec.path),
+                "patch_estado": str(spec.payload.get("estado", "")),
+                "patch_proposito": str(spec.payload.get("proposito", "")),
+                "patch_regla_normativa": str(spec.payload.get("regla_normativa", "")),
+                "columnas": spec.columns,
+                "n_rut_patch": int(len(patch_ruts)),
+                "rut_column_selected": selected_column,
+                "rut_columns_evaluated": list(matches_by_column.keys()),
+                "rut_matches_by_column": matches_by_column,
+                "n_rows_total": int(len(out)),
+                "n_rows_targeted": int(per_patch_targeted[idx].sum()),
+                "n_rows_affected": int(per_patch_affected[idx].sum()),
+                "n_rut_matched": int(len(matched)),
+                "n_rut_missing": int(len(missing_ruts)),
+                "rut_missing_sample": missing_ruts[:20],
+            }
+            for col in spec.columns:
+                before, after = distributions[(idx, col)]
+                stats[f"{col.lower()}_distribution_before_target"] = before
+                stats[f"{col.lower()}_distribution_after_target"] = after
+            report["patches"].append(stats)
+
+        report["rut_column_selected"] = selected_column
+        report["rut_matches_by_column"] = matches_by_column
+        report["n_rows_targeted"] = int(targeted_any.sum())
+        report["n_rows_affected"] = int(affected_any.sum())
+        return out, report
+
+
 def apply_sit_fon_sol_patch(
     df: pd.DataFrame,
     patch_path: str | Path,
@@ -173,46 +504,8 @@ def apply_sit_fon_sol_patch(
     if target_col not in df.columns:
         raise ValueError(f"No existe columna objetivo '{target_col}' para aplicar patch SIT_FON_SOL")
 
-    patch_payload = load_json_patch_payload(patch_path)
-    patch_map = _extract_patch_map(patch_payload)
-
-    out = df.copy()
-
-    rut_series, target_mask, selected_column, matches_by_column, matched_ruts, missing_patch_ruts = resolve_patch_targets(
-        out,
-        patch_map,
-        rut_columns_candidates=rut_columns_candidates,
-    )
-
-    out[target_col] = pd.to_numeric(out[target_col], errors="coerce").astype("Int64")
-    before_target = out.loc[target_mask, target_col].astype("Int64")
-    before_distribution = before_target.astype("string").fillna("<NA>").value_counts(dropna=False).to_dict()
-
-    new_values = rut_series.map(patch_map)
-    out.loc[target_mask, target_col] = pd.to_numeric(new_values[target_mask], errors="coerce").astype("Int64")
-    after_target = out.loc[target_mask, target_col].astype("Int64")
-    after_distribution = after_target.astype("string").fillna("<NA>").value_counts(dropna=False).to_dict()
-
-    rows_affected_mask = target_mask & (before_target.reindex(out.index).astype("Int64") != out[target_col]).fillna(False)
-    rows_affected = int(rows_affected_mask.sum())
-
-    stats: dict[str, object] = {
-        "patch_path": str(Path(patch_path).expanduser().resolve()),
-        "patch_estado": str(patch_payload.get("estado", "")),
-        "patch_proposito": str(patch_payload.get("proposito", "")),
-        "patch_regla_normativa": str(patch_payload.get("regla_normativa", "")),
-        "n_rut_patch": int(len(patch_map)),
-        "rut_column_selected": selected_column,
-        "rut_columns_evaluated": list(matches_by_column.keys()),
-        "rut_matches_by_column": matches_by_column,
-        "n_rows_total": int(len(out)),
-        "n_rows_targeted": int(target_mask.sum()),
-        "n_rows_affected": rows_affected,
-        "n_rut_matched": int(len(matched_ruts)),
-        "n_rut_missing": int(len(missing_patch_ruts)),
-        "rut_missing_sample": missing_patch_ruts[:20],
-        "sit_fon_sol_distribution_before_target": {str(k): int(v) for k, v in before_distribution.items()},
-        "sit_fon_sol_distribution_after_target": {str(k): int(v) for k, v in after_distribution.items()},
-    }
-
-    return out, stats
+    spec = load_patch_spec(patch_path)
+    spec.updates["COLUMNA"] = target_col
+    registry = PatchRegistry([spec], rules={target_col: PATCH_COLUMN_RULES["SIT_FON_SOL"]})
+    out, report = registry.apply(df, rut_columns_candidates=rut_columns_candidates, trace=False)
+    return out, report["patches"][0]
@@ -0,0 +1,31 @@
+"""Perf telemetry utilities for MU 2026 pipeline runs."""
+
+from .telemetry import (
+    DEFAULT_PERF_PROFILE_FILENAME,
+    PERF_PROFILE_ENV,
+    PERF_TRACEMALLOC_ENV,
+    PerfProfiler,
+    StageRecord,
+    StageSequence,
+    activate_profiler,
+    current_profiler,
+    deactivate_profiler,
+    perf_profile_enabled,
+    perf_sequence,
+    perf_stage,
+)
+
+__all__ = [
+    "DEFAULT_PERF_PROFILE_FILENAME",
+    "PERF_PROFILE_ENV",
+    "PERF_TRACEMALLOC_ENV",
+    "PerfProfiler",
+    "StageRecord",
+    "StageSequence",
+    "activate_profiler",
+    "current_profiler",
+    "deactivate_profiler",
+    "perf_profile_enabled",
+    "perf_sequence",
+    "perf_stage",
+]
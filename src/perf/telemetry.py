@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from src.export.atomic import atomic_write_json
+
+try:  # pragma: no cover - no disponible en Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+DEFAULT_PERF_PROFILE_FILENAME = "perf_profile.json"
+PERF_TRACEMALLOC_ENV = "MU_PERF_TRACEMALLOC"
+PERF_PROFILE_ENV = "MU_PERF_PROFILE"
+
+
+def perf_profile_enabled() -> bool:
+    """Perfil activo salvo ``MU_PERF_PROFILE=0`` (para scripts sin ``--sin-perf-profile``)."""
+    return os.environ.get(PERF_PROFILE_ENV, "").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _current_rss_mb() -> float | None:
+    """RSS actual del proceso (Linux: /proc/self/statm)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            pages = int(fh.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 2)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _peak_rss_mb() -> float | None:
+    """RSS máximo del proceso desde su inicio (ru_maxrss)."""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB; macOS reporta bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(maxrss / divisor, 2)
+
+
+@dataclass
+class StageRecord:
+    """Métricas de una etapa lógica del pipeline."""
+
+    name: str
+    wall_s: float
+    cpu_s: float
+    rows_in: int | None = None
+    rows_out: int | None = None
+    rss_mb: float | None = None
+    rss_delta_mb: float | None = None
+    rss_peak_mb: float | None = None
+    py_alloc_peak_mb: float | None = None
+    wall_s_prev: float | None = None
+
+    @property
+    def rows_dropped(self) -> int | None:
+        if self.rows_in is None or self.rows_out is None:
+            return None
+        return self.rows_in - self.rows_out
+
+
+class _Snapshot:
+    __slots__ = ("wall", "cpu", "rss")
+
+    def __init__(self) -> None:
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.rss = _current_rss_mb()
+
+
+class StageSequence:
+    """Cronómetro secuencial: cada ``lap`` cierra la etapa abierta y abre la siguiente.
+
+    Pensado para funciones largas (p.ej. el pipeline MU) donde envolver cada
+    bloque en ``with`` obligaría a re-indentar cientos de líneas. ``rows_in``
+    de cada etapa es el ``rows_out`` de la anterior, lo que deja el embudo de
+    filas (cuántos alumnos caen en cada filtro) directamente en el perfil.
+    """
+
+    def __init__(self, profiler: "PerfProfiler", prefix: str, rows_in: int | None = None) -> None:
+        self._profiler = profiler
+        self._prefix = prefix
+        self._rows = rows_in
+        self._start = profiler._begin()
+
+    def lap(self, name: str, rows_out: int | None = None) -> StageRecord | None:
+        record = self._profiler._end(f"{self._prefix}.{name}", self._start, self._rows, rows_out)
+        if rows_out is not None:
+            self._rows = rows_out
+        self._start = self._profiler._begin()
+        return record
+
+
+class PerfProfiler:
+    """Telemetría liviana por etapa: tiempo de pared, CPU, memoria y filas.
+
+    La medición con ``tracemalloc`` es opcional (``MU_PERF_TRACEMALLOC=1``)
+    porque su sobrecosto en pandas no es despreciable; RSS se mide siempre.
+    """
+
+    def __init__(self, run_name: str = "pipeline", use_tracemalloc: bool | None = None, enabled: bool = True) -> None:
+        self.run_name = run_name
+        self.enabled = enabled
+        if use_tracemalloc is None:
+            use_tracemalloc = os.environ.get(PERF_TRACEMALLOC_ENV, "").strip() in {"1", "true", "TRUE", "si", "SI"}
+        self.use_tracemalloc = bool(use_tracemalloc) and enabled
+        self.records: list[StageRecord] = []
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        if self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    # ── medición ────────────────────────────────────────────────────────
+    def _begin(self) -> _Snapshot | None:
+        if not self.enabled:
+            return None
+        if self.use_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        return _Snapshot()
+
+    def _end(
+        self,
+        name: str,
+        start: _Snapshot | None,
+        rows_in: int | None,
+        rows_out: int | None,
+    ) -> StageRecord | None:
+        if not self.enabled or start is None:
+            return None
+        end = _Snapshot()
+        py_peak = None
+        if self.use_tracemalloc and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            py_peak = round(peak / (1024 * 1024), 2)
+        rss_delta = None
+        if start.rss is not None and end.rss is not None:
+            rss_delta = round(end.rss - start.rss, 2)
+        record = StageRecord(
+            name=name,
+            wall_s=round(end.wall - start.wall, 4),
+            cpu_s=round(end.cpu - start.cpu, 4),
+            rows_in=None if rows_in is None else int(rows_in),
+            rows_out=None if rows_out is None else int(rows_out),
+            rss_mb=end.rss,
+            rss_delta_mb=rss_delta,
+            rss_peak_mb=_peak_rss_mb(),
+            py_alloc_peak_mb=py_peak,
+        )
+        self.records.append(record)
+        return record
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int | None = None) -> Iterator[dict[str, int | None]]:
+        """Mide un bloque. El llamador puede fijar ``ctx["rows_out"]`` dentro del ``with``."""
+        ctx: dict[str, int | None] = {"rows_out": None}
+        start = self._begin()
+        try:
+            yield ctx
+        finally:
+            self._end(name, start, rows_in, ctx.get("rows_out"))
+
+    def sequence(self, prefix: str, rows_in: int | None = None) -> StageSequence:
+        return StageSequence(self, prefix, rows_in=rows_in)
+
+    # ── salida ──────────────────────────────────────────────────────────
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "run": self.run_name,
+            "started_at": self.started_at,
+            "total_wall_s": round(time.perf_counter() - self._t0, 4),
+            "total_cpu_s": round(time.process_time() - self._cpu0, 4),
+            "rss_peak_mb": _peak_rss_mb(),
+            "tracemalloc": self.use_tracemalloc,
+            "stages": [{**asdict(r), "rows_dropped": r.rows_dropped} for r in self.records],
+        }
+
+    def _attach_previous(self, path: Path) -> None:
+        """Anota ``wall_s_prev`` desde un perfil previo para detectar regresiones."""
+        if not path.exists():
+            return
+        try:
+            previous = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        prev_by_name = {
+            str(s.get("name")): s.get("wall_s")
+            for s in previous.get("stages", [])
+            if isinstance(s, dict)
+        }
+        for record in self.records:
+            prev = prev_by_name.get(record.name)
+            if isinstance(prev, (int, float)):
+                record.wall_s_prev = float(prev)
+
+    def write_json(self, path: Path) -> Path:
+        path = Path(path)
+        self._attach_previous(path)
+        return atomic_write_json(path, self.to_dict())
+
+    def summary_lines(self) -> list[str]:
+        header = f"{'ETAPA':<48} {'WALL_S':>9} {'CPU_S':>9} {'Δ_PREV':>8} {'FILAS_IN':>9} {'FILAS_OUT':>9} {'RSS_MB':>9}"
+        lines = [header, "-" * len(header)]
+        for r in self.records:
+            delta_prev = ""
+            if r.wall_s_prev:
+                delta_prev = f"{(r.wall_s - r.wall_s_prev) / r.wall_s_prev * 100:+.0f}%"
+            lines.append(
+                f"{r.name[:48]:<48} {r.wall_s:>9.3f} {r.cpu_s:>9.3f} {delta_prev:>8} "
+                f"{'' if r.rows_in is None else r.rows_in:>9} {'' if r.rows_out is None else r.rows_out:>9} "
+                f"{'' if r.rss_mb is None else r.rss_mb:>9}"
+            )
+        total = self.to_dict()
+        lines.append("-" * len(header))
+        lines.append(
+            f"{'TOTAL ' + self.run_name:<48} {total['total_wall_s']:>9.3f} {total['total_cpu_s']:>9.3f} "
+            f"{'':>8} {'':>9} {'':>9} {'' if total['rss_peak_mb'] is None else total['rss_peak_mb']:>9}"
+        )
+        return lines
+
+    def print_summary(self) -> None:
+        if not self.enabled or not self.records:
+            return
+        print(f"\n⏱️  Perfil de rendimiento ({self.run_name}):")
+        for line in self.summary_lines():
+            print(f"  {line}")
+
+
+# ── perfil activo del proceso ───────────────────────────────────────────
+# Las etapas instrumentadas registran en el perfil activo; si nadie lo activó,
+# se usa uno deshabilitado y la instrumentación no cuesta nada.
+_DISABLED = PerfProfiler("disabled", use_tracemalloc=False, enabled=False)
+_ACTIVE: PerfProfiler = _DISABLED
+
+
+def activate_profiler(profiler: PerfProfiler) -> PerfProfiler:
+    global _ACTIVE
+    _ACTIVE = profiler
+    return profiler
+
+
+def deactivate_profiler() -> None:
+    global _ACTIVE
+    if _ACTIVE.use_tracemalloc and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _ACTIVE = _DISABLED
+
+
+def current_profiler() -> PerfProfiler:
+    return _ACTIVE
+
+
+def perf_stage(name: str, rows_in: int | None = None):
+    """Atajo: ``with perf_stage("x") as ctx: ...`` sobre el perfil activo."""
+    return _ACTIVE.stage(name, rows_in=rows_in)
+
+
+def perf_sequence(prefix: str, rows_in: int | None = None) -> StageSequence:
+    return _ACTIVE.sequence(prefix, rows_in=rows_in)
@@ -0,0 +1,11 @@
+"""Long-format trace store for MU 2026 audit columns."""
+
+from .store import (
+    TRACE_LONG_COLUMNS,
+    TraceStore,
+)
+
+__all__ = [
+    "TRACE_LONG_COLUMNS",
+    "TraceStore",
+]
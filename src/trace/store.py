@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from src.export import atomic_write, compressed_path
+
+TRACE_LONG_COLUMNS = ("ROW_ID", "CODCLI", "ETAPA", "CAMPO", "VALOR")
+DEFAULT_CHUNK_ROWS = 250
+
+
+class TraceStore:
+    """Columnas de trazabilidad apartadas del frame operativo.
+
+    ``detach`` retira del frame ancho todo lo que no está en ``keep`` y lo
+    guarda por etapa, indexado igual que el frame original; puede llamarse
+    al cierre de cada etapa, pero una columna apartada no puede volver a
+    escribirse en el frame (se rechaza en vez de duplicarla). Las etapas
+    siguientes trabajan sobre el frame angosto; la hoja ancha solo se
+    reconstruye con ``materialize`` cuando el xlsx la pide, respetando el
+    orden original de columnas. ``to_long`` entrega la misma traza en formato
+    (ROW_ID, CODCLI, ETAPA, CAMPO, VALOR), omitiendo celdas vacías.
+    """
+
+    def __init__(self, key_column: str = "CODCLI") -> None:
+        self.key_column = key_column
+        self._blocks: dict[str, pd.DataFrame] = {}
+        self._order: list[str] = []
+        self._keys: pd.Series | None = None
+
+    @property
+    def columns(self) -> list[str]:
+        return [c for block in self._blocks.values() for c in block.columns]
+
+    def detach(self, df: pd.DataFrame, stage: str, keep: Iterable[str]) -> pd.DataFrame:
+        if stage in self._blocks:
+            raise ValueError(f"Etapa de traza duplicada: {stage!r}")
+        keep_set = set(keep)
+        trace_cols = [c for c in df.columns if c not in keep_set]
+        recreadas = [c for c in trace_cols if c in set(self.columns)]
+        if recreadas:
+            raise ValueError(f"Columnas de traza re-creadas después de apartarse: {recreadas}")
+        if not self._order:
+            self._order = list(df.columns)
+        else:
+            self._order += [c for c in df.columns if c not in self._order]
+        if self._keys is None and self.key_column in df.columns:
+            self._keys = df[self.key_column]
+        self._blocks[stage] = df[trace_cols]
+        return df.drop(columns=trace_cols)
+
+    def materialize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Frame ancho: columnas vigentes de ``df`` + trazas, en el orden original."""
+        if not self._blocks:
+            return df
+        duplicadas = [c for c in df.columns if c in set(self.columns)]
+        if duplicadas:
+            raise ValueError(f"Columnas presentes en el frame y en la traza apartada: {duplicadas}")
+        parts = [df] + [block.reindex(df.index) for block in self._blocks.values()]
+        wide = pd.concat(parts, axis=1)
+        order = [c for c in self._order if c in wide.columns]
+        order += [c for c in df.columns if c not in self._order]
+        return wide[order]
+
+    def iter_long(self, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """Traza larga por bloques de filas (memoria acotada por bloque)."""
+        for stage, block in self._blocks.items():
+            if not len(block.columns):
+                continue
+            campos = block.columns.to_numpy(dtype=object)
+            keys = (
+                self._keys.reindex(block.index).to_numpy(dtype=object)
+                if self._keys is not None
+                else np.full(len(block), None, dtype=object)
+            )
+            row_ids = block.index.to_numpy()
+            for start in range(0, len(block), chunk_rows):
+                stop = start + chunk_rows
+                values = block.iloc[start:stop].astype(object).to_numpy()
+                filled = ~pd.isna(values)
+                filled[filled] = values[filled] != ""
+                row_pos, col_pos = np.nonzero(filled)
+                yield pd.DataFrame({
+                    "ROW_ID": row_ids[start:stop][row_pos],
+                    "CODCLI": keys[start:stop][row_pos],
+                    "ETAPA": stage,
+                    "CAMPO": campos[col_pos],
+                    "VALOR": values[row_pos, col_pos],
+                })
+
+    def to_long(self) -> pd.DataFrame:
+        frames = list(self.iter_long())
+        if not frames:
+            return pd.DataFrame(columns=list(TRACE_LONG_COLUMNS))
+        return pd.concat(frames, ignore_index=True)
+
+    def write(self, path: Path, compression: str | None = None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Path:
+        """Escribe la traza larga (TSV, compresión opcional) en forma atómica y por bloques."""
+        final_path = compressed_path(path, compression)
+        with atomic_write(final_path, "w", newline="", compression=compression) as fh:
+            fh.write("\t".join(TRACE_LONG_COLUMNS) + "\n")
+            for frame in self.iter_long(chunk_rows):
+                frame.to_csv(fh, sep="\t", index=False, header=False)
+        return final_path
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "etapas": {stage: len(block.columns) for stage, block in self._blocks.items()},
+            "columnas_apartadas": len(self.columns),
+        }
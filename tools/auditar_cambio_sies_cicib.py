@@ -4,19 +4,25 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 import unicodedata
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-RULES = {
-    ("INGENIERIA EN CIBERSEGURIDAD", "D"): ("I162S2C46J1V1", "A"),
-    ("INGENIERIA EN CIBERSEGURIDAD", "V"): ("I162S2C46J2V1", "B"),
-    ("CONTINUIDAD INGENIERIA CIBERSEGURIDAD", "V"): ("I162S2C46J2V3", "C"),
-    ("CONTINUIDAD INGENIERIA CIBERSEGURIDAD", "O"): ("I162S2C46J4V1", "D"),
-    ("INGENIERIA EN CIBERSEGURIDAD", "O"): ("I162S2C46J4V3", "E"),
-}
+from src.export import parquet_engine_available  # noqa: E402
+
+DEFAULT_REGLAS_PATH = ROOT / "control" / "reglas_cambio_sies.tsv"
+REGLAS_COLS = ["PREFIJO", "REGLA", "NOMBRE_CARRERA", "JORNADA", "CODIGO_SIES_ESPERADO"]
+
+ARCHIVO_SUBIDA_SHEET = "ARCHIVO_LISTO_SUBIDA"
+ARCHIVO_SUBIDA_PARQUET = "archivo_listo_subida.parquet"
+ARCHIVO_SUBIDA_XLSX = "archivo_listo_para_sies.xlsx"
 
 
 BASE_COLS = [
@@ -46,70 +52,160 @@ def normalize_text(value: object) -> str:
     return re.sub(r"\s+", " ", text)
 
 
-def load_archivo_subida(xlsx_path: Path) -> pd.DataFrame:
-    df = pd.read_excel(xlsx_path, sheet_name="ARCHIVO_LISTO_SUBIDA", dtype=str)
-    for col in BASE_COLS:
+def normalize_series(series: pd.Series) -> pd.Series:
+    """``normalize_text`` evaluado una vez por valor distinto (factorize) y expandido por código."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    normed = np.array([normalize_text(v) for v in uniques] + [""], dtype=object)
+    return pd.Series(normed[codes], index=series.index, dtype=object)
+
+
+def _text(series: pd.Series) -> pd.Series:
+    """Texto sin espacios laterales; nulos como cadena vacía (no "nan")."""
+    return series.fillna("").astype(str).str.strip()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Catálogo de reglas
+# ═══════════════════════════════════════════════════════════════════════════
+
+def load_reglas(path: Path = DEFAULT_REGLAS_PATH, prefijos: list[str] | None = None) -> pd.DataFrame:
+    """Lee el TSV de reglas y lo deja normalizado para el cruce (NOMBRE_NORM, JORNADA_NORM)."""
+    reglas = pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False)
+    faltantes = [c for c in REGLAS_COLS if c not in reglas.columns]
+    if faltantes:
+        raise ValueError(f"{path}: faltan columnas de reglas {faltantes}")
+    reglas = reglas[REGLAS_COLS].apply(lambda s: s.str.strip())
+    reglas["PREFIJO"] = reglas["PREFIJO"].str.upper()
+    if prefijos:
+        pedidos = {p.strip().upper() for p in prefijos}
+        desconocidos = sorted(pedidos - set(reglas["PREFIJO"]))
+        if desconocidos:
+            raise ValueError(f"Prefijos sin reglas en {path}: {desconocidos}")
+        reglas = reglas[reglas["PREFIJO"].isin(pedidos)]
+    reglas = reglas.assign(
+        NOMBRE_NORM=normalize_series(reglas["NOMBRE_CARRERA"]),
+        JORNADA_NORM=reglas["JORNADA"].str.upper(),
+    ).reset_index(drop=True)
+    dup = reglas.duplicated(["NOMBRE_NORM", "JORNADA_NORM"], keep=False)
+    if dup.any():
+        claves = sorted(set(zip(reglas.loc[dup, "NOMBRE_NORM"], reglas.loc[dup, "JORNADA_NORM"])))
+        raise ValueError(f"Reglas duplicadas para (NOMBRE_CARRERA, JORNADA): {claves}")
+    return reglas
+
+
+def match_reglas(nombre_norm: pd.Series, jornada_norm: pd.Series, reglas: pd.DataFrame) -> np.ndarray:
+    """Posición de la regla por fila (-1 sin regla) vía un único ``get_indexer`` sobre MultiIndex."""
+    index = pd.MultiIndex.from_arrays([reglas["NOMBRE_NORM"], reglas["JORNADA_NORM"]])
+    return index.get_indexer(pd.MultiIndex.from_arrays([nombre_norm, jornada_norm]))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Carga de ARCHIVO_LISTO_SUBIDA (Parquet / TSV / XLSX)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def resolve_archivo_subida(path: Path) -> Path:
+    """Un directorio de salida del pipeline se resuelve al Parquet si hay motor, si no al XLSX."""
+    if not path.is_dir():
+        return path
+    parquet = path / ARCHIVO_SUBIDA_PARQUET
+    if parquet.exists() and parquet_engine_available():
+        return parquet
+    return path / ARCHIVO_SUBIDA_XLSX
+
+
+def _read_parquet_columns(path: Path, columns: list[str]) -> pd.DataFrame:
+    try:
+        return pd.read_parquet(path, columns=columns)
+    except (KeyError, ValueError):
+        # Algún artefacto antiguo sin todas las columnas: se proyecta tras leer.
+        df = pd.read_parquet(path)
+        return df[[c for c in columns if c in df.columns]]
+
+
+def load_archivo_subida(path: Path, columns: list[str] = BASE_COLS) -> pd.DataFrame:
+    """Lee solo ``columns`` del artefacto, como texto, y completa las ausentes con nulos."""
+    path = resolve_archivo_subida(Path(path))
+    wanted = set(columns)
+    name = path.name.lower()
+    if name.endswith(".parquet"):
+        df = _read_parquet_columns(path, list(columns))
+        df = df.astype({c: "string" for c in df.columns}).astype(object)
+    elif name.endswith((".tsv", ".tsv.gz", ".csv", ".csv.gz")):
+        sep = "," if ".csv" in name else "\t"
+        df = pd.read_csv(path, sep=sep, dtype=str, usecols=lambda c: c in wanted)
+    else:
+        df = pd.read_excel(path, sheet_name=ARCHIVO_SUBIDA_SHEET, dtype=str, usecols=lambda c: c in wanted)
+    for col in columns:
         if col not in df.columns:
             df[col] = pd.NA
-    return df
-
-
-def build_universe(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out["NOMBRE_NORM"] = out["NOMBRE_CARRERA_FUENTE"].map(normalize_text)
-    out["JORNADA_NORM"] = out["JORNADA_FUENTE"].fillna("").astype(str).str.strip().str.upper()
-    out["CODCARPR_NORM"] = out["CODCARPR_NORM"].map(normalize_text)
-    out["RUT"] = (
-        out["N_DOC"].fillna("").astype(str).str.replace(r"\D", "", regex=True)
-        + "-"
-        + out["DV"].fillna("").astype(str).str.strip().str.upper()
-    )
-    out["CODIGO_ESPERADO"] = out.apply(
-        lambda r: RULES.get((r["NOMBRE_NORM"], r["JORNADA_NORM"]), (pd.NA, pd.NA))[0], axis=1
-    )
-    out["REGLA_A_E"] = out.apply(
-        lambda r: RULES.get((r["NOMBRE_NORM"], r["JORNADA_NORM"]), (pd.NA, pd.NA))[1], axis=1
-    )
-    out = out[out["CODIGO_ESPERADO"].notna()].copy()
+    return df[list(columns)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Universo, causas y evidencia
+# ═══════════════════════════════════════════════════════════════════════════
+
+def build_universe(df: pd.DataFrame, reglas: pd.DataFrame) -> pd.DataFrame:
+    nombre_norm = normalize_series(df["NOMBRE_CARRERA_FUENTE"])
+    jornada_norm = _text(df["JORNADA_FUENTE"]).str.upper()
+    pos = match_reglas(nombre_norm, jornada_norm, reglas)
+    keep = pos >= 0
+
+    out = df.loc[keep].copy()
+    pos = pos[keep]
+    out["NOMBRE_NORM"] = nombre_norm[keep]
+    out["JORNADA_NORM"] = jornada_norm[keep]
+    out["CODCARPR_NORM"] = normalize_series(out["CODCARPR_NORM"])
+    out["RUT"] = out["N_DOC"].fillna("").astype(str).str.replace(r"\D", "", regex=True) + "-" + _text(out["DV"]).str.upper()
+    out["CODIGO_ESPERADO"] = reglas["CODIGO_SIES_ESPERADO"].to_numpy()[pos]
+    out["REGLA_A_E"] = reglas["REGLA"].to_numpy()[pos]
+    out["PREFIJO"] = reglas["PREFIJO"].to_numpy()[pos]
     out["AUDIT_KEY"] = (
-        out["CODCLI"].fillna("").astype(str).str.strip()
+        _text(out["CODCLI"])
         + "|"
-        + out["N_DOC"].fillna("").astype(str).str.strip()
+        + _text(out["N_DOC"])
         + "|"
-        + out["DV"].fillna("").astype(str).str.strip().str.upper()
+        + _text(out["DV"]).str.upper()
         + "|"
-        + out["SOURCE_KEY_3"].fillna("").astype(str).str.strip()
+        + _text(out["SOURCE_KEY_3"])
     )
     out["SEQ_KEY"] = out.groupby("AUDIT_KEY", dropna=False).cumcount()
     return out
 
 
-def classify_cause(row: pd.Series) -> str:
-    codcarpr = str(row.get("CODCARPR_NORM", "") or "").strip()
-    diag = str(row.get("SIES_MATCH_DIAG", "") or "").upper()
-    status = str(row.get("SIES_MATCH_STATUS", "") or "").upper()
-    final_code = str(row.get("CODIGO_CARRERA_SIES_FINAL", "") or "").strip().upper()
-    expected = str(row.get("CODIGO_ESPERADO", "") or "").strip().upper()
-    n_codes = pd.to_numeric(pd.Series([row.get("N_CODES_SIES")]), errors="coerce").iloc[0]
-
-    if not codcarpr:
-        return "BLOQUEANTE_CODCARPR_NORM_VACIO"
-    if "PROBABLE_PROBLEMA_" in diag:
-        return "PROBLEMA_LLAVE"
-    if status in {"SIN_MATCH_SIES", "SIN_PUENTE_SIES"}:
-        return "SIN_MATCH_PUENTE"
-    if status == "AMBIGUO_SIES" or (pd.notna(n_codes) and float(n_codes) > 1 and not final_code):
-        return "MATCH_AMBIGUO"
-    if final_code and expected and final_code != expected:
-        return "MATCH_INCORRECTO"
-    if final_code and expected and final_code == expected:
-        return "OK"
-    return "OTRO"
-
-
-def build_before_table(df_before: pd.DataFrame) -> pd.DataFrame:
-    before = build_universe(df_before)
-    before["CAUSA_RAIZ"] = before.apply(classify_cause, axis=1)
+def classify_causes(df: pd.DataFrame) -> pd.Series:
+    """CAUSA_RAIZ por fila; el orden de ``np.select`` replica la precedencia de la regla original."""
+    codcarpr = _text(df["CODCARPR_NORM"])
+    diag = df["SIES_MATCH_DIAG"].fillna("").astype(str).str.upper()
+    status = df["SIES_MATCH_STATUS"].fillna("").astype(str).str.upper()
+    final_code = _text(df["CODIGO_CARRERA_SIES_FINAL"]).str.upper()
+    expected = _text(df["CODIGO_ESPERADO"]).str.upper()
+    n_codes = pd.to_numeric(df["N_CODES_SIES"], errors="coerce")
+    has_final = final_code.ne("")
+    has_expected = expected.ne("")
+
+    conditions = [
+        codcarpr.eq(""),
+        diag.str.contains("PROBABLE_PROBLEMA_", regex=False),
+        status.isin({"SIN_MATCH_SIES", "SIN_PUENTE_SIES"}),
+        status.eq("AMBIGUO_SIES") | (n_codes.gt(1) & ~has_final),
+        has_final & has_expected & final_code.ne(expected),
+        has_final & has_expected & final_code.eq(expected),
+    ]
+    choices = [
+        "BLOQUEANTE_CODCARPR_NORM_VACIO",
+        "PROBLEMA_LLAVE",
+        "SIN_MATCH_PUENTE",
+        "MATCH_AMBIGUO",
+        "MATCH_INCORRECTO",
+        "OK",
+    ]
+    return pd.Series(np.select(conditions, choices, default="OTRO"), index=df.index, dtype=object)
+
+
+def build_before_table(df_before: pd.DataFrame, reglas: pd.DataFrame) -> pd.DataFrame:
+    before = build_universe(df_before, reglas)
+    before["CAUSA_RAIZ"] = classify_causes(before)
     return before
 
 
@@ -149,6 +245,7 @@ def build_evidence(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
             "SIES_ANTES",
             "SIES_DESPUES",
             "CODIGO_ESPERADO",
+            "PREFIJO",
             "REGLA_A_E",
             "CAUSA_RAIZ",
             "ARCHIVO_INTERVENIDO",
@@ -164,27 +261,22 @@ def build_evidence(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
 
 def build_rut_audit(evidence: pd.DataFrame) -> pd.DataFrame:
     out = evidence.copy()
-    rut_count = out["RUT"].value_counts(dropna=False).to_dict()
-    rut_keys = out.groupby("RUT", dropna=False)["SOURCE_KEY_3"].nunique().to_dict()
-    out["RUT_OCURRENCIAS"] = out["RUT"].map(rut_count)
-    out["RUT_KEYS_DISTINTAS"] = out["RUT"].map(rut_keys)
-    estados = []
-    for _, r in out.iterrows():
-        sies_antes = str(r.get("SIES_ANTES", "") or "").strip().upper()
-        sies_despues = str(r.get("SIES_DESPUES", "") or "").strip().upper()
-        esperado = str(r.get("CODIGO_ESPERADO", "") or "").strip().upper()
-        if not sies_despues:
-            estado = "NO_ENCONTRADO"
-        elif int(r.get("RUT_KEYS_DISTINTAS", 0) or 0) > 1:
-            estado = "MULTIPLE_MATCH"
-        elif sies_despues == esperado and sies_antes != esperado:
-            estado = "OK_CAMBIADO"
-        elif sies_despues == esperado:
-            estado = "OK_YA_CORRECTO"
-        else:
-            estado = "FAIL"
-        estados.append(estado)
-    out["ESTADO"] = estados
+    out["RUT_OCURRENCIAS"] = out.groupby("RUT", dropna=False)["RUT"].transform("size")
+    out["RUT_KEYS_DISTINTAS"] = out.groupby("RUT", dropna=False)["SOURCE_KEY_3"].transform("nunique")
+    sies_antes = _text(out["SIES_ANTES"]).str.upper()
+    sies_despues = _text(out["SIES_DESPUES"]).str.upper()
+    esperado = _text(out["CODIGO_ESPERADO"]).str.upper()
+    ok_post = sies_despues.eq(esperado)
+    out["ESTADO"] = np.select(
+        [
+            sies_despues.eq(""),
+            out["RUT_KEYS_DISTINTAS"].gt(1),
+            ok_post & sies_antes.ne(esperado),
+            ok_post,
+        ],
+        ["NO_ENCONTRADO", "MULTIPLE_MATCH", "OK_CAMBIADO", "OK_YA_CORRECTO"],
+        default="FAIL",
+    )
     return out[
         [
             "RUT",
@@ -230,21 +322,28 @@ def build_summary(before: pd.DataFrame, evidence: pd.DataFrame, rut_audit: pd.Da
         "fallidos": int(fail.sum()),
         "ambiguedad_post": int(ambiguo_post.sum()),
         "rut_estado": rut_audit["ESTADO"].value_counts(dropna=False).to_dict(),
+        "por_prefijo": evidence["PREFIJO"].value_counts(sort=False).sort_index().to_dict(),
     }
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Auditoria antes/despues para cambio SIES CICIB MU 2026")
-    parser.add_argument("--antes-xlsx", required=True, help="Ruta XLSX baseline ANTES")
-    parser.add_argument("--despues-xlsx", required=True, help="Ruta XLSX DESPUES")
+    parser = argparse.ArgumentParser(description="Auditoria antes/despues para cambios SIES MU 2026 (reglas por catalogo)")
+    parser.add_argument("--antes", "--antes-xlsx", dest="antes", required=True,
+                        help="ARCHIVO_LISTO_SUBIDA baseline ANTES (.parquet, .tsv/.csv, .xlsx o directorio de salida)")
+    parser.add_argument("--despues", "--despues-xlsx", dest="despues", required=True,
+                        help="ARCHIVO_LISTO_SUBIDA DESPUES (.parquet, .tsv/.csv, .xlsx o directorio de salida)")
     parser.add_argument("--out-dir", required=True, help="Directorio de salida reportes")
+    parser.add_argument("--reglas", default=str(DEFAULT_REGLAS_PATH), help="TSV de reglas (PREFIJO, REGLA, NOMBRE_CARRERA, JORNADA, CODIGO_SIES_ESPERADO)")
+    parser.add_argument("--prefijo", action="append", default=None,
+                        help="Prefijo de carrera a auditar (repetible); por defecto todas las reglas del catalogo")
     args = parser.parse_args()
 
-    antes = load_archivo_subida(Path(args.antes_xlsx))
-    despues = load_archivo_subida(Path(args.despues_xlsx))
+    reglas = load_reglas(Path(args.reglas), args.prefijo)
+    antes = load_archivo_subida(Path(args.antes))
+    despues = load_archivo_subida(Path(args.despues))
 
-    before_table = build_before_table(antes)
-    after_table = build_universe(despues)
+    before_table = build_before_table(antes, reglas)
+    after_table = build_universe(despues, reglas)
     evidence = build_evidence(before_table, after_table)
     rut_audit = build_rut_audit(evidence)
     summary = build_summary(before_table, evidence, rut_audit)
@@ -252,10 +351,12 @@ def main() -> None:
     out_dir = Path(args.out_dir).expanduser().resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    before_path = out_dir / "DIAGNOSTICO_ANTES_CICIB.tsv"
-    evidence_path = out_dir / "EVIDENCIA_CAMBIO_CICIB.tsv"
-    rut_path = out_dir / "AUDITORIA_RUT_CICIB.tsv"
-    summary_path = out_dir / "RESUMEN_CICIB.json"
+    prefijos = sorted(reglas["PREFIJO"].unique())
+    tag = prefijos[0] if len(prefijos) == 1 else "TODAS"
+    before_path = out_dir / f"DIAGNOSTICO_ANTES_{tag}.tsv"
+    evidence_path = out_dir / f"EVIDENCIA_CAMBIO_{tag}.tsv"
+    rut_path = out_dir / f"AUDITORIA_RUT_{tag}.tsv"
+    summary_path = out_dir / f"RESUMEN_{tag}.json"
 
     before_table.to_csv(before_path, sep="\t", index=False, encoding="utf-8")
     evidence.to_csv(evidence_path, sep="\t", index=False, encoding="utf-8")